@@ -8,6 +8,7 @@ from .events import tracks_bp
 from .events import cars_bp
 from .events import games_bp
 from .webhooks import webhook_bp
+from .admin import admin_bp
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 api_bp.register_blueprint(auth_bp)
@@ -18,3 +19,4 @@ api_bp.register_blueprint(tracks_bp)
 api_bp.register_blueprint(cars_bp)
 api_bp.register_blueprint(games_bp)
 api_bp.register_blueprint(webhook_bp)
+api_bp.register_blueprint(admin_bp)
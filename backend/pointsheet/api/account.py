@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 from flask import Blueprint, current_app, Response
+from api.pagination import page_request, paginated
 from pointsheet.auth import api_auth
 
 from modules.account.queries.get_all_drivers import GetAllDrivers
@@ -15,13 +16,18 @@ account_bp = Blueprint("account", __name__, url_prefix='accounts')
 @api_auth.login_required
 def get_all_drivers():
     # Execute the query to get all drivers
-    drivers = current_app.application.execute(GetAllDrivers())
+    drivers = current_app.application.execute(GetAllDrivers(page=page_request()))
 
     # Map the drivers to the response model
-    return [
-        DriverResponse(id=driver.id, name=driver.name, role=driver.role).model_dump()
-        for driver in drivers
-    ], HTTPStatus.OK
+    return paginated(
+        drivers,
+        [
+            DriverResponse(
+                id=driver.id, name=driver.name, role=driver.role
+            ).model_dump()
+            for driver in drivers
+        ],
+    )
 
 
 @account_bp.route("/drivers/<uuid:id>", methods=["GET"])
@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+from flask import Blueprint, current_app, request
+
+from modules.notification.queries.get_webhook_stats import GetWebhookStats
+from pointsheet import instrumentation
+from pointsheet.auth import api_auth
+from pointsheet.cache import query_cache
+from pointsheet.domain.entity import UserRole
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@admin_bp.route("/metrics", methods=["GET"])
+@api_auth.login_required(role=UserRole.admin)
+def get_metrics():
+    """
+    Return the p50/p95 latency, database time and statement counts recorded
+    for recent requests and lato transactions, grouped by name, and the hits
+    and misses of the query result cache.
+    """
+    return {
+        **instrumentation.metrics.snapshot(),
+        "cache": query_cache.stats(),
+    }, HTTPStatus.OK
+
+
+@admin_bp.route("/webhooks/stats", methods=["GET"])
+@api_auth.login_required(role=UserRole.admin)
+def get_webhook_stats():
+    """
+    Return the deliveries, status codes and latency histogram of every
+    webhook and platform over the last ``days`` (1 by default), and the
+    depth and oldest pending log of the queue.
+    """
+    stats = current_app.application.execute(
+        GetWebhookStats(days=request.args.get("days", 1))
+    )
+    return stats.summary(), HTTPStatus.OK
@@ -1,6 +1,8 @@
 from flask import Blueprint, current_app, Response, jsonify, request
 
 from modules.event.queries.get_all_cars import GetAllCars
+from modules.event.queries.suggest_cars import SuggestCars
+from api.pagination import page_request, paginated
 from pointsheet.auth import api_auth
 
 cars_bp = Blueprint("cars", __name__, url_prefix="/cars")
@@ -11,16 +13,46 @@ cars_bp = Blueprint("cars", __name__, url_prefix="/cars")
 def get_cars():
     """
     Get all cars with optional filtering by game.
-    
+
+    Query Parameters:
+        game: The name of the game the cars belong to
+        search: Words the car model or year start with, best matches first
+
     Returns:
-        A JSON array of all cars matching the filter criteria.
+        A JSON array with one page of the cars matching the filter criteria.
+        The cursor of the next page is in the ``X-Next-Cursor`` header.
     """
-    # Extract query parameters
-    query_params = request.args.to_dict()
-    
     # Create and execute the query
-    query = GetAllCars(**query_params)
+    query = GetAllCars(
+        game=request.args.get("game"),
+        search=request.args.get("search"),
+        page=page_request(),
+    )
     cars = current_app.application.execute(query)
-    
+
     # Return the results
-    return [car.model_dump() for car in cars] if cars else []
\ No newline at end of file
+    return paginated(cars, [car.model_dump() for car in cars])
+
+
+@cars_bp.route("/suggest", methods=["GET"])
+@api_auth.login_required
+def suggest_cars():
+    """
+    Typeahead for car pickers.
+
+    Query Parameters:
+        q: What the user typed so far, every word is matched as a prefix
+        game: The ID of the game the cars belong to
+        limit: The number of suggestions (default: 10, at most 25)
+
+    Returns:
+        A JSON array with the best matching cars.
+    """
+    query = SuggestCars(
+        search=request.args.get("q", ""),
+        game_id=request.args.get("game", type=int),
+        limit=request.args.get("limit", 10, type=int),
+    )
+    cars = current_app.application.execute(query)
+
+    return jsonify([car.model_dump() for car in cars])
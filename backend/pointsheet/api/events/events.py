@@ -8,16 +8,25 @@ from modules.event.commands.join_event import JoinEvent
 from modules.event.commands.leave_event import LeaveEvent
 from modules.event.commands.remove_schedule import RemoveSchedule
 from modules.event.commands.save_race_result import SaveEventResults
-from modules.event.commands.save_uploaded_result import UploadRaceResult
+from modules.event.commands.save_uploaded_result import (
+    UploadRaceResult,
+    UploadRaceResultImages,
+)
 from modules.event.commands.update_event import UpdateEventModel
 from modules.event.commands.delete_event import DeleteEvent
+from modules.event.domain.value_objects import ParticipationStatus
+from modules.event.importers import importer_registry
 from modules.event.queries.get_event import GetEvent
 from modules.event.queries.get_events import GetEvents
+from api.pagination import page_request, paginated
 from pointsheet.auth import api_auth, get_user_id
 from pointsheet.domain.responses import ResourceCreated, ResourceUpdated
 
 event_bp = Blueprint("events", __name__, url_prefix="/events")
 
+# Screenshots of one result: the grids of most games fit on two or three
+MAX_RESULT_IMAGES = 5
+
 
 @event_bp.route("", methods=["POST"])
 @api_auth.login_required
@@ -34,9 +43,9 @@ def events():
 @event_bp.route("", methods=["GET"])
 @api_auth.login_required
 def get_events():
-    cmd = GetEvents()
-    all_events = current_app.application.execute(cmd)
-    return [evt.model_dump() for evt in all_events] if all_events else []
+    cmd = GetEvents(page=page_request())
+    page = current_app.application.execute(cmd)
+    return paginated(page, [evt.model_dump() for evt in page])
 
 
 @event_bp.route("/<uuid:event_id>", methods=["GET"])
@@ -50,8 +59,15 @@ def get_event(event_id):
 @event_bp.route("/<uuid:event_id>/join", methods=["PUT"])
 @api_auth.login_required
 def join_event(event_id):
-    cmd = JoinEvent(event_id=event_id, driver_id=get_user_id().id)
-    current_app.application.execute(cmd)
+    cmd = JoinEvent(
+        event_id=event_id,
+        driver_id=get_user_id().id,
+        waitlist=request.args.get("waitlist", "false").lower() == "true",
+    )
+    status = current_app.application.execute(cmd)
+
+    if status == ParticipationStatus.waitlisted:
+        return {"status": status.value}, 202
     return Response(status=204)
 
 
@@ -71,9 +87,14 @@ def leave_event(event_id):
 def upload_results(event_id):
     from utils.file_validation import validate_file, secure_filename
 
-    uploaded_file = request.files.get("file")
+    uploaded_files = request.files.getlist("file")
     allowed_extensions = {"csv", "jpg", "jpeg", "png"}
 
+    if len(uploaded_files) > 1:
+        # the screenshots of a result are uploaded to its schedule
+        return jsonify({"error": "Too many files. Upload one file per request"}), 400
+    uploaded_file = uploaded_files[0] if uploaded_files else None
+
     # Validate the file
     is_valid, error_message = validate_file(uploaded_file, allowed_extensions)
     if not is_valid:
@@ -119,8 +140,13 @@ def remove_event_schedule(event_id, schedule_id):
 def upload_result(event_id, schedule_id):
     from utils.file_validation import validate_file, secure_filename
 
-    uploaded_file = request.files.get("file")
-    allowed_extensions = {"csv", "jpg", "jpeg", "png"}
+    uploaded_files = request.files.getlist("file")
+    # screenshots, or the results files of the games and their servers
+    allowed_extensions = {"jpg", "jpeg", "png"} | importer_registry.extensions()
+
+    if len(uploaded_files) > 1:
+        return upload_result_images(event_id, schedule_id, uploaded_files)
+    uploaded_file = uploaded_files[0] if uploaded_files else None
 
     # Validate the file
     is_valid, error_message = validate_file(uploaded_file, allowed_extensions)
@@ -140,6 +166,29 @@ def upload_result(event_id, schedule_id):
     return Response(status=204)
 
 
+def upload_result_images(event_id, schedule_id, uploaded_files):
+    from utils.file_validation import validate_file
+
+    if len(uploaded_files) > MAX_RESULT_IMAGES:
+        return jsonify(
+            {
+                "error": f"Too many files. At most {MAX_RESULT_IMAGES} screenshots per result"
+            }
+        ), 400
+    for uploaded_file in uploaded_files:
+        is_valid, error_message = validate_file(uploaded_file, {"jpg", "jpeg", "png"})
+        if not is_valid:
+            return jsonify({"error": f"{uploaded_file.filename}: {error_message}"}), 400
+
+    cmd = UploadRaceResultImages(
+        event_id=event_id,
+        schedule_id=schedule_id,
+        files=uploaded_files,
+    )
+    current_app.application.execute(cmd)
+    return Response(status=204)
+
+
 @event_bp.route("/<uuid:event_id>/result", methods=["POST"])
 @api_auth.login_required
 def add_race_result(event_id):
@@ -3,6 +3,7 @@ from flask import Blueprint, current_app, Response, jsonify, request
 from modules.event.queries.get_games import GetGames
 from modules.event.queries.get_game import GetGame
 from modules.event.queries.get_cars import GetCars
+from api.pagination import page_request
 from pointsheet.auth import api_auth
 
 games_bp = Blueprint("games", __name__, url_prefix="/games")
@@ -51,17 +52,16 @@ def get_game_cars(game_id):
         game_id: The ID of the game to retrieve cars for.
 
     Query Parameters:
-        page: The page number (default: 1)
-        page_size: The number of items per page (default: 20)
+        cursor: The ``next_cursor`` of the previous page (default: first page)
+        limit: The number of items per page (default: 50)
+        total: Set to ``true`` to include the total number of cars
 
     Returns:
-        A JSON object containing the paginated list of cars and pagination metadata.
+        A JSON object containing the page of cars and pagination metadata.
     """
-    # Extract pagination parameters from query string
-    page = request.args.get('page', 1, type=int)
-    page_size = request.args.get('page_size', 20, type=int)
-
-    query = GetCars(game_id=game_id, page=page, page_size=page_size, search=request.args.get('search'))
+    query = GetCars(
+        game_id=game_id, page=page_request(), search=request.args.get("search")
+    )
     result = current_app.application.execute(query)
 
     # The result is now always a PaginatedResponse
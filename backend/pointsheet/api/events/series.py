@@ -15,6 +15,7 @@ from modules.event.commands.update_series_status import UpdateSeriesStatus
 from modules.event.commands.upload_series_cover_image import UploadSeriesCoverImage
 from modules.event.domain.entity import Event, Series
 from modules.event.domain.value_objects import SeriesStatus
+from api.pagination import page_request, paginated
 from pointsheet.auth import api_auth
 from pointsheet.domain.types import EntityId
 from modules.event.queries.get_all_series import GetAllSeries
@@ -36,9 +37,12 @@ def fetch_all_series():
         status_values = args['status']
         args['status'] = [SeriesStatus(status) for status in status_values]
 
-    cmd = GetAllSeries(**args)
-    result = current_app.application.execute(cmd)
-    return [item.model_dump() for item in result]
+    for name in ("cursor", "limit", "total"):
+        args.pop(name, None)
+
+    cmd = GetAllSeries(**args, page=page_request())
+    page = current_app.application.execute(cmd)
+    return paginated(page, [item.model_dump() for item in page])
 
 
 @series_bp.route("/series", methods=["POST"])
@@ -0,0 +1,36 @@
+"""Helpers for the keyset paginated listings."""
+
+from urllib.parse import urlencode
+
+from flask import jsonify, request
+
+from pointsheet.domain.responses import CursorPage
+from pointsheet.repository import DEFAULT_PAGE_SIZE, PageRequest
+
+PAGINATION_HEADERS = ["Link", "X-Next-Cursor", "X-Total-Count"]
+
+
+def page_request() -> PageRequest:
+    """Read ``cursor``, ``limit`` and ``total`` from the query string."""
+    return PageRequest(
+        cursor=request.args.get("cursor") or None,
+        limit=request.args.get("limit", DEFAULT_PAGE_SIZE, type=int),
+        with_total=request.args.get("total", "false").lower() == "true",
+    )
+
+
+def paginated(page: CursorPage, items: list):
+    """Respond with ``items`` as a JSON array and the page metadata as headers."""
+    response = jsonify(items)
+    pagination = page.pagination
+
+    if pagination.next_cursor:
+        args = request.args.copy()
+        args["cursor"] = pagination.next_cursor
+        query = urlencode(list(args.items(multi=True)))
+        response.headers["Link"] = f'<{request.base_url}?{query}>; rel="next"'
+        response.headers["X-Next-Cursor"] = pagination.next_cursor
+    if pagination.total is not None:
+        response.headers["X-Total-Count"] = str(pagination.total)
+
+    return response
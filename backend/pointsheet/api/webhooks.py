@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify, current_app, request
 from flask_pydantic import validate
 
 from modules.notification.commands.create_webhook import CreateWebhook
@@ -11,7 +11,9 @@ from modules.notification.domain.requests import WebhookCreate, WebhookUpdate, W
 from modules.notification.queries.get_webhook import GetWebhook
 from modules.notification.queries.get_all_webhooks import GetAllWebhooks
 from modules.notification.queries.get_webhook_subscriptions import GetWebhookSubscriptions
+from modules.notification.queries.get_webhook_logs import GetWebhookLogs
 from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from api.pagination import page_request, paginated
 from pointsheet.domain.responses import ResourceCreated
 
 webhook_bp = Blueprint("webhooks", __name__, url_prefix="/webhooks")
@@ -95,6 +97,19 @@ def get_webhook_subscriptions(webhook_id):
     subscriptions = current_app.application.execute(query)
     return jsonify([subscription.model_dump() for subscription in subscriptions]) if subscriptions else [],200
 
+# Get delivery logs for a webhook, newest first
+@webhook_bp.route("/<webhook_id>/logs", methods=["GET"])
+def get_webhook_logs(webhook_id):
+    succeeded = request.args.get("succeeded")
+    query = GetWebhookLogs(
+        webhook_id=webhook_id,
+        succeeded=None if succeeded is None else succeeded.lower() == "true",
+        page=page_request(),
+    )
+    logs = current_app.application.execute(query)
+    return paginated(logs, [log.model_dump(mode="json") for log in logs])
+
+
 # Delete a subscription
 @webhook_bp.route("/subscriptions/<subscription_id>", methods=["DELETE"])
 def delete_subscription(subscription_id):
@@ -0,0 +1,102 @@
+"""
+Latency of the car typeahead and ranked search over the Forza catalog.
+
+The catalog is loaded ``--copies`` times, each copy as another game.
+
+Usage:
+    python benchmarks/car_search.py --copies 10 --iterations 20
+"""
+
+import argparse
+import csv
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules.event.queries.get_all_cars import GetAllCars  # noqa: E402
+from modules.event.repository import CarRepository  # noqa: E402
+from pointsheet import create_app  # noqa: E402
+from pointsheet.db import SessionFactory, engine  # noqa: E402
+from pointsheet.models import BaseModel, Car, Game  # noqa: E402
+from pointsheet.repository import PageRequest  # noqa: E402
+
+CATALOG = Path(__file__).resolve().parent.parent / "data" / "forza_cars.csv"
+TYPED = ["mercedes amg", "porsche 911", "mclaren", "ford mustang", "nissan gt"]
+
+
+def create_catalog(copies: int) -> int:
+    with open(CATALOG) as file:
+        rows = list(csv.DictReader(file))
+
+    session = SessionFactory()
+    for copy in range(copies):
+        game = Game(name=f"Forza {copy}")
+        session.add_all(
+            Car(game=game, model=row["model"], year=row["year"]) for row in rows
+        )
+    session.commit()
+    session.close()
+    return len(rows) * copies
+
+
+def prefixes() -> list:
+    return [text[:length] for text in TYPED for length in range(2, len(text) + 1)]
+
+
+def measure(lookup, iterations: int) -> list:
+    session = SessionFactory()
+    repo = CarRepository(session)
+    durations = []
+    for _ in range(iterations):
+        for prefix in prefixes():
+            started = time.perf_counter()
+            lookup(repo, prefix)
+            durations.append(time.perf_counter() - started)
+    session.close()
+    return durations
+
+
+def report(label: str, durations: list):
+    durations = sorted(durations)
+    print(f"{label}")
+    print(f"  p50: {statistics.median(durations) * 1000:8.2f} ms")
+    print(f"  p95: {durations[int(len(durations) * 0.95)] * 1000:8.2f} ms")
+    print(f"  max: {durations[-1] * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    create_app()
+    logging.disable(logging.CRITICAL)
+    BaseModel.metadata.create_all(bind=engine)
+    cars = create_catalog(args.copies)
+
+    print(f"{cars} cars, {len(prefixes())} prefixes, {args.iterations} iterations")
+    report(
+        "suggest (10 cars)",
+        measure(lambda repo, prefix: repo.suggest(prefix), args.iterations),
+    )
+    report(
+        "search (first page of 50 with total)",
+        measure(
+            lambda repo, prefix: repo.all(
+                GetAllCars(search=prefix), PageRequest(with_total=True)
+            ),
+            args.iterations,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cost of ``JoinEvent`` on an event that already has 60 drivers.
+
+Each join is followed by an untimed ``LeaveEvent``.
+
+Usage:
+    python benchmarks/join_event.py --iterations 200
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules import application  # noqa: E402
+from modules.event.commands.join_event import JoinEvent  # noqa: E402
+from modules.event.commands.leave_event import LeaveEvent  # noqa: E402
+from modules.event.domain.value_objects import (  # noqa: E402
+    DriverResult,
+    EventStatus,
+    ScheduleType,
+)
+from pointsheet import create_app, instrumentation  # noqa: E402
+from pointsheet.db import SessionFactory, engine  # noqa: E402
+from pointsheet.models import (  # noqa: E402
+    BaseModel,
+    Car,
+    Event,
+    EventSchedule,
+    Game,
+    Participants,
+    RaceResult,
+)
+from pointsheet.models.account import Driver  # noqa: E402
+
+DRIVERS = 60
+
+
+def create_event() -> uuid.UUID:
+    session = SessionFactory()
+    game = Game(name="Assetto Corsa Competizione")
+    cars = [Car(game=game, model=f"Car {n}", year="2024") for n in range(5)]
+    event_id = uuid.uuid4()
+    drivers = [
+        Participants(id=uuid.uuid4(), name=f"Driver {n}", event_id=event_id)
+        for n in range(DRIVERS)
+    ]
+    race = EventSchedule(type=ScheduleType.race, nbr_of_laps=20)
+    race.result = RaceResult(
+        result=[
+            DriverResult(
+                driver_id=driver.id,
+                driver=driver.name,
+                position=position,
+                best_lap="1:48.000",
+                total="36:00.000",
+            )
+            for position, driver in enumerate(drivers, start=1)
+        ]
+    )
+    session.add(
+        Event(
+            id=event_id,
+            title="Sign-up rush",
+            host=uuid.uuid4(),
+            status=EventStatus.open,
+            starts_at=datetime.now() + timedelta(days=7),
+            ends_at=datetime.now() + timedelta(days=7, hours=2),
+            max_participants=100,
+            game=game,
+            cars=cars,
+            drivers=drivers,
+            schedule=[
+                EventSchedule(type=ScheduleType.practice, duration="30m"),
+                EventSchedule(type=ScheduleType.qualification, duration="15m"),
+                race,
+            ],
+        )
+    )
+    session.commit()
+    session.close()
+    return event_id
+
+
+def create_driver(session) -> uuid.UUID:
+    driver_id = uuid.uuid4()
+    session.add(Driver(id=driver_id, name=f"Newcomer {driver_id.hex[:6]}"))
+    session.commit()
+    return driver_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    logging.disable(logging.CRITICAL)
+    BaseModel.metadata.create_all(bind=engine)
+    event_id = create_event()
+
+    durations, statements = [], []
+    setup_session = SessionFactory()
+    with app.test_request_context():
+        for _ in range(args.iterations):
+            driver_id = create_driver(setup_session)
+            tracker = instrumentation.start_tracking("benchmark", "join_event")
+            started = time.perf_counter()
+            application.execute(JoinEvent(event_id=event_id, driver_id=driver_id))
+            durations.append(time.perf_counter() - started)
+            instrumentation.stop_tracking(tracker)
+            statements.append(tracker.statement_count)
+            application.execute(LeaveEvent(event_id=event_id, driver_id=driver_id))
+    setup_session.close()
+
+    print(f"JoinEvent on a {DRIVERS} driver event, {args.iterations} iterations")
+    print(f"  mean:       {statistics.mean(durations) * 1000:8.2f} ms")
+    print(f"  p95:        {statistics.quantiles(durations, n=20)[-1] * 1000:8.2f} ms")
+    print(f"  statements: {statistics.mean(statements):8.1f} per join")
+
+
+if __name__ == "__main__":
+    main()
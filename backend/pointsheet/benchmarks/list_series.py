@@ -0,0 +1,170 @@
+"""
+Memory and latency of listing 500 series, aggregates against read models.
+
+Memory is the tracemalloc peak of one listing.
+
+Usage:
+    python benchmarks/list_series.py --iterations 5
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules.event.domain.value_objects import (  # noqa: E402
+    DriverResult,
+    EventStatus,
+    ScheduleType,
+    SeriesStatus,
+)
+from modules.event.queries.get_all_series import GetAllSeries  # noqa: E402
+from modules.event.read_models import EventReadModel  # noqa: E402
+from modules.event.repository import SeriesRepository  # noqa: E402
+from pointsheet import create_app  # noqa: E402
+from pointsheet.db import SessionFactory, engine  # noqa: E402
+from pointsheet.models import (  # noqa: E402
+    BaseModel,
+    Car,
+    Event,
+    EventSchedule,
+    Game,
+    Participants,
+    RaceResult,
+    Series,
+)
+from pointsheet.repository import MAX_PAGE_SIZE, PageRequest  # noqa: E402
+
+SERIES = 500
+EVENTS_PER_SERIES = 4
+DRIVERS_PER_EVENT = 12
+
+
+def create_series():
+    session = SessionFactory()
+    game = Game(name="Assetto Corsa Competizione")
+    cars = [Car(game=game, model=f"Car {n}", year="2024") for n in range(3)]
+    starts_at = datetime.now() + timedelta(days=7)
+
+    for n in range(SERIES):
+        series = Series(
+            id=uuid.uuid4(),
+            title=f"Series {n}",
+            status=SeriesStatus.started,
+            description="Weekly league races",
+        )
+        for round_ in range(EVENTS_PER_SERIES):
+            event_id = uuid.uuid4()
+            drivers = [
+                Participants(id=uuid.uuid4(), name=f"Driver {d}", event_id=event_id)
+                for d in range(DRIVERS_PER_EVENT)
+            ]
+            race = EventSchedule(type=ScheduleType.race, nbr_of_laps=20)
+            race.result = RaceResult(
+                result=[
+                    DriverResult(
+                        driver_id=driver.id,
+                        driver=driver.name,
+                        position=position,
+                        best_lap="1:48.000",
+                        total="36:00.000",
+                    )
+                    for position, driver in enumerate(drivers, start=1)
+                ]
+            )
+            series.events.append(
+                Event(
+                    id=event_id,
+                    title=f"Round {round_}",
+                    host=uuid.uuid4(),
+                    status=EventStatus.open,
+                    starts_at=starts_at,
+                    ends_at=starts_at + timedelta(hours=2),
+                    game=game,
+                    cars=cars,
+                    drivers=drivers,
+                    schedule=[
+                        EventSchedule(type=ScheduleType.practice, duration="30m"),
+                        EventSchedule(type=ScheduleType.qualification, duration="15m"),
+                        race,
+                    ],
+                )
+            )
+        session.add(series)
+    session.commit()
+    session.close()
+
+
+def list_aggregates(session) -> list:
+    repo = SeriesRepository(session)
+    return walk(lambda page: repo.all(GetAllSeries(), page))
+
+
+def list_summaries(session) -> list:
+    read_model = EventReadModel(session)
+    return walk(lambda page: read_model.series(GetAllSeries(), page))
+
+
+def walk(fetch) -> list:
+    cursor, items = None, []
+    while True:
+        page = fetch(PageRequest(cursor=cursor, limit=MAX_PAGE_SIZE))
+        items += [item.model_dump() for item in page]
+        cursor = page.pagination.next_cursor
+        if cursor is None:
+            return items
+
+
+def measure(listing, iterations: int) -> tuple[list, int]:
+    durations = []
+    for _ in range(iterations):
+        session = SessionFactory()
+        started = time.perf_counter()
+        items = listing(session)
+        durations.append(time.perf_counter() - started)
+        session.close()
+        assert len(items) == SERIES
+
+    session = SessionFactory()
+    tracemalloc.start()
+    listing(session)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.close()
+    return durations, peak
+
+
+def report(label: str, durations: list, peak: int):
+    print(f"{label}")
+    print(f"  mean:        {statistics.mean(durations) * 1000:8.1f} ms")
+    print(f"  min:         {min(durations) * 1000:8.1f} ms")
+    print(f"  peak memory: {peak / 1024 / 1024:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    create_app()
+    logging.disable(logging.CRITICAL)
+    BaseModel.metadata.create_all(bind=engine)
+    create_series()
+
+    print(f"Listing {SERIES} series, {args.iterations} iterations")
+    report("aggregates (SeriesRepository)", *measure(list_aggregates, args.iterations))
+    report("read model (SeriesSummary)", *measure(list_summaries, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
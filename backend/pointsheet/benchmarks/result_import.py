@@ -0,0 +1,93 @@
+"""
+Time of importing a results file, from its bytes to the results rows.
+
+Synthetic results are read as an ACC server file and as a CSV export.
+
+Usage:
+    python benchmarks/result_import.py --drivers 30 --iterations 200
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules.event.importers import SIGNATURE_SIZE, importer_registry  # noqa: E402
+
+
+def acc_file(drivers: int) -> bytes:
+    lines = [
+        {
+            "car": {
+                "carId": 1000 + n,
+                "raceNumber": n,
+                "drivers": [{"firstName": "Driver", "lastName": str(n)}],
+            },
+            "currentDriver": {
+                "firstName": "Driver",
+                "lastName": str(n),
+                "shortName": f"D{n}",
+            },
+            "timing": {
+                "bestLap": 138000 + 37 * n,
+                "totalTime": 2780000 + 1200 * n,
+                "lapCount": 20,
+            },
+        }
+        for n in range(1, drivers + 1)
+    ]
+    session = {
+        "sessionType": "R",
+        "trackName": "spa",
+        "sessionResult": {"leaderBoardLines": lines},
+        "laps": [],
+    }
+    return json.dumps(session, indent=2).encode("utf-16")
+
+
+def csv_file(drivers: int) -> bytes:
+    rows = [
+        f"{n},Driver {n},Porsche,1:{32 + n // 60}.{n:03d},,46:{n:02d}.000"
+        for n in range(1, drivers + 1)
+    ]
+    return (
+        "Pos,Driver,Car,Best Lap,Penalty,Total Time\n" + "\n".join(rows) + "\n"
+    ).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--drivers", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    for filename, content in (
+        ("race.json", acc_file(args.drivers)),
+        ("race.csv", csv_file(args.drivers)),
+    ):
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            importer = importer_registry.importer_for(
+                filename, content[:SIGNATURE_SIZE]
+            )
+            output = importer.read(io.BytesIO(content))
+            timings.append(time.perf_counter() - started)
+        print(
+            f"{importer.name:<4} {len(content) / 1024:6.1f} KiB, {len(output.results)} results:"
+            f" median {statistics.median(timings) * 1000:.2f} ms, max {max(timings) * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Wall time of reading result screenshots with the OCR pool, by its size.
+
+Without a ``tesseract`` binary only the OpenCV preprocessing is timed.
+
+Usage:
+    python benchmarks/result_ocr_pool.py --images 24 --iterations 3
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import cv2  # noqa: E402
+import numpy  # noqa: E402
+
+from modules.event.ocr import preprocess, read_image  # noqa: E402
+
+
+def preprocess_only(file_path) -> tuple:
+    return preprocess(file_path)[0].shape
+
+
+def draw_screenshot(path: str, width: int, seed: int) -> None:
+    height = width * 9 // 16
+    rng = numpy.random.default_rng(seed)
+    image = rng.integers(20, 60, (height, width, 3), dtype=numpy.uint8)
+    scale = width / 1920
+    columns = [int(x * scale) for x in (80, 200, 900, 1250, 1600)]
+    row_height = int(44 * scale)
+
+    def text(value, x, y):
+        cv2.putText(
+            image,
+            value,
+            (x, y),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            scale,
+            (235, 235, 235),
+            max(1, int(2 * scale)),
+        )
+
+    for column, title in zip(
+        columns, ("Pos", "Driver", "Best Lap", "Race Time", "Total")
+    ):
+        text(title, column, int(120 * scale))
+    for position in range(1, 21):
+        y = int(120 * scale) + row_height * position
+        for column, value in zip(
+            columns,
+            (
+                str(position),
+                f"Driver {seed}-{position}",
+                f"1:4{position % 10}.{position * 37:03d}",
+                f"45:{position:02d}.{position * 91 % 1000:03d}",
+                f"45:{position:02d}.{position * 91 % 1000:03d}",
+            ),
+        ):
+            text(value, column, y)
+    cv2.imwrite(path, image)
+
+
+def pool_sizes(cpus: int) -> list:
+    sizes, size = [], 1
+    while size < cpus:
+        sizes.append(size)
+        size *= 2
+    return sizes + [cpus]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--images", type=int, default=24)
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stage = read_image if shutil.which("tesseract") else preprocess_only
+    cpus = args.max_workers
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"result_{n}.png") for n in range(args.images)]
+        for seed, path in enumerate(paths):
+            draw_screenshot(path, args.width, seed)
+
+        print(
+            f"{args.images} screenshots of {args.width}px, {stage.__name__}, {os.cpu_count()} CPUs"
+        )
+        baseline = None
+        for workers in pool_sizes(cpus):
+            with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                list(executor.map(stage, paths[:workers]))
+                durations = []
+                for _ in range(args.iterations):
+                    started = time.perf_counter()
+                    list(executor.map(stage, paths))
+                    durations.append(time.perf_counter() - started)
+            median = statistics.median(durations)
+            baseline = baseline or median
+            print(
+                f"{workers:>3} workers {median * 1000:9.1f} ms"
+                f"  {median / args.images * 1000:7.1f} ms/screenshot  {baseline / median:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Where the time of reading a result screenshot goes, stage by stage.
+
+The whole screenshot is compared with the table cropped by the default profile.
+
+Usage:
+    python benchmarks/result_preprocessing.py --width 2560 --iterations 10
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import cv2  # noqa: E402
+
+from modules.event.ocr import preprocess, read_image  # noqa: E402
+from modules.event.preprocessing import DEFAULT_PROFILE, PreprocessingProfile, rotate  # noqa: E402
+from result_ocr_pool import draw_screenshot  # noqa: E402
+
+PROFILES = {
+    "whole screenshot": PreprocessingProfile(
+        crop_table=False, deskew=False, text_height=0
+    ),
+    "table": DEFAULT_PROFILE,
+}
+
+
+def screenshot(path: str, width: int, skew: float) -> None:
+    draw_screenshot(path, width, seed=7)
+    image = cv2.imread(path)
+    scale = width / 1920
+    cv2.putText(
+        image,
+        "RACE RESULTS",
+        (int(760 * scale), int(50 * scale)),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        1.5 * scale,
+        (250, 250, 250),
+        max(1, int(3 * scale)),
+    )
+    cv2.circle(
+        image, (int(1800 * scale), int(980 * scale)), int(70 * scale), (200, 60, 60), -1
+    )
+    gray = rotate(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), skew)
+    cv2.imwrite(path, gray)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--skew", type=float, default=2.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    with_tesseract = shutil.which("tesseract") is not None
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.png")
+        screenshot(path, args.width, args.skew)
+        print(
+            f"{args.width}px screenshot turned {args.skew}°, median of {args.iterations} runs"
+        )
+
+        for name, profile in PROFILES.items():
+            runs = []
+            for _ in range(args.iterations):
+                if with_tesseract:
+                    _, timings = read_image(path, profile)
+                    image = None
+                else:
+                    image, timings = preprocess(path, profile)
+                runs.append(timings)
+            if image is None:
+                image, _ = preprocess(path, profile)
+
+            stages = {
+                stage: statistics.median(run[stage] for run in runs)
+                for stage in runs[0]
+            }
+            print(
+                f"{name}: {sum(stages.values()):.1f} ms, {image.shape[1]}x{image.shape[0]} to Tesseract"
+                f" ({image.size / 1e6:.2f} Mpx)"
+            )
+            for stage, duration in stages.items():
+                print(f"  {stage:<13} {duration:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
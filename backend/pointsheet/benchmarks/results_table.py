@@ -0,0 +1,120 @@
+"""
+Latency and accuracy of the local results-table parser over the fixture corpus.
+
+A screenshot is added to the corpus with ``--capture``, which needs
+Tesseract; fill in ``expected`` by hand afterwards.
+
+Usage:
+    python benchmarks/results_table.py --iterations 200 --min-confidence 0.8
+    python benchmarks/results_table.py --capture screenshot.png --name acc_spa
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules.event.results_table import ResultsTableParser, Word  # noqa: E402
+
+CORPUS = (
+    Path(__file__).resolve().parent.parent
+    / "modules"
+    / "event"
+    / "tests"
+    / "fixtures"
+    / "results_tables"
+)
+FIELDS = ("position", "driver", "best_lap", "race", "penalties", "total")
+
+
+def field_accuracy(results, expected) -> tuple:
+    """Expected fields found with the same value, and expected fields."""
+    parsed = {result.position: result.model_dump() for result in results.results}
+    right = total = 0
+    for row in expected["results"]:
+        found = parsed.get(row["position"], {})
+        for name in FIELDS:
+            if row.get(name) is not None:
+                total += 1
+                right += found.get(name) == row[name]
+    return right, total
+
+
+def capture(image: str, name: str) -> Path:
+    from modules.event.ocr import read_image
+
+    path = CORPUS / f"{name}.json"
+    words, _ = read_image(image)
+    fixture = {
+        "description": f"Captured from {os.path.basename(image)}",
+        "fallback": False,
+        "expected": None,
+    }
+    lines = ",\n".join("    " + json.dumps(word.to_row()) for word in words)
+    header = json.dumps(fixture, indent=2)[:-2]
+    path.write_text(f'{header},\n  "words": [\n{lines}\n  ]\n}}\n')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    parser.add_argument("--capture", help="Screenshot to add to the corpus")
+    parser.add_argument("--name", help="Name of the captured fixture")
+    args = parser.parse_args()
+
+    if args.capture:
+        print(f"Wrote {capture(args.capture, args.name or Path(args.capture).stem)}")
+        return
+
+    table_parser = ResultsTableParser()
+    right = total = decisions = 0
+    durations = []
+    fixtures = sorted(CORPUS.glob("*.json"))
+    print(
+        f"{'fixture':<18} {'words':>5} {'median':>9} {'confidence':>10} {'decision':>8} {'fields':>7}"
+    )
+    for path in fixtures:
+        fixture = json.loads(path.read_text())
+        words = [Word(*row) for row in fixture["words"]]
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            table = table_parser.parse(words)
+            timings.append(time.perf_counter() - started)
+        median = statistics.median(timings)
+        durations.append(median)
+
+        falls_back = table.confidence < args.min_confidence
+        decisions += falls_back == fixture["fallback"]
+        fields = "-"
+        if fixture["expected"] and not falls_back:
+            fixture_right, fixture_total = field_accuracy(
+                table.results, fixture["expected"]
+            )
+            right, total = right + fixture_right, total + fixture_total
+            fields = f"{fixture_right}/{fixture_total}"
+        print(
+            f"{path.stem:<18} {len(words):>5} {median * 1e6:7.0f}µs {table.confidence:>10.3f}"
+            f" {'llm' if falls_back else 'local':>8} {fields:>7}"
+        )
+
+    print(
+        f"median {statistics.median(durations) * 1000:.2f} ms per screen,"
+        f" {decisions}/{len(fixtures)} decisions right,"
+        f" {right}/{total} fields right ({right / max(total, 1):.1%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Per-call overhead of ``application.execute`` for a trivial query.
+
+``GetGames`` runs with the lazy transaction wiring and with an eager copy.
+
+Usage:
+    python benchmarks/transaction_overhead.py --iterations 5000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from lagom import Container  # noqa: E402
+from lato import TransactionContext  # noqa: E402
+
+import modules  # noqa: E402
+from modules import (  # noqa: E402
+    REPOSITORIES,
+    CorrelationId,
+    TransactionScope,
+    application,
+)
+from modules.dependency_provider import LagomDependencyProvider  # noqa: E402
+from modules.event.queries.get_games import GetGames  # noqa: E402
+from pointsheet import create_app  # noqa: E402
+from pointsheet.db import Session, engine  # noqa: E402
+from pointsheet.domain.types import UserId  # noqa: E402
+from pointsheet.models import BaseModel  # noqa: E402
+
+
+def eager_transaction_context():
+    txn_container = Container()
+    txn_container[CorrelationId] = uuid.uuid4()
+
+    scope = TransactionScope()
+    session = scope.session
+    txn_container[TransactionScope] = scope
+    txn_container[Session] = session
+
+    txn_container[logging.Logger] = modules.logger
+    for repository_class in REPOSITORIES:
+        txn_container[repository_class] = repository_class(session)
+    txn_container[UserId] = modules.get_user_id()
+
+    return TransactionContext(LagomDependencyProvider(txn_container))
+
+
+def measure(iterations: int) -> float:
+    """Mean wall time of one ``execute(GetGames())`` in microseconds."""
+    for _ in range(100):
+        application.execute(GetGames())
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        application.execute(GetGames())
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def measure_context_creation(factory, iterations: int) -> float:
+    """Mean wall time of building one transaction context in microseconds."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        factory()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def report(label: str, eager: float, lazy: float):
+    print(f"{label}")
+    print(f"  eager wiring: {eager:8.1f} us")
+    print(f"  lazy wiring:  {lazy:8.1f} us")
+    print(f"  saved:        {eager - lazy:8.1f} us ({(1 - lazy / eager):.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_app()
+    # Handler and SQL logging would dominate the numbers.
+    logging.disable(logging.CRITICAL)
+    BaseModel.metadata.create_all(bind=engine)
+
+    lazy_factory = application._transaction_context_factory
+    with app.test_request_context():
+        report(
+            "transaction context creation",
+            measure_context_creation(eager_transaction_context, args.iterations),
+            measure_context_creation(lazy_factory, args.iterations),
+        )
+
+        lazy = measure(args.iterations)
+        application.on_create_transaction_context(eager_transaction_context)
+        try:
+            eager = measure(args.iterations)
+        finally:
+            application.on_create_transaction_context(lazy_factory)
+        report("application.execute(GetGames())", eager, lazy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Sequential webhook sending against the concurrent dispatcher.
+
+50 logs are sent to fast, slow and failing stub servers on localhost.
+
+Usage:
+    python benchmarks/webhook_dispatch.py --slow-delay 0.5 --iterations 3
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import update  # noqa: E402
+
+from modules.notification.domain.value_objects import WebhookPlatform  # noqa: E402
+from modules.notification.dispatcher import WebhookDispatcher  # noqa: E402
+from modules.notification.services import WebhookSenderService  # noqa: E402
+from pointsheet import create_app  # noqa: E402
+from pointsheet.db import SessionFactory, engine  # noqa: E402
+from pointsheet.models import BaseModel  # noqa: E402
+from pointsheet.models.notification import Webhook, WebhookLog  # noqa: E402
+
+BATCH = {"fast": 40, "slow": 5, "failing": 5}
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, status: int, delay: float):
+        self.status = status
+        self.delay = delay
+        self.connections = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.delay)
+        body = b"{}"
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_servers(slow_delay: float) -> dict:
+    servers = {
+        "fast": StubServer(200, 0.005),
+        "slow": StubServer(200, slow_delay),
+        "failing": StubServer(500, 0.005),
+    }
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers
+
+
+def create_logs(servers: dict):
+    session = SessionFactory()
+    for name, count in BATCH.items():
+        webhook = Webhook(
+            id=uuid.uuid4(),
+            name=name,
+            target_url=servers[name].url,
+            platform=WebhookPlatform.GENERIC_HTTP.value,
+        )
+        session.add(webhook)
+        session.add_all(
+            WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={"n": n})
+            for n in range(count)
+        )
+    session.commit()
+    session.close()
+
+
+def reset_logs():
+    session = SessionFactory()
+    session.execute(
+        update(WebhookLog).values(
+            http_status=None,
+            response_body=None,
+            succeeded=False,
+            attempts=0,
+            next_attempt_at=datetime.now(),
+        )
+    )
+    session.commit()
+    session.close()
+
+
+def measure(process, servers: dict, iterations: int) -> tuple[list, int]:
+    durations = []
+    for server in servers.values():
+        server.connections = 0
+    for _ in range(iterations):
+        reset_logs()
+        session = SessionFactory()
+        started = time.perf_counter()
+        success_count, failure_count = process(session)
+        durations.append(time.perf_counter() - started)
+        session.close()
+        assert (success_count, failure_count) == (45, 5), (success_count, failure_count)
+    connections = sum(server.connections for server in servers.values())
+    return durations, connections // iterations
+
+
+def sequential(session) -> tuple:
+    dispatcher = WebhookDispatcher(
+        session=session,
+        sender_service=WebhookSenderService(),
+        max_workers=1,
+        per_host=1,
+    )
+    return dispatcher.dispatch(limit=50)
+
+
+def concurrent(session) -> tuple:
+    dispatcher = WebhookDispatcher(session=session, max_workers=16, per_host=4)
+    try:
+        return dispatcher.dispatch(limit=50)
+    finally:
+        dispatcher.sender_service.sessions.close()
+
+
+def report(label: str, durations: list, connections: int):
+    print(f"{label}")
+    print(f"  mean:        {statistics.mean(durations) * 1000:8.1f} ms")
+    print(f"  min:         {min(durations) * 1000:8.1f} ms")
+    print(f"  connections: {connections:8d} per batch")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    create_app()
+    logging.disable(logging.CRITICAL)
+    BaseModel.metadata.create_all(bind=engine)
+    servers = start_servers(args.slow_delay)
+    create_logs(servers)
+
+    print(
+        f"{sum(BATCH.values())} webhooks, slow endpoint {args.slow_delay}s, {args.iterations} iterations"
+    )
+    report("sequential (one worker)", *measure(sequential, servers, args.iterations))
+    report("concurrent (16 workers)", *measure(concurrent, servers, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
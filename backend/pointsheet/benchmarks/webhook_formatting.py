@@ -0,0 +1,150 @@
+"""
+Formatting a batch of webhook payloads, before and after the formatter registry.
+
+The template alone is also timed, ``str.format`` against ``ContentTemplate.render``.
+
+Usage:
+    python benchmarks/webhook_formatting.py --payloads 10000 --iterations 5
+"""
+
+import argparse
+import importlib
+import os
+import re
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from modules.notification.domain.entity import Webhook  # noqa: E402
+from modules.notification.domain.value_objects import WebhookPlatform  # noqa: E402
+from modules.notification.formatters.registry import formatter_registry  # noqa: E402
+from modules.notification.formatters.templates import compile_template  # noqa: E402
+
+EVENTS = ("SeriesStarted", "DriverJoinedEvent", "RaceResultUploaded", "EventCreated")
+TEMPLATE = "{event_type}: driver {driver_id} in event {event_id}"
+
+
+def legacy_formatter(platform: WebhookPlatform, event_type: str):
+    """The formatter lookup of the former DynamicWebhookFormatterFactory."""
+    event_name = re.sub(r"(?<!^)(?=[A-Z])", "_", event_type).lower()
+    try:
+        module = importlib.import_module(
+            f"modules.notification.formatters.{platform.value}.{event_name}"
+        )
+        for attr_name in dir(module):
+            if attr_name.endswith("Formatter"):
+                return getattr(module, attr_name)()
+    except (ImportError, AttributeError):
+        pass
+    module = importlib.import_module(
+        f"modules.notification.formatters.{platform.value}.default"
+    )
+    return module.DefaultFormatter()
+
+
+def legacy_format(webhook: Webhook, payload: dict) -> dict:
+    formatter = legacy_formatter(webhook.platform, payload["event_type"])
+    formatted = formatter.format_payload(webhook, payload)
+    # The former DiscordFormatter.create_content parsed the template for every payload
+    formatted["content"] = webhook.config["content_template"].format(**payload)
+    return formatted
+
+
+def registry_format(webhook: Webhook, payload: dict) -> dict:
+    formatter = formatter_registry.formatter(webhook.platform, payload["event_type"])
+    return formatter.format_payload(webhook, payload)
+
+
+def payloads(count: int) -> list:
+    return [
+        {
+            "event_type": EVENTS[n % len(EVENTS)],
+            "driver_id": str(uuid.uuid4()),
+            "event_id": str(uuid.uuid4()),
+            "series_id": str(uuid.uuid4()),
+        }
+        for n in range(count)
+    ]
+
+
+def measure(format_one, webhook: Webhook, batch: list, iterations: int) -> list:
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        for payload in batch:
+            format_one(webhook, payload)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def measure_templates(batch: list, iterations: int) -> tuple:
+    compiled = compile_template(TEMPLATE)
+    parsed, substituted = [], []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        for payload in batch:
+            TEMPLATE.format(**payload)
+        parsed.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for payload in batch:
+            compiled.render(payload)
+        substituted.append(time.perf_counter() - started)
+    return parsed, substituted
+
+
+def report(name: str, durations: list, count: int) -> float:
+    median = statistics.median(durations)
+    print(f"{name:<22} {median * 1000:9.1f} ms  {median / count * 1e6:7.2f} µs/payload")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--payloads", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    webhook = Webhook(
+        target_url="https://discord.test/hook",
+        platform=WebhookPlatform.DISCORD,
+        config={"content_template": TEMPLATE},
+    )
+    batch = payloads(args.payloads)
+    formatter_registry.discover()
+    # Import every formatter module before timing, the former factory paid for that once as well
+    for payload in batch[: len(EVENTS)]:
+        legacy_format(webhook, payload)
+        assert (
+            registry_format(webhook, payload)["content"]
+            == legacy_format(webhook, payload)["content"]
+        )
+
+    print(f"{args.payloads} payloads, median of {args.iterations} runs")
+    legacy = report(
+        "importlib scan",
+        measure(legacy_format, webhook, batch, args.iterations),
+        args.payloads,
+    )
+    registry = report(
+        "registry",
+        measure(registry_format, webhook, batch, args.iterations),
+        args.payloads,
+    )
+    parsed, substituted = measure_templates(batch, args.iterations)
+    template_parsed = report("template str.format", parsed, args.payloads)
+    template_compiled = report("template compiled", substituted, args.payloads)
+    print(
+        f"formatting {legacy / registry:.1f}x faster, templates {template_parsed / template_compiled:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
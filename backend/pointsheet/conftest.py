@@ -6,7 +6,9 @@ import sqlalchemy.event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from modules.auth.repository import RegisterUserRepository
+from modules.notification.routing import subscription_routes
 from pointsheet import create_app
+from pointsheet.cache import query_cache
 from pointsheet.db import engine
 from pointsheet.models import BaseModel
 
@@ -61,6 +63,17 @@ def patch_session(db_session):
             yield session
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_query_cache():
+    # Factories write straight to the database without publishing domain
+    # events, so results cached by an earlier test could be stale. The same
+    # goes for the webhook routes.
+    query_cache.clear()
+    query_cache.reset_stats()
+    subscription_routes.clear()
+    yield
+
+
 @pytest.fixture(scope="module")
 def app():
     app = create_app()
@@ -8,9 +8,12 @@ from alembic.config import Config
 from dotenv import load_dotenv
 from sqlalchemy import text
 
+from pointsheet.cache import backend_from_config, query_cache
+from pointsheet.config import config
 from pointsheet.db import get_session
-from pointsheet.models.event import Track, Car, Game
+from pointsheet.models.event import CAR_FTS_DDL, Track, Car, Game
 from modules.notification.webhook_cli import webhook_cli
+from modules.event.extraction_cache_cli import extraction_cache_cli
 
 debug = False
 
@@ -63,6 +66,14 @@ def seed_data():
     pass
 
 
+def invalidate_catalog_cache():
+    # The servers share the SQLite query cache by default. An in-process
+    # cache ("memory") can't be reached from here and serves the old catalog
+    # until it expires.
+    query_cache.configure(backend_from_config(config))
+    query_cache.invalidate("catalog")
+
+
 @seed_data.command("load-tracks", help="Load tracks from CSV file")
 def load_tracks():
     csv_path = os.path.join(os.path.dirname(__file__), "data", "tracks.csv")
@@ -75,6 +86,7 @@ def load_tracks():
             for row in csv_reader:
                 track = Track(**row)
                 session.add(track)
+    invalidate_catalog_cache()
 
 
 @seed_data.command("load-games", help="Load games from CSV file")
@@ -88,6 +100,7 @@ def load_games():
             for row in csv_reader:
                 game = Game(**row)
                 session.add(game)
+    invalidate_catalog_cache()
 
 
 @seed_data.command("load-cars", help="Load cars from CSV file")
@@ -101,67 +114,31 @@ def load_cars():
             for row in csv_reader:
                 car = Car(**row)
                 session.add(car)
+    invalidate_catalog_cache()
 
 @app.command("create-car-fts", help="Create and populate car full-text search index")
 def create_car_full_text_search_index():
     session = next(get_session())
     with session.begin():
-        session.execute(text("""
-            DROP TABLE IF EXISTS car_fts;
-        """))
-
-        session.execute(text("""
-            DROP TRIGGER IF EXISTS car_ai;
-        """))
-
-        session.execute(text("""
-            DROP TRIGGER IF EXISTS car_ad;
-        """))
-
-        session.execute(text("""
-            DROP TRIGGER IF EXISTS car_au;
-        """))
-
-        session.execute(text("""
-            CREATE VIRTUAL TABLE car_fts USING fts5(
-                model, 
-                year,
-                content='car',
-                content_rowid='id'
-            );
-        """))
-
-        session.execute(text("""
-            INSERT INTO car_fts(rowid, model, year)
-            SELECT id, model, year
-            FROM cars;
-        """))
-
-        session.execute(text("""
-            CREATE TRIGGER car_ai AFTER INSERT ON cars BEGIN
-                INSERT INTO car_fts(rowid, model, year)
-                VALUES (new.id, new.model, new.year);
-            END;
-        """))
-
-        session.execute(text("""
-            CREATE TRIGGER car_ad AFTER DELETE ON cars BEGIN
-                DELETE FROM car_fts WHERE rowid = old.id;
-            END;
-        """))
-
-        session.execute(text("""
-            CREATE TRIGGER car_au AFTER UPDATE ON cars BEGIN
-                UPDATE car_fts SET 
-                    model = new.model,
-                    year = new.year
-                WHERE rowid = old.id;
-            END;
-        """))
-
+        for trigger in (
+            "car_ai",
+            "car_ad",
+            "car_au",
+            "car_fts_ai",
+            "car_fts_ad",
+            "car_fts_au",
+        ):
+            session.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        session.execute(text("DROP TABLE IF EXISTS car_fts"))
+
+        for statement in CAR_FTS_DDL:
+            session.execute(text(statement))
+        session.execute(text("INSERT INTO car_fts(car_fts) VALUES ('rebuild')"))
+    invalidate_catalog_cache()
 
 
 app.add_command(webhook_cli)
+app.add_command(extraction_cache_cli)
 
 if __name__ == "__main__":
     app()
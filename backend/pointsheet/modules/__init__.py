@@ -4,9 +4,17 @@ import uuid
 from typing import Callable
 
 from lagom import Container
-from lato import Application, TransactionContext
+from lato import Application, Query, TransactionContext
 
-from pointsheet.db import get_session, Session
+from pointsheet import instrumentation
+from pointsheet.cache import PendingInvalidations, query_cache
+from pointsheet.db import (
+    get_session,
+    engine,
+    read_engine,
+    ReadSessionFactory,
+    Session,
+)
 from pointsheet.domain.types import UserId
 from .account import account_module
 from .account.repository import DriverRepository, TeamRepository
@@ -15,9 +23,17 @@ from .auth.repository import ActiveUserRepository, RegisterUserRepository
 from .dependency_provider import LagomDependencyProvider
 from .event import event_module
 from pointsheet.auth import get_user_id
+from .event.read_models import EventReadModel
 from .event.repository import EventRepository, SeriesRepository, TrackRepository, GameRepository, CarRepository
-from .notification.repository import WebhookRepository, WebhookSubscriptionRepository, WebhookLogRepository
+from .notification.repository import (
+    WebhookRepository,
+    WebhookSubscriptionRepository,
+    WebhookLogRepository,
+    OutboxRepository,
+)
 from .notification.notification_module import notification_module
+from .notification.read_models import WebhookStatsReadModel
+from .notification.routing import PendingRouteChanges, subscription_routes
 
 app_container = Container()
 dp = LagomDependencyProvider(app_container)
@@ -43,37 +59,141 @@ application.include_submodule(auth_module)
 application.include_submodule(notification_module)
 
 
+class TransactionScope:
+    """
+    State of a single transaction. The session, repositories, user id,
+    pending cache invalidations and webhook route changes are only built the
+    first time a handler asks for them.
+    """
+
+    _unset = object()
+
+    def __init__(self):
+        self._session = None
+        self._repositories = {}
+        self._user_id = self._unset
+        self._invalidations = None
+        self._route_changes = None
+        self.read_only = False
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self):
+        return self._session
+
+    @property
+    def user_id(self):
+        if self._user_id is self._unset:
+            self._user_id = get_user_id()
+        return self._user_id
+
+    @property
+    def invalidations(self) -> PendingInvalidations:
+        if self._invalidations is None:
+            self._invalidations = PendingInvalidations()
+        return self._invalidations
+
+    @property
+    def route_changes(self) -> PendingRouteChanges:
+        if self._route_changes is None:
+            self._route_changes = PendingRouteChanges()
+        return self._route_changes
+
+    def invalidate_cache(self):
+        """Drop the cached query results the committed transaction made stale."""
+        if self._invalidations is not None:
+            query_cache.invalidate(*self._invalidations.tags)
+
+    def apply_route_changes(self):
+        """Update the webhook routes with the committed webhooks and subscriptions."""
+        if self._route_changes is not None and self._route_changes.changes:
+            subscription_routes.apply(self._route_changes)
+
+    def open(self, read_only: bool = False):
+        """Open the session of the transaction, the first call decides its mode."""
+        if self._session is None:
+            self.read_only = read_only
+            if not read_only:
+                self._session = Session()
+            elif read_engine is engine:
+                # An in-memory database only has the writer's connection: the
+                # read joins its transaction, which closing the read leaves
+                # as it was.
+                self._session = ReadSessionFactory(bind=Session().connection())
+            else:
+                self._session = ReadSessionFactory()
+        return self._session
+
+    def repository(self, repository_class, session):
+        repository = self._repositories.get(repository_class)
+        if repository is None:
+            repository = repository_class(session)
+            self._repositories[repository_class] = repository
+        return repository
+
+
+def _is_query(container) -> bool:
+    # lato registers the executed message before it resolves the handler's
+    # arguments, and the first registration wins for the whole transaction.
+    return "message" in container.defined_types and isinstance(
+        container["message"], Query
+    )
+
+
+def _transaction_session(container):
+    return container[TransactionScope].open(read_only=_is_query(container))
+
+
+REPOSITORIES = (
+    EventRepository,
+    SeriesRepository,
+    ActiveUserRepository,
+    RegisterUserRepository,
+    TrackRepository,
+    TeamRepository,
+    DriverRepository,
+    GameRepository,
+    CarRepository,
+    WebhookRepository,
+    WebhookSubscriptionRepository,
+    WebhookLogRepository,
+    OutboxRepository,
+    EventReadModel,
+    WebhookStatsReadModel,
+)
+
+
+def _repository_factory(repository_class):
+    return lambda c: c[TransactionScope].repository(repository_class, c[Session])
+
+
+# Definitions shared by every transaction container. Defining them once keeps
+# creating a transaction cheap; each one defers to the transaction's scope.
+transaction_definitions = Container()
+transaction_definitions[Session] = _transaction_session
+transaction_definitions[logging.Logger] = logger
+for _repository_class in REPOSITORIES:
+    transaction_definitions[_repository_class] = _repository_factory(_repository_class)
+transaction_definitions[UserId] = lambda c: c[TransactionScope].user_id
+transaction_definitions[PendingInvalidations] = lambda c: c[
+    TransactionScope
+].invalidations
+transaction_definitions[PendingRouteChanges] = lambda c: c[
+    TransactionScope
+].route_changes
+
+
 @application.on_create_transaction_context
 def on_create_transaction_context():
-    txn_container = Container()
+    txn_container = Container(transaction_definitions)
     txn_container[CorrelationId] = uuid.uuid4()
-
-    session = Session()
-    txn_container[Session] = session
-
-    # repository
-    txn_container[logging.Logger] = logger
-    txn_container[EventRepository] = EventRepository(session)
-    txn_container[SeriesRepository] = SeriesRepository(session)
-    txn_container[ActiveUserRepository] = ActiveUserRepository(session)
-    txn_container[RegisterUserRepository] = RegisterUserRepository(session)
-    txn_container[TrackRepository] = TrackRepository(session)
-    txn_container[TeamRepository] = TeamRepository(session)
-    txn_container[DriverRepository] = DriverRepository(session)
-    txn_container[GameRepository] = GameRepository(session)
-    txn_container[CarRepository] = CarRepository(session)
-    txn_container[WebhookRepository] = WebhookRepository(session)
-    txn_container[WebhookSubscriptionRepository] = WebhookSubscriptionRepository(session)
-    txn_container[WebhookLogRepository] = WebhookLogRepository(session)
-    txn_container[UserId] = get_user_id()
+    txn_container[TransactionScope] = TransactionScope()
 
     # Create the transaction context with the dependency provider
-    txn_context = TransactionContext(LagomDependencyProvider(txn_container))
-
-    # Set the dependencies using the set_dependency method
-    # txn_context.set_dependencies(user_id=get_user_id())
-
-    return txn_context
+    return TransactionContext(LagomDependencyProvider(txn_container))
 
 
 @application.on_enter_transaction_context
@@ -81,7 +201,10 @@ def on_enter_transaction_context(ctx: TransactionContext):
     logger = ctx[logging.Logger]
     transaction_id = uuid.uuid4()
     logger = logger.getChild(f"transaction-{transaction_id}")
-    ctx.dependency_provider.update(transaction_id=transaction_id, publish=ctx.publish)
+    tracker = instrumentation.start_tracking("transaction", "transaction")
+    ctx.dependency_provider.update(
+        transaction_id=transaction_id, publish=ctx.publish, tracker=tracker
+    )
     logger.debug("<<< Begin transaction")
 
 
@@ -90,15 +213,27 @@ def on_exit_transaction_context(ctx: TransactionContext, exception=None):
     logger = ctx[logging.Logger]
     logger.debug(">>> End transaction")
 
-    # close transaciton
-    session = ctx[Session]
+    # close transaction, unless no handler needed the session
+    scope = ctx[TransactionScope]
 
-    if exception is not None:
-        session.rollback()
-    else:
-        session.commit()
+    try:
+        if scope.opened:
+            session = scope.session
+            # A read has nothing to flush and never commits, it may run
+            # inside a command: closing its session ends it.
+            if not scope.read_only:
+                if exception is not None:
+                    session.rollback()
+                else:
+                    session.commit()
 
-    session.close()
+            session.close()
+
+        if exception is None:
+            scope.invalidate_cache()
+            scope.apply_route_changes()
+    finally:
+        instrumentation.stop_tracking(ctx[instrumentation.Tracker])
 
 
 
@@ -115,3 +250,9 @@ def logging_middleware(ctx: TransactionContext, call_next: Callable):
     result = call_next()
     logger.debug(f"Finished executing {description}")
     return result
+
+
+@application.transaction_middleware
+def instrumentation_middleware(ctx: TransactionContext, call_next: Callable):
+    instrumentation.note_handler(ctx.current_handler.fn.__name__)
+    return call_next()
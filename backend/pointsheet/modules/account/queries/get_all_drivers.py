@@ -1,14 +1,16 @@
 from lato import Query
+from pydantic import Field
 
 from modules.account import account_module
 from modules.account.repository import DriverRepository
+from pointsheet.repository import PageRequest
 
 
 class GetAllDrivers(Query):
-    pass
+    page: PageRequest = Field(default_factory=PageRequest)
 
 
 @account_module.handler(GetAllDrivers)
 def get_all_drivers(cmd: GetAllDrivers, repo: DriverRepository):
-    drivers = repo.all()
-    return drivers
\ No newline at end of file
+    drivers = repo.all(cmd.page)
+    return drivers
@@ -4,19 +4,19 @@ from sqlalchemy import select
 
 from modules.account.data_mappers import DriverMapper, TeamMapper
 from modules.account.domain.entity import Driver, Team
+from pointsheet.domain.responses import CursorPage
 from pointsheet.domain.types import EntityId
 from pointsheet.models.account import Driver as DriverEntity, Team as TeamEntity
-from pointsheet.repository import AbstractRepository
+from pointsheet.repository import AbstractRepository, PageRequest
 
 
 class DriverRepository(AbstractRepository[DriverEntity, Driver]):
     mapper_class = DriverMapper
     model_class = Driver
 
-    def all(self) -> list[Driver]:
+    def all(self, page: PageRequest | None = None) -> CursorPage[Driver]:
         stmt = select(DriverEntity)
-        result = self._session.execute(stmt).scalars()
-        return [self._map_to_model(item) for item in result]
+        return self._paginate(stmt, page or PageRequest(), keys=[DriverEntity.id])
 
     def find_by_id(self, id: Any) -> Driver | None:
         stmt = select(DriverEntity).where(DriverEntity.id == id)
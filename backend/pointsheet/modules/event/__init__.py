@@ -5,3 +5,4 @@ from lato import ApplicationModule
 event_module = ApplicationModule("event_module")
 importlib.import_module("modules.event.commands")
 importlib.import_module("modules.event.queries")
+importlib.import_module("modules.event.handlers")
@@ -2,13 +2,14 @@ from datetime import datetime
 from typing import Optional, Self, List
 
 from flask import current_app
-from lato import Command
+from lato import Command, TransactionContext
 from pyarrow.tests.util import random_seed
 from pydantic import ValidationError, model_validator, field_validator
 
 from modules.event import event_module
 from modules.event.domain.entity import Event, Car
 from modules.event.domain.value_objects import EventStatus
+from modules.event.events import EventCreated
 from modules.event.exceptions import HostNotFound, SeriesNotFoundException, NoCarFound
 from modules.event.repository import EventRepository, CarRepository, TrackRepository
 from pointsheet.domain.types import EntityId
@@ -72,7 +73,13 @@ class CreateEvent(Command):
 
 
 @event_module.handler(CreateEvent)
-def create_event(cmd: CreateEvent, repo: EventRepository, car_repo: CarRepository, track_repo: TrackRepository):
+def create_event(
+    cmd: CreateEvent,
+    ctx: TransactionContext,
+    repo: EventRepository,
+    car_repo: CarRepository,
+    track_repo: TrackRepository,
+):
     event = Event(**cmd.model_dump(exclude={"cars", "track"}))
 
     if cmd.cars:
@@ -87,3 +94,4 @@ def create_event(cmd: CreateEvent, repo: EventRepository, car_repo: CarRepositor
         event.track = track.id
 
     repo.add(event)
+    ctx.publish(EventCreated(event_id=event.id))
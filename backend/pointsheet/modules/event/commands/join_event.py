@@ -1,10 +1,11 @@
-from flask import current_app
 from lato import Command, TransactionContext
 
-
+from modules.account.repository import DriverRepository
+from modules.auth.exceptions import EventNotFoundException
 from modules.event import event_module
-from modules.event.exceptions import DriverNotFound
-from modules.event.events import DriverJoinedEvent
+from modules.event.domain.value_objects import ParticipationStatus
+from modules.event.exceptions import DriverNotFound, EventFull
+from modules.event.events import DriverJoinedEvent, DriverWaitlisted
 from modules.event.repository import EventRepository
 from pointsheet.domain.types import EntityId
 
@@ -12,20 +13,38 @@ from pointsheet.domain.types import EntityId
 class JoinEvent(Command):
     event_id: EntityId
     driver_id: EntityId
+    waitlist: bool = False
 
 
 @event_module.handler(JoinEvent)
 def handle_join_event(
-    cmd: JoinEvent, ctx: TransactionContext, event_repo: EventRepository
-):
-    from modules.account.queries.get_user import GetUser
+    cmd: JoinEvent,
+    ctx: TransactionContext,
+    event_repo: EventRepository,
+    driver_repo: DriverRepository,
+) -> ParticipationStatus:
+    if not event_repo.exists(cmd.event_id):
+        raise EventNotFoundException()
 
-    driver = current_app.application.execute(GetUser(user_id=cmd.driver_id))
+    driver = driver_repo.find_by_id(cmd.driver_id)
 
     if not driver:
         raise DriverNotFound()
 
-    event = event_repo.find_by_id(cmd.event_id)
-    event.add_driver(driver)
-    event_repo.update(event)
-    ctx.publish(DriverJoinedEvent(event_id=cmd.event_id, driver_id=cmd.driver_id))
+    status = event_repo.add_participant(
+        cmd.event_id, driver.id, driver.name, waitlist=cmd.waitlist
+    )
+
+    match status:
+        case ParticipationStatus.joined:
+            ctx.publish(
+                DriverJoinedEvent(event_id=cmd.event_id, driver_id=cmd.driver_id)
+            )
+        case ParticipationStatus.waitlisted:
+            ctx.publish(
+                DriverWaitlisted(event_id=cmd.event_id, driver_id=cmd.driver_id)
+            )
+        case ParticipationStatus.full:
+            raise EventFull()
+
+    return status
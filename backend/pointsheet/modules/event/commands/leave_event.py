@@ -2,7 +2,7 @@ from lato import Command, TransactionContext
 
 from modules.event import event_module
 from modules.auth.exceptions import EventNotFoundException
-from modules.event.events import DriverLeftEvent
+from modules.event.events import DriverJoinedEvent, DriverLeftEvent
 from modules.event.repository import EventRepository
 from pointsheet.domain.types import EntityId
 
@@ -16,12 +16,12 @@ class LeaveEvent(Command):
 def handle_remove_driver_from_event(
     cmd: LeaveEvent, ctx: TransactionContext, event_repo: EventRepository
 ):
-    event = event_repo.find_by_id(cmd.event_id)
-
-    if not event:
+    if not event_repo.exists(cmd.event_id):
         raise EventNotFoundException()
 
-    event.remove_driver(cmd.driver_id)
-    event_repo.update(event)
+    promoted_driver = event_repo.remove_participant(cmd.event_id, cmd.driver_id)
 
     ctx.publish(DriverLeftEvent(event_id=cmd.event_id, driver_id=cmd.driver_id))
+
+    if promoted_driver:
+        ctx.publish(DriverJoinedEvent(event_id=cmd.event_id, driver_id=promoted_driver))
@@ -1,4 +1,6 @@
+import io
 import os
+from typing import List
 
 from lato import Command, TransactionContext
 from pydantic import ConfigDict
@@ -7,10 +9,17 @@ from werkzeug.utils import secure_filename
 
 from modules.auth.exceptions import EventNotFoundException
 from modules.event import event_module
+from modules.event.events import RaceResultUploaded
+from modules.event.importers import SIGNATURE_SIZE, importer_registry
 from modules.event.repository import EventRepository
-from modules.event.tasks import extract_race_result_from_file
+from modules.event.tasks import (
+    extract_race_result_from_file,
+    extract_race_results_from_files,
+    import_race_result_from_file,
+)
+from modules.event.use_case.save_race_result import SaveRaceResult
 from pointsheet.domain.types import EntityId
-from pointsheet.storage import FileStore
+from pointsheet.config import config
 
 
 class UploadRaceResult(Command):
@@ -25,18 +34,70 @@ class UploadRaceResult(Command):
 def handle_save_uploaded_result(
     cmd: UploadRaceResult,
     ctx: TransactionContext,
-    file_store: FileStore,
-    config,
     repo: EventRepository,
 ):
-    # validate file extension
+    event = repo.find_by_id(cmd.event_id)
+
+    if not event:
+        raise EventNotFoundException()
+
     file_name = secure_filename(cmd.file.filename)
+    content = cmd.file.read()
+    importer = importer_registry.importer_for(file_name, content[:SIGNATURE_SIZE])
+
+    if importer and len(content) <= config.RESULT_IMPORT_INLINE_MAX_BYTES:
+        # a results file is read in milliseconds: no need for the task queue
+        output = importer.read(io.BytesIO(content), event.game)
+        SaveRaceResult(repo)(event.id, cmd.schedule_id, output)
+        ctx.publish(
+            RaceResultUploaded(event_id=cmd.event_id, schedule_id=cmd.schedule_id)
+        )
+        return
+
     full_path = os.path.join(config.UPLOAD_FOLDER, file_name)
-    file_location = file_store.save_file(full_path, cmd.file.read())
+    file_location = config.file_store.save_file(full_path, content)
+
+    if importer:
+        import_race_result_from_file.delay(
+            cmd.event_id, cmd.schedule_id, file_location, repo
+        )
+    else:
+        extract_race_result_from_file.delay(
+            cmd.event_id, cmd.schedule_id, file_location, repo
+        )
+
+
+class UploadRaceResultImages(Command):
+    """The screenshots of a schedule's results, when the grid doesn't fit on one."""
 
+    event_id: EntityId
+    schedule_id: int
+    files: List[FileStorage]
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+@event_module.handler(UploadRaceResultImages)
+def handle_save_uploaded_result_images(
+    cmd: UploadRaceResultImages,
+    ctx: TransactionContext,
+    repo: EventRepository,
+):
     event = repo.find_by_id(cmd.event_id)
 
     if not event:
         raise EventNotFoundException()
 
-    extract_race_result_from_file.delay(cmd.event_id, cmd.schedule_id, file_location, repo)
+    file_locations = [
+        # screenshots are often all named alike, they mustn't overwrite each other
+        config.file_store.save_file(
+            os.path.join(config.UPLOAD_FOLDER, secure_filename(file.filename)),
+            file.read(),
+            rename=True,
+        )
+        for file in cmd.files
+    ]
+
+    extract_race_results_from_files.delay(
+        cmd.event_id, cmd.schedule_id, file_locations, repo
+    )
@@ -1,12 +1,13 @@
 from typing import Optional, List
 
-from lato import Command
+from lato import Command, TransactionContext
 
 from modules.event import event_module
 from modules.event.repository import EventRepository, CarRepository
 from modules.auth.exceptions import EventNotFoundException
 from modules.event.domain.value_objects import EventStatus
 from modules.event.domain.entity import Car
+from modules.event.events import EventUpdated
 from pointsheet.domain.types import EntityId
 from datetime import datetime
 
@@ -27,7 +28,12 @@ class UpdateEventModel(Command):
 
 
 @event_module.handler(UpdateEventModel)
-def handle_update_event(cmd: UpdateEventModel, repo: EventRepository, car_repo: CarRepository):
+def handle_update_event(
+    cmd: UpdateEventModel,
+    ctx: TransactionContext,
+    repo: EventRepository,
+    car_repo: CarRepository,
+):
     event = repo.find_by_id(cmd.event_id)
     if not event:
         return EventNotFoundException()
@@ -49,4 +55,5 @@ def handle_update_event(cmd: UpdateEventModel, repo: EventRepository, car_repo:
             event.add_car(car)
 
     repo.update(event)
+    ctx.publish(EventUpdated(event_id=cmd.event_id))
     return None
\ No newline at end of file
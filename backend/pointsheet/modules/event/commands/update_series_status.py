@@ -41,6 +41,7 @@ def update_series_status(
             published_event =  SeriesClosed(series_id=cmd.series_id)
         case _SeriesStatus.not_started:
             series.not_started()
+            published_event = SeriesStatusNotStarted(series_id=cmd.series_id)
         case _:
             raise ValueError("Invalid status")
 
@@ -1,12 +1,13 @@
 import os
 import uuid
 
-from lato import Command
+from lato import Command, TransactionContext
 from pydantic import ConfigDict
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 from modules.event import event_module
+from modules.event.events import SeriesUpdated
 from modules.event.repository import SeriesRepository
 from modules.event.exceptions import SeriesNotFoundException
 from pointsheet.config import config
@@ -35,6 +36,7 @@ def rename_file(file_path):
 @event_module.handler(UploadSeriesCoverImage)
 def handle_upload_series_cover_image(
     cmd: UploadSeriesCoverImage,
+    ctx: TransactionContext,
     repo: SeriesRepository,
 ):
     # Validate file extension
@@ -58,3 +60,4 @@ def handle_upload_series_cover_image(
     else:
         series.cover_image = f"{config.DOMAIN}/{file_location}"
     repo.update(series)
+    ctx.publish(SeriesUpdated(series_id=cmd.series_id))
@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+
 from modules.event.domain.entity import (
     Event as EventModel,
     Schedule,
@@ -20,6 +22,21 @@ from pointsheet.models import (
 from pointsheet.repository import DataMapper
 
 
+def _assign(entity, **values) -> None:
+    """Set only the attributes whose value changed, so unchanged rows are not updated."""
+    for key, value in values.items():
+        if getattr(entity, key) != value:
+            setattr(entity, key, value)
+
+
+def _dump_results(results) -> list:
+    # Results are loaded back from JSON as dicts, compare them in that form.
+    return [
+        result.model_dump() if isinstance(result, BaseModel) else result
+        for result in results or []
+    ]
+
+
 class ResultMapper(DataMapper[RaceResult, RaceResultEntity]):
     def to_db_entity(self, instance: RaceResultEntity) -> RaceResult:
         return RaceResult(
@@ -120,6 +137,114 @@ class EventModelMapper(DataMapper[Event, EventModel]):
 
         return event
 
+    def update_db_entity(self, instance: EventModel, entity: Event, session) -> None:
+        """
+        Apply the state of ``instance`` to the already persistent ``entity``,
+        touching only the columns and children that differ.
+        """
+        _assign(
+            entity,
+            title=instance.title,
+            starts_at=instance.starts_at,
+            ends_at=instance.ends_at,
+            series=instance.series,
+            host=instance.host,
+            status=instance.status,
+            track=instance.track,
+            max_participants=instance.max_participants,
+            is_multi_class=instance.is_multi_class,
+            game_id=instance.game,
+        )
+        self._update_drivers(instance, entity)
+        self._update_schedule(instance, entity)
+        self._update_cars(instance, entity, session)
+
+    def _update_drivers(self, instance: EventModel, entity: Event) -> None:
+        drivers = {driver.id: driver for driver in instance.drivers or []}
+        participants = {}
+
+        for participant in list(entity.drivers):
+            if participant.id in drivers:
+                participants[participant.id] = participant
+            else:
+                entity.drivers.remove(participant)
+
+        for driver in drivers.values():
+            participant = participants.get(driver.id)
+            if participant is None:
+                entity.drivers.append(
+                    Participants(id=driver.id, name=driver.name, event_id=instance.id)
+                )
+            else:
+                _assign(participant, name=driver.name)
+
+    def _update_schedule(self, instance: EventModel, entity: Event) -> None:
+        schedules = {
+            schedule.id: schedule for schedule in instance.schedule or [] if schedule.id
+        }
+        existing = {}
+
+        for _schedule in list(entity.schedule):
+            if _schedule.id in schedules:
+                existing[_schedule.id] = _schedule
+            else:
+                entity.schedule.remove(_schedule)
+
+        for schedule in instance.schedule or []:
+            _schedule = existing.get(schedule.id) if schedule.id else None
+            if _schedule is None:
+                entity.schedule.append(
+                    EventSchedule(
+                        type=schedule.type,
+                        nbr_of_laps=schedule.nbr_of_laps or None,
+                        duration=schedule.duration,
+                        event_id=instance.id,
+                        result=(
+                            schedule.result
+                            and self.result_mapper.to_db_entity(schedule.result)
+                        ),
+                    )
+                )
+                continue
+
+            _assign(
+                _schedule,
+                type=schedule.type,
+                nbr_of_laps=schedule.nbr_of_laps or None,
+                duration=schedule.duration,
+            )
+            if schedule.result is None:
+                if _schedule.result is not None:
+                    _schedule.result = None
+            elif _schedule.result is None:
+                _schedule.result = self.result_mapper.to_db_entity(schedule.result)
+            else:
+                _assign(
+                    _schedule.result,
+                    upload_file=schedule.result.upload_file,
+                    mark_down=schedule.result.mark_down,
+                )
+                if _dump_results(_schedule.result.result) != _dump_results(
+                    schedule.result.result
+                ):
+                    _schedule.result.result = schedule.result.result
+
+    def _update_cars(self, instance: EventModel, entity: Event, session) -> None:
+        cars = {car.id: car for car in instance.cars or []}
+        current = set()
+
+        for car in list(entity.cars):
+            if car.id in cars:
+                current.add(car.id)
+            else:
+                entity.cars.remove(car)
+
+        for car_id, car in cars.items():
+            if car_id not in current:
+                entity.cars.append(
+                    session.get(Car, car_id) or self.car_mapper.to_db_entity(car)
+                )
+
     def to_domain_model(self, instance: Event) -> EventModel:
         event = EventModel(
             title=instance.title,
@@ -182,6 +307,40 @@ class SeriesModelMapper(DataMapper[Series, SeriesModel]):
             else [],
         )
 
+    def update_db_entity(self, instance: SeriesModel, entity: Series, session) -> None:
+        """
+        Apply the state of ``instance`` to the already persistent ``entity``,
+        touching only the columns and events that differ.
+        """
+        _assign(
+            entity,
+            title=instance.title,
+            starts_at=instance.starts_at,
+            ends_at=instance.ends_at,
+            status=instance.status,
+            cover_image=instance.cover_image,
+            description=instance.description,
+        )
+
+        events = {event.id: event for event in instance.events or []}
+        existing = {}
+
+        for _event in list(entity.events):
+            if _event.id in events:
+                existing[_event.id] = _event
+            else:
+                entity.events.remove(_event)
+
+        for event in events.values():
+            _event = existing.get(event.id) or session.get(Event, event.id)
+            if _event is None:
+                entity.events.append(self.event_mapper.to_db_entity(event))
+                continue
+
+            self.event_mapper.update_db_entity(event, _event, session)
+            if event.id not in existing:
+                entity.events.append(_event)
+
     def to_domain_model(self, instance: Series) -> SeriesModel:
         return SeriesModel(
             id=instance.id,
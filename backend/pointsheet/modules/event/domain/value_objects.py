@@ -20,6 +20,12 @@ class EventStatus(str, Enum):
     in_progress = "in_progress"
 
 
+class ParticipationStatus(str, Enum):
+    joined = "joined"
+    waitlisted = "waitlisted"
+    full = "full"
+
+
 class ScheduleType(str, Enum):
     practice = "practice"
     qualification = "qualification"
@@ -37,6 +37,11 @@ class DriverJoinedEvent(Event):
     driver_id: EntityId
 
 
+class DriverWaitlisted(Event):
+    event_id: EntityId
+    driver_id: EntityId
+
+
 class DriverLeftEvent(Event):
     event_id: EntityId
     driver_id: EntityId
@@ -57,3 +62,11 @@ class RaceResultUploaded(Event):
 
 class EventDeleted(Event):
     event_id: EntityId
+
+
+class EventCreated(Event):
+    event_id: EntityId
+
+
+class EventUpdated(Event):
+    event_id: EntityId
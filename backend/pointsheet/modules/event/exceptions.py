@@ -29,6 +29,11 @@ class DriverAlreadySingedUp(PointSheetException):
     code = 400
 
 
+class EventFull(PointSheetException):
+    message = "Event has reached its maximum number of participants"
+    code = 409
+
+
 class DriverNotFound(PointSheetException):
     message = "Driver not found"
     code = 404
@@ -49,4 +54,14 @@ class HostNotFound(PointSheetException):
 
 class NoCarFound(PointSheetException):
     message = "Car not found"
-    code = 404
\ No newline at end of file
+    code = 404
+
+
+class UnreadableResultFile(PointSheetException):
+    message = "The results file can't be read"
+    code = 400
+
+    def __init__(self, message=None):
+        if message:
+            self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,238 @@
+"""Cache of the race results extracted from screenshots."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+OCR_LAYER = "ocr"
+RESULTS_LAYER = "results"
+LAYERS = (OCR_LAYER, RESULTS_LAYER)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """The sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ocr_key(image_digest: str, parameters: Mapping[str, Any]) -> str:
+    """Key of the words read in an image with the given preprocessing parameters."""
+    encoded = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+    return f"{image_digest}:{hashlib.sha256(encoded.encode()).hexdigest()[:16]}"
+
+
+def results_key(text: str, prompt_version: Any) -> str:
+    """Key of the results extracted from a text with a version of the prompt."""
+    return f"{hashlib.sha256(text.encode()).hexdigest()}:v{prompt_version}"
+
+
+@dataclass
+class CacheEntry:
+    layer: str
+    key: str
+    size: int
+    hits: int
+    created_at: float
+    used_at: float
+
+
+@dataclass
+class LayerStats:
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        return {"entries": self.entries, "bytes": self.bytes, "hits": self.hits}
+
+
+class ExtractionCache:
+    """The OCR words and the extracted results of screenshots, stored in a SQLite file."""
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS extraction_cache (
+            layer TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            used_at REAL NOT NULL,
+            PRIMARY KEY (layer, key)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_extraction_cache_used_at ON extraction_cache (used_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        cache = self
+
+        class _Transaction:
+            def __enter__(self):
+                cache._conn.execute("BEGIN IMMEDIATE")
+                return cache._conn
+
+            def __exit__(self, exc_type, exc, tb):
+                cache._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+        return _Transaction()
+
+    def get(self, layer: str, key: str) -> Optional[str]:
+        """The cached value, or None; a hit makes the entry the most recently used."""
+        row = self._conn.execute(
+            "SELECT value FROM extraction_cache WHERE layer = ? AND key = ?",
+            (layer, key),
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(
+            "UPDATE extraction_cache SET hits = hits + 1, used_at = ? WHERE layer = ? AND key = ?",
+            (self._clock(), layer, key),
+        )
+        return row[0]
+
+    def set(self, layer: str, key: str, value: str) -> None:
+        """Store a value and evict the least recently used entries beyond ``max_bytes``."""
+        size = len(value.encode())
+        now = self._clock()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache (layer, key, value, size, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (layer, key, value, size, now, now),
+            )
+            (total,) = conn.execute(
+                "SELECT coalesce(sum(size), 0) FROM extraction_cache"
+            ).fetchone()
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for entry_layer, entry_key, entry_size in conn.execute(
+                "SELECT layer, key, size FROM extraction_cache ORDER BY used_at"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                evicted.append((entry_layer, entry_key))
+                total -= entry_size
+            conn.executemany(
+                "DELETE FROM extraction_cache WHERE layer = ? AND key = ?", evicted
+            )
+
+    def cached(self, layer: str, key: str, compute: Callable[[], str]) -> str:
+        """The cached value, or the one ``compute`` returns, which is then stored."""
+        value = self.get(layer, key)
+        if value is None:
+            value = compute()
+            self.set(layer, key, value)
+        return value
+
+    def stats(self) -> Dict[str, LayerStats]:
+        stats = {layer: LayerStats() for layer in LAYERS}
+        for layer, entries, size, hits in self._conn.execute(
+            "SELECT layer, count(*), sum(size), sum(hits) FROM extraction_cache GROUP BY layer"
+        ):
+            stats[layer] = LayerStats(entries=entries, bytes=size, hits=hits)
+        return stats
+
+    def entries(self, layer: Optional[str] = None, limit: int = 20) -> List[CacheEntry]:
+        """The most recently used entries, of a layer or of both."""
+        query = (
+            "SELECT layer, key, size, hits, created_at, used_at FROM extraction_cache"
+        )
+        params: list = []
+        if layer is not None:
+            query += " WHERE layer = ?"
+            params.append(layer)
+        query += " ORDER BY used_at DESC LIMIT ?"
+        params.append(limit)
+        return [CacheEntry(*row) for row in self._conn.execute(query, params)]
+
+    def purge(
+        self, layer: Optional[str] = None, unused_for: Optional[float] = None
+    ) -> int:
+        """
+        Delete entries.
+
+        Args:
+            layer: Only delete the entries of this layer
+            unused_for: Only delete the entries not used for that many seconds
+
+        Returns:
+            The number of deleted entries
+        """
+        conditions, params = [], []
+        if layer is not None:
+            conditions.append("layer = ?")
+            params.append(layer)
+        if unused_for is not None:
+            conditions.append("used_at < ?")
+            params.append(self._clock() - unused_for)
+        query = "DELETE FROM extraction_cache"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._transaction() as conn:
+            return conn.execute(query, params).rowcount
+
+
+_default_cache: Optional[ExtractionCache] = None
+_default_lock = threading.Lock()
+
+
+def extraction_cache_from_config(app_config) -> Optional[ExtractionCache]:
+    """The cache configured by ``EXTRACTION_CACHE_PATH``, None if it is disabled."""
+    if not app_config.EXTRACTION_CACHE_PATH:
+        return None
+    return ExtractionCache(
+        app_config.EXTRACTION_CACHE_PATH,
+        max_bytes=app_config.EXTRACTION_CACHE_MAX_BYTES,
+    )
+
+
+def default_extraction_cache() -> Optional[ExtractionCache]:
+    """The configured cache, opened once per process."""
+    global _default_cache
+    if _default_cache is None:
+        from pointsheet.config import config
+
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = extraction_cache_from_config(config)
+    return _default_cache
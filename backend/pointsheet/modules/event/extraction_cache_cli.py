@@ -0,0 +1,90 @@
+import json
+from datetime import datetime
+from typing import Optional
+
+import click
+
+from modules.event.extraction_cache import LAYERS, extraction_cache_from_config
+from pointsheet.config import config
+
+
+def _cache():
+    cache = extraction_cache_from_config(config)
+    if cache is None:
+        raise click.ClickException(
+            "The extraction cache is disabled, set EXTRACTION_CACHE_PATH"
+        )
+    return cache
+
+
+def _time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@click.group(name="extraction-cache")
+def extraction_cache_cli():
+    """Commands for the cache of the race results extracted from screenshots."""
+    pass
+
+
+@extraction_cache_cli.command(
+    name="stats", help="Show the entries and size of each cache layer"
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the statistics as JSON")
+def cache_stats(as_json: bool):
+    cache = _cache()
+    stats = cache.stats()
+    if as_json:
+        click.echo(
+            json.dumps(
+                {
+                    "path": cache.path,
+                    "max_bytes": cache.max_bytes,
+                    "layers": {
+                        layer: layer_stats.summary()
+                        for layer, layer_stats in stats.items()
+                    },
+                },
+                indent=2,
+            )
+        )
+        return
+
+    total = sum(layer_stats.bytes for layer_stats in stats.values())
+    click.echo(f"{cache.path}: {total} of {cache.max_bytes} bytes")
+    for layer, layer_stats in stats.items():
+        click.echo(
+            f"  {layer}: {layer_stats.entries} entries, {layer_stats.bytes} bytes, {layer_stats.hits} hits"
+        )
+
+
+@extraction_cache_cli.command(
+    name="list", help="List the most recently used cache entries"
+)
+@click.option(
+    "--layer", type=click.Choice(LAYERS), help="Only list the entries of this layer"
+)
+@click.option("--limit", default=20, help="Maximum number of entries to list")
+def list_entries(layer: Optional[str], limit: int):
+    entries = _cache().entries(layer, limit)
+    if not entries:
+        click.echo("No cache entries")
+        return
+    for entry in entries:
+        click.echo(
+            f"{entry.layer:<8} {entry.key} {entry.size:>8} bytes {entry.hits:>4} hits"
+            f" | created {_time(entry.created_at)} used {_time(entry.used_at)}"
+        )
+
+
+@extraction_cache_cli.command(name="purge", help="Delete cache entries")
+@click.option(
+    "--layer", type=click.Choice(LAYERS), help="Only delete the entries of this layer"
+)
+@click.option(
+    "--unused-days", type=float, help="Only delete the entries not used for N days"
+)
+def purge_entries(layer: Optional[str], unused_days: Optional[float]):
+    unused_for = unused_days * 86400 if unused_days is not None else None
+    deleted = _cache().purge(layer, unused_for)
+    click.echo(f"Deleted {deleted} cache entries")
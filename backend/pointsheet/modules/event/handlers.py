@@ -0,0 +1,51 @@
+from lato import Event
+
+from modules.event import event_module
+from modules.event.events import (
+    DriverJoinedEvent,
+    DriverLeftEvent,
+    DriverWaitlisted,
+    EventCreated,
+    EventDeleted,
+    EventScheduleAdded,
+    EventScheduleRemoved,
+    EventUpdated,
+    RaceResultUploaded,
+    SeriesClosed,
+    SeriesCreated,
+    SeriesDeleted,
+    SeriesStarted,
+    SeriesStatusNotStarted,
+    SeriesStatusUpdated,
+    SeriesUpdated,
+)
+from pointsheet.cache import PendingInvalidations
+
+# Cached query results each domain event makes stale. Series summaries count
+# their events, so adding or removing an event touches both listings.
+CACHE_TAGS = {
+    SeriesCreated: ("series",),
+    SeriesStatusUpdated: ("series",),
+    SeriesStarted: ("series",),
+    SeriesClosed: ("series",),
+    SeriesStatusNotStarted: ("series",),
+    SeriesUpdated: ("series", "events"),
+    SeriesDeleted: ("series", "events"),
+    EventCreated: ("series", "events"),
+    EventUpdated: ("series", "events"),
+    EventDeleted: ("series", "events"),
+    DriverJoinedEvent: ("events",),
+    DriverLeftEvent: ("events",),
+    DriverWaitlisted: ("events",),
+    EventScheduleAdded: ("events",),
+    EventScheduleRemoved: ("events",),
+    RaceResultUploaded: ("events",),
+}
+
+
+def invalidate_cached_queries(event: Event, invalidations: PendingInvalidations):
+    invalidations.add(*CACHE_TAGS[type(event)])
+
+
+for _event_class in CACHE_TAGS:
+    event_module.handler(_event_class)(invalidate_cached_queries)
@@ -0,0 +1,271 @@
+"""Importers of the result files exported by games and their dedicated servers."""
+
+import abc
+import codecs
+import csv
+import io
+import json
+import re
+from typing import BinaryIO, Dict, Iterable, List, Optional
+
+from modules.event.domain.value_objects import ListOfResults, Result
+from modules.event.exceptions import UnreadableResultFile
+from modules.event.results_table import (
+    HEADER_FIELDS,
+    normalize_time,
+    parse_penalty,
+    parse_position,
+)
+
+# Bytes read from an upload to recognize its format
+SIGNATURE_SIZE = 4096
+
+# Columns of the CSV exports of a game, by the id of the games of data/games.csv
+CSV_GAME_COLUMNS: Dict[int, Dict[str, str]] = {
+    # Forza Motorsport: the driver is a gamertag
+    1: {"gamertag": "driver", "best lap time": "best_lap", "race time": "total"},
+    # Assetto Corsa Competizione: exports of the server results by league tools
+    2: {
+        "player name": "driver",
+        "short name": "driver",
+        "best lap time": "best_lap",
+        "total time": "total",
+    },
+}
+
+# ACC writes this lap time for the cars that didn't complete a lap
+ACC_NO_LAP = 2147483647
+
+
+def _header(label: str) -> str:
+    return re.sub(r"[^a-z0-9#]+", " ", label.lower()).strip()
+
+
+def _extension(filename: str) -> str:
+    return filename.rsplit(".", 1)[1].lower() if "." in filename else ""
+
+
+def _decode(data: bytes) -> str:
+    """Text of UTF-8 or UTF-16 bytes: ACC writes its results in UTF-16 LE."""
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode("utf-16", errors="ignore")
+    if data[1:2] == b"\x00":
+        return data.decode("utf-16-le", errors="ignore")
+    return data.decode("utf-8-sig", errors="ignore")
+
+
+def format_milliseconds(milliseconds: int) -> str:
+    """A lap or race time as the results screens show it, e.g. ``1:32.100`` or ``1:02:03.456``."""
+    seconds, millis = divmod(int(milliseconds), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+    return f"{minutes}:{seconds:02d}.{millis:03d}"
+
+
+class ResultImporter(abc.ABC):
+    """Reads the results of a file format."""
+
+    name: str
+    extensions: frozenset = frozenset()
+
+    def accepts(self, extension: str, head: bytes) -> bool:
+        """Whether a file is in this format, by its extension and its first bytes."""
+        return extension in self.extensions
+
+    @abc.abstractmethod
+    def read(self, stream: BinaryIO, game: Optional[int] = None) -> ListOfResults:
+        """
+        The results of a file.
+
+        Raises:
+            UnreadableResultFile: The file isn't in this format or has no results
+        """
+
+
+class AccResultImporter(ResultImporter):
+    name = "acc"
+    extensions = frozenset({"json"})
+
+    def accepts(self, extension: str, head: bytes) -> bool:
+        text = _decode(head)
+        return '"sessionType"' in text or '"sessionResult"' in text
+
+    def read(self, stream: BinaryIO, game: Optional[int] = None) -> ListOfResults:
+        try:
+            session = json.loads(_decode(stream.read()))
+            lines = session["sessionResult"]["leaderBoardLines"]
+        except (ValueError, KeyError, TypeError):
+            raise UnreadableResultFile("Not an Assetto Corsa Competizione results file")
+
+        penalties: Dict[int, float] = {}
+        for penalty in session.get("post_race_penalties") or []:
+            if penalty.get("penalty") == "PostRaceTime":
+                car = penalty.get("carId")
+                penalties[car] = penalties.get(car, 0.0) + float(
+                    penalty.get("penaltyValue") or 0
+                )
+
+        leader_laps = lines[0]["timing"].get("lapCount", 0) if lines else 0
+        results = []
+        for position, line in enumerate(lines, start=1):
+            car, timing = line["car"], line["timing"]
+            results.append(
+                Result(
+                    position=position,
+                    driver=self._driver_name(line),
+                    best_lap=self._best_lap(timing),
+                    total=self._total(timing, leader_laps),
+                    penalties=penalties.get(car.get("carId")),
+                )
+            )
+        if not results:
+            raise UnreadableResultFile("The results file has no results")
+        return ListOfResults(results=results)
+
+    @staticmethod
+    def _driver_name(line: dict) -> str:
+        driver = line.get("currentDriver") or (line["car"].get("drivers") or [{}])[0]
+        name = f"{driver.get('firstName', '')} {driver.get('lastName', '')}".strip()
+        return name or driver.get("shortName") or f"#{line['car'].get('raceNumber')}"
+
+    @staticmethod
+    def _best_lap(timing: dict) -> Optional[str]:
+        best_lap = timing.get("bestLap")
+        return (
+            format_milliseconds(best_lap)
+            if best_lap and best_lap < ACC_NO_LAP
+            else None
+        )
+
+    @staticmethod
+    def _total(timing: dict, leader_laps: int) -> Optional[str]:
+        laps = timing.get("lapCount", 0)
+        if not laps:
+            return "DNF" if leader_laps else None
+        if laps < leader_laps:
+            behind = leader_laps - laps
+            return f"+{behind} Lap{'s' if behind > 1 else ''}"
+        return (
+            format_milliseconds(timing["totalTime"])
+            if timing.get("totalTime")
+            else None
+        )
+
+
+class CsvResultImporter(ResultImporter):
+    name = "csv"
+    extensions = frozenset({"csv"})
+
+    def columns(self, game: Optional[int]) -> Dict[str, str]:
+        """The field of each header a game's exports may have."""
+        from pointsheet.config import config
+
+        columns = {**HEADER_FIELDS, **CSV_GAME_COLUMNS.get(game, {})}
+        overrides = config.RESULT_CSV_COLUMNS.get(game, {}) if game is not None else {}
+        columns.update({_header(label): field for label, field in overrides.items()})
+        return columns
+
+    def read(self, stream: BinaryIO, game: Optional[int] = None) -> ListOfResults:
+        text = io.TextIOWrapper(
+            stream, encoding="utf-8-sig", errors="replace", newline=""
+        )
+        try:
+            try:
+                dialect = csv.Sniffer().sniff(
+                    text.read(SIGNATURE_SIZE), delimiters=",;\t"
+                )
+            except csv.Error:
+                dialect = csv.excel
+            text.seek(0)
+            rows = csv.reader(text, dialect)
+
+            header = next(rows, None)
+            columns = self.columns(game)
+            fields = [columns.get(_header(label)) for label in header or []]
+            if "driver" not in fields:
+                raise UnreadableResultFile("The CSV file has no driver column")
+
+            results = list(self._results(rows, fields))
+        finally:
+            # closing the wrapper would close the caller's stream
+            text.detach()
+        if not results:
+            raise UnreadableResultFile("The CSV file has no results")
+        return ListOfResults(results=results)
+
+    @staticmethod
+    def _results(
+        rows: Iterable[List[str]], fields: List[Optional[str]]
+    ) -> Iterable[Result]:
+        order = 0
+        for line, row in enumerate(rows, start=2):
+            values: Dict[str, str] = {}
+            for field, value in zip(fields, row):
+                # the first column of a field wins, e.g. "Driver" over "Short Name"
+                if field and value.strip() and field not in values:
+                    values[field] = value.strip()
+            if not values.get("driver"):
+                continue
+
+            order += 1
+            position = order
+            if "position" in values:
+                position = parse_position(values["position"])
+                if position is None:
+                    raise UnreadableResultFile(
+                        f"Line {line}: invalid position {values['position']!r}"
+                    )
+            penalties = (
+                parse_penalty(values["penalties"]) if "penalties" in values else None
+            )
+            yield Result(
+                position=position,
+                driver=values["driver"],
+                penalties=penalties,
+                **{
+                    field: normalize_time(values[field]) or values[field]
+                    for field in ("best_lap", "race", "total")
+                    if field in values
+                },
+            )
+
+
+class ImporterRegistry:
+    """The importers of result files, tried in order of registration."""
+
+    def __init__(self, importers: Iterable[ResultImporter] = ()):
+        self._importers: List[ResultImporter] = list(importers)
+
+    def register(self, importer: ResultImporter) -> None:
+        self._importers.append(importer)
+
+    def extensions(self) -> frozenset:
+        """The extensions of the files some importer reads."""
+        return frozenset().union(*(importer.extensions for importer in self._importers))
+
+    def importer_for(self, filename: str, head: bytes) -> Optional[ResultImporter]:
+        """
+        The importer of a file, None if it has to be read by OCR.
+
+        Args:
+            filename: Name of the uploaded file, for its extension
+            head: The first ``SIGNATURE_SIZE`` bytes of the file
+
+        Raises:
+            UnreadableResultFile: The extension is a results file's, e.g.
+                ``.json``, but no importer knows its content. OCR can't read
+                it either.
+        """
+        extension = _extension(filename)
+        for importer in self._importers:
+            if importer.accepts(extension, head):
+                return importer
+        if extension in self.extensions():
+            raise UnreadableResultFile(f"Unknown results file format: .{extension}")
+        return None
+
+
+# The server results are recognized by their content before the CSV by its extension
+importer_registry = ImporterRegistry([AccResultImporter(), CsvResultImporter()])
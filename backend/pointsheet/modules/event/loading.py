@@ -0,0 +1,55 @@
+"""Loading profiles for the event and series aggregates."""
+
+from enum import Enum
+from typing import List
+
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from pointsheet.models import Event, EventSchedule, Series
+
+
+class LoadProfile(str, Enum):
+    """Parts of an aggregate a caller needs, loaded in a fixed number of statements."""
+
+    # Schedules with their results, participants and cars. Required by
+    # commands, since the whole aggregate is written back on update.
+    full_aggregate = "full_aggregate"
+    # Schedules with their results and the participants they refer to.
+    with_results = "with_results"
+    # Event columns and participants only, for listings.
+    summary = "summary"
+
+
+def event_load_options(
+    profile: LoadProfile = LoadProfile.full_aggregate,
+) -> List[ORMOption]:
+    """Loader options for an ``Event`` query using the given profile."""
+    match profile:
+        case LoadProfile.full_aggregate:
+            return [
+                selectinload(Event.schedule).joinedload(EventSchedule.result),
+                selectinload(Event.drivers),
+                selectinload(Event.cars),
+            ]
+        case LoadProfile.with_results:
+            return [
+                selectinload(Event.schedule).joinedload(EventSchedule.result),
+                selectinload(Event.drivers),
+                noload(Event.cars),
+            ]
+        case LoadProfile.summary:
+            return [
+                selectinload(Event.drivers),
+                noload(Event.schedule),
+                noload(Event.cars),
+            ]
+        case _:
+            raise ValueError(f"Unknown load profile: {profile}")
+
+
+def series_load_options(
+    profile: LoadProfile = LoadProfile.full_aggregate,
+) -> List[ORMOption]:
+    """Loader options for a ``Series`` query, applying the profile to its events."""
+    return [selectinload(Series.events).options(*event_load_options(profile))]
@@ -0,0 +1,82 @@
+"""Reading the words of race result screenshots."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+import pytesseract
+
+from modules.event.preprocessing import (
+    DEFAULT_PROFILE,
+    PreprocessingProfile,
+    Preprocessor,
+    StageTimings,
+    timed,
+)
+from modules.event.results_table import Word, words_from_data
+
+
+def preprocess(
+    file_path, profile: PreprocessingProfile = DEFAULT_PROFILE
+) -> Tuple[numpy.ndarray, StageTimings]:
+    timings: StageTimings = {}
+    with timed(timings, "load"):
+        image = cv2.imread(file_path)
+    if image is None:
+        raise ValueError(f"Not an image: {file_path}")
+    image, stage_timings = Preprocessor(profile).run(image)
+    return image, {**timings, **stage_timings}
+
+
+def read_image(
+    file_path, profile: PreprocessingProfile = DEFAULT_PROFILE
+) -> Tuple[List[Word], StageTimings]:
+    """The words of a screenshot and the time (ms) of each stage reading it."""
+    image, timings = preprocess(file_path, profile)
+    with timed(timings, "tesseract"):
+        words = words_from_data(
+            pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        )
+    return words, timings
+
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def ocr_executor(max_workers: Optional[int] = None) -> Executor:
+    """
+    The pool reading screenshots, started on first use.
+
+    Args:
+        max_workers: Size of the pool, ``OCR_WORKERS`` or the number of CPUs
+            by default
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from pointsheet.config import config
+
+            workers = max_workers or config.OCR_WORKERS or os.cpu_count() or 1
+            if multiprocessing.current_process().daemon:
+                # Celery's prefork workers are daemons, which can't start processes.
+                # OpenCV and the tesseract subprocess release the GIL, threads still
+                # read the screenshots in parallel.
+                _executor = ThreadPoolExecutor(workers, thread_name_prefix="ocr")
+            else:
+                _executor = ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def shutdown_ocr_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,254 @@
+"""Preparing result screenshots for Tesseract."""
+
+import dataclasses
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy
+
+# Part of the key of the cached OCR words: bump it when the stages change
+PIPELINE_VERSION = 1
+
+StageTimings = Dict[str, float]
+Region = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class PreprocessingProfile:
+    """
+    Args:
+        crop_table: Crop the screenshot to the results table
+        min_table_rows: Rows a table needs to be cropped to
+        deskew: Straighten the table
+        max_skew: Larger angles (degrees) are taken for a misdetection
+        text_height: Height of the text after rescaling, 0 not to rescale
+        invert: Whether the text is lighter than the background, None to
+            tell by the brightness of the image
+        median_blur: Aperture of the median blur, 0 not to blur
+    """
+
+    crop_table: bool = True
+    min_table_rows: int = 3
+    deskew: bool = True
+    max_skew: float = 8.0
+    text_height: int = 32
+    invert: Optional[bool] = None
+    median_blur: int = 5
+
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            **dataclasses.asdict(self),
+            "pipeline": PIPELINE_VERSION,
+            "output": "words",
+        }
+
+
+DEFAULT_PROFILE = PreprocessingProfile()
+
+# By the id of the games of data/games.csv
+GAME_PROFILES: Dict[int, PreprocessingProfile] = {
+    # Forza Motorsport: light text on dark translucent rows over the track
+    1: PreprocessingProfile(invert=True),
+    # Assetto Corsa Competizione: flat leaderboard, the blur eats the thin font
+    2: PreprocessingProfile(median_blur=3),
+}
+
+
+def profile_for_game(game_id: Optional[int]) -> PreprocessingProfile:
+    """The profile of a game, with the overrides of ``OCR_GAME_PROFILES``."""
+    from pointsheet.config import config
+
+    profile = GAME_PROFILES.get(game_id, DEFAULT_PROFILE)
+    overrides = config.OCR_GAME_PROFILES.get(game_id) if game_id is not None else None
+    return dataclasses.replace(profile, **overrides) if overrides else profile
+
+
+@contextmanager
+def timed(timings: StageTimings, stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = (
+            timings.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+        )
+
+
+def format_timings(timings: StageTimings) -> str:
+    return ", ".join(f"{stage} {duration:.0f}ms" for stage, duration in timings.items())
+
+
+def _foreground(gray: numpy.ndarray) -> numpy.ndarray:
+    """The text in white on black, whatever the colors of the screenshot."""
+    binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    # text covers less of the screenshot than its background
+    if cv2.countNonZero(binary) > binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+
+def _glyph_height(binary: numpy.ndarray) -> Optional[float]:
+    """Median height of the characters: connected components too small or large to be one are left out."""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    heights = [
+        stats[label, cv2.CC_STAT_HEIGHT]
+        for label in range(1, count)
+        if stats[label, cv2.CC_STAT_AREA] >= 6
+        and 4 <= stats[label, cv2.CC_STAT_HEIGHT] <= binary.shape[0] / 8
+    ]
+    return float(statistics.median(heights)) if heights else None
+
+
+def _line_boxes(binary: numpy.ndarray, glyph_height: float) -> List[Region]:
+    """The boxes of the text runs: characters and words joined, columns apart."""
+    size = max(int(glyph_height), 1)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (size, max(size // 3, 1)))
+    joined = cv2.dilate(binary, kernel)
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = [cv2.boundingRect(contour) for contour in contours]
+    return [box for box in boxes if 0.5 * glyph_height <= box[3] <= 3 * glyph_height]
+
+
+def _table_rows(boxes: List[Region]) -> List[List[Region]]:
+    """Text runs side by side, by row from the top."""
+    rows: List[List[Region]] = []
+    for box in sorted(boxes, key=lambda box: box[1] + box[3] / 2):
+        center = box[1] + box[3] / 2
+        if rows:
+            last = rows[-1][0]
+            if last[1] <= center <= last[1] + last[3]:
+                rows[-1].append(box)
+                continue
+        rows.append([box])
+    return [row for row in rows if len(row) >= 2]
+
+
+def detect_table(
+    gray: numpy.ndarray, min_rows: int = 3
+) -> Tuple[Optional[Region], Optional[float]]:
+    """
+    The region of the results table and the height of its characters.
+
+    Returns:
+        The region (x, y, width, height), None if no table has ``min_rows``
+        rows, and the glyph height, None if no text was found
+    """
+    binary = _foreground(gray)
+    glyph_height = _glyph_height(binary)
+    if glyph_height is None:
+        return None, None
+
+    rows = _table_rows(_line_boxes(binary, glyph_height))
+    if len(rows) < min_rows:
+        return None, glyph_height
+
+    tops = [min(box[1] for box in row) for row in rows]
+    # the lower quartile: a title or footer spaced away doesn't stretch the table's pitch
+    gaps = sorted(next_top - top for top, next_top in zip(tops, tops[1:]))
+    pitch = gaps[len(gaps) // 4]
+    # the longest run of rows spaced like the table's
+    best, start = (0, 0), 0
+    for index in range(1, len(rows) + 1):
+        if index == len(rows) or tops[index] - tops[index - 1] > 2.5 * pitch:
+            if index - start > best[1] - best[0]:
+                best = (start, index)
+            start = index
+    table = [box for row in rows[best[0] : best[1]] for box in row]
+    if best[1] - best[0] < min_rows:
+        return None, glyph_height
+
+    margin = int(glyph_height)
+    left = max(min(box[0] for box in table) - margin, 0)
+    top = max(min(box[1] for box in table) - margin, 0)
+    right = min(max(box[0] + box[2] for box in table) + margin, gray.shape[1])
+    bottom = min(max(box[1] + box[3] for box in table) + margin, gray.shape[0])
+    return (left, top, right - left, bottom - top), glyph_height
+
+
+def skew_angle(gray: numpy.ndarray, glyph_height: Optional[float] = None) -> float:
+    """The rotation (degrees, counterclockwise) leveling the text rows, by the median of their long runs."""
+    binary = _foreground(gray)
+    glyph_height = glyph_height or _glyph_height(binary)
+    if glyph_height is None:
+        return 0.0
+    size = max(int(glyph_height), 1)
+    joined = cv2.dilate(
+        binary, cv2.getStructuringElement(cv2.MORPH_RECT, (size * 2, 1))
+    )
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    angles = []
+    for contour in contours:
+        (_, _), (width, height), angle = cv2.minAreaRect(contour)
+        if max(width, height) < 6 * glyph_height:
+            continue
+        if width < height:
+            angle -= 90
+        # the row's angle to the horizontal, within ±45°
+        angles.append((angle + 45) % 90 - 45)
+    return float(statistics.median(angles)) if angles else 0.0
+
+
+def rotate(gray: numpy.ndarray, angle: float) -> numpy.ndarray:
+    """The image rotated counterclockwise by ``angle`` degrees around its center."""
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(
+        gray,
+        matrix,
+        (width, height),
+        flags=cv2.INTER_CUBIC,
+        borderMode=cv2.BORDER_REPLICATE,
+    )
+
+
+class Preprocessor:
+    """Runs the stages of its profile: table crop, deskew, rescale, binarize, denoise."""
+
+    def __init__(self, profile: PreprocessingProfile = DEFAULT_PROFILE):
+        self.profile = profile
+
+    def run(self, image: numpy.ndarray) -> Tuple[numpy.ndarray, StageTimings]:
+        """The image for Tesseract and the time (ms) of each stage."""
+        profile = self.profile
+        timings: StageTimings = {}
+
+        with timed(timings, "grayscale"):
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+        glyph_height = None
+        if profile.crop_table or profile.text_height:
+            with timed(timings, "detect_table"):
+                region, glyph_height = detect_table(gray, profile.min_table_rows)
+                if profile.crop_table and region is not None:
+                    x, y, width, height = region
+                    gray = gray[y : y + height, x : x + width]
+
+        if profile.deskew:
+            with timed(timings, "deskew"):
+                angle = skew_angle(gray, glyph_height)
+                if 0.2 <= abs(angle) <= profile.max_skew:
+                    gray = rotate(gray, angle)
+
+        if profile.text_height and glyph_height:
+            with timed(timings, "rescale"):
+                scale = min(max(profile.text_height / glyph_height, 0.5), 4.0)
+                if not 0.9 <= scale <= 1.1:
+                    interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+                    gray = cv2.resize(
+                        gray, None, fx=scale, fy=scale, interpolation=interpolation
+                    )
+
+        with timed(timings, "binarize"):
+            invert = profile.invert if profile.invert is not None else gray.mean() < 127
+            threshold = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+            binary = cv2.threshold(gray, 0, 255, threshold + cv2.THRESH_OTSU)[1]
+
+        if profile.median_blur > 1:
+            with timed(timings, "denoise"):
+                binary = cv2.medianBlur(binary, profile.median_blur)
+
+        return binary, timings
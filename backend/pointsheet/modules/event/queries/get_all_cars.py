@@ -1,16 +1,22 @@
 from typing import Optional
 
 from lato import Query
+from pydantic import Field
 
 from modules.event.repository import CarRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
+from pointsheet.repository import PageRequest
 
 
 class GetAllCars(Query):
     game: Optional[str] = None
+    search: Optional[str] = None
+    page: PageRequest = Field(default_factory=PageRequest)
 
 
 @event_module.handler(GetAllCars)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_all_cars(query: GetAllCars, repo: CarRepository):
-    result = repo.all(query)
-    return result
\ No newline at end of file
+    result = repo.all(query, query.page)
+    return result
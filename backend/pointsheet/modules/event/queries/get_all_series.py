@@ -1,18 +1,25 @@
 from typing import List, Optional
 
 from lato import Query
+from pydantic import Field
 
 from modules.event import event_module
-from modules.event.domain.entity import Series
 from modules.event.domain.value_objects import SeriesStatus
-from modules.event.repository import SeriesRepository
+from modules.event.read_models import EventReadModel, SeriesSummary
+from pointsheet.cache import query_cache
+from pointsheet.domain.responses import CursorPage
+from pointsheet.repository import PageRequest
 
 
 class GetAllSeries(Query):
     status: Optional[List[SeriesStatus]] = None
+    page: PageRequest = Field(default_factory=PageRequest)
 
 
 @event_module.handler(GetAllSeries)
-def fetch_all_series(query: GetAllSeries, repository: SeriesRepository) -> List[Series]:
-    result = repository.all(query)
+@query_cache.cached(tags=("series", "events"))
+def fetch_all_series(
+    query: GetAllSeries, read_model: EventReadModel
+) -> CursorPage[SeriesSummary]:
+    result = read_model.series(query, query.page)
     return result
@@ -4,6 +4,7 @@ from lato import Query
 
 from modules.event.repository import TrackRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
 
 
 class OrderBy(Enum):
@@ -20,6 +21,7 @@ class GetAllTracks(Query):
 
 
 @event_module.handler(GetAllTracks)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_all_tracks(query: GetAllTracks, repo: TrackRepository):
     result = repo.all(order=query)
     return result
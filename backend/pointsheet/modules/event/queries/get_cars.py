@@ -1,19 +1,22 @@
 from typing import Optional
 from lato import Query
+from pydantic import Field
 
 from modules.event.repository import CarRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
+from pointsheet.repository import PageRequest
 
 
 class GetCars(Query):
     game_id: int
     search: Optional[str] = None
-    page: Optional[int] = 1
-    page_size: Optional[int] = 20
+    page: PageRequest = Field(default_factory=PageRequest)
 
 
 @event_module.handler(GetCars)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_game_cars(query: GetCars, repo: CarRepository):
     # Use the existing CarRepository to fetch cars filtered by game_id with pagination
-    result = repo.all(query)
+    result = repo.all(query, query.page)
     return result
@@ -1,14 +1,18 @@
 from lato import Query
+from pydantic import Field
 
 from modules.event import event_module
-from modules.event.repository import EventRepository
+from modules.event.read_models import EventReadModel
+from pointsheet.cache import query_cache
+from pointsheet.repository import PageRequest
 
 
 class GetEvents(Query):
-    pass
+    page: PageRequest = Field(default_factory=PageRequest)
 
 
 @event_module.handler(GetEvents)
-def fetch_all_events(cmd: GetEvents, repo: EventRepository):
-    result = repo.all()
+@query_cache.cached(tags=("events",))
+def fetch_all_events(cmd: GetEvents, read_model: EventReadModel):
+    result = read_model.events(cmd.page)
     return result
@@ -2,6 +2,7 @@ from lato import Query
 
 from modules.event.repository import GameRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
 
 
 class GetGame(Query):
@@ -9,6 +10,7 @@ class GetGame(Query):
 
 
 @event_module.handler(GetGame)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_game(query: GetGame, repo: GameRepository):
     result = repo.find_by_id(query.game_id)
     return result
\ No newline at end of file
@@ -2,6 +2,7 @@ from lato import Query
 
 from modules.event.repository import GameRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
 
 
 class GetGames(Query):
@@ -9,6 +10,7 @@ class GetGames(Query):
 
 
 @event_module.handler(GetGames)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_all_games(query: GetGames, repo: GameRepository):
     result = repo.all(query)
     return result
\ No newline at end of file
@@ -3,6 +3,7 @@ from sqlalchemy import select
 
 from modules.event.repository import TrackRepository
 from modules.event import event_module
+from pointsheet.cache import CATALOG_TTL, query_cache
 from pointsheet.models import Track
 
 
@@ -11,6 +12,7 @@ class GetTrackById(Query):
 
 
 @event_module.handler(GetTrackById)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
 def fetch_track_by_id(query: GetTrackById, repo: TrackRepository):
     """
     Fetch a track by its ID.
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from lato import Query
+from pydantic import Field
+
+from modules.event import event_module
+from modules.event.repository import CarRepository
+from pointsheet.cache import CATALOG_TTL, query_cache
+
+
+class SuggestCars(Query):
+    search: str
+    game_id: Optional[int] = None
+    limit: int = Field(10, ge=1, le=25)
+
+
+@event_module.handler(SuggestCars)
+@query_cache.cached(ttl=CATALOG_TTL, tags=("catalog",))
+def suggest_cars(query: SuggestCars, repo: CarRepository):
+    return repo.suggest(query.search, game_id=query.game_id, limit=query.limit)
@@ -0,0 +1,122 @@
+"""Read models for the event and series listings."""
+
+from datetime import datetime
+from typing import Optional
+
+from lato import Query
+from pydantic import BaseModel
+from sqlalchemy import func, select
+
+from modules.event.domain.value_objects import EventStatus, SeriesStatus
+from pointsheet.domain.responses import CursorPage
+from pointsheet.domain.types import EntityId
+from pointsheet.models import Event, Participants, Series
+from pointsheet.repository import PageRequest, paginate
+
+
+class EventSummary(BaseModel):
+    id: EntityId
+    title: str
+    host: EntityId
+    track: Optional[int] = None
+    status: Optional[EventStatus] = None
+    series: Optional[EntityId] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    max_participants: Optional[int] = None
+    is_multi_class: Optional[bool] = None
+    game: Optional[int] = None
+    current_participants: int = 0
+
+
+class SeriesSummary(BaseModel):
+    id: EntityId
+    title: str
+    status: Optional[SeriesStatus] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    cover_image: Optional[str] = None
+    description: Optional[str] = None
+    event_count: int = 0
+
+
+def _summary(model: type[BaseModel]):
+    return lambda row: model.model_construct(**row._mapping)
+
+
+class EventReadModel:
+    """
+    Listings selecting only the columns they show. The DTOs are built with
+    ``model_construct``: the values come straight from the database.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def events(
+        self, page: PageRequest | None = None, series_id: EntityId | None = None
+    ) -> CursorPage[EventSummary]:
+        current_participants = (
+            select(func.count())
+            .select_from(Participants)
+            .where(
+                Participants.event_id == Event.id, Participants.waitlisted.is_(False)
+            )
+            .correlate(Event)
+            .scalar_subquery()
+        )
+        stmt = select(
+            Event.id,
+            Event.title,
+            Event.host,
+            Event.track,
+            Event.status,
+            Event.series,
+            Event.starts_at,
+            Event.ends_at,
+            Event.max_participants,
+            Event.is_multi_class,
+            Event.game_id.label("game"),
+            current_participants.label("current_participants"),
+        )
+        if series_id:
+            stmt = stmt.where(Event.series == series_id)
+
+        return paginate(
+            self._session,
+            stmt,
+            page or PageRequest(),
+            keys=[Event.id],
+            map_row=_summary(EventSummary),
+        )
+
+    def series(
+        self, criteria: Query, page: PageRequest | None = None
+    ) -> CursorPage[SeriesSummary]:
+        event_count = (
+            select(func.count())
+            .select_from(Event)
+            .where(Event.series == Series.id)
+            .correlate(Series)
+            .scalar_subquery()
+        )
+        stmt = select(
+            Series.id,
+            Series.title,
+            Series.status,
+            Series.starts_at,
+            Series.ends_at,
+            Series.cover_image,
+            Series.description,
+            event_count.label("event_count"),
+        )
+        if statuses := getattr(criteria, "status", None):
+            stmt = stmt.where(Series.status.in_([status.value for status in statuses]))
+
+        return paginate(
+            self._session,
+            stmt,
+            page or PageRequest(),
+            keys=[Series.id],
+            map_row=_summary(SeriesSummary),
+        )
@@ -1,45 +1,224 @@
+import re
 from datetime import datetime, timezone
-from typing import Any, List, Union
+from typing import Any, List
 
 from lato import Query
-from sqlalchemy import select, or_, func
+from sqlalchemy import (
+    DateTime,
+    String,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 
 from pointsheet.models import Event, Series, Participants, Track, Car, Game
-from pointsheet.repository import AbstractRepository
-from pointsheet.domain.responses import PaginatedResponse
+from pointsheet.models.event import car_fts
+from pointsheet.repository import AbstractRepository, PageRequest
+from pointsheet.domain.responses import CursorPage
 
 from .data_mappers import EventModelMapper, SeriesModelMapper, TrackModelMapper, CarModelMapper, GameModelMapper
+from .loading import LoadProfile, event_load_options, series_load_options
 from .domain.entity import Event as EventModel
 from .domain.entity import Series as SeriesModel
 from .domain.entity import Track as TrackModel
 from .domain.entity import Car as CarModel
 from .domain.entity import Game as GameModel
 from pointsheet.domain.types import EntityId
-from .domain.value_objects import EventStatus
+from .domain.value_objects import EventStatus, ParticipationStatus
+from .exceptions import DriverAlreadySingedUp
+from pointsheet.models.custom_types import EntityIdType
+
+
+_SEARCH_WORD = re.compile(r"\w+")
+
+
+def fts_match(search: str):
+    """
+    MATCH ``car_fts`` against every word of ``search`` as a prefix.
+
+    Each word is quoted, so FTS5 operators and punctuation in user input are
+    searched for as text: ``"merc amg"`` becomes ``"merc"* "amg"*``. Returns
+    ``None`` when ``search`` has no words.
+    """
+    words = _SEARCH_WORD.findall(search)
+    if not words:
+        return None
+    expression = " ".join(f'"{word}"*' for word in words)
+    return literal_column("car_fts").op("MATCH")(expression)
 
 
 class EventRepository(AbstractRepository[Event, EventModel]):
     mapper_class = EventModelMapper
     model_class = EventModel
 
-    def find_by_id(self, id: Any) -> EventModel | None:
-        stmt = select(Event).where(Event.id == id)
+    def __init__(self, session):
+        super().__init__(session)
+        # Entities mapped by this repository, kept alive so ``update`` can
+        # diff against them instead of loading the aggregate again.
+        self._loaded = {}
+
+    def update(self, model: EventModel) -> None:
+        entity = self._loaded.get(model.id)
+        if entity is None or entity not in self._session:
+            entity = self._session.get(Event, model.id, options=event_load_options())
+
+        if entity is None:
+            super().update(model)
+            return
+
+        self.mapper.update_db_entity(model, entity, self._session)
+
+    def find_by_id(
+        self, id: Any, profile: LoadProfile = LoadProfile.full_aggregate
+    ) -> EventModel | None:
+        stmt = select(Event).where(Event.id == id).options(*event_load_options(profile))
         result = self._session.execute(stmt).scalar()
 
         if result:
+            # only a fully loaded aggregate can be diffed on update
+            if profile == LoadProfile.full_aggregate:
+                self._loaded[result.id] = result
             return self._map_to_model(result)
         return None
 
-    def all(self) -> List[EventModel]:
-        stmt = select(Event).order_by(Event.id)
-        result = self._session.execute(stmt).scalars()
-        return [self._map_to_model(item) for item in result]
+    def all(
+        self,
+        page: PageRequest | None = None,
+        profile: LoadProfile = LoadProfile.full_aggregate,
+    ) -> CursorPage[EventModel]:
+        stmt = select(Event).options(*event_load_options(profile))
+        return self._paginate(stmt, page or PageRequest(), keys=[Event.id])
 
     def delete(self, id: EntityId) -> None:
         entity_to_delete = self._session.get(Event, id)
         if entity_to_delete:
             self._session.delete(entity_to_delete)
 
+    def exists(self, id: EntityId) -> bool:
+        stmt = select(Event.id).where(Event.id == id)
+        return self._session.execute(stmt).first() is not None
+
+    def add_participant(
+        self, event_id: EntityId, driver_id: EntityId, name: str, waitlist: bool = False
+    ) -> ParticipationStatus:
+        """
+        Sign a driver up without loading the event aggregate.
+
+        The driver is added by a single INSERT ... SELECT which only produces a
+        row while the event is below ``max_participants``, so the capacity
+        check and the insert cannot be interleaved with another sign-up. When
+        the event is full the driver goes on the waitlist if ``waitlist`` is
+        set. A second sign-up for the same event is rejected by the
+        participants primary key.
+        """
+        joined_at = datetime.now()
+        rows = select(
+            literal(driver_id, EntityIdType),
+            literal(name, String),
+            Event.id,
+            false(),
+            literal(joined_at, DateTime),
+        ).where(Event.id == event_id, self._has_room(event_id))
+        columns = ["id", "name", "event_id", "waitlisted", "joined_at"]
+
+        self._expire_participants(event_id)
+        try:
+            result = self._session.execute(
+                insert(Participants).from_select(columns, rows)
+            )
+            if result.rowcount:
+                return ParticipationStatus.joined
+
+            if not waitlist:
+                return ParticipationStatus.full
+
+            self._session.execute(
+                insert(Participants).values(
+                    id=driver_id,
+                    name=name,
+                    event_id=event_id,
+                    waitlisted=True,
+                    joined_at=joined_at,
+                )
+            )
+            return ParticipationStatus.waitlisted
+        except IntegrityError:
+            raise DriverAlreadySingedUp()
+
+    def remove_participant(
+        self, event_id: EntityId, driver_id: EntityId
+    ) -> EntityId | None:
+        """
+        Remove a driver from the event or its waitlist.
+
+        When a confirmed driver leaves, the longest waiting driver takes the
+        free place. Returns the id of the promoted driver, if any.
+        """
+        self._expire_participants(event_id)
+        waitlisted = self._session.execute(
+            delete(Participants)
+            .where(Participants.event_id == event_id, Participants.id == driver_id)
+            .returning(Participants.waitlisted)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+
+        if waitlisted is not False:
+            return None
+
+        next_driver = self._session.execute(
+            select(Participants.id)
+            .where(Participants.event_id == event_id, Participants.waitlisted.is_(True))
+            .order_by(Participants.joined_at)
+            .limit(1)
+        ).scalar()
+
+        if next_driver is None:
+            return None
+
+        promoted = self._session.execute(
+            update(Participants)
+            .where(
+                Participants.event_id == event_id,
+                Participants.id == next_driver,
+                Participants.waitlisted.is_(True),
+                select(Event.id)
+                .where(Event.id == event_id, self._has_room(event_id))
+                .exists(),
+            )
+            .values(waitlisted=False)
+            .execution_options(synchronize_session=False)
+        )
+        return next_driver if promoted.rowcount else None
+
+    def _expire_participants(self, event_id: EntityId) -> None:
+        # The participant statements bypass the unit of work, so an event
+        # already loaded in this session would keep its old driver lists.
+        self._loaded.pop(event_id, None)
+        instance = self._session.identity_map.get(
+            self._session.identity_key(Event, event_id)
+        )
+        if instance is not None:
+            self._session.expire(instance, ["drivers", "waitlist"])
+
+    @staticmethod
+    def _has_room(event_id: EntityId):
+        confirmed = (
+            select(func.count())
+            .select_from(Participants)
+            .where(
+                Participants.event_id == event_id, Participants.waitlisted.is_(False)
+            )
+            .scalar_subquery()
+        )
+        return or_(Event.max_participants.is_(None), confirmed < Event.max_participants)
+
     def get_recent_event_by_user(self, query: Query):
         driver_search = {"id": str(query.driver_id)}
 
@@ -48,6 +227,7 @@ class EventRepository(AbstractRepository[Event, EventModel]):
             .where(Event.drivers.contains([driver_search]))
             .order_by(Event.starts_at.desc())
             .limit(1)
+            .options(*event_load_options())
         )
         result = self._session.execute(stmt).scalar()
         return self._map_to_model(result) if result else None
@@ -60,6 +240,7 @@ class EventRepository(AbstractRepository[Event, EventModel]):
                 Event.status == EventStatus.open,
             )
             .order_by(Event.starts_at)
+            .options(*event_load_options())
         )
 
         if query.user_id:
@@ -70,11 +251,14 @@ class EventRepository(AbstractRepository[Event, EventModel]):
         result = self._session.execute(stmt).scalars()
         return [self._map_to_model(item) for item in result]
 
-    def get_ongoing_events(self, query: Query):
+    def get_ongoing_events(
+        self, query: Query, profile: LoadProfile = LoadProfile.full_aggregate
+    ):
         stmt = (
             select(Event)
             .where(Event.status.in_([EventStatus.in_progress, EventStatus.open]))
             .order_by(Event.starts_at)
+            .options(*event_load_options(profile))
         )
 
         if query.user_id:
@@ -88,8 +272,29 @@ class SeriesRepository(AbstractRepository[Series, SeriesModel]):
     mapper_class = SeriesModelMapper
     model_class = SeriesModel
 
-    def all(self, criteria: Query) -> List[SeriesModel]:
-        stmt = select(Series).order_by(Series.id)
+    def __init__(self, session):
+        super().__init__(session)
+        # See EventRepository._loaded
+        self._loaded = {}
+
+    def update(self, model: SeriesModel) -> None:
+        entity = self._loaded.get(model.id)
+        if entity is None or entity not in self._session:
+            entity = self._session.get(Series, model.id, options=series_load_options())
+
+        if entity is None:
+            super().update(model)
+            return
+
+        self.mapper.update_db_entity(model, entity, self._session)
+
+    def all(
+        self,
+        criteria: Query,
+        page: PageRequest | None = None,
+        profile: LoadProfile = LoadProfile.full_aggregate,
+    ) -> CursorPage[SeriesModel]:
+        stmt = select(Series).options(*series_load_options(profile))
 
         if value := getattr(criteria, "status"):
             if isinstance(value, list):
@@ -100,13 +305,19 @@ class SeriesRepository(AbstractRepository[Series, SeriesModel]):
                 # Backward compatibility for single status
                 stmt = stmt.where(Series.status == value.value)
 
-        result = self._session.execute(stmt).scalars()
-        return [self._map_to_model(item) for item in result]
+        return self._paginate(stmt, page or PageRequest(), keys=[Series.id])
 
-    def find_by_id(self, id: Any) -> SeriesModel | None:
-        result = self._session.get(Series, id)
+    def find_by_id(
+        self, id: Any, profile: LoadProfile = LoadProfile.full_aggregate
+    ) -> SeriesModel | None:
+        stmt = (
+            select(Series).where(Series.id == id).options(*series_load_options(profile))
+        )
+        result = self._session.execute(stmt).scalar()
 
         if result:
+            if profile == LoadProfile.full_aggregate:
+                self._loaded[result.id] = result
             return self._map_to_model(result)
         return None
 
@@ -169,96 +380,79 @@ class CarRepository(AbstractRepository[Car, CarModel]):
         return select(Car).join(Game)
 
     def _apply_game_filter(self, stmt: Any, query: Query = None) -> Any:
-        """Apply game filter to the query if provided."""
-        if query and hasattr(query, 'game_id') and query.game_id:
-            # Check if game is an integer (id) or string (name)
-            if isinstance(query.game_id, int):
-                return stmt.where(Game.id == query.game_id)
-            else:
-                return stmt.where(Game.name == query.game)
+        """Apply the game filter of the query, by id or by name."""
+        if game_id := getattr(query, "game_id", None):
+            return stmt.where(Car.game_id == game_id)
+        if game := getattr(query, "game", None):
+            return stmt.where(Game.name == game)
         return stmt
 
-    def _get_car_ids_from_search(self, search_term: str) -> List[int]:
-        """Get car IDs that match the search term using FTS5."""
-        from sqlalchemy import text
-        try:
-            # For content tables, join FTS5 results with the content table
-            fts_stmt = select(text("cars.id")).select_from(
-                text("car_fts").join(text("cars"), text("car_fts.rowid = cars.id"))
-            ).where(text("car_fts MATCH :search")).params(search=search_term)
-
-            return self._session.execute(fts_stmt).scalars().all()
-        except Exception as e:
-            # Log the error and return empty list to trigger fallback
-            print(f"FTS5 search failed: {e}")
-            return []
-
-    def _apply_search_filter(self, stmt: Any, query: Query = None) -> Any:
-        """Apply search filter to the query if provided."""
-        if query and hasattr(query, 'search') and query.search:
-            car_ids = self._get_car_ids_from_search(query.search)
-            if car_ids:
-                return stmt.where(Car.id.in_(car_ids))
-            else:
-                # Fallback to LIKE search if no FTS matches or if FTS is not available
-                search_term = f"%{query.search}%"
-                return stmt.where(Car.model.ilike(search_term))
-        return stmt
-
-    def _get_pagination_params(self, query: Query = None) -> tuple[int, int]:
-        """Extract pagination parameters from the query."""
-        page = 1
-        page_size = 20
-
-        if query:
-            if hasattr(query, 'page'):
-                page = max(1, query.page)  # Ensure page is at least 1
-            if hasattr(query, 'page_size'):
-                page_size = max(1, query.page_size)  # Ensure page_size is at least 1
-
-        return page, page_size
-
-    def _apply_pagination(self, stmt: Any, page: int, page_size: int) -> Any:
-        """Apply pagination to the query."""
-        return stmt.offset((page - 1) * page_size).limit(page_size)
-
-    def _count_total_records(self, query: Query = None) -> int:
-        """Count total records for pagination."""
-        count_stmt = select(func.count()).select_from(Car).join(Game)
-        count_stmt = self._apply_game_filter(count_stmt, query)
-        count_stmt = self._apply_search_filter(count_stmt, query)
-        return self._session.execute(count_stmt).scalar() or 0
-
-    def all(self, query: Query = None) -> Union[List[CarModel], PaginatedResponse[CarModel]]:
-        """Get all cars with optional filtering, searching, and pagination."""
-        # Build base query
-        stmt = self._build_base_query()
-
-        # Apply filters
-        stmt = self._apply_game_filter(stmt, query)
-        stmt = self._apply_search_filter(stmt, query)
+    def all(
+        self, query: Query = None, page: PageRequest | None = None
+    ) -> CursorPage[CarModel]:
+        """Get cars with optional filtering and searching, one page at a time."""
+        page = page or PageRequest()
+        stmt = self._apply_game_filter(self._build_base_query(), query)
+
+        if search := getattr(query, "search", None):
+            return self._search(stmt, search, page)
+        return self._paginate(stmt, page, keys=[Car.id])
+
+    def _search(
+        self, stmt: Any, search: str, page: PageRequest
+    ) -> CursorPage[CarModel]:
+        """
+        Page through the cars matching ``search``, best match first.
+
+        The ranked matches are a subquery so the keyset can compare their
+        bm25 rank and, when asked for, a window function counts every match
+        in the same statement.
+        """
+        match = fts_match(search)
+        if match is None:
+            return CursorPage.create(
+                items=[], limit=page.limit, total=0 if page.with_total else None
+            )
 
-        # Order by id by default
-        stmt = stmt.order_by(Car.id)
+        columns = [Car.id.label("id"), car_fts.c.rank.label("rank")]
+        if page.with_total:
+            columns.append(func.count().over().label("total"))
+        ranked = (
+            stmt.with_only_columns(*columns)
+            .join(car_fts, car_fts.c.rowid == Car.id)
+            .where(match)
+            .subquery("ranked")
+        )
+        stmt = select(Car, *ranked.c).join(ranked, ranked.c.id == Car.id)
+
+        return self._paginate(
+            stmt,
+            page,
+            keys=[ranked.c.rank, ranked.c.id],
+            map_row=lambda row: self._map_to_model(row.Car),
+            total_column="total" if page.with_total else None,
+        )
 
-        # Get total count for pagination
-        total = self._count_total_records(query)
+    def suggest(
+        self, search: str, game_id: int | None = None, limit: int = 10
+    ) -> List[CarModel]:
+        """The best ``limit`` cars whose words start with those of ``search``."""
+        match = fts_match(search)
+        if match is None:
+            return []
 
-        # Apply pagination
-        page, page_size = self._get_pagination_params(query)
-        stmt = self._apply_pagination(stmt, page, page_size)
+        stmt = (
+            select(Car)
+            .join(car_fts, car_fts.c.rowid == Car.id)
+            .where(match)
+            .order_by(car_fts.c.rank, Car.id)
+            .limit(limit)
+        )
+        if game_id:
+            stmt = stmt.where(Car.game_id == game_id)
 
-        # Execute query and map results
         result = self._session.execute(stmt).scalars()
-        items = [self._map_to_model(item) for item in result]
-
-        # Create and return paginated response
-        return PaginatedResponse.create(
-            items=items,
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        return [self._map_to_model(item) for item in result]
 
     def find_by_id(self, id: int) -> CarModel | None:
         stmt = select(Car).where(Car.id == id)
@@ -0,0 +1,383 @@
+"""Parser of the results tables read from screenshots."""
+
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from modules.event.domain.value_objects import ListOfResults, Result
+
+TIME_FIELDS = ("best_lap", "race", "total")
+
+HEADER_FIELDS = {
+    "#": "position",
+    "p": "position",
+    "pos": "position",
+    "position": "position",
+    "place": "position",
+    "rank": "position",
+    "driver": "driver",
+    "drivers": "driver",
+    "name": "driver",
+    "player": "driver",
+    "racer": "driver",
+    "best": "best_lap",
+    "best lap": "best_lap",
+    "best time": "best_lap",
+    "fastest lap": "best_lap",
+    "lap": "best_lap",
+    "race": "race",
+    "race time": "race",
+    "time": "race",
+    "pen": "penalties",
+    "pens": "penalties",
+    "penalty": "penalties",
+    "penalties": "penalties",
+    "total": "total",
+    "total time": "total",
+    "result": "total",
+}
+
+POSITION = re.compile(r"^[Pp]?(\d{1,2})(?:st|nd|rd|th|\.)?$")
+LAP_TIME = re.compile(r"^\+?(?:(?:\d{1,2}:)?\d{1,2}:\d{2}|\d{1,2})\.\d{3}$")
+LAPPED = re.compile(r"^\+\d+\s*laps?$", re.IGNORECASE)
+STATUS = re.compile(r"^(?:[DO0]N[FS]|DSQ|DQ)$")
+PENALTY = re.compile(r"^\+?(\d+(?:\.\d+)?)\s*s?$")
+EMPTY = {"-", "--", "—", "–"}
+_MISREAD_STATUSES = {"ONF": "DNF", "0NF": "DNF", "ONS": "DNS", "0NS": "DNS"}
+# The time columns of a row without header, by the number of times it has
+_TIME_COLUMNS = {
+    1: ("total",),
+    2: ("best_lap", "total"),
+    3: ("best_lap", "race", "total"),
+}
+
+# Letters Tesseract reads in place of digits in times
+_DIGITS = str.maketrans({"O": "0", "o": "0", "l": "1", "I": "1", "|": "1", ",": "."})
+
+
+@dataclass(frozen=True)
+class Word:
+    """A word Tesseract found, with its bounding box and confidence (0-100)."""
+
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    conf: float = 100.0
+    block: int = 0
+    par: int = 0
+    line: int = 0
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def center_x(self) -> float:
+        return self.left + self.width / 2
+
+    @property
+    def center_y(self) -> float:
+        return self.top + self.height / 2
+
+    def to_row(self) -> list:
+        return [
+            self.text,
+            self.left,
+            self.top,
+            self.width,
+            self.height,
+            self.conf,
+            self.block,
+            self.par,
+            self.line,
+        ]
+
+
+def words_from_data(data: Mapping[str, Sequence]) -> List[Word]:
+    """The words of ``pytesseract.image_to_data(..., output_type=Output.DICT)``, without the empty boxes."""
+    words = []
+    for index, text in enumerate(data["text"]):
+        text = str(text).strip()
+        conf = float(data["conf"][index])
+        if not text or conf < 0:
+            continue
+        words.append(
+            Word(
+                text=text,
+                left=int(data["left"][index]),
+                top=int(data["top"][index]),
+                width=int(data["width"][index]),
+                height=int(data["height"][index]),
+                conf=conf,
+                block=int(data["block_num"][index]),
+                par=int(data["par_num"][index]),
+                line=int(data["line_num"][index]),
+            )
+        )
+    return words
+
+
+def words_to_text(words: Sequence[Word]) -> str:
+    """The text of the words, a line per Tesseract line, like ``pytesseract.image_to_string``."""
+    lines: Dict[tuple, List[str]] = {}
+    for word in words:
+        lines.setdefault((word.block, word.par, word.line), []).append(word.text)
+    return "\n".join(" ".join(line) for line in lines.values())
+
+
+@dataclass
+class Cell:
+    words: List[Word]
+
+    @property
+    def text(self) -> str:
+        return " ".join(word.text for word in self.words)
+
+    @property
+    def left(self) -> int:
+        return self.words[0].left
+
+    @property
+    def right(self) -> int:
+        return self.words[-1].right
+
+    @property
+    def center_x(self) -> float:
+        return (self.left + self.right) / 2
+
+
+@dataclass
+class ParsedTable:
+    results: ListOfResults
+    confidence: float
+    # rows looking like results (a position or a time), parsed or not
+    candidate_rows: int = 0
+    header: bool = False
+    rejected: List[str] = field(default_factory=list)
+
+
+def normalize_time(text: str) -> Optional[str]:
+    """A lap or race time, a status (``ONF`` is ``DNF``) or a lapped gap; None if the text is neither."""
+    compact = text.replace(" ", "")
+    status = compact.upper()
+    if STATUS.match(status):
+        return _MISREAD_STATUSES.get(status, status)
+    if LAPPED.match(text.strip()):
+        return text.strip()
+    if any(char.isdigit() for char in compact):
+        candidate = compact.translate(_DIGITS)
+        if LAP_TIME.match(candidate):
+            return candidate
+    return None
+
+
+def parse_position(text: str) -> Optional[int]:
+    match = POSITION.match(text.strip())
+    return int(match.group(1)) if match else None
+
+
+def parse_penalty(text: str) -> Optional[float]:
+    match = PENALTY.match(text.strip())
+    return float(match.group(1)) if match else None
+
+
+class ResultsTableParser:
+    """
+    Extracts the results of a table from its word boxes.
+
+    Args:
+        row_tolerance: Words whose centers are closer than this share of the
+            median word height are on the same row
+        cell_gap: Words closer than this share of the median word height are
+            in the same cell
+        headerless: Share of the confidence kept when the columns are
+            guessed without a header
+    """
+
+    def __init__(
+        self, row_tolerance: float = 0.6, cell_gap: float = 1.2, headerless: float = 0.9
+    ):
+        self.row_tolerance = row_tolerance
+        self.cell_gap = cell_gap
+        self.headerless = headerless
+
+    def parse(self, words: Sequence[Word]) -> ParsedTable:
+        if not words:
+            return ParsedTable(ListOfResults(results=[]), 0.0)
+
+        height = statistics.median(word.height for word in words)
+        rows = [self._cells(row, height) for row in self._rows(words, height)]
+        header_index, columns = self._header(rows)
+
+        parsed: List[tuple] = []
+        rejected: List[str] = []
+        candidates = 0
+        for row in rows[header_index + 1 :]:
+            if not self._looks_like_result(row):
+                continue
+            candidates += 1
+            if columns:
+                fields = self._fields_from_columns(row, columns)
+            else:
+                fields = self._fields_from_content(row)
+            result, complete = self._result(fields)
+            if result is None:
+                rejected.append(" | ".join(cell.text for cell in row))
+                continue
+            parsed.append(
+                (result, complete, [word for cell in row for word in cell.words])
+            )
+
+        results = ListOfResults(results=[result for result, _, _ in parsed])
+        return ParsedTable(
+            results=results,
+            confidence=self._confidence(parsed, candidates, header=bool(columns)),
+            candidate_rows=candidates,
+            header=bool(columns),
+            rejected=rejected,
+        )
+
+    def _rows(self, words: Sequence[Word], height: float) -> List[List[Word]]:
+        rows: List[List[Word]] = []
+        centers: List[float] = []
+        for word in sorted(words, key=lambda word: word.center_y):
+            if rows and abs(word.center_y - centers[-1]) <= self.row_tolerance * height:
+                rows[-1].append(word)
+                centers[-1] += (word.center_y - centers[-1]) / len(rows[-1])
+            else:
+                rows.append([word])
+                centers.append(word.center_y)
+        return [sorted(row, key=lambda word: word.left) for row in rows]
+
+    def _cells(self, row: List[Word], height: float) -> List[Cell]:
+        cells: List[Cell] = []
+        for word in row:
+            if cells and word.left - cells[-1].right <= self.cell_gap * height:
+                cells[-1].words.append(word)
+            else:
+                cells.append(Cell([word]))
+        return cells
+
+    @staticmethod
+    def _header_field(text: str) -> Optional[str]:
+        name = " ".join(re.sub(r"[^a-z#]+", " ", text.lower()).split())
+        return HEADER_FIELDS.get(name)
+
+    def _header_columns(self, cell: Cell) -> List[tuple]:
+        """The columns named in a header cell; close labels (``Penalties Total``) share a cell."""
+        columns, start = [], 0
+        while start < len(cell.words):
+            for end in range(len(cell.words), start, -1):
+                name = self._header_field(Cell(cell.words[start:end]).text)
+                if name is not None:
+                    columns.append((name, Cell(cell.words[start:end]).center_x))
+                    start = end
+                    break
+            else:
+                start += 1
+        return columns
+
+    def _header(self, rows: List[List[Cell]]):
+        """The index of the header row and the center of its columns; -1 and {} without header."""
+        for index, row in enumerate(rows):
+            columns = {}
+            for cell in row:
+                for name, center_x in self._header_columns(cell):
+                    columns.setdefault(name, center_x)
+            if len(columns) >= 2 and ("position" in columns or "driver" in columns):
+                return index, columns
+        return -1, {}
+
+    @staticmethod
+    def _looks_like_result(row: List[Cell]) -> bool:
+        first_word = row[0].words[0].text
+        return parse_position(first_word) is not None or any(
+            normalize_time(word.text) is not None for cell in row for word in cell.words
+        )
+
+    @staticmethod
+    def _fields_from_columns(
+        row: List[Cell], columns: Dict[str, float]
+    ) -> Dict[str, str]:
+        ordered = sorted(columns.items(), key=lambda column: column[1])
+        bounds = [(left[1] + right[1]) / 2 for left, right in zip(ordered, ordered[1:])]
+        fields: Dict[str, List[str]] = {}
+        # by word: the cells of close columns run into each other
+        for word in (word for cell in row for word in cell.words):
+            column = sum(word.center_x > bound for bound in bounds)
+            fields.setdefault(ordered[column][0], []).append(word.text)
+        return {name: " ".join(texts) for name, texts in fields.items()}
+
+    @staticmethod
+    def _fields_from_content(row: List[Cell]) -> Dict[str, str]:
+        words = [word.text for cell in row for word in cell.words]
+        values: Dict[str, str] = {}
+        if words and parse_position(words[0]) is not None:
+            values["position"] = words.pop(0)
+
+        name, times = [], []
+        for text in words:
+            if normalize_time(text) is not None:
+                times.append(text)
+            elif text.startswith("+") and parse_penalty(text) is not None:
+                values["penalties"] = text
+            elif not times:
+                name.append(text)
+        if name:
+            values["driver"] = " ".join(name)
+        times = times[-3:]
+        for field_name, text in zip(_TIME_COLUMNS.get(len(times), ()), times):
+            values[field_name] = text
+        return values
+
+    @staticmethod
+    def _result(values: Dict[str, str]):
+        """The result of a row and whether every value of it was read, or None if it isn't a result."""
+        position = parse_position(values.get("position", ""))
+        driver = values.get("driver", "").strip()
+        times = {
+            name: normalize_time(values[name])
+            for name in TIME_FIELDS
+            if values.get(name)
+        }
+        if (
+            position is None
+            or not any(char.isalpha() for char in driver)
+            or not any(times.values())
+        ):
+            return None, False
+
+        complete = all(value is not None for value in times.values())
+        penalties = None
+        penalty_text = values.get("penalties", "").strip()
+        if penalty_text and penalty_text not in EMPTY:
+            penalties = parse_penalty(penalty_text)
+            complete = complete and penalties is not None
+        result = Result(
+            position=position,
+            driver=driver,
+            penalties=penalties,
+            **{name: value for name, value in times.items() if value is not None},
+        )
+        return result, complete
+
+    def _confidence(self, parsed: List[tuple], candidates: int, header: bool) -> float:
+        if not parsed:
+            return 0.0
+        rows = sum(1.0 if complete else 0.5 for _, complete, _ in parsed) / candidates
+        first = parsed[0][0].position
+        in_sequence = sum(
+            result.position == first + index
+            for index, (result, _, _) in enumerate(parsed)
+        ) / len(parsed)
+        ocr = (
+            statistics.fmean(word.conf for _, _, words in parsed for word in words)
+            / 100
+        )
+        confidence = rows * in_sequence * min(ocr, 1.0)
+        if not header:
+            confidence *= self.headerless
+        return round(confidence, 3)
@@ -1,14 +1,27 @@
-from lato import TransactionContext
-
 from modules.auth.exceptions import EventNotFoundException
 from modules.event.domain.entity import Event
 from modules.event.events import RaceResultUploaded
+from modules.event.exceptions import UnreadableResultFile
+from modules.event.importers import SIGNATURE_SIZE, importer_registry
+from modules.event.preprocessing import profile_for_game
 from modules.event.repository import EventRepository
-from modules.event.use_case.extract_race_result import ExtractRaceResult
+from modules.event.use_case.extract_race_result import (
+    ExtractRaceResult,
+    ExtractRaceResults,
+)
 from modules.event.use_case.save_race_result import SaveRaceResult
 from pointsheet.celery_worker import celery_task
 
 
+def _publish(event):
+    # Handlers only run in a transaction of the application, a bare
+    # TransactionContext has none: the cache invalidations and webhooks of
+    # the event would be skipped.
+    from modules import application
+
+    application.publish(event)
+
+
 @celery_task.task(retry_backoff=True, retry_kwargs={"max_retries": 2})
 def say_hello():
     print("Hello world!!")
@@ -23,11 +36,58 @@ def extract_race_result_from_file(event_id, schedule_id, file_path, repo: EventR
     if not event:
         raise EventNotFoundException()
 
-    output = ExtractRaceResult(file_path).execute()
+    output = ExtractRaceResult(
+        file_path, profile=profile_for_game(event.game)
+    ).execute()
+    save_result_op = SaveRaceResult(repo)
+
+    save_result_op(event.id, schedule_id, output)
+
+    _publish(RaceResultUploaded(event_id=event_id, schedule_id=schedule_id))
+
+
+@celery_task.task(
+    autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 5}
+)
+def extract_race_results_from_files(
+    event_id, schedule_id, file_paths, repo: EventRepository
+):
+    event: Event = repo.find_by_id(event_id)
+
+    if not event:
+        raise EventNotFoundException()
+
+    output = ExtractRaceResults(
+        file_paths, profile=profile_for_game(event.game)
+    ).execute()
+    save_result_op = SaveRaceResult(repo)
+
+    save_result_op(event.id, schedule_id, output)
+
+    _publish(RaceResultUploaded(event_id=event_id, schedule_id=schedule_id))
+
+
+@celery_task.task(
+    autoretry_for=(OSError,), retry_backoff=True, retry_kwargs={"max_retries": 5}
+)
+def import_race_result_from_file(
+    event_id, schedule_id, file_path, repo: EventRepository
+):
+    """Results files too large to import during the upload: no OCR, the file holds the results."""
+    event: Event = repo.find_by_id(event_id)
+
+    if not event:
+        raise EventNotFoundException()
+
+    with open(file_path, "rb") as file:
+        importer = importer_registry.importer_for(file_path, file.read(SIGNATURE_SIZE))
+        if not importer:
+            raise UnreadableResultFile(f"No importer for {file_path}")
+        file.seek(0)
+        output = importer.read(file, event.game)
+
     save_result_op = SaveRaceResult(repo)
 
     save_result_op(event.id, schedule_id, output)
 
-    TransactionContext().publish(
-        RaceResultUploaded(event_id=event_id, schedule_id=schedule_id)
-    )
+    _publish(RaceResultUploaded(event_id=event_id, schedule_id=schedule_id))
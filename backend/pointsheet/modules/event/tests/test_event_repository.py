@@ -1,8 +1,23 @@
+import re
 import uuid
+from contextlib import contextmanager
 
-from modules.event.domain.entity import Event, Schedule
-from modules.event.domain.value_objects import EventStatus, ScheduleType
-from modules.event.repository import EventRepository
+import sqlalchemy.event
+from sqlalchemy import select
+
+from modules.event.domain.entity import Driver, Event, Schedule
+from modules.event.domain.value_objects import (
+    DriverResult,
+    EventStatus,
+    ScheduleType,
+    SeriesStatus,
+)
+from modules.event.loading import LoadProfile
+from modules.event.repository import EventRepository, SeriesRepository
+from pointsheet.db import engine
+from pointsheet.models import Car, Game, Series
+from pointsheet.models.event import Event as EventEntity
+from pointsheet.models.event import EventSchedule, Participants, RaceResult
 
 
 def test_saving_schedule_to_event(db_session):
@@ -82,3 +97,173 @@ def test_removing_most_recent_schedule_with_four_schedules(db_session):
     assert new_obj.schedule[1].type == ScheduleType.qualification
     assert new_obj.schedule[2].type == ScheduleType.race
     assert new_obj.schedule[2].nbr_of_laps == 50
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sqlalchemy.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _series_with_events(db_session, nbr_of_events: int) -> uuid.UUID:
+    game = Game(name="Forza Motorsport")
+    car = Car(model="Porsche 911 GT3", year="2023", game=game)
+    series = Series(title="Sunday league", status=SeriesStatus.started)
+
+    for i in range(nbr_of_events):
+        drivers = [
+            Participants(id=uuid.uuid4(), name=f"Driver {i}-{n}") for n in range(3)
+        ]
+        schedule = [
+            EventSchedule(type=ScheduleType.practice, nbr_of_laps=5),
+            EventSchedule(
+                type=ScheduleType.race,
+                duration="30m",
+                result=RaceResult(
+                    result=[
+                        DriverResult(
+                            driver_id=driver.id, driver=driver.name, position=pos
+                        )
+                        for pos, driver in enumerate(drivers, start=1)
+                    ]
+                ),
+            ),
+        ]
+        series.events.append(
+            EventEntity(
+                id=uuid.uuid4(),
+                title=f"Round {i}",
+                host=uuid.uuid4(),
+                status=EventStatus.open,
+                drivers=drivers,
+                schedule=schedule,
+                cars=[car],
+            )
+        )
+
+    db_session.add(series)
+    db_session.commit()
+    series_id = series.id
+    db_session.expunge_all()
+    return series_id
+
+
+def test_series_query_count_does_not_grow_with_events(db_session):
+    series_id = _series_with_events(db_session, nbr_of_events=30)
+    repo = SeriesRepository(db_session)
+
+    with count_statements() as statements:
+        model = repo.find_by_id(series_id)
+
+    assert len(model.events) == 30
+    assert all(len(event.schedule) == 2 for event in model.events)
+    assert all(len(event.drivers) == 3 for event in model.events)
+    assert all(event.schedule[1].result for event in model.events)
+    # series, events, schedules + results, participants, cars
+    assert len(statements) <= 5
+
+
+def test_event_listing_query_count_does_not_grow_with_events(db_session):
+    _series_with_events(db_session, nbr_of_events=30)
+    repo = EventRepository(db_session)
+
+    with count_statements() as statements:
+        events = repo.all()
+
+    assert len(events) == 30
+    assert len(statements) <= 4
+
+
+def test_summary_profile_skips_schedule_and_cars(db_session):
+    series_id = _series_with_events(db_session, nbr_of_events=5)
+    repo = SeriesRepository(db_session)
+
+    with count_statements() as statements:
+        model = repo.find_by_id(series_id, profile=LoadProfile.summary)
+
+    assert all(event.schedule is None for event in model.events)
+    assert all(event.cars is None for event in model.events)
+    assert all(event.current_participants == 3 for event in model.events)
+    assert len(statements) <= 3
+
+
+def _writes(statements) -> list:
+    writes = []
+    for statement in statements:
+        if match := re.match(r"(INSERT INTO|UPDATE|DELETE FROM) (\w+)", statement):
+            writes.append(f"{match.group(1)} {match.group(2)}")
+    return writes
+
+
+def _first_event_id(db_session, series_id) -> uuid.UUID:
+    event_id = db_session.scalar(
+        select(EventEntity.id).where(EventEntity.series == series_id)
+    )
+    db_session.expunge_all()
+    return event_id
+
+
+def test_update_only_inserts_the_new_participant(db_session):
+    event_id = _first_event_id(db_session, _series_with_events(db_session, 1))
+    repo = EventRepository(db_session)
+    event = repo.find_by_id(event_id)
+    event.add_driver(Driver(id=uuid.uuid4(), name="Newcomer"))
+
+    with count_statements() as statements:
+        repo.update(event)
+        db_session.commit()
+
+    assert _writes(statements) == ["INSERT INTO participants"]
+    assert len(repo.find_by_id(event_id).drivers) == 4
+
+
+def test_update_only_deletes_the_removed_schedule(db_session):
+    event_id = _first_event_id(db_session, _series_with_events(db_session, 1))
+    repo = EventRepository(db_session)
+    event = repo.find_by_id(event_id)
+    practice = next(s for s in event.schedule if s.type == ScheduleType.practice)
+    event.remove_schedule(practice.id)
+
+    with count_statements() as statements:
+        repo.update(event)
+        db_session.commit()
+
+    assert _writes(statements) == ["DELETE FROM event_schedule"]
+    schedule = repo.find_by_id(event_id).schedule
+    assert [s.type for s in schedule] == [ScheduleType.race]
+    assert schedule[0].result is not None
+
+
+def test_series_update_only_touches_the_changed_event(db_session):
+    series_id = _series_with_events(db_session, nbr_of_events=5)
+    repo = SeriesRepository(db_session)
+    series = repo.find_by_id(series_id)
+    event_id = series.events[2].id
+    series.update_event(event_id, {"title": "Renamed round"})
+
+    with count_statements() as statements:
+        repo.update(series)
+        db_session.commit()
+
+    assert _writes(statements) == ["UPDATE events"]
+    titles = {event.id: event.title for event in repo.find_by_id(series_id).events}
+    assert titles[event_id] == "Renamed round"
+    assert len(titles) == 5
+
+
+def test_update_of_an_unknown_event_falls_back_to_merge(db_session):
+    event = Event(id=uuid.uuid4(), title="Detached", host=uuid.uuid4())
+    repo = EventRepository(db_session)
+
+    repo.update(event)
+    db_session.commit()
+
+    assert repo.find_by_id(event.id).title == "Detached"
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.event.domain.value_objects import ListOfResults, Result
+from modules.event.extraction_cache import OCR_LAYER, ExtractionCache
+from modules.event.results_table import Word
+from modules.event.use_case import extract_race_result
+from modules.event.use_case.extract_race_result import ExtractRaceResults, merge_results
+
+
+def _rows(*rows):
+    """Word boxes of a results table with a header, a row per (position, driver, best lap)."""
+    words = [
+        Word("Pos", 10, 10, 30, 20, 95),
+        Word("Driver", 80, 10, 60, 20, 95),
+        Word("Best", 300, 10, 40, 20, 95),
+        Word("Lap", 347, 10, 30, 20, 95),
+    ]
+    for line, (position, driver, best_lap) in enumerate(rows, start=1):
+        top = 10 + 40 * line
+        words += [
+            Word(str(position), 10, top, 10, 20, 95),
+            Word(driver, 80, top, 80, 20, 95),
+            Word(best_lap, 300, top, 80, 20, 95),
+        ]
+    return words
+
+
+SCREENSHOTS = {
+    "first.png": _rows(
+        (1, "Max", "1:32.100"), (2, "Lando", "1:32.200"), (3, "Oscar", "1:32.300")
+    ),
+    # scrolled: the third row is on both screenshots
+    "second.png": _rows(
+        (3, "Oscar", "1:32.300"), (4, "Lewis", "1:32.400"), (5, "George", "1:32.500")
+    ),
+}
+
+
+@pytest.fixture
+def screenshots(tmp_path, monkeypatch):
+    read = []
+
+    def read_image(file_path, profile):
+        read.append(file_path)
+        return SCREENSHOTS[file_path.rsplit("/", 1)[-1]], {"tesseract": 100.0}
+
+    monkeypatch.setattr(extract_race_result, "read_image", read_image)
+    for name in SCREENSHOTS:
+        (tmp_path / name).write_bytes(name.encode())
+    return [str(tmp_path / name) for name in SCREENSHOTS], read
+
+
+def test_results_of_several_screenshots_are_merged_by_position(screenshots, tmp_path):
+    paths, read = screenshots
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"))
+
+    with ThreadPoolExecutor(2) as executor:
+        first = ExtractRaceResults(paths, cache, min_confidence=0.8, executor=executor)
+        output = first.execute()
+        second = ExtractRaceResults(paths, cache, min_confidence=0.8, executor=executor)
+        second.execute()
+
+    assert [(result.position, result.driver) for result in output.results] == [
+        (1, "Max"),
+        (2, "Lando"),
+        (3, "Oscar"),
+        (4, "Lewis"),
+        (5, "George"),
+    ]
+    # the second upload is read from the cache
+    assert sorted(read) == sorted(paths)
+    assert cache.stats()[OCR_LAYER].hits == 2
+    # the time of each stage, summed over the screenshots
+    assert first.timings["tesseract"] == 200.0
+    assert {"ocr_cache", "parse"} <= set(first.timings)
+    assert "tesseract" not in second.timings
+
+
+def test_merge_keeps_the_most_complete_row_of_a_position():
+    partial = Result(position=3, driver="Oscar")
+    complete = Result(
+        position=3, driver="Oscar", best_lap="1:32.300", total="45:10.000"
+    )
+
+    merged = merge_results(
+        [
+            ListOfResults(results=[Result(position=4, driver="Lewis"), partial]),
+            ListOfResults(results=[complete, Result(position=1, driver="Max")]),
+        ]
+    )
+
+    assert [result.position for result in merged.results] == [1, 3, 4]
+    assert merged.results[1] is complete
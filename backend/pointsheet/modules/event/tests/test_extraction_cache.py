@@ -0,0 +1,132 @@
+import pytest
+
+from modules.event.domain.value_objects import ListOfResults, Result
+from modules.event.extraction_cache import (
+    OCR_LAYER,
+    RESULTS_LAYER,
+    ExtractionCache,
+    ocr_key,
+)
+from modules.event.results_table import Word
+from modules.event.use_case import extract_race_result
+from modules.event.use_case.extract_race_result import ExtractRaceResult
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache" / "extraction.sqlite"), clock=Clock())
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    path = tmp_path / "result.png"
+    path.write_bytes(b"png bytes")
+    return path
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"ocr": 0, "llm": 0}
+
+    def read_image(file_path, profile):
+        calls["ocr"] += 1
+        # read with too little confidence to skip the LLM
+        words = [
+            Word("1", 10, 10, 10, 20, 40.0),
+            Word("Max", 60, 10, 30, 20, 40.0),
+            Word("1:32.100", 200, 10, 80, 20, 40.0),
+        ]
+        return words, {"tesseract": 1.0}
+
+    def extract(self, text):
+        calls["llm"] += 1
+        if calls.get("fail_llm"):
+            raise RuntimeError("quota exceeded")
+        return ListOfResults(
+            results=[Result(position=1, driver="Max", best_lap="1:32.100")]
+        )
+
+    monkeypatch.setattr(extract_race_result, "read_image", read_image)
+    monkeypatch.setattr(ExtractRaceResult, "extract", extract)
+    return calls
+
+
+def test_uploading_the_same_screenshot_again_skips_ocr_and_llm(
+    cache, screenshot, calls, tmp_path
+):
+    first = ExtractRaceResult(str(screenshot), cache).execute()
+    # the same content under another file name
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(screenshot.read_bytes())
+    second = ExtractRaceResult(str(copy), cache).execute()
+
+    assert first == second
+    assert second.results[0].driver == "Max"
+    assert calls == {"ocr": 1, "llm": 1}
+    stats = cache.stats()
+    assert (stats[OCR_LAYER].entries, stats[OCR_LAYER].hits) == (1, 1)
+    assert (stats[RESULTS_LAYER].entries, stats[RESULTS_LAYER].hits) == (1, 1)
+
+
+def test_a_retry_after_a_failed_llm_call_only_calls_the_llm(cache, screenshot, calls):
+    calls["fail_llm"] = True
+    with pytest.raises(RuntimeError):
+        ExtractRaceResult(str(screenshot), cache).execute()
+
+    calls["fail_llm"] = False
+    ExtractRaceResult(str(screenshot), cache).execute()
+
+    assert (calls["ocr"], calls["llm"]) == (1, 2)
+    assert cache.stats()[RESULTS_LAYER].entries == 1
+
+
+def test_results_are_extracted_again_for_another_prompt_version(
+    cache, screenshot, calls, monkeypatch
+):
+    ExtractRaceResult(str(screenshot), cache).execute()
+    monkeypatch.setattr(extract_race_result, "PROMPT_VERSION", 2)
+    ExtractRaceResult(str(screenshot), cache).execute()
+
+    assert calls == {"ocr": 1, "llm": 2}
+
+
+def test_the_ocr_key_depends_on_the_preprocessing_parameters():
+    assert ocr_key("abc", {"median_blur": 5, "threshold": "otsu"}) == ocr_key(
+        "abc", {"threshold": "otsu", "median_blur": 5}
+    )
+    assert ocr_key("abc", {"median_blur": 5}) != ocr_key("abc", {"median_blur": 3})
+
+
+def test_least_recently_used_entries_are_evicted_beyond_the_size_limit(tmp_path):
+    cache = ExtractionCache(
+        str(tmp_path / "extraction.sqlite"), max_bytes=25, clock=Clock()
+    )
+    cache.set(OCR_LAYER, "a", "x" * 10)
+    cache.set(OCR_LAYER, "b", "x" * 10)
+    assert cache.get(OCR_LAYER, "a") is not None
+
+    cache.set(RESULTS_LAYER, "c", "x" * 10)
+
+    assert cache.get(OCR_LAYER, "b") is None
+    assert [entry.key for entry in cache.entries()] == ["c", "a"]
+
+
+def test_purge_by_layer_and_age(cache):
+    cache.set(OCR_LAYER, "old", "text")
+    cache._clock.now += 86400
+    cache.set(OCR_LAYER, "new", "text")
+    cache.set(RESULTS_LAYER, "results", "{}")
+
+    assert cache.purge(OCR_LAYER, unused_for=3600) == 1
+    assert cache.purge(RESULTS_LAYER) == 1
+    assert [entry.key for entry in cache.entries()] == ["new"]
+    assert cache.purge() == 1
@@ -0,0 +1,119 @@
+import codecs
+import io
+from pathlib import Path
+
+import pytest
+
+from modules.event.exceptions import UnreadableResultFile
+from modules.event.importers import (
+    AccResultImporter,
+    CsvResultImporter,
+    SIGNATURE_SIZE,
+    format_milliseconds,
+    importer_registry,
+)
+
+ACC_RACE = Path(__file__).parent / "fixtures" / "result_files" / "acc_race.json"
+
+
+def _importer(filename, content: bytes):
+    return importer_registry.importer_for(filename, content[:SIGNATURE_SIZE])
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16"])
+def test_acc_server_results(encoding):
+    # ACC servers write their results in UTF-16
+    content = ACC_RACE.read_text().encode(encoding)
+
+    importer = _importer("race.json", content)
+    output = importer.read(io.BytesIO(content))
+
+    assert isinstance(importer, AccResultImporter)
+    assert [
+        (result.position, result.driver, result.best_lap, result.total)
+        for result in output.results
+    ] == [
+        (1, "Max Verstappen", "2:18.512", "46:23.451"),
+        (2, "Lando Norris", "2:18.790", "46:30.012"),
+        (3, "Oscar Piastri", "2:19.455", "+1 Lap"),
+        (4, "Lewis Hamilton", None, "DNF"),
+    ]
+    # only the penalties applied after the race change the result
+    assert [result.penalties for result in output.results] == [None, 5.0, None, None]
+
+
+def test_csv_columns_are_matched_by_header():
+    content = (
+        codecs.BOM_UTF8
+        + (
+            "Pos;Driver;Car;Best Lap;Penalty;Total Time\n"
+            "1;Max;Porsche;1:32.100;;45:10.000\n"
+            "\n"
+            "2;Lando;BMW;1:32.200;5s;45:12.300\n"
+            "3;Oscar;Audi;;;DNF\n"
+        ).encode()
+    )
+
+    importer = _importer("results.csv", content)
+    output = importer.read(io.BytesIO(content))
+
+    assert isinstance(importer, CsvResultImporter)
+    assert [
+        (
+            result.position,
+            result.driver,
+            result.best_lap,
+            result.penalties,
+            result.total,
+        )
+        for result in output.results
+    ] == [
+        (1, "Max", "1:32.100", None, "45:10.000"),
+        (2, "Lando", "1:32.200", 5.0, "45:12.300"),
+        (3, "Oscar", None, None, "DNF"),
+    ]
+
+
+def test_csv_columns_of_a_game(monkeypatch):
+    from pointsheet.config import config
+
+    monkeypatch.setattr(config, "RESULT_CSV_COLUMNS", {1: {"Racer Tag": "driver"}})
+    content = (
+        b"Racer Tag,Gamertag,Race Time\nxMax,Max99,45:10.000\nxLando,Lando4,45:12.300\n"
+    )
+
+    output = CsvResultImporter().read(io.BytesIO(content), game=1)
+
+    # without a position column, the rows are in the order of the results
+    assert [
+        (result.position, result.driver, result.total) for result in output.results
+    ] == [(1, "xMax", "45:10.000"), (2, "xLando", "45:12.300")]
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (b"Car,Laps\nPorsche,20\n", "no driver column"),
+        (b"Pos,Driver\nfirst,Max\n", "Line 2"),
+        (b"Pos,Driver\n", "no results"),
+    ],
+)
+def test_unreadable_csv(content, message):
+    with pytest.raises(UnreadableResultFile, match=message):
+        CsvResultImporter().read(io.BytesIO(content))
+
+
+def test_other_json_is_unreadable():
+    # no importer knows it, and OCR can't read it
+    with pytest.raises(UnreadableResultFile):
+        _importer("standings.json", b'{"standings": []}')
+
+
+def test_screenshots_have_no_importer():
+    assert _importer("result.png", b"\x89PNG\r\n\x1a\n") is None
+    assert importer_registry.extensions() == {"csv", "json"}
+
+
+def test_format_milliseconds():
+    assert format_milliseconds(92100) == "1:32.100"
+    assert format_milliseconds(3723456) == "1:02:03.456"
@@ -0,0 +1,196 @@
+import threading
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from modules import application
+from modules.account.repository import DriverRepository
+from modules.event.commands.join_event import JoinEvent, handle_join_event
+from modules.event.commands.leave_event import (
+    LeaveEvent,
+    handle_remove_driver_from_event,
+)
+from modules.event.domain.value_objects import EventStatus, ParticipationStatus
+from modules.event.events import DriverJoinedEvent, DriverLeftEvent, DriverWaitlisted
+from modules.event.exceptions import DriverAlreadySingedUp, EventFull
+from modules.event.repository import EventRepository
+from pointsheet import db
+from pointsheet.factories.account import UserFactory
+from pointsheet.factories.event import EventFactory
+from pointsheet.models import BaseModel, Participants
+from pointsheet.models.account import Driver
+from pointsheet.models.event import Event as EventEntity
+
+
+def published(ctx):
+    # Domain events get a fresh id, compare them on their payload.
+    return [
+        (type(call.args[0]), call.args[0].event_id, call.args[0].driver_id)
+        for call in ctx.publish.call_args_list
+    ]
+
+
+def join(db_session, event_id, driver_id, waitlist=False):
+    ctx = MagicMock()
+    status = handle_join_event(
+        JoinEvent(event_id=event_id, driver_id=driver_id, waitlist=waitlist),
+        ctx,
+        EventRepository(db_session),
+        DriverRepository(db_session),
+    )
+    return status, published(ctx)
+
+
+def leave(db_session, event_id, driver_id):
+    ctx = MagicMock()
+    handle_remove_driver_from_event(
+        LeaveEvent(event_id=event_id, driver_id=driver_id),
+        ctx,
+        EventRepository(db_session),
+    )
+    return published(ctx)
+
+
+def test_join_publishes_driver_joined(db_session):
+    event = EventFactory(session=db_session, max_participants=2)
+    driver = UserFactory(session=db_session)
+
+    status, published = join(db_session, event.id, driver.id)
+
+    assert status == ParticipationStatus.joined
+    assert published == [(DriverJoinedEvent, event.id, driver.id)]
+
+
+def test_join_is_rejected_when_event_is_full(db_session):
+    event = EventFactory(session=db_session, max_participants=1)
+    first, second = UserFactory(session=db_session), UserFactory(session=db_session)
+    join(db_session, event.id, first.id)
+
+    with pytest.raises(EventFull):
+        join(db_session, event.id, second.id)
+
+
+def test_joining_twice_is_rejected(db_session):
+    event = EventFactory(session=db_session)
+    driver = UserFactory(session=db_session)
+    join(db_session, event.id, driver.id)
+
+    with pytest.raises(DriverAlreadySingedUp):
+        join(db_session, event.id, driver.id)
+
+
+def test_driver_can_join_more_than_one_event(db_session):
+    events = [EventFactory(session=db_session) for _ in range(2)]
+    driver = UserFactory(session=db_session)
+
+    for event in events:
+        assert join(db_session, event.id, driver.id)[0] == ParticipationStatus.joined
+
+
+def test_full_event_waitlists_and_promotes_on_leave(db_session):
+    event = EventFactory(session=db_session, max_participants=1)
+    first, second = UserFactory(session=db_session), UserFactory(session=db_session)
+    join(db_session, event.id, first.id)
+
+    status, published = join(db_session, event.id, second.id, waitlist=True)
+
+    assert status == ParticipationStatus.waitlisted
+    assert published == [(DriverWaitlisted, event.id, second.id)]
+
+    published = leave(db_session, event.id, first.id)
+
+    assert published == [
+        (DriverLeftEvent, event.id, first.id),
+        (DriverJoinedEvent, event.id, second.id),
+    ]
+    event = EventRepository(db_session).find_by_id(event.id)
+    assert [driver.id for driver in event.drivers] == [second.id]
+
+
+def test_leaving_from_the_waitlist_promotes_nobody(db_session):
+    event = EventFactory(session=db_session, max_participants=1)
+    first, second = UserFactory(session=db_session), UserFactory(session=db_session)
+    join(db_session, event.id, first.id)
+    join(db_session, event.id, second.id, waitlist=True)
+
+    published = leave(db_session, event.id, second.id)
+
+    assert published == [(DriverLeftEvent, event.id, second.id)]
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    # Each thread needs its own connection to the same database, which an
+    # in-memory SQLite database cannot provide. The transactions of the
+    # application open their sessions on it for the length of the test.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'sign_up.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    BaseModel.metadata.create_all(engine)
+    db.SessionFactory.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        db.SessionFactory.configure(bind=db.engine)
+        engine.dispose()
+
+
+def test_concurrent_sign_ups_never_exceed_capacity(file_database):
+    SessionFactory = sessionmaker(bind=file_database)
+
+    capacity, nbr_of_drivers = 5, 40
+    event_id = uuid.uuid4()
+    drivers = [uuid.uuid4() for _ in range(nbr_of_drivers)]
+    with SessionFactory() as session:
+        session.add(
+            EventEntity(
+                id=event_id,
+                title="Sign-up rush",
+                host=uuid.uuid4(),
+                status=EventStatus.open,
+                max_participants=capacity,
+            )
+        )
+        session.add_all(
+            Driver(id=id, name=f"Driver {n}") for n, id in enumerate(drivers)
+        )
+        session.commit()
+
+    barrier = threading.Barrier(nbr_of_drivers)
+    statuses = []
+
+    def sign_up(driver_id):
+        barrier.wait()
+        statuses.append(
+            application.execute(
+                JoinEvent(event_id=event_id, driver_id=driver_id, waitlist=True)
+            )
+        )
+
+    threads = [threading.Thread(target=sign_up, args=(id,)) for id in drivers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with SessionFactory() as session:
+        confirmed = session.scalar(
+            select(func.count())
+            .select_from(Participants)
+            .where(
+                Participants.event_id == event_id, Participants.waitlisted.is_(False)
+            )
+        )
+        waitlisted = session.scalar(
+            select(func.count())
+            .select_from(Participants)
+            .where(Participants.event_id == event_id, Participants.waitlisted.is_(True))
+        )
+
+    assert statuses.count(ParticipationStatus.joined) == capacity
+    assert statuses.count(ParticipationStatus.waitlisted) == nbr_of_drivers - capacity
+    assert (confirmed, waitlisted) == (capacity, nbr_of_drivers - capacity)
@@ -0,0 +1,94 @@
+import cv2
+import numpy
+import pytest
+
+from modules.event.preprocessing import (
+    DEFAULT_PROFILE,
+    GAME_PROFILES,
+    PreprocessingProfile,
+    Preprocessor,
+    detect_table,
+    profile_for_game,
+    rotate,
+    skew_angle,
+)
+from pointsheet.config import config
+
+TABLE = (300, 200)
+
+
+def _screenshot(rows=12):
+    """A dark results screen: a title, a logo and a table of ``rows`` rows at ``TABLE``."""
+    image = numpy.full((900, 1600), 30, dtype=numpy.uint8)
+    cv2.putText(image, "RACE RESULTS", (600, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.4, 240, 3)
+    cv2.rectangle(image, (1350, 760), (1550, 860), 220, -1)
+    for row in range(rows):
+        y = TABLE[1] + 40 * row
+        for x, text in zip(
+            (0, 80, 420, 640),
+            (str(row + 1), f"Driver {row + 1}", "1:42.345", "45:10.123"),
+        ):
+            cv2.putText(
+                image, text, (TABLE[0] + x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 235, 2
+            )
+    return image
+
+
+def test_the_table_is_found_without_the_title_and_logo():
+    (x, y, width, height), glyph_height = detect_table(_screenshot())
+
+    assert TABLE[0] - 40 <= x <= TABLE[0]
+    assert TABLE[1] - 50 <= y <= TABLE[1] - 15
+    assert x + width < 1350 and y + height < 760
+    assert 10 <= glyph_height <= 20
+
+
+def test_no_table_is_found_in_a_screen_without_rows():
+    region, _ = detect_table(_screenshot(rows=2))
+
+    assert region is None
+
+
+@pytest.mark.parametrize("angle", [-4, 3])
+def test_skew_angle_levels_the_rows(angle):
+    assert skew_angle(rotate(_screenshot(), angle)) == pytest.approx(-angle, abs=0.5)
+
+
+def test_preprocessing_crops_rescales_and_times_each_stage():
+    image, timings = Preprocessor(PreprocessingProfile(text_height=32)).run(
+        cv2.cvtColor(_screenshot(), cv2.COLOR_GRAY2BGR)
+    )
+
+    assert list(timings) == [
+        "grayscale",
+        "detect_table",
+        "deskew",
+        "rescale",
+        "binarize",
+        "denoise",
+    ]
+    # cropped to the table, then scaled up to the text height
+    assert image.shape[1] < 1600 * 32 / 15
+    assert set(numpy.unique(image)) <= {0, 255}
+    # dark text on a light background
+    assert numpy.count_nonzero(image) > image.size / 2
+
+
+def test_stages_can_be_turned_off():
+    profile = PreprocessingProfile(
+        crop_table=False, deskew=False, text_height=0, median_blur=0
+    )
+
+    image, timings = Preprocessor(profile).run(_screenshot())
+
+    assert image.shape == (900, 1600)
+    assert list(timings) == ["grayscale", "binarize"]
+
+
+def test_game_profiles_are_overridden_by_the_configuration(monkeypatch):
+    monkeypatch.setattr(config, "OCR_GAME_PROFILES", {2: {"text_height": 40}})
+
+    assert profile_for_game(None) is DEFAULT_PROFILE
+    assert profile_for_game(2).text_height == 40
+    assert profile_for_game(2).median_blur == GAME_PROFILES[2].median_blur
+    assert profile_for_game(2).parameters() != GAME_PROFILES[2].parameters()
@@ -0,0 +1,85 @@
+import uuid
+
+from modules.event.domain.value_objects import EventStatus, SeriesStatus
+from modules.event.queries.get_all_series import GetAllSeries
+from modules.event.read_models import EventReadModel, EventSummary, SeriesSummary
+from modules.event.tests.test_event_repository import (
+    _series_with_events,
+    count_statements,
+)
+from pointsheet.models import Participants, Series
+from pointsheet.models.event import Event as EventEntity
+from pointsheet.repository import PageRequest
+
+
+def test_series_summaries_count_events_in_one_statement(db_session):
+    series_id = _series_with_events(db_session, nbr_of_events=12)
+    db_session.add(Series(id=uuid.uuid4(), title="Empty", status=SeriesStatus.started))
+    db_session.commit()
+
+    with count_statements() as statements:
+        page = EventReadModel(db_session).series(GetAllSeries())
+
+    counts = {summary.title: summary.event_count for summary in page}
+    assert counts == {"Sunday league": 12, "Empty": 0}
+    assert all(isinstance(summary, SeriesSummary) for summary in page)
+    assert next(s for s in page if s.id == series_id).status == SeriesStatus.started
+    assert len(statements) == 1
+
+
+def test_series_summaries_filter_on_status(db_session):
+    db_session.add_all(
+        [
+            Series(id=uuid.uuid4(), title="Running", status=SeriesStatus.started),
+            Series(id=uuid.uuid4(), title="Done", status=SeriesStatus.closed),
+        ]
+    )
+    db_session.commit()
+
+    page = EventReadModel(db_session).series(GetAllSeries(status=[SeriesStatus.closed]))
+
+    assert [summary.title for summary in page] == ["Done"]
+
+
+def test_event_summaries_count_confirmed_participants(db_session):
+    event_id = uuid.uuid4()
+    db_session.add(
+        EventEntity(
+            id=event_id,
+            title="Full grid",
+            host=uuid.uuid4(),
+            status=EventStatus.open,
+            max_participants=2,
+        )
+    )
+    db_session.add_all(
+        Participants(
+            id=uuid.uuid4(), name=f"Driver {n}", event_id=event_id, waitlisted=n >= 2
+        )
+        for n in range(3)
+    )
+    db_session.commit()
+
+    with count_statements() as statements:
+        page = EventReadModel(db_session).events(PageRequest())
+
+    assert len(page) == 1
+    summary = page[0]
+    assert isinstance(summary, EventSummary)
+    assert summary.current_participants == 2
+    assert summary.model_dump()["status"] == EventStatus.open
+    assert len(statements) == 1
+
+
+def test_event_summaries_page_by_cursor(db_session):
+    series_id = _series_with_events(db_session, nbr_of_events=5)
+    read_model = EventReadModel(db_session)
+
+    first = read_model.events(PageRequest(limit=3), series_id=series_id)
+    second = read_model.events(
+        PageRequest(limit=3, cursor=first.pagination.next_cursor), series_id=series_id
+    )
+
+    assert len(first) == 3 and len(second) == 2
+    assert second.pagination.next_cursor is None
+    assert all(summary.current_participants == 3 for summary in [*first, *second])
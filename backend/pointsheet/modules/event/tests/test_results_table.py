@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from modules.event.domain.value_objects import ListOfResults, Result
+from modules.event.results_table import (
+    ResultsTableParser,
+    Word,
+    normalize_time,
+    words_from_data,
+    words_to_text,
+)
+from modules.event.use_case import extract_race_result
+from modules.event.use_case.extract_race_result import ExtractRaceResult
+
+CORPUS = Path(__file__).parent / "fixtures" / "results_tables"
+MIN_CONFIDENCE = 0.8
+
+
+def load_fixture(path: Path):
+    fixture = json.loads(path.read_text())
+    return [Word(*row) for row in fixture["words"]], fixture
+
+
+@pytest.mark.parametrize(
+    "path", sorted(CORPUS.glob("*.json")), ids=lambda path: path.stem
+)
+def test_corpus(path):
+    words, fixture = load_fixture(path)
+
+    table = ResultsTableParser().parse(words)
+
+    if fixture["fallback"]:
+        assert table.confidence < MIN_CONFIDENCE
+    else:
+        assert table.confidence >= MIN_CONFIDENCE
+        assert table.results == ListOfResults.model_validate(fixture["expected"])
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1:32.100", "1:32.100"),
+        ("1:02:03.456", "1:02:03.456"),
+        ("32,100", "32.100"),
+        ("1:3O.l00", "1:30.100"),
+        ("+1.234", "+1.234"),
+        ("+2 Laps", "+2 Laps"),
+        ("ONF", "DNF"),
+        ("dsq", "DSQ"),
+        ("Lando", None),
+        ("1:32", None),
+    ],
+)
+def test_normalize_time(text, expected):
+    assert normalize_time(text) == expected
+
+
+def test_words_from_tesseract_data_skip_empty_boxes():
+    data = {
+        "text": ["", "1", "Max", " "],
+        "conf": [-1, 91.5, 88, -1],
+        "left": [0, 10, 40, 0],
+        "top": [0, 5, 5, 0],
+        "width": [500, 10, 30, 0],
+        "height": [300, 20, 20, 0],
+        "block_num": [1, 1, 1, 1],
+        "par_num": [1, 1, 1, 1],
+        "line_num": [0, 1, 1, 2],
+    }
+
+    words = words_from_data(data)
+
+    assert [word.text for word in words] == ["1", "Max"]
+    assert words_to_text(words) == "1 Max"
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def extract(self, text):
+        calls.append(text)
+        return ListOfResults(results=[Result(position=1, driver="From the LLM")])
+
+    monkeypatch.setattr(ExtractRaceResult, "extract", extract)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "fixture_name, calls_llm", [("acc_leaderboard", False), ("noisy_capture", True)]
+)
+def test_extraction_calls_the_llm_only_below_the_confidence_threshold(
+    fixture_name, calls_llm, llm_calls, monkeypatch, tmp_path
+):
+    words, _ = load_fixture(CORPUS / f"{fixture_name}.json")
+    monkeypatch.setattr(
+        extract_race_result, "read_image", lambda file_path, profile: (words, {})
+    )
+    monkeypatch.setattr(extract_race_result, "default_extraction_cache", lambda: None)
+
+    output = ExtractRaceResult(
+        str(tmp_path / "result.png"), min_confidence=MIN_CONFIDENCE
+    ).execute()
+
+    assert bool(llm_calls) == calls_llm
+    assert (output.results[0].driver == "From the LLM") == calls_llm
+    if calls_llm:
+        assert llm_calls[0].startswith("R3SULTS")
@@ -1,30 +1,196 @@
-import cv2
-import pytesseract
-from typing import Any
+import json
+import logging
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import List, Optional, Sequence
 
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import HumanMessagePromptTemplate
 
-from modules.event.domain.value_objects import ListOfResults
+from modules.event.domain.value_objects import ListOfResults, Result
+from modules.event.extraction_cache import (
+    OCR_LAYER,
+    RESULTS_LAYER,
+    ExtractionCache,
+    default_extraction_cache,
+    file_digest,
+    ocr_key,
+    results_key,
+)
+from modules.event.ocr import ocr_executor, read_image
+from modules.event.preprocessing import (
+    DEFAULT_PROFILE,
+    PreprocessingProfile,
+    StageTimings,
+    format_timings,
+    timed,
+)
+from modules.event.results_table import ResultsTableParser, Word, words_to_text
+from pointsheet.config import config
 from pointsheet.langchain import vertex_ai
 
+logger = logging.getLogger(__name__)
 
-def get_text_from_image(file_path):
-    img = cv2.imread(file_path)
-    gray_scale = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    thresh = cv2.threshold(gray_scale, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[
-        1
-    ]
+# Part of the key of the cached results: bump it when the prompts or ListOfResults change
+PROMPT_VERSION = 1
 
-    median = cv2.medianBlur(thresh, 5)
-    return pytesseract.image_to_string(median)
+
+def _encode_words(words: List[Word]) -> str:
+    return json.dumps([word.to_row() for word in words])
+
+
+def _decode_words(value: str) -> List[Word]:
+    return [Word(*row) for row in json.loads(value)]
+
+
+def _add_timings(timings: StageTimings, stages: StageTimings) -> None:
+    for stage, duration in stages.items():
+        timings[stage] = timings.get(stage, 0.0) + duration
+
+
+def get_words_from_image(
+    file_path,
+    cache: Optional[ExtractionCache] = None,
+    profile: PreprocessingProfile = DEFAULT_PROFILE,
+    timings: Optional[StageTimings] = None,
+) -> List[Word]:
+    """The words of an image, adding the time of each stage reading it to ``timings``."""
+    timings = {} if timings is None else timings
+    key = None
+    if cache:
+        with timed(timings, "ocr_cache"):
+            key = ocr_key(file_digest(file_path), profile.parameters())
+            value = cache.get(OCR_LAYER, key)
+        if value is not None:
+            return _decode_words(value)
+
+    words, stages = read_image(file_path, profile)
+    _add_timings(timings, stages)
+    if cache:
+        cache.set(OCR_LAYER, key, _encode_words(words))
+    return words
+
+
+def get_words_from_images(
+    file_paths: Sequence[str],
+    cache: Optional[ExtractionCache] = None,
+    executor: Optional[Executor] = None,
+    profile: PreprocessingProfile = DEFAULT_PROFILE,
+    timings: Optional[StageTimings] = None,
+) -> List[List[Word]]:
+    """The words of each image; the images missing from the cache are read in parallel by the OCR pool."""
+    timings = {} if timings is None else timings
+    words: List[Optional[List[Word]]] = [None] * len(file_paths)
+    keys = []
+    if cache:
+        with timed(timings, "ocr_cache"):
+            keys = [
+                ocr_key(file_digest(path), profile.parameters()) for path in file_paths
+            ]
+            for index, key in enumerate(keys):
+                value = cache.get(OCR_LAYER, key)
+                if value is not None:
+                    words[index] = _decode_words(value)
+
+    missing = [index for index, image_words in enumerate(words) if image_words is None]
+    if missing:
+        executor = executor or ocr_executor()
+        read = executor.map(
+            read_image, [file_paths[index] for index in missing], repeat(profile)
+        )
+        for index, (image_words, stages) in zip(missing, read):
+            words[index] = image_words
+            _add_timings(timings, stages)
+            if cache:
+                cache.set(OCR_LAYER, keys[index], _encode_words(image_words))
+    return words
+
+
+def get_text_from_image(
+    file_path,
+    cache: Optional[ExtractionCache] = None,
+    profile: PreprocessingProfile = DEFAULT_PROFILE,
+) -> str:
+    return words_to_text(get_words_from_image(file_path, cache, profile))
+
+
+def merge_results(parts: Sequence[ListOfResults]) -> ListOfResults:
+    """
+    The results of several screenshots of a grid, by position.
+
+    Scrolled screenshots overlap: of the rows read for a position, the one with
+    the most values is kept, the first one when they have as many.
+    """
+    merged = {}
+    for part in parts:
+        for result in part.results:
+            kept = merged.get(result.position)
+            if kept is None or _values(result) > _values(kept):
+                merged[result.position] = result
+    return ListOfResults(results=[merged[position] for position in sorted(merged)])
+
+
+def _values(result: Result) -> int:
+    return sum(value is not None for value in result.model_dump().values())
 
 
 class ExtractRaceResult:
-    def __init__(self, image_path):
+    """
+    Extracts the results of a screenshot: from its table when the words read
+    form one confidently, otherwise by the LLM.
+    """
+
+    def __init__(
+        self,
+        image_path,
+        cache: Optional[ExtractionCache] = None,
+        min_confidence: Optional[float] = None,
+        profile: PreprocessingProfile = DEFAULT_PROFILE,
+    ):
         self.image_path = image_path
+        self.cache = cache if cache is not None else default_extraction_cache()
+        self.min_confidence = (
+            min_confidence
+            if min_confidence is not None
+            else config.RESULTS_PARSER_MIN_CONFIDENCE
+        )
+        self.profile = profile
+        self.parser = ResultsTableParser()
+        # time (ms) of each stage of the last extraction
+        self.timings: StageTimings = {}
+
+    def execute(self) -> ListOfResults:
+        self.timings = {}
+        words = get_words_from_image(
+            self.image_path, self.cache, self.profile, self.timings
+        )
+        output = self.results_from_words(words)
+        logger.info(
+            "Extracted the results of %s: %s",
+            self.image_path,
+            format_timings(self.timings),
+        )
+        return output
+
+    def results_from_words(self, words: List[Word]) -> ListOfResults:
+        with timed(self.timings, "parse"):
+            table = self.parser.parse(words)
+        if table.confidence >= self.min_confidence:
+            return table.results
+
+        text = words_to_text(words)
+        with timed(self.timings, "llm"):
+            if self.cache is None:
+                return self.extract(text)
 
-    def execute(self) -> Any:
+            value = self.cache.cached(
+                RESULTS_LAYER,
+                results_key(text, PROMPT_VERSION),
+                lambda: self.extract(text).model_dump_json(),
+            )
+        return ListOfResults.model_validate_json(value)
+
+    def extract(self, text: str) -> ListOfResults:
         system_prompt = SystemMessage(
             """
             You are a helpful assistant. Extract race results from the context. Response only with the requested output format. """
@@ -46,5 +212,45 @@ class ExtractRaceResult:
         chain = vertex_ai.create_system_prompt(
             system_prompt, human_prompt, response_model=ListOfResults
         )
-        output = chain({"context": f"Image: {get_text_from_image(self.image_path)}"})
+        return chain({"context": f"Image: {text}"})
+
+
+class ExtractRaceResults:
+    """Extracts the results of a schedule spread over several screenshots."""
+
+    def __init__(
+        self,
+        image_paths: Sequence[str],
+        cache: Optional[ExtractionCache] = None,
+        min_confidence: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        profile: PreprocessingProfile = DEFAULT_PROFILE,
+    ):
+        self.image_paths = list(image_paths)
+        self.executor = executor
+        self.extractor = ExtractRaceResult(None, cache, min_confidence, profile)
+
+    @property
+    def timings(self) -> StageTimings:
+        """Time (ms) of each stage of the last extraction, summed over the screenshots."""
+        return self.extractor.timings
+
+    def execute(self) -> ListOfResults:
+        extractor = self.extractor
+        extractor.timings = {}
+        words = get_words_from_images(
+            self.image_paths,
+            extractor.cache,
+            self.executor,
+            extractor.profile,
+            extractor.timings,
+        )
+        output = merge_results(
+            [extractor.results_from_words(image_words) for image_words in words]
+        )
+        logger.info(
+            "Extracted the results of %d screenshots: %s",
+            len(self.image_paths),
+            format_timings(extractor.timings),
+        )
         return output
@@ -42,7 +42,6 @@ class SaveRaceResult:
             driver_results.append(driver_result)
 
         if driver_results:
-            race_result = RaceResult(schedule_id=schedule_id)
-            race_result.add_result(*driver_results)
+            race_result = RaceResult(schedule_id=schedule_id, result=driver_results)
             event.add_result(race_result=race_result)
             self.event_repo.update(event)
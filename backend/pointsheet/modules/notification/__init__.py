@@ -6,9 +6,23 @@ to configured endpoints like Discord, Slack, Telegram, etc. It also tracks
 delivered webhooks with a WebhookLog.
 """
 
-from modules.notification.domain.entity import Webhook, WebhookSubscription, WebhookLog
-from modules.notification.domain.value_objects import WebhookPlatform, WebhookEventType, WebhookDeliveryStatus
-from modules.notification.repository import WebhookRepository, WebhookSubscriptionRepository, WebhookLogRepository
+from modules.notification.domain.entity import (
+    Webhook,
+    WebhookSubscription,
+    WebhookLog,
+    OutboxMessage,
+)
+from modules.notification.domain.value_objects import (
+    WebhookPlatform,
+    WebhookEventType,
+    WebhookDeliveryStatus,
+)
+from modules.notification.repository import (
+    WebhookRepository,
+    WebhookSubscriptionRepository,
+    WebhookLogRepository,
+    OutboxRepository,
+)
 from modules.notification.formatters import (
     WebhookFormatter, DiscordWebhookFormatter, WebhookFormatterFactory, DynamicWebhookFormatterFactory
 )
@@ -20,12 +34,14 @@ __all__ = [
     "Webhook",
     "WebhookSubscription",
     "WebhookLog",
+    "OutboxMessage",
     "WebhookPlatform",
     "WebhookEventType",
     "WebhookDeliveryStatus",
     "WebhookRepository",
     "WebhookSubscriptionRepository",
     "WebhookLogRepository",
+    "OutboxRepository",
     "WebhookFormatter",
     "DiscordWebhookFormatter",
     "WebhookFormatterFactory",
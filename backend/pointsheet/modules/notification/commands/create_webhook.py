@@ -7,6 +7,7 @@ from modules.notification import notification_module
 from modules.notification.domain.entity import Webhook
 from modules.notification.domain.value_objects import WebhookPlatform
 from modules.notification.repository import WebhookRepository
+from modules.notification.routing import PendingRouteChanges
 
 
 class CreateWebhook(Command):
@@ -21,7 +22,12 @@ class CreateWebhook(Command):
 
 
 @notification_module.handler(CreateWebhook)
-def create_webhook(cmd: CreateWebhook, repo: WebhookRepository, ctx: TransactionContext):
+def create_webhook(
+    cmd: CreateWebhook,
+    repo: WebhookRepository,
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
+):
     """
     Handler for the CreateWebhook command.
     
@@ -31,6 +37,7 @@ def create_webhook(cmd: CreateWebhook, repo: WebhookRepository, ctx: Transaction
         cmd: The CreateWebhook command
         repo: The webhook repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
     
     Returns:
         The created webhook
@@ -46,5 +53,6 @@ def create_webhook(cmd: CreateWebhook, repo: WebhookRepository, ctx: Transaction
     )
     
     repo.add(webhook)
+    route_changes.save_webhook(webhook)
     
     return webhook
\ No newline at end of file
@@ -9,6 +9,7 @@ from modules.notification.domain.entity import WebhookSubscription
 from modules.notification.domain.value_objects import WebhookEventType
 from modules.notification.exceptions import WebhookNotFoundException, InvalidWebhookConfigurationException
 from modules.notification.repository import WebhookRepository, WebhookSubscriptionRepository
+from modules.notification.routing import PendingRouteChanges
 
 
 class CreateWebhookSubscription(Command):
@@ -26,7 +27,8 @@ def create_webhook_subscription(
     cmd: CreateWebhookSubscription,
     webhook_repo: WebhookRepository,
     subscription_repo: WebhookSubscriptionRepository,
-    ctx: TransactionContext
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
 ):
     """
     Handler for the CreateWebhookSubscription command.
@@ -38,6 +40,7 @@ def create_webhook_subscription(
         webhook_repo: The webhook repository
         subscription_repo: The webhook subscription repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
 
     Returns:
         The created webhook subscription
@@ -66,5 +69,6 @@ def create_webhook_subscription(
     )
 
     subscription_repo.add(subscription)
+    route_changes.save_subscription(subscription)
 
     return subscription
@@ -5,6 +5,7 @@ from lato import Command, TransactionContext
 from modules.notification import notification_module
 from modules.notification.exceptions import WebhookNotFoundException
 from modules.notification.repository import WebhookRepository
+from modules.notification.routing import PendingRouteChanges
 
 
 class DeleteWebhook(Command):
@@ -15,7 +16,12 @@ class DeleteWebhook(Command):
 
 
 @notification_module.handler(DeleteWebhook)
-def delete_webhook(cmd: DeleteWebhook, repo: WebhookRepository, ctx: TransactionContext):
+def delete_webhook(
+    cmd: DeleteWebhook,
+    repo: WebhookRepository,
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
+):
     """
     Handler for the DeleteWebhook command.
 
@@ -25,6 +31,7 @@ def delete_webhook(cmd: DeleteWebhook, repo: WebhookRepository, ctx: Transaction
         cmd: The DeleteWebhook command
         repo: The webhook repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
 
     Returns:
         True if the webhook was deleted
@@ -38,5 +45,6 @@ def delete_webhook(cmd: DeleteWebhook, repo: WebhookRepository, ctx: Transaction
         raise WebhookNotFoundException()
 
     repo.delete(webhook.id)
+    route_changes.delete_webhook(webhook.id)
 
     return True
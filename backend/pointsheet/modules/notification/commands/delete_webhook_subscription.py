@@ -5,6 +5,7 @@ from lato import Command, TransactionContext
 from modules.notification import notification_module
 from modules.notification.exceptions import WebhookSubscriptionNotFoundException
 from modules.notification.repository import WebhookSubscriptionRepository
+from modules.notification.routing import PendingRouteChanges
 
 
 class DeleteWebhookSubscription(Command):
@@ -18,7 +19,8 @@ class DeleteWebhookSubscription(Command):
 def delete_webhook_subscription(
     cmd: DeleteWebhookSubscription,
     repo: WebhookSubscriptionRepository,
-    ctx: TransactionContext
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
 ):
     """
     Handler for the DeleteWebhookSubscription command.
@@ -29,6 +31,7 @@ def delete_webhook_subscription(
         cmd: The DeleteWebhookSubscription command
         repo: The webhook subscription repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
 
     Returns:
         True if the webhook subscription was deleted
@@ -42,5 +45,6 @@ def delete_webhook_subscription(
         raise WebhookSubscriptionNotFoundException()
 
     repo.delete(subscription.id)
+    route_changes.delete_subscription(subscription.id)
 
     return True
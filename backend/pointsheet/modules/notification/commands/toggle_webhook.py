@@ -6,6 +6,7 @@ from lato import Command, TransactionContext
 from modules.notification import notification_module
 from modules.notification.exceptions import WebhookNotFoundException
 from modules.notification.repository import WebhookRepository
+from modules.notification.routing import PendingRouteChanges
 
 
 class ToggleWebhook(Command):
@@ -16,7 +17,12 @@ class ToggleWebhook(Command):
 
 
 @notification_module.handler(ToggleWebhook)
-def toggle_webhook(cmd: ToggleWebhook, repo: WebhookRepository, ctx: TransactionContext):
+def toggle_webhook(
+    cmd: ToggleWebhook,
+    repo: WebhookRepository,
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
+):
     """
     Handler for the ToggleWebhook command.
 
@@ -26,6 +32,7 @@ def toggle_webhook(cmd: ToggleWebhook, repo: WebhookRepository, ctx: Transaction
         cmd: The ToggleWebhook command
         repo: The webhook repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
 
     Returns:
         A tuple of (webhook_id, enabled) indicating the new enabled status
@@ -42,5 +49,6 @@ def toggle_webhook(cmd: ToggleWebhook, repo: WebhookRepository, ctx: Transaction
     webhook.updated_at = datetime.now()
 
     repo.update(webhook)
+    route_changes.save_webhook(webhook)
 
     return webhook.id, webhook.enabled
@@ -9,6 +9,7 @@ from modules.notification.domain.entity import Webhook
 from modules.notification.domain.value_objects import WebhookPlatform
 from modules.notification.exceptions import WebhookNotFoundException
 from modules.notification.repository import WebhookRepository
+from modules.notification.routing import PendingRouteChanges
 from pointsheet.domain.types import EntityId
 
 
@@ -26,7 +27,12 @@ class UpdateWebhook(Command):
 
 
 @notification_module.handler(UpdateWebhook)
-def update_webhook(cmd: UpdateWebhook, repo: WebhookRepository, ctx: TransactionContext):
+def update_webhook(
+    cmd: UpdateWebhook,
+    repo: WebhookRepository,
+    ctx: TransactionContext,
+    route_changes: PendingRouteChanges,
+):
     """
     Handler for the UpdateWebhook command.
 
@@ -36,6 +42,7 @@ def update_webhook(cmd: UpdateWebhook, repo: WebhookRepository, ctx: Transaction
         cmd: The UpdateWebhook command
         repo: The webhook repository
         ctx: The transaction context
+        route_changes: Changes to the webhook routes, applied on commit
 
     Returns:
         The updated webhook
@@ -65,5 +72,6 @@ def update_webhook(cmd: UpdateWebhook, repo: WebhookRepository, ctx: Transaction
     webhook.updated_at = datetime.now()
 
     repo.update(webhook)
+    route_changes.save_webhook(webhook)
 
     return webhook
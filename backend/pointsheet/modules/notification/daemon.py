@@ -0,0 +1,211 @@
+"""The long running process sending webhooks as they come in."""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.outbox import OutboxRelay
+
+
+class DatabaseWriteWatcher:
+    """
+    Notices commits made to the database by other connections.
+
+    On SQLite, ``PRAGMA data_version`` changes whenever another connection
+    commits, and reading it does not touch any table, so it can be checked
+    every ``interval`` seconds for next to nothing. Other databases are not
+    watched and ``wait`` simply sleeps.
+    """
+
+    def __init__(self, engine, interval: float = 0.2):
+        """
+        Initialize the watcher.
+
+        Args:
+            engine: The engine of the database to watch
+            interval: Seconds between two checks
+        """
+        self.interval = interval
+        self._connection = None
+        self._version = None
+        if engine.url.get_backend_name() == "sqlite" and engine.url.database not in (
+            None,
+            "",
+            ":memory:",
+        ):
+            self._connection = engine.raw_connection()
+            self.mark()
+
+    def _data_version(self) -> int:
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def mark(self) -> None:
+        """Only count writes committed from now on."""
+        if self._connection is not None:
+            self._version = self._data_version()
+
+    def wait(self, timeout: float, stopping: threading.Event) -> bool:
+        """
+        Wait until another connection commits, ``timeout`` passes or ``stopping`` is set.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+            stopping: Ends the wait early when set
+
+        Returns:
+            True if the database was written to
+        """
+        if self._connection is None:
+            stopping.wait(timeout)
+            return False
+
+        deadline = time.monotonic() + timeout
+        while not stopping.is_set():
+            version = self._data_version()
+            if version != self._version:
+                self._version = version
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            stopping.wait(min(self.interval, remaining))
+        return False
+
+    def close(self) -> None:
+        """Close the watching connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class WebhookDaemon:
+    """
+    Keeps sending pending webhooks until it is stopped.
+
+    Each batch first expands the notification outbox into webhook logs (see
+    ``OutboxRelay``), then sends the due logs. After a batch that found work the queue is polled again right away.
+    Every empty poll doubles the wait before the next one, from
+    ``min_interval`` up to ``max_interval``, and a write to the database
+    (see ``DatabaseWriteWatcher``) ends the wait early, so a new
+    notification goes out within moments while an idle daemon barely
+    touches the database. ``stop`` lets the batch in flight finish and save
+    its outcomes before ``run`` returns.
+    """
+
+    def __init__(
+        self,
+        dispatcher: WebhookDispatcher,
+        watcher: Optional[DatabaseWriteWatcher] = None,
+        logger: Optional[logging.Logger] = None,
+        limit: int = 50,
+        timeout: int = 10,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        relay: Optional[OutboxRelay] = None,
+    ):
+        """
+        Initialize the webhook daemon.
+
+        Args:
+            dispatcher: The dispatcher sending the batches
+            watcher: Wakes the daemon when the database is written to
+            logger: The logger to use
+            limit: Maximum number of webhooks per batch
+            timeout: HTTP request timeout in seconds
+            min_interval: Seconds between polls while webhooks keep coming in
+            max_interval: Seconds between polls of an idle queue
+            relay: Expands the outbox before each batch
+        """
+        self.dispatcher = dispatcher
+        self.relay = relay
+        self.watcher = watcher
+        self.logger = logger or logging.getLogger(__name__)
+        self.limit = limit
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stopping = threading.Event()
+
+    def stop(self, *args) -> None:
+        """Stop after the batch in flight. Usable as a signal handler."""
+        if not self.stopping.is_set():
+            self.logger.info("Stopping after the current batch...")
+        self.stopping.set()
+
+    def run_once(self) -> int:
+        """
+        Expand the outbox and send one batch.
+
+        Returns:
+            The number of outbox messages expanded and webhooks sent
+        """
+        expanded = 0
+        if self.relay is not None:
+            try:
+                expanded = self.relay.expand(self.limit)
+            except Exception as e:
+                self.logger.error(f"Error expanding the notification outbox: {str(e)}")
+                self.relay.session.rollback()
+
+        try:
+            success_count, failure_count = self.dispatcher.dispatch(
+                self.limit, self.timeout
+            )
+        except Exception as e:
+            self.logger.error(f"Error processing webhooks: {str(e)}")
+            self.dispatcher.session.rollback()
+            return expanded
+
+        if success_count or failure_count:
+            self.logger.info(
+                f"Processed {success_count + failure_count} webhooks: {success_count} succeeded, {failure_count} failed"
+            )
+        return expanded + success_count + failure_count
+
+    def wait(self, interval: float) -> bool:
+        """
+        Wait before the next poll.
+
+        Args:
+            interval: Maximum number of seconds to wait
+
+        Returns:
+            True if the wait was cut short by a database write
+        """
+        if self.watcher is None:
+            self.stopping.wait(interval)
+            return False
+        return self.watcher.wait(interval, self.stopping)
+
+    def run(self) -> None:
+        """Poll and send until ``stop`` is called."""
+        self.logger.info(f"Webhook daemon {self.dispatcher.worker_id} started.")
+        interval = self.min_interval
+        try:
+            while not self.stopping.is_set():
+                # Writes made by the batch itself wake the daemon for one extra poll,
+                # writes made while it polls are not missed
+                if self.watcher is not None:
+                    self.watcher.mark()
+                sent = self.run_once()
+                if sent >= self.limit:
+                    interval = self.min_interval
+                    continue
+
+                interval = (
+                    self.min_interval if sent else min(interval * 2, self.max_interval)
+                )
+                if self.wait(interval):
+                    interval = self.min_interval
+        finally:
+            self.dispatcher.release_claims()
+            if self.relay is not None:
+                self.relay.release_claims()
+            self.logger.info(f"Webhook daemon {self.dispatcher.worker_id} stopped.")
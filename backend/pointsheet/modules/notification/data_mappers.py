@@ -1,8 +1,14 @@
 from modules.notification.domain.entity import Webhook as WebhookEntity
 from modules.notification.domain.entity import WebhookSubscription as WebhookSubscriptionEntity
 from modules.notification.domain.entity import WebhookLog as WebhookLogEntity
+from modules.notification.domain.entity import OutboxMessage as OutboxMessageEntity
 from modules.notification.domain.value_objects import WebhookPlatform, WebhookEventType
-from pointsheet.models.notification import Webhook, WebhookSubscription, WebhookLog
+from pointsheet.models.notification import (
+    Webhook,
+    WebhookSubscription,
+    WebhookLog,
+    OutboxMessage,
+)
 from pointsheet.repository import DataMapper
 
 
@@ -95,7 +101,12 @@ class WebhookLogModelMapper(DataMapper[WebhookLog, WebhookLogEntity]):
             http_status=model.http_status,
             response_body=model.response_body,
             succeeded=model.succeeded,
-            timestamp=model.timestamp
+            timestamp=model.timestamp,
+            attempts=model.attempts,
+            next_attempt_at=model.next_attempt_at,
+            last_error_class=model.last_error_class,
+            latency_ms=model.latency_ms,
+            digest_key=model.digest_key,
         )
 
     def to_db_entity(self, entity: WebhookLogEntity) -> WebhookLog:
@@ -110,5 +121,46 @@ class WebhookLogModelMapper(DataMapper[WebhookLog, WebhookLogEntity]):
             http_status=entity.http_status,
             response_body=entity.response_body,
             succeeded=entity.succeeded,
-            timestamp=entity.timestamp
+            timestamp=entity.timestamp,
+            attempts=entity.attempts,
+            next_attempt_at=entity.next_attempt_at,
+            last_error_class=entity.last_error_class,
+            latency_ms=entity.latency_ms,
+            digest_key=entity.digest_key,
+        )
+
+
+class OutboxMessageModelMapper(DataMapper[OutboxMessage, OutboxMessageEntity]):
+    """
+    Mapper for converting between OutboxMessage model and entity.
+    """
+
+    def to_domain_model(self, model: OutboxMessage) -> OutboxMessageEntity:
+        """
+        Convert an OutboxMessage model to an OutboxMessageEntity.
+        """
+        return OutboxMessageEntity(
+            id=model.id,
+            event_type=WebhookEventType(model.event_type),
+            resource_type=model.resource_type,
+            resource_id=model.resource_id,
+            payload=model.payload,
+            subscription_ids=model.subscription_ids,
+            created_at=model.created_at,
+        )
+
+    def to_db_entity(self, entity: OutboxMessageEntity) -> OutboxMessage:
+        """
+        Convert an OutboxMessageEntity to an OutboxMessage model.
+        """
+        return OutboxMessage(
+            id=entity.id,
+            event_type=entity.event_type.value,
+            resource_type=entity.resource_type,
+            resource_id=entity.resource_id,
+            payload=entity.payload,
+            subscription_ids=[
+                str(subscription_id) for subscription_id in entity.subscription_ids
+            ],
+            created_at=entity.created_at,
         )
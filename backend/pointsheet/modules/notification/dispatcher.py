@@ -0,0 +1,634 @@
+"""Concurrent delivery of the pending webhook logs."""
+
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from pointsheet.db import get_session
+from pointsheet.domain.types import EntityId
+from modules.notification.data_mappers import WebhookModelMapper
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.rate_limits import RateLimit, RateLimiter
+from modules.notification.routing import SubscriptionRoutes, subscription_routes
+from modules.notification.services import (
+    HostSessions,
+    RetryPolicy,
+    WebhookSenderService,
+    due,
+    elapsed_ms,
+    error_class,
+)
+from pointsheet.models.notification import Webhook, WebhookLog as WebhookLogModel
+
+
+@dataclass(frozen=True)
+class Delivery:
+    """
+    A pending webhook delivery, detached from the database session so it can
+    be sent from any thread.
+    """
+
+    log_id: EntityId
+    webhook_id: EntityId
+    url: str
+    headers: Dict[str, str]
+    payload: Dict[str, Any]
+    attempts: int = 0
+    platform: str = WebhookPlatform.GENERIC_HTTP.value
+    # Logs sent along in this message when it is a digest
+    merged_log_ids: Tuple[EntityId, ...] = ()
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+    @property
+    def log_ids(self) -> Tuple[EntityId, ...]:
+        return (self.log_id,) + self.merged_log_ids
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """
+    The outcome of sending a delivery.
+
+    A delivery that was not sent because its webhook is rate limited has
+    ``sent`` False and is due again at ``retry_at``, as is a delivery the
+    endpoint throttled with a 429.
+    """
+
+    delivery: Delivery
+    status_code: int
+    response_body: str
+    error: Optional[Exception] = None
+    rate_limit: Optional[RateLimit] = None
+    retry_at: Optional[datetime] = None
+    sent: bool = True
+    # Milliseconds the request took, until the response or the error
+    latency_ms: Optional[int] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.sent and self.error is None and 200 <= self.status_code < 300
+
+    @property
+    def throttled(self) -> bool:
+        return self.sent and self.status_code == 429 and self.retry_at is not None
+
+    @property
+    def error_class(self) -> Optional[str]:
+        return error_class(self.status_code, self.error)
+
+
+class WebhookDispatcher:
+    """
+    Sends pending webhooks concurrently.
+
+    At most ``max_workers`` deliveries are in flight, and at most ``per_host``
+    of them to the same host, so one slow endpoint only holds its own slots
+    while the others keep going. Deliveries wait in a queue per webhook and
+    are handed to the thread pool as slots free up, a worker thread never
+    waits for a busy host. Each webhook is also held to its rate limit (see
+    ``RateLimiter``): a delivery that may go within ``max_hold`` seconds waits
+    in its queue, later ones go back to the due-queue for the moment the
+    limit resets, and the other webhooks keep flowing meanwhile. Connections
+    are kept alive per host. Logs that ``OutboxRelay`` held for a digest are
+    merged, up to the platform's ``max_items`` per message, and share the
+    outcome of their message. Outcomes are saved from the calling thread,
+    ``chunk_size`` logs per UPDATE and commit.
+    """
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        sender_service: Optional[WebhookSenderService] = None,
+        logger: Optional[logging.Logger] = None,
+        max_workers: int = 16,
+        per_host: int = 4,
+        chunk_size: int = 50,
+        worker_id: Optional[str] = None,
+        lease: int = 300,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_hold: float = 1.0,
+        routes: Optional[SubscriptionRoutes] = None,
+    ):
+        """
+        Initialize the webhook dispatcher.
+
+        Args:
+            session: The database session to use
+            sender_service: The webhook sender service to use
+            logger: The logger to use
+            max_workers: Maximum number of deliveries in flight
+            per_host: Maximum number of deliveries in flight to one host
+            chunk_size: Number of delivery outcomes saved per commit
+            worker_id: Name the claimed logs are marked with, unique per dispatcher by default
+            lease: Seconds a claim is held before another dispatcher may take the logs over
+            retry_policy: When failed deliveries are tried again
+            rate_limiter: Rate limits of the webhooks, kept across batches
+            max_hold: Longest wait in seconds for a rate limit within a batch
+            routes: Routing table whose digest formatters are used
+        """
+        self.session = session or next(get_session())
+        self.logger = logger or logging.getLogger(__name__)
+        self.sender_service = sender_service or WebhookSenderService(
+            self.logger, HostSessions(per_host)
+        )
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.chunk_size = chunk_size
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.lease = timedelta(seconds=lease)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_hold = max_hold
+        self.routes = routes or subscription_routes
+        self.mapper = WebhookModelMapper()
+
+    def _pending(self, stmt, now: datetime, failed_only: bool = False):
+        """Restrict a statement to due logs of enabled webhooks that nobody holds a lease on."""
+        stmt = stmt.join(Webhook, Webhook.id == WebhookLogModel.webhook_id).where(
+            due(now), Webhook.enabled.is_(True)
+        )
+        return stmt.where(WebhookLogModel.attempts > 0) if failed_only else stmt
+
+    def find_deliveries(
+        self, limit: int = 50, failed_only: bool = False
+    ) -> List[Delivery]:
+        """
+        Find due deliveries to enabled webhooks, first due first, without
+        claiming them.
+
+        Args:
+            limit: Maximum number of deliveries to return
+            failed_only: Only return the deliveries that failed before
+
+        Returns:
+            A list of deliveries
+        """
+        stmt = (
+            self._pending(
+                select(
+                    WebhookLogModel.id,
+                    WebhookLogModel.payload,
+                    WebhookLogModel.attempts,
+                    WebhookLogModel.digest_key,
+                    Webhook,
+                ),
+                datetime.now(),
+                failed_only,
+            )
+            .order_by(WebhookLogModel.next_attempt_at)
+            .limit(limit)
+        )
+
+        return self._to_deliveries(self.session.execute(stmt))
+
+    def claim_deliveries(
+        self, limit: int = 50, failed_only: bool = False
+    ) -> List[Delivery]:
+        """
+        Claim due deliveries, first due first.
+
+        The claimed logs are marked with ``worker_id`` and a lease in a single
+        UPDATE, which re-checks that no other dispatcher holds them, so
+        dispatchers on several nodes can share the queue without sending a
+        log twice. A claim ends when the outcome is saved, or when the lease
+        expires because its dispatcher died.
+
+        Args:
+            limit: Maximum number of deliveries to claim
+            failed_only: Only claim the deliveries that failed before
+
+        Returns:
+            A list of claimed deliveries
+        """
+        now = datetime.now()
+        expires_at = now + self.lease
+        claimable = (
+            self._pending(select(WebhookLogModel.id), now, failed_only)
+            .order_by(WebhookLogModel.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=WebhookLogModel)
+        )
+        self.session.execute(
+            update(WebhookLogModel)
+            .where(
+                WebhookLogModel.id.in_(claimable.scalar_subquery()),
+                or_(
+                    WebhookLogModel.lease_expires_at.is_(None),
+                    WebhookLogModel.lease_expires_at < now,
+                ),
+            )
+            .values(claimed_by=self.worker_id, lease_expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        return self._claimed(expires_at)
+
+    def _claimed(self, expires_at: datetime) -> List[Delivery]:
+        """The deliveries of the logs this dispatcher claimed with a lease until ``expires_at``."""
+        stmt = (
+            select(
+                WebhookLogModel.id,
+                WebhookLogModel.payload,
+                WebhookLogModel.attempts,
+                WebhookLogModel.digest_key,
+                Webhook,
+            )
+            .join(Webhook, Webhook.id == WebhookLogModel.webhook_id)
+            .where(
+                WebhookLogModel.claimed_by == self.worker_id,
+                WebhookLogModel.lease_expires_at == expires_at,
+            )
+            .order_by(WebhookLogModel.next_attempt_at)
+        )
+
+        return self._to_deliveries(self.session.execute(stmt))
+
+    def release_claims(self) -> None:
+        """Give back the logs this dispatcher claimed but did not send."""
+        self.session.execute(
+            update(WebhookLogModel)
+            .where(
+                WebhookLogModel.claimed_by == self.worker_id,
+                WebhookLogModel.lease_expires_at.isnot(None),
+            )
+            .values(claimed_by=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+    def _to_deliveries(self, rows) -> List[Delivery]:
+        deliveries = []
+        digests: Dict[
+            Tuple[EntityId, str], List[Tuple[EntityId, Dict[str, Any], int]]
+        ] = {}
+        webhooks = {}
+        for log_id, payload, attempts, digest_key, webhook in rows:
+            if digest_key and self.routes.digest_formatter(
+                WebhookPlatform(webhook.platform)
+            ):
+                digests.setdefault((webhook.id, digest_key), []).append(
+                    (log_id, payload, attempts)
+                )
+                webhooks[webhook.id] = webhook
+            else:
+                deliveries.append(self._delivery(webhook, log_id, payload, attempts))
+
+        for (webhook_id, _), logs in digests.items():
+            webhook = webhooks[webhook_id]
+            formatter = self.routes.digest_formatter(WebhookPlatform(webhook.platform))
+            for start in range(0, len(logs), formatter.max_items):
+                chunk = logs[start : start + formatter.max_items]
+                log_ids = [log_id for log_id, _, _ in chunk]
+                payload = (
+                    chunk[0][1]
+                    if len(chunk) == 1
+                    else formatter.merge(
+                        self.mapper.to_domain_model(webhook),
+                        [payload for _, payload, _ in chunk],
+                    )
+                )
+                attempts = max(attempts for _, _, attempts in chunk)
+                deliveries.append(
+                    self._delivery(
+                        webhook, log_ids[0], payload, attempts, tuple(log_ids[1:])
+                    )
+                )
+        return deliveries
+
+    def _delivery(
+        self, webhook, log_id, payload, attempts, merged_log_ids=()
+    ) -> Delivery:
+        return Delivery(
+            log_id=log_id,
+            webhook_id=webhook.id,
+            url=webhook.target_url,
+            headers=self.sender_service.build_headers(webhook),
+            payload=payload,
+            attempts=attempts,
+            platform=webhook.platform,
+            merged_log_ids=merged_log_ids,
+        )
+
+    def dispatch(
+        self,
+        limit: int = 50,
+        timeout: int = 10,
+        dry_run: bool = False,
+        failed_only: bool = False,
+    ) -> Tuple[int, int]:
+        """
+        Send pending webhook notifications.
+
+        Args:
+            limit: Maximum number of webhooks to send
+            timeout: HTTP request timeout in seconds
+            dry_run: Don't actually send webhooks, just log what would be sent
+            failed_only: Only send the webhooks that failed before and are due for a retry
+
+        Returns:
+            A tuple of (success_count, failure_count), a digest counting every log it carries
+        """
+        success_count = 0
+        failure_count = 0
+
+        if dry_run:
+            deliveries = self.find_deliveries(limit, failed_only)
+        else:
+            deliveries = self.claim_deliveries(limit, failed_only)
+        if not deliveries:
+            self.logger.debug("No pending webhook notifications found.")
+            return success_count, failure_count
+
+        self.logger.info(f"Found {len(deliveries)} pending webhook notifications.")
+
+        if dry_run:
+            for delivery in deliveries:
+                self.logger.info(
+                    f"DRY RUN: Would send webhook log {delivery.log_id} to {delivery.url}"
+                )
+            return success_count, failure_count
+
+        results = []
+        for result in self.send_all(deliveries, timeout):
+            if not result.sent:
+                self.logger.info(
+                    f"Webhook {result.delivery.log_id} rate limited, due again at {result.retry_at}"
+                )
+            elif result.succeeded:
+                success_count += len(result.delivery.log_ids)
+                self.logger.info(
+                    f"Webhook {result.delivery.log_id} sent with status {result.status_code}"
+                )
+            elif result.throttled:
+                failure_count += len(result.delivery.log_ids)
+                self.logger.warning(
+                    f"Webhook {result.delivery.log_id} throttled, due again at {result.retry_at}"
+                )
+            else:
+                failure_count += len(result.delivery.log_ids)
+                self.logger.warning(
+                    f"Webhook {result.delivery.log_id} failed: {result.error or result.status_code}"
+                )
+
+            results.append(result)
+            if len(results) >= self.chunk_size:
+                self.save_results(results)
+                results = []
+
+        self.save_results(results)
+        return success_count, failure_count
+
+    def retry_log(
+        self, log_id: EntityId, timeout: int = 10
+    ) -> Optional[DeliveryResult]:
+        """
+        Send a single webhook log now, due or not, e.g. a dead-lettered one.
+
+        The log is claimed like the due ones, sent within the rate limit of
+        its webhook and its outcome saved as ``dispatch`` saves it. A log
+        whose webhook was deleted is dead-lettered.
+
+        Args:
+            log_id: The ID of the webhook log to send
+            timeout: HTTP request timeout in seconds
+
+        Returns:
+            The result of the delivery, or None if the log wasn't sent: it
+            doesn't exist, its webhook is disabled or gone, or another
+            dispatcher holds it
+        """
+        log = self.session.get(WebhookLogModel, log_id)
+        if log is None:
+            self.logger.warning(f"Webhook log {log_id} not found.")
+            return None
+
+        webhook = self.session.get(Webhook, log.webhook_id)
+        if webhook is None:
+            self.logger.warning(
+                f"Webhook {log.webhook_id} not found for log {log.id}, dead-lettering it"
+            )
+            log.next_attempt_at = None
+            self.session.commit()
+            return None
+
+        if not webhook.enabled:
+            self.logger.info(f"Skipping disabled webhook {webhook.id}")
+            return None
+
+        now = datetime.now()
+        expires_at = now + self.lease
+        claimed = self.session.execute(
+            update(WebhookLogModel)
+            .where(
+                WebhookLogModel.id == log.id,
+                or_(
+                    WebhookLogModel.lease_expires_at.is_(None),
+                    WebhookLogModel.lease_expires_at < now,
+                ),
+            )
+            .values(claimed_by=self.worker_id, lease_expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.session.commit()
+        if not claimed:
+            self.logger.warning(
+                f"Webhook log {log.id} is being sent by another worker."
+            )
+            return None
+
+        results = list(self.send_all(self._claimed(expires_at), timeout))
+        self.save_results(results)
+        return results[0]
+
+    def send_all(
+        self, deliveries: List[Delivery], timeout: int = 10
+    ) -> Iterator[DeliveryResult]:
+        """
+        Send deliveries within the global, per-host and per-webhook limits.
+
+        Args:
+            deliveries: The deliveries to send
+            timeout: HTTP request timeout in seconds
+
+        Returns:
+            The results, in the order the deliveries complete, followed by
+            the deliveries held back by a rate limit
+        """
+        queues: Dict[EntityId, deque] = {}
+        for delivery in deliveries:
+            queues.setdefault(delivery.webhook_id, deque()).append(delivery)
+        in_flight: Counter = Counter()
+        futures = {}
+        deferred = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="webhook"
+        ) as executor:
+
+            def submit_ready() -> Optional[float]:
+                """Submit what may go now, return the seconds until a held delivery may go."""
+                next_ready = None
+                for webhook_id, queue in list(queues.items()):
+                    while queue and len(futures) < self.max_workers:
+                        delivery = queue[0]
+                        if in_flight[delivery.host] >= self.per_host:
+                            break
+                        delay = self.rate_limiter.delay(delivery)
+                        if delay > self.max_hold:
+                            retry_at = datetime.now() + timedelta(seconds=delay)
+                            deferred.extend(
+                                DeliveryResult(
+                                    held, 0, "", retry_at=retry_at, sent=False
+                                )
+                                for held in queue
+                            )
+                            queue.clear()
+                        elif delay > 0:
+                            next_ready = (
+                                delay if next_ready is None else min(next_ready, delay)
+                            )
+                            break
+                        else:
+                            self.rate_limiter.take(delivery)
+                            queue.popleft()
+                            in_flight[delivery.host] += 1
+                            futures[executor.submit(self.send, delivery, timeout)] = (
+                                delivery
+                            )
+                    if not queue:
+                        del queues[webhook_id]
+                return next_ready
+
+            while True:
+                next_ready = submit_ready()
+                if not futures:
+                    if not queues:
+                        break
+                    time.sleep(next_ready)
+                    continue
+                done, _ = wait(futures, timeout=next_ready, return_when=FIRST_COMPLETED)
+                for future in done:
+                    delivery = futures.pop(future)
+                    in_flight[delivery.host] -= 1
+                    result = future.result()
+                    self.rate_limiter.observe(result)
+                    yield result
+
+        yield from deferred
+
+    def send(self, delivery: Delivery, timeout: int = 10) -> DeliveryResult:
+        """
+        Send a single delivery.
+
+        Args:
+            delivery: The delivery to send
+            timeout: HTTP request timeout in seconds
+
+        Returns:
+            The result of the delivery
+        """
+        started = time.perf_counter()
+        try:
+            response = self.sender_service.post(
+                delivery.url, delivery.headers, delivery.payload, timeout
+            )
+        except Exception as e:
+            return DeliveryResult(
+                delivery, 0, str(e), e, latency_ms=elapsed_ms(started)
+            )
+        latency_ms = elapsed_ms(started)
+
+        rate_limit = RateLimit.from_response(response)
+        retry_at = None
+        if (
+            response.status_code == 429
+            and rate_limit
+            and rate_limit.retry_after is not None
+        ):
+            retry_at = datetime.now() + timedelta(seconds=rate_limit.retry_after)
+        return DeliveryResult(
+            delivery,
+            response.status_code,
+            response.text,
+            rate_limit=rate_limit,
+            retry_at=retry_at,
+            latency_ms=latency_ms,
+        )
+
+    def save_results(self, results: List[DeliveryResult]) -> None:
+        """
+        Save the outcome of deliveries in one UPDATE and one commit, and
+        schedule the retry of those that failed.
+
+        Args:
+            results: The results to save
+        """
+        if not results:
+            return
+
+        outcomes = []
+        for result in results:
+            outcome = self._outcome(result)
+            outcomes.append(outcome)
+            # The logs of a digest share the outcome of their message. Its
+            # latency is only counted once, on the log it was sent for.
+            merged = (
+                dict(outcome, latency_ms=None) if "latency_ms" in outcome else outcome
+            )
+            outcomes.extend(
+                dict(merged, id=log_id) for log_id in result.delivery.merged_log_ids
+            )
+        self.session.execute(update(WebhookLogModel), outcomes)
+        self.session.commit()
+
+    def _outcome(self, result: DeliveryResult) -> Dict[str, Any]:
+        """The columns of a log to update with the result of its delivery."""
+        outcome = {
+            "id": result.delivery.log_id,
+            "claimed_by": None,
+            "lease_expires_at": None,
+        }
+        if not result.sent:
+            outcome["next_attempt_at"] = result.retry_at
+            return outcome
+
+        outcome.update(
+            http_status=result.status_code,
+            response_body=result.response_body[:1000],
+            succeeded=result.succeeded,
+            last_error_class=result.error_class,
+            latency_ms=result.latency_ms,
+        )
+        if result.throttled:
+            # Being throttled is not a failure of the endpoint, it does not use up an attempt
+            outcome["next_attempt_at"] = result.retry_at
+            return outcome
+
+        attempts = result.delivery.attempts + 1
+        outcome["attempts"] = attempts
+        outcome["next_attempt_at"] = (
+            None
+            if result.succeeded
+            else self.retry_policy.next_attempt_at(
+                attempts, result.status_code, result.error
+            )
+        )
+        return outcome
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Dict, Optional, List, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 from pointsheet.domain.entity import AggregateRoot
 from pointsheet.domain.types import EntityId, uuid_default
@@ -54,3 +54,36 @@ class WebhookLog(AggregateRoot):
     response_body: Optional[str] = None
     succeeded: bool = False
     timestamp: datetime = Field(default_factory=datetime.now)
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = Field(default_factory=datetime.now)
+    last_error_class: Optional[str] = None
+    latency_ms: Optional[int] = None
+    digest_key: Optional[str] = None
+
+    @computed_field
+    @property
+    def status(self) -> WebhookDeliveryStatus:
+        if self.succeeded:
+            return WebhookDeliveryStatus.DELIVERED
+        if self.next_attempt_at is None:
+            return WebhookDeliveryStatus.DEAD_LETTERED
+        if self.attempts:
+            return WebhookDeliveryStatus.FAILED
+        return WebhookDeliveryStatus.PENDING
+
+
+class OutboxMessage(AggregateRoot):
+    """
+    Entity representing a domain event in the notification outbox.
+
+    The transaction that publishes an event only stores the event and the
+    subscriptions it was routed to; the webhook logs are created from it
+    after the transaction has committed.
+    """
+
+    event_type: WebhookEventType
+    resource_type: Optional[str] = None
+    resource_id: Optional[EntityId] = None
+    payload: Dict[str, Any]
+    subscription_ids: List[EntityId]
+    created_at: datetime = Field(default_factory=datetime.now)
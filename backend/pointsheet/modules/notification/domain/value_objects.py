@@ -42,3 +42,4 @@ class WebhookDeliveryStatus(str, Enum):
     PENDING = "pending"
     DELIVERED = "delivered"
     FAILED = "failed"
+    DEAD_LETTERED = "dead_lettered"
@@ -4,7 +4,10 @@ Webhook formatters package.
 This package contains formatters for different webhook platforms and event types.
 """
 
-from modules.notification.formatters.base import WebhookFormatter
+from modules.notification.formatters.base import (
+    WebhookDigestFormatter,
+    WebhookFormatter,
+)
 from modules.notification.formatters.factory import DynamicWebhookFormatterFactory
 from modules.notification.formatters.discord.base import DiscordFormatter as DiscordWebhookFormatter
 
@@ -45,4 +48,11 @@ class WebhookFormatterFactory:
         else:
             raise ValueError(f"Unsupported webhook platform: {platform}")
 
-__all__ = ["DynamicWebhookFormatterFactory", "WebhookFormatter", "DiscordWebhookFormatter", "WebhookFormatterFactory"]
+
+__all__ = [
+    "DynamicWebhookFormatterFactory",
+    "WebhookFormatter",
+    "WebhookDigestFormatter",
+    "DiscordWebhookFormatter",
+    "WebhookFormatterFactory",
+]
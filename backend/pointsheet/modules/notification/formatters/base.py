@@ -1,6 +1,6 @@
 import abc
 from abc import abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from modules.notification.domain.entity import Webhook
 
@@ -24,4 +24,31 @@ class WebhookFormatter(abc.ABC):
         Returns:
             A formatted payload suitable for the specific platform
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class WebhookDigestFormatter(abc.ABC):
+    """
+    Abstract base class for digest formatters.
+
+    A digest formatter merges the formatted payloads of several events into
+    one message, so a burst of events about the same resource costs one
+    request to the platform.
+    """
+
+    # Most payloads one message can hold
+    max_items: int = 10
+
+    @abstractmethod
+    def merge(self, webhook: Webhook, payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge formatted payloads into one.
+
+        Args:
+            webhook: The webhook configuration
+            payloads: At most ``max_items`` payloads made by ``WebhookFormatter.format_payload``
+
+        Returns:
+            A payload carrying all of them
+        """
+        pass
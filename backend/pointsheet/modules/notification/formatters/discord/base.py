@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, List
 
 from modules.notification.domain.entity import Webhook
 from modules.notification.formatters.base import WebhookFormatter
+from modules.notification.formatters.templates import compile_template
 
 class DiscordFormatter(WebhookFormatter):
     """Base formatter for Discord webhooks."""
@@ -10,10 +11,15 @@ class DiscordFormatter(WebhookFormatter):
         """Format a payload for Discord webhooks."""
         # Get webhook config or use defaults
         config = webhook.config or {}
-        
+
+        # A template configured on the webhook wins over the content of the event's formatter
+        content = self.render_template(config, payload)
+        if content is None:
+            content = self.create_content(webhook, payload, config)
+
         # Create the Discord webhook payload
         discord_payload = {
-            "content": self.create_content(webhook, payload, config),
+            "content": content,
             "username": config.get("username", "PSR"),
             "avatar_url": config.get("avatar_url"),
         }
@@ -24,18 +30,25 @@ class DiscordFormatter(WebhookFormatter):
             discord_payload["embeds"] = embeds
             
         return discord_payload
-    
+
+    def render_template(
+        self, config: Dict[str, Any], payload: Dict[str, Any]
+    ) -> Optional[str]:
+        """Fill in the ``content_template`` of the config, None if there is none or it doesn't fit the payload."""
+        template = config.get("content_template")
+        if not template:
+            return None
+        compiled = compile_template(template)
+        if compiled is None:
+            return None
+        try:
+            return compiled.render(payload)
+        except (KeyError, IndexError, AttributeError):
+            # Fallback if template formatting fails
+            return None
+
     def create_content(self, webhook: Webhook, payload: Dict[str, Any], config: Dict[str, Any]) -> str:
         """Create the content field for a Discord webhook."""
-        # Use a template from config or create a default message
-        template = config.get("content_template")
-        if template:
-            try:
-                return template.format(**payload)
-            except KeyError:
-                # Fallback if template formatting fails
-                pass
-        
         # Default implementation - should be overridden by subclasses
         event_type = payload.get("event_type", "Unknown")
         return f"New event: {event_type}"
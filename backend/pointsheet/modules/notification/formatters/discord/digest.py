@@ -0,0 +1,53 @@
+from collections import Counter
+from typing import Dict, Any, List
+
+from modules.notification.domain.entity import Webhook
+from modules.notification.formatters.base import WebhookDigestFormatter
+
+# Discord limits of a webhook message
+MAX_EMBEDS = 10
+MAX_CONTENT_LENGTH = 2000
+
+
+class DigestFormatter(WebhookDigestFormatter):
+    """Merges Discord messages into one, with up to 10 embeds."""
+
+    max_items = MAX_EMBEDS
+
+    def merge(self, webhook: Webhook, payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge Discord payloads, one content line per message and all their embeds."""
+        digest = {
+            "content": self.create_content(webhook, payloads),
+            "username": payloads[0].get("username"),
+            "avatar_url": payloads[0].get("avatar_url"),
+        }
+
+        embeds = self.create_embeds(webhook, payloads)
+        if embeds:
+            digest["embeds"] = embeds
+
+        return digest
+
+    def create_content(self, webhook: Webhook, payloads: List[Dict[str, Any]]) -> str:
+        """Create the content of the digest, repeated lines are counted instead."""
+        lines = Counter(
+            payload.get("content") for payload in payloads if payload.get("content")
+        )
+        content = "\n".join(
+            line if count == 1 else f"{line} (×{count})"
+            for line, count in lines.items()
+        )
+        if len(content) > MAX_CONTENT_LENGTH:
+            content = content[: MAX_CONTENT_LENGTH - 1] + "…"
+        return content
+
+    def create_embeds(
+        self, webhook: Webhook, payloads: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Collect the embeds of the payloads, the same embed only once."""
+        embeds = []
+        for payload in payloads:
+            for embed in payload.get("embeds") or ():
+                if embed not in embeds:
+                    embeds.append(embed)
+        return embeds[:MAX_EMBEDS]
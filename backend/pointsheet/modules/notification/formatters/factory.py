@@ -1,16 +1,18 @@
-import importlib
-import re
-from typing import Type
+from typing import Optional
 
-from modules.notification.domain.entity import Webhook
 from modules.notification.domain.value_objects import WebhookPlatform
-from modules.notification.formatters.base import WebhookFormatter
+from modules.notification.formatters.base import (
+    WebhookDigestFormatter,
+    WebhookFormatter,
+)
+from modules.notification.formatters.registry import formatter_registry
 
 class DynamicWebhookFormatterFactory:
     """
     Factory for dynamically creating webhook formatters.
-    
-    This factory creates the appropriate formatter for a given webhook platform and event type.
+
+    This factory returns the appropriate formatter for a given webhook platform and event type,
+    from the formatters ``formatter_registry`` discovered in the platform packages.
     """
     
     @staticmethod
@@ -28,34 +30,20 @@ class DynamicWebhookFormatterFactory:
         Raises:
             ValueError: If the platform is not supported
         """
-        platform_value = platform.value.lower()
-        
-        # Convert event type to snake_case (e.g., SeriesCreated -> series_created)
-        event_name = re.sub(r'(?<!^)(?=[A-Z])', '_', event_type).lower()
-        
-        # Try to import the specific formatter
-        try:
-            module_path = f"modules.notification.formatters.{platform_value}.{event_name}"
-            module = importlib.import_module(module_path)
-            
-            # Look for a class that ends with "Formatter"
-            formatter_class = None
-            for attr_name in dir(module):
-                if attr_name.endswith("Formatter"):
-                    formatter_class = getattr(module, attr_name)
-                    break
-            
-            if formatter_class:
-                return formatter_class()
-        except (ImportError, AttributeError):
-            # If specific formatter not found, try to use the default formatter
-            try:
-                module_path = f"modules.notification.formatters.{platform_value}.default"
-                module = importlib.import_module(module_path)
-                default_formatter_class = getattr(module, "DefaultFormatter")
-                return default_formatter_class()
-            except (ImportError, AttributeError):
-                pass
-        
-        # If no formatter found, raise error
-        raise ValueError(f"Unsupported webhook platform: {platform} or event type: {event_type}")
\ No newline at end of file
+        return formatter_registry.formatter(platform, event_type)
+
+    @staticmethod
+    def create_digest_formatter(
+        platform: WebhookPlatform,
+    ) -> Optional[WebhookDigestFormatter]:
+        """
+        Create the digest formatter of the specified platform.
+
+        Args:
+            platform: The webhook platform
+
+        Returns:
+            The ``DigestFormatter`` of the platform's package, or None if its
+            messages can't be merged
+        """
+        return formatter_registry.digest_formatter(platform)
@@ -0,0 +1,135 @@
+"""
+Registry of the webhook formatters.
+
+The formatter modules of the platform packages are imported once, and one
+instance of each formatter is kept.
+"""
+
+import importlib
+import inspect
+import pkgutil
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.formatters.base import (
+    WebhookDigestFormatter,
+    WebhookFormatter,
+)
+
+PACKAGE = "modules.notification.formatters"
+BASE_MODULE = "base"
+DEFAULT_MODULE = "default"
+DIGEST_MODULE = "digest"
+
+
+@lru_cache(maxsize=256)
+def module_names(event_type: str) -> Tuple[str, ...]:
+    """
+    The modules that may hold an event's formatter, e.g. ``SeriesCreated`` ->
+    ``series_created``, and ``DriverJoinedEvent`` -> ``driver_joined_event``
+    or ``driver_joined``.
+    """
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", event_type).lower()
+    if name.endswith("_event") and name != "_event":
+        return name, name[: -len("_event")]
+    return (name,)
+
+
+def _defined_in(module, base: type) -> Optional[type]:
+    """
+    The concrete subclass of ``base`` defined in a module, if any. The event
+    modules import the platform's base formatter, which isn't theirs.
+    """
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if (
+            cls.__module__ == module.__name__
+            and issubclass(cls, base)
+            and not inspect.isabstract(cls)
+        ):
+            return cls
+    return None
+
+
+class FormatterRegistry:
+    """The formatters of every platform, discovered once."""
+
+    def __init__(self, package: str = PACKAGE):
+        self.package = package
+        self._lock = threading.Lock()
+        self._formatters: Optional[Dict[Tuple[str, str], WebhookFormatter]] = None
+        self._digest_formatters: Dict[str, WebhookDigestFormatter] = {}
+
+    def discover(self) -> None:
+        """Import the formatter modules of every platform package and instantiate their formatters."""
+        formatters: Dict[Tuple[str, str], WebhookFormatter] = {}
+        digest_formatters: Dict[str, WebhookDigestFormatter] = {}
+        package = importlib.import_module(self.package)
+        for platform in pkgutil.iter_modules(package.__path__):
+            if not platform.ispkg:
+                continue
+            platform_package = importlib.import_module(
+                f"{self.package}.{platform.name}"
+            )
+            for module_info in pkgutil.iter_modules(platform_package.__path__):
+                if module_info.name == BASE_MODULE:
+                    continue
+                module = importlib.import_module(
+                    f"{platform_package.__name__}.{module_info.name}"
+                )
+                if module_info.name == DIGEST_MODULE:
+                    digest_class = _defined_in(module, WebhookDigestFormatter)
+                    if digest_class is not None:
+                        digest_formatters[platform.name] = digest_class()
+                    continue
+                formatter_class = _defined_in(module, WebhookFormatter)
+                if formatter_class is not None:
+                    formatters[(platform.name, module_info.name)] = formatter_class()
+        with self._lock:
+            self._formatters = formatters
+            self._digest_formatters = digest_formatters
+
+    @property
+    def discovered(self) -> bool:
+        return self._formatters is not None
+
+    def formatter(self, platform: WebhookPlatform, event_type: str) -> WebhookFormatter:
+        """
+        The formatter of an event on a platform, or the platform's default one.
+
+        Args:
+            platform: The webhook platform
+            event_type: The event type, e.g. ``DriverJoinedEvent``
+
+        Returns:
+            The formatter, shared by every webhook of the platform
+
+        Raises:
+            ValueError: If the platform has no formatter for the event
+        """
+        formatters = self._discovered()
+        platform_name = platform.value.lower()
+        for name in module_names(event_type) + (DEFAULT_MODULE,):
+            formatter = formatters.get((platform_name, name))
+            if formatter is not None:
+                return formatter
+        raise ValueError(
+            f"Unsupported webhook platform: {platform} or event type: {event_type}"
+        )
+
+    def digest_formatter(
+        self, platform: WebhookPlatform
+    ) -> Optional[WebhookDigestFormatter]:
+        """The digest formatter of a platform, or None if its messages can't be merged."""
+        self._discovered()
+        return self._digest_formatters.get(platform.value.lower())
+
+    def _discovered(self) -> Dict[Tuple[str, str], WebhookFormatter]:
+        if self._formatters is None:
+            self.discover()
+        return self._formatters
+
+
+formatter_registry = FormatterRegistry()
@@ -0,0 +1,72 @@
+"""
+Precompiled content templates.
+
+A webhook's ``content_template`` is parsed once into its literal text and
+fields, rendering only substitutes the fields.
+"""
+
+import string
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+
+_formatter = string.Formatter()
+
+
+class ContentTemplate:
+    """
+    A parsed ``str.format`` template, rendered with keyword fields only.
+
+    Plain fields (``{name}``) are looked up and converted with ``str``, like
+    ``str.format`` does for the payload's strings and numbers. Fields with an
+    attribute or index, a conversion or a format spec go through
+    ``string.Formatter``.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        # (literal text, field name, conversion, format spec) of each field, in order
+        self.parts: List[Tuple[str, Optional[str], Optional[str], str]] = []
+        self.simple = True
+        for literal, field_name, format_spec, conversion in _formatter.parse(template):
+            if field_name is not None:
+                if field_name == "" or field_name[0].isdigit():
+                    raise ValueError(
+                        f"Positional field in content template: {template!r}"
+                    )
+                if conversion or format_spec or not field_name.isidentifier():
+                    self.simple = False
+            self.parts.append((literal, field_name, conversion, format_spec or ""))
+
+    def render(self, fields: Mapping[str, Any]) -> str:
+        """
+        Fill in the template.
+
+        Raises:
+            KeyError: If the template names a field that isn't given
+        """
+        pieces = []
+        if self.simple:
+            for literal, field_name, _, _ in self.parts:
+                pieces.append(literal)
+                if field_name is not None:
+                    pieces.append(str(fields[field_name]))
+            return "".join(pieces)
+
+        for literal, field_name, conversion, format_spec in self.parts:
+            pieces.append(literal)
+            if field_name is not None:
+                value, _ = _formatter.get_field(field_name, (), fields)
+                value = _formatter.convert_field(value, conversion)
+                if "{" in format_spec:
+                    format_spec = _formatter.vformat(format_spec, (), fields)
+                pieces.append(_formatter.format_field(value, format_spec))
+        return "".join(pieces)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> Optional[ContentTemplate]:
+    """The compiled template, shared by the webhooks using it; None if it isn't a valid template."""
+    try:
+        return ContentTemplate(template)
+    except ValueError:
+        return None
@@ -1,11 +1,20 @@
 from lato import TransactionContext
 
 from modules.notification.notification_module import notification_module
-from modules.notification.repository import WebhookRepository, WebhookSubscriptionRepository, WebhookLogRepository
-from modules.event.events import DriverJoinedEvent, DriverLeftEvent, EventScheduleAdded, RaceResultUploaded, \
-    EventDeleted
+from modules.notification.repository import (
+    WebhookRepository,
+    WebhookSubscriptionRepository,
+    OutboxRepository,
+)
+from modules.event.events import (
+    DriverJoinedEvent,
+    DriverLeftEvent,
+    EventScheduleAdded,
+    RaceResultUploaded,
+    EventDeleted,
+)
 from modules.notification import WebhookEventType
-from modules.notification.handlers.series import _event_to_payload, _create_delivery_logs
+from modules.notification.handlers.series import _event_to_payload, _enqueue_deliveries
 
 
 @notification_module.handler(DriverJoinedEvent)
@@ -14,18 +23,18 @@ def handle_driver_joined_event(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle DriverJoinedEvent event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.DRIVER_JOINED,
         payload,
         resource_type="Event",
         resource_id=event.event_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
 
 
@@ -35,18 +44,18 @@ def handle_driver_left_event(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle DriverLeftEvent event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.DRIVER_LEFT,
         payload,
         resource_type="Event",
         resource_id=event.event_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
 
 
@@ -56,18 +65,18 @@ def handle_event_schedule_added(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle EventScheduleAdded event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.EVENT_OPEN,
         payload,
         resource_type="Event",
         resource_id=event.event_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
 
 
@@ -77,18 +86,18 @@ def handle_race_result_uploaded(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle RaceResultUploaded event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.RACE_RESULT_UPLOADED,
         payload,
         resource_type="Event",
         resource_id=event.event_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
 
 
@@ -98,16 +107,16 @@ def handle_event_deleted(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle EventDeleted event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.EVENT_CLOSED,
         payload,
         resource_type="Event",
         resource_id=event.event_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
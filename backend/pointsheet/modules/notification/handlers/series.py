@@ -12,28 +12,35 @@ from modules.event.events import (
     SeriesStarted, SeriesClosed
 )
 from modules.notification.domain.value_objects import WebhookEventType
-from modules.notification.domain.entity import WebhookLog
-from modules.notification.repository import WebhookRepository, WebhookSubscriptionRepository, WebhookLogRepository
+from modules.notification.domain.entity import OutboxMessage
+from modules.notification.repository import (
+    WebhookRepository,
+    WebhookSubscriptionRepository,
+    OutboxRepository,
+)
 from modules.notification.notification_module import notification_module
-from modules.notification.formatters import DynamicWebhookFormatterFactory
+from modules.notification.routing import subscription_routes
 from pointsheet.domain.types import EntityId
 
 
-def _create_delivery_logs(
+def _enqueue_deliveries(
     event_type: WebhookEventType,
     payload: Dict[str, Any],
     resource_type: Optional[str] = None,
     resource_id: Optional[EntityId] = None,
     webhook_repository: WebhookRepository = None,
     subscription_repository: WebhookSubscriptionRepository = None,
-    log_repository: WebhookLogRepository = None
+    outbox_repository: OutboxRepository = None,
 ) -> None:
     """
-    Create webhook delivery logs for a specific event type.
+    Put an event in the notification outbox for the subscriptions it goes to.
 
-    First tries to find subscriptions specific to the resource,
-    then falls back to general subscriptions for the event type,
-    and finally to default subscriptions if none are found.
+    Subscriptions specific to the resource, to its type and to the event type
+    all apply; when there are none, the default subscriptions are used. They
+    are looked up in the in-memory routing table, which is only loaded from
+    the repositories when it is missing or stale. The transaction only writes
+    one outbox message, ``OutboxRelay`` formats the payloads and creates the
+    webhook logs once it has committed.
 
     Args:
         event_type: The type of event
@@ -42,41 +49,27 @@ def _create_delivery_logs(
         resource_id: Optional resource ID
         webhook_repository: Repository for webhooks
         subscription_repository: Repository for webhook subscriptions
-        log_repository: Repository for webhook logs
+        outbox_repository: Repository for the notification outbox
     """
-    # Find subscriptions in order of specificity
-    subscriptions = subscription_repository.find_by_event_type(
-        event_type, resource_type, resource_id
+    routes = subscription_routes.routes(
+        event_type,
+        resource_type,
+        resource_id,
+        load=lambda: (webhook_repository.all(), subscription_repository.all()),
+    )
+    if not routes:
+        return
+
+    outbox_repository.add(
+        OutboxMessage(
+            event_type=event_type,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            payload=payload,
+            subscription_ids=[route.subscription_id for route in routes],
+            created_at=datetime.now(),
+        )
     )
-
-    # If no specific subscriptions found, use defaults
-    if not subscriptions:
-        subscriptions = subscription_repository.find_default_subscriptions()
-
-    # Create logs for each subscription
-    for subscription in subscriptions:
-        webhook = webhook_repository.find_by_id(subscription.webhook_id)
-        if webhook and webhook.enabled:
-            try:
-                # Get event type from payload
-                event_type_name = payload.get("event_type", "Unknown")
-
-                # Format the payload for the specific platform and event type
-                formatter = DynamicWebhookFormatterFactory.create_formatter(webhook.platform, event_type_name)
-                formatted_payload = formatter.format_payload(webhook, payload)
-
-                # Create the webhook log with the formatted payload
-                log = WebhookLog(
-                    webhook_id=webhook.id,
-                    subscription_id=subscription.id,
-                    payload=formatted_payload,
-                    succeeded=False,
-                    timestamp=datetime.now()
-                )
-                log_repository.add(log)
-            except ValueError as e:
-                # Log error if platform is not supported
-                print(f"Error formatting webhook payload: {str(e)}")
 
 
 def _event_to_payload(event: Event) -> Dict[str, Any]:
@@ -89,8 +82,8 @@ def _event_to_payload(event: Event) -> Dict[str, Any]:
     Returns:
         A dictionary containing the event data
     """
-    # Convert event to dictionary
-    event_dict = event.model_dump()
+    # Convert event to dictionary, in the JSON types the outbox stores it as
+    event_dict = event.model_dump(mode="json")
 
     # Add event type
     event_dict["event_type"] = event.__class__.__name__
@@ -104,18 +97,18 @@ def handle_series_started(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle SeriesStarted event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.SERIES_STARTED,
         payload,
         resource_type="Series",
         resource_id=event.series_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
 
 
@@ -125,16 +118,16 @@ def handle_series_closed(
     ctx: TransactionContext,
     webhook_repository: WebhookRepository,
     webhook_subscription_repository: WebhookSubscriptionRepository,
-    webhook_log_repository: WebhookLogRepository
+    outbox_repository: OutboxRepository,
 ) -> None:
     """Handle SeriesClosed event."""
     payload = _event_to_payload(event)
-    _create_delivery_logs(
+    _enqueue_deliveries(
         WebhookEventType.SERIES_CLOSED,
         payload,
         resource_type="Series",
         resource_id=event.series_id,
         webhook_repository=webhook_repository,
         subscription_repository=webhook_subscription_repository,
-        log_repository=webhook_log_repository
+        outbox_repository=outbox_repository,
     )
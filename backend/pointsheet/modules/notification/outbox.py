@@ -0,0 +1,252 @@
+"""Expansion of the notification outbox into webhook logs."""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from pointsheet.db import get_session
+from modules.notification.data_mappers import WebhookModelMapper
+from modules.notification.routing import SubscriptionRoutes, subscription_routes
+from pointsheet.models.notification import (
+    OutboxMessage as OutboxMessageModel,
+    Webhook,
+    WebhookSubscription,
+    WebhookLog as WebhookLogModel,
+)
+
+
+class OutboxRelay:
+    """
+    Turns the notification outbox into webhook logs.
+
+    A command's transaction only writes one ``OutboxMessage`` per routed
+    domain event. The relay claims messages with a lease, the way
+    ``WebhookDispatcher`` claims logs, formats the payload of each
+    subscription and writes the logs in the same commit that deletes the
+    messages. A relay that dies before that commit leaves its messages to
+    another one once the lease expires; one whose lease was taken over
+    writes nothing, so a message is expanded once.
+
+    Events about a resource are coalesced per webhook when the webhook's
+    platform can merge messages (it has a digest formatter): their logs get
+    the resource as ``digest_key`` and are held until the end of a window
+    of ``digest_window`` seconds, or the ``digest_window`` of the webhook's
+    config, that the first of them opened. ``WebhookDispatcher`` then sends
+    the logs of a window as one message.
+    """
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        logger: Optional[logging.Logger] = None,
+        worker_id: Optional[str] = None,
+        lease: int = 300,
+        routes: Optional[SubscriptionRoutes] = None,
+        digest_window: float = 0,
+    ):
+        """
+        Initialize the outbox relay.
+
+        Args:
+            session: The database session to use
+            logger: The logger to use
+            worker_id: Name the claimed messages are marked with, unique per relay by default
+            lease: Seconds a claim is held before another relay may take the messages over
+            routes: Routing table whose formatters are used
+            digest_window: Seconds events about a resource are held to be sent as one message
+        """
+        self.session = session or next(get_session())
+        self.logger = logger or logging.getLogger(__name__)
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.lease = timedelta(seconds=lease)
+        self.routes = routes or subscription_routes
+        self.mapper = WebhookModelMapper()
+        self.digest_window = digest_window
+
+    def claim_messages(self, limit: int = 50) -> List[OutboxMessageModel]:
+        """
+        Claim outbox messages, oldest first.
+
+        Args:
+            limit: Maximum number of messages to claim
+
+        Returns:
+            A list of claimed messages
+        """
+        now = datetime.now()
+        expires_at = now + self.lease
+        unclaimed = or_(
+            OutboxMessageModel.lease_expires_at.is_(None),
+            OutboxMessageModel.lease_expires_at < now,
+        )
+        claimable = (
+            select(OutboxMessageModel.id)
+            .where(unclaimed)
+            .order_by(OutboxMessageModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        self.session.execute(
+            update(OutboxMessageModel)
+            .where(OutboxMessageModel.id.in_(claimable.scalar_subquery()), unclaimed)
+            .values(claimed_by=self.worker_id, lease_expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        stmt = (
+            select(OutboxMessageModel)
+            .where(
+                OutboxMessageModel.claimed_by == self.worker_id,
+                OutboxMessageModel.lease_expires_at == expires_at,
+            )
+            .order_by(OutboxMessageModel.created_at)
+        )
+        return list(self.session.execute(stmt).scalars())
+
+    def expand(self, limit: int = 50) -> int:
+        """
+        Expand claimed outbox messages into webhook logs.
+
+        Subscriptions deleted since the event was published are skipped.
+
+        Args:
+            limit: Maximum number of messages to expand
+
+        Returns:
+            The number of messages expanded
+        """
+        messages = self.claim_messages(limit)
+        if not messages:
+            return 0
+
+        subscription_ids = {
+            subscription_id
+            for message in messages
+            for subscription_id in message.subscription_ids
+        }
+        rows = self.session.execute(
+            select(WebhookSubscription.id, Webhook)
+            .join(Webhook, Webhook.id == WebhookSubscription.webhook_id)
+            .where(WebhookSubscription.id.in_(subscription_ids))
+        )
+        webhooks = {
+            str(subscription_id): self.mapper.to_domain_model(webhook)
+            for subscription_id, webhook in rows
+        }
+
+        logs = []
+        for message in messages:
+            event_type_name = message.payload.get("event_type", "Unknown")
+            digest_key = (
+                f"{message.resource_type}:{message.resource_id}"
+                if message.resource_id
+                else None
+            )
+            for subscription_id in message.subscription_ids:
+                webhook = webhooks.get(subscription_id)
+                if webhook is None:
+                    continue
+                try:
+                    formatter = self.routes.formatter(webhook.platform, event_type_name)
+                    payload = formatter.format_payload(webhook, message.payload)
+                except ValueError as e:
+                    self.logger.warning(f"Error formatting webhook payload: {str(e)}")
+                    continue
+                logs.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "webhook_id": webhook.id,
+                        "subscription_id": subscription_id,
+                        "payload": payload,
+                        "succeeded": False,
+                        "timestamp": message.created_at,
+                        "attempts": 0,
+                        "next_attempt_at": message.created_at,
+                        "digest_key": digest_key if self._window(webhook) else None,
+                    }
+                )
+        self._hold_digests(logs, webhooks)
+
+        deleted = self.session.execute(
+            delete(OutboxMessageModel)
+            .where(
+                OutboxMessageModel.id.in_([message.id for message in messages]),
+                OutboxMessageModel.claimed_by == self.worker_id,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if deleted.rowcount != len(messages):
+            # The lease ran out and another relay took the messages over
+            self.session.rollback()
+            self.logger.warning(
+                f"Lost the claim on outbox messages, {len(messages)} left to another relay"
+            )
+            return 0
+        if logs:
+            self.session.execute(insert(WebhookLogModel), logs)
+        self.session.commit()
+
+        self.logger.info(
+            f"Expanded {len(messages)} outbox messages into {len(logs)} webhook logs."
+        )
+        return len(messages)
+
+    def _window(self, webhook) -> float:
+        """Seconds the logs of a webhook are held to be merged, 0 if they aren't."""
+        if self.routes.digest_formatter(webhook.platform) is None:
+            return 0
+        return float((webhook.config or {}).get("digest_window", self.digest_window))
+
+    def _hold_digests(
+        self, logs: List[Dict[str, Any]], webhooks: Dict[str, Any]
+    ) -> None:
+        """Hold the logs to be merged until the end of their window, opening windows as needed."""
+        keyed = [log for log in logs if log["digest_key"]]
+        if not keyed:
+            return
+
+        now = datetime.now()
+        # Windows opened by earlier batches and not sent yet
+        rows = self.session.execute(
+            select(
+                WebhookLogModel.webhook_id,
+                WebhookLogModel.digest_key,
+                func.max(WebhookLogModel.next_attempt_at),
+            )
+            .where(
+                WebhookLogModel.digest_key.in_({log["digest_key"] for log in keyed}),
+                WebhookLogModel.next_attempt_at > now,
+                WebhookLogModel.attempts == 0,
+                WebhookLogModel.claimed_by.is_(None),
+            )
+            .group_by(WebhookLogModel.webhook_id, WebhookLogModel.digest_key)
+        )
+        windows = {
+            (str(webhook_id), digest_key): ends_at
+            for webhook_id, digest_key, ends_at in rows
+        }
+        for log in keyed:
+            key = (str(log["webhook_id"]), log["digest_key"])
+            if key not in windows:
+                webhook = webhooks[str(log["subscription_id"])]
+                windows[key] = now + timedelta(seconds=self._window(webhook))
+            log["next_attempt_at"] = windows[key]
+
+    def release_claims(self) -> None:
+        """Give back the messages this relay claimed but did not expand."""
+        self.session.execute(
+            update(OutboxMessageModel)
+            .where(OutboxMessageModel.claimed_by == self.worker_id)
+            .values(claimed_by=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
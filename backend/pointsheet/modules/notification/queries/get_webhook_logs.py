@@ -0,0 +1,40 @@
+from typing import Optional
+from uuid import UUID
+
+from lato import Query
+from pydantic import Field
+
+from modules.notification import notification_module
+from modules.notification.domain.entity import WebhookLog
+from modules.notification.repository import WebhookLogRepository
+from pointsheet.domain.responses import CursorPage
+from pointsheet.repository import PageRequest
+
+
+class GetWebhookLogs(Query):
+    """
+    Query to get the delivery logs of a webhook.
+    """
+
+    webhook_id: UUID
+    succeeded: Optional[bool] = None
+    page: PageRequest = Field(default_factory=PageRequest)
+
+
+@notification_module.handler(GetWebhookLogs)
+def get_webhook_logs(
+    query: GetWebhookLogs, repo: WebhookLogRepository
+) -> CursorPage[WebhookLog]:
+    """
+    Handler for the GetWebhookLogs query.
+
+    Gets one page of delivery logs for a webhook, newest first.
+
+    Args:
+        query: The GetWebhookLogs query
+        repo: The webhook log repository
+
+    Returns:
+        A page of webhook logs
+    """
+    return repo.all(query, query.page)
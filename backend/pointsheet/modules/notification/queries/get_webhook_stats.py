@@ -0,0 +1,33 @@
+from lato import Query
+from pydantic import Field
+
+from modules.notification import notification_module
+from modules.notification.read_models import WebhookStats, WebhookStatsReadModel
+
+
+class GetWebhookStats(Query):
+    """
+    Query to get the delivery statistics of every webhook.
+    """
+
+    days: float = Field(default=1, gt=0)
+
+
+@notification_module.handler(GetWebhookStats)
+def get_webhook_stats(
+    query: GetWebhookStats, read_model: WebhookStatsReadModel
+) -> WebhookStats:
+    """
+    Handler for the GetWebhookStats query.
+
+    Counts the deliveries, status codes and latencies of the last days and
+    the pending logs, per webhook.
+
+    Args:
+        query: The GetWebhookStats query
+        read_model: The webhook statistics read model
+
+    Returns:
+        The statistics of every webhook
+    """
+    return read_model.delivery_stats(query.days)
@@ -0,0 +1,206 @@
+"""Rate limits of the webhook endpoints, followed by ``WebhookDispatcher``."""
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+import requests
+
+from pointsheet.domain.types import EntityId
+from modules.notification.domain.value_objects import WebhookPlatform
+
+if TYPE_CHECKING:
+    from modules.notification.dispatcher import Delivery, DeliveryResult
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    What a response tells about the rate limit of its webhook.
+
+    Discord sends ``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset-After`` with every response, and answers a 429 with a
+    ``retry_after`` in the JSON body. Slack and most other services only send
+    ``Retry-After``, in seconds or as an HTTP date.
+    """
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_after: Optional[float] = None
+    retry_after: Optional[float] = None
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> Optional["RateLimit"]:
+        """
+        Read the rate limit of a response.
+
+        Args:
+            response: The HTTP response
+
+        Returns:
+            The rate limit, or None if the response does not tell
+        """
+        headers = getattr(response, "headers", None) or {}
+        limit = _number(headers.get("X-RateLimit-Limit"), int)
+        remaining = _number(headers.get("X-RateLimit-Remaining"), int)
+        reset_after = _number(headers.get("X-RateLimit-Reset-After"), float)
+        if reset_after is None and headers.get("X-RateLimit-Reset"):
+            reset_at = _number(headers.get("X-RateLimit-Reset"), float)
+            reset_after = None if reset_at is None else max(0.0, reset_at - time.time())
+
+        retry_after = None
+        if response.status_code == 429:
+            try:
+                retry_after = _number(response.json().get("retry_after"), float)
+            except (ValueError, AttributeError):
+                pass
+            if retry_after is None:
+                retry_after = _retry_after_header(headers.get("Retry-After"))
+            if retry_after is None and remaining == 0:
+                retry_after = reset_after
+
+        if (
+            limit is None
+            and remaining is None
+            and reset_after is None
+            and retry_after is None
+        ):
+            return None
+        return cls(limit, remaining, reset_after, retry_after)
+
+
+def _number(value: Optional[str], type_: Callable):
+    try:
+        return None if value is None else type_(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after_header(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header, in seconds or as an HTTP date."""
+    seconds = _number(value, float)
+    if seconds is not None or not value:
+        return seconds
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket of a single webhook.
+
+    Holds up to ``capacity`` requests, refilled evenly over ``period``
+    seconds. What the endpoint reports wins over the local count: the
+    remaining requests it announces cap the tokens, and a reset or retry
+    delay blocks the bucket until then.
+    """
+
+    def __init__(self, capacity: float, period: float, now: float):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated_at = now
+        self.blocked_until = now
+
+    def _refill(self, now: float) -> None:
+        if not math.isinf(self.capacity):
+            elapsed = max(0.0, now - self.updated_at)
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.capacity / self.period
+            )
+        self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        """Seconds before the next request may be sent, 0 if it may go now."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.period / self.capacity
+
+    def take(self, now: float) -> None:
+        """Spend a token on a request."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def observe(self, rate_limit: RateLimit, now: float) -> None:
+        """Adjust the bucket to the rate limit reported by the endpoint."""
+        self._refill(now)
+        if rate_limit.limit:
+            self.capacity = rate_limit.limit
+            self.tokens = min(self.tokens, self.capacity)
+        if rate_limit.remaining is not None:
+            self.tokens = min(self.tokens, rate_limit.remaining)
+        if rate_limit.remaining == 0 and rate_limit.reset_after is not None:
+            self.blocked_until = max(self.blocked_until, now + rate_limit.reset_after)
+        if rate_limit.retry_after is not None:
+            self.tokens = min(self.tokens, 0)
+            self.blocked_until = max(self.blocked_until, now + rate_limit.retry_after)
+
+
+class RateLimiter:
+    """
+    One token bucket per webhook.
+
+    A new bucket starts from the documented limit of the platform, Discord
+    allows 5 requests per 2 seconds to a webhook, and follows the rate-limit
+    headers of the responses from then on. Generic endpoints are not limited
+    until they answer with rate-limit headers or a 429. The limiter is used
+    from the dispatcher's scheduling thread only.
+    """
+
+    PLATFORM_LIMITS = {
+        WebhookPlatform.DISCORD.value: (5, 2.0),
+        WebhookPlatform.SLACK.value: (1, 1.0),
+        WebhookPlatform.TELEGRAM.value: (20, 60.0),
+    }
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            clock: Monotonic clock in seconds
+        """
+        self.clock = clock
+        self._buckets: Dict[EntityId, TokenBucket] = {}
+
+    def bucket(self, delivery: "Delivery") -> TokenBucket:
+        """
+        Get the bucket of the webhook of a delivery.
+
+        Args:
+            delivery: The delivery
+
+        Returns:
+            The token bucket of its webhook
+        """
+        bucket = self._buckets.get(delivery.webhook_id)
+        if bucket is None:
+            capacity, period = self.PLATFORM_LIMITS.get(
+                delivery.platform, (math.inf, 1.0)
+            )
+            bucket = self._buckets[delivery.webhook_id] = TokenBucket(
+                capacity, period, self.clock()
+            )
+        return bucket
+
+    def delay(self, delivery: "Delivery") -> float:
+        """Seconds before a delivery may be sent, 0 if it may go now."""
+        return self.bucket(delivery).delay(self.clock())
+
+    def take(self, delivery: "Delivery") -> None:
+        """Count a delivery that is sent now."""
+        self.bucket(delivery).take(self.clock())
+
+    def observe(self, result: "DeliveryResult") -> None:
+        """Adjust the bucket of a delivery to the rate limit of its response."""
+        if result.rate_limit is not None:
+            self.bucket(result.delivery).observe(result.rate_limit, self.clock())
@@ -0,0 +1,327 @@
+"""
+Read model for webhook delivery statistics.
+
+The statistics are counted in SQL over ``webhook_logs``, grouped by webhook.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from sqlalchemy import case, func, select
+
+from pointsheet.domain.types import EntityId
+from pointsheet.models.notification import Webhook, WebhookLog
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last bucket has none
+LATENCY_BUCKETS_MS: Tuple[int, ...] = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram(BaseModel):
+    """Counts of delivery attempts per latency bucket, ``buckets[i]`` up to ``LATENCY_BUCKETS_MS[i]``."""
+
+    buckets: List[int] = Field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    count: int = 0
+    total_ms: int = 0
+    max_ms: Optional[int] = None
+
+    @property
+    def avg_ms(self) -> Optional[float]:
+        return round(self.total_ms / self.count, 1) if self.count else None
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """
+        The upper bound of the bucket holding the percentile, or the slowest
+        attempt when it falls in the last bucket.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(percent / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return (
+                    LATENCY_BUCKETS_MS[index]
+                    if index < len(LATENCY_BUCKETS_MS)
+                    else self.max_ms
+                )
+        return self.max_ms
+
+    def add(self, bucket: int, count: int, total_ms: int, max_ms: int) -> None:
+        self.buckets[bucket] += count
+        self.count += count
+        self.total_ms += total_ms
+        self.max_ms = max_ms if self.max_ms is None else max(self.max_ms, max_ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in enumerate(other.buckets):
+            self.buckets[bucket] += count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        if other.max_ms is not None:
+            self.max_ms = (
+                other.max_ms if self.max_ms is None else max(self.max_ms, other.max_ms)
+            )
+
+
+class QueueDepth(BaseModel):
+    """The logs still in the due-queue: waiting for their window, their retry or the next poll."""
+
+    pending: int = 0
+    due: int = 0
+    oldest_pending_at: Optional[datetime] = None
+
+    def oldest_pending_age(self, now: datetime) -> Optional[float]:
+        """Seconds the oldest pending log has been waiting."""
+        if self.oldest_pending_at is None:
+            return None
+        return max(0.0, (now - self.oldest_pending_at).total_seconds())
+
+    def merge(self, other: "QueueDepth") -> None:
+        self.pending += other.pending
+        self.due += other.due
+        if other.oldest_pending_at is not None and (
+            self.oldest_pending_at is None
+            or other.oldest_pending_at < self.oldest_pending_at
+        ):
+            self.oldest_pending_at = other.oldest_pending_at
+
+
+class DeliveryStats(BaseModel):
+    """The deliveries of a webhook or a platform since the start of the window."""
+
+    deliveries: int = 0
+    delivered: int = 0
+    dead_lettered: int = 0
+    # Logs per HTTP status of their last attempt, 0 when no response was received
+    statuses: Dict[int, int] = Field(default_factory=dict)
+    latency: LatencyHistogram = Field(default_factory=LatencyHistogram)
+    queue: QueueDepth = Field(default_factory=QueueDepth)
+
+    def merge(self, other: "DeliveryStats") -> None:
+        self.deliveries += other.deliveries
+        self.delivered += other.delivered
+        self.dead_lettered += other.dead_lettered
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.latency.merge(other.latency)
+        self.queue.merge(other.queue)
+
+    def summary(self, now: datetime) -> dict:
+        """The statistics as a JSON-friendly dict, with the latency percentiles."""
+        return {
+            "deliveries": self.deliveries,
+            "delivered": self.delivered,
+            "dead_lettered": self.dead_lettered,
+            "statuses": {
+                str(status): count for status, count in sorted(self.statuses.items())
+            },
+            "latency": {
+                "count": self.latency.count,
+                "avg_ms": self.latency.avg_ms,
+                "p50_ms": self.latency.percentile(50),
+                "p95_ms": self.latency.percentile(95),
+                "p99_ms": self.latency.percentile(99),
+                "max_ms": self.latency.max_ms,
+                "histogram": {
+                    _bucket_label(bucket): count
+                    for bucket, count in enumerate(self.latency.buckets)
+                },
+            },
+            "queue": {
+                "pending": self.queue.pending,
+                "due": self.queue.due,
+                "oldest_pending_age_seconds": self.queue.oldest_pending_age(now),
+            },
+        }
+
+
+class WebhookDeliveryStats(DeliveryStats):
+    id: EntityId
+    name: Optional[str] = None
+    platform: str
+    enabled: bool = True
+
+    def summary(self, now: datetime) -> dict:
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "platform": self.platform,
+            "enabled": self.enabled,
+            **super().summary(now),
+        }
+
+
+class WebhookStats(BaseModel):
+    """Delivery statistics per webhook and per platform, and of the whole queue."""
+
+    since: datetime
+    now: datetime
+    webhooks: List[WebhookDeliveryStats] = Field(default_factory=list)
+
+    @property
+    def platforms(self) -> Dict[str, DeliveryStats]:
+        platforms: Dict[str, DeliveryStats] = {}
+        for webhook in self.webhooks:
+            platforms.setdefault(webhook.platform, DeliveryStats()).merge(webhook)
+        return platforms
+
+    @property
+    def queue(self) -> QueueDepth:
+        queue = QueueDepth()
+        for webhook in self.webhooks:
+            queue.merge(webhook.queue)
+        return queue
+
+    def summary(self) -> dict:
+        queue = self.queue
+        return {
+            "since": self.since.isoformat(),
+            "queue": {
+                "pending": queue.pending,
+                "due": queue.due,
+                "oldest_pending_age_seconds": queue.oldest_pending_age(self.now),
+            },
+            "platforms": {
+                platform: stats.summary(self.now)
+                for platform, stats in sorted(self.platforms.items())
+            },
+            "webhooks": [webhook.summary(self.now) for webhook in self.webhooks],
+        }
+
+
+def _bucket_label(bucket: int) -> str:
+    if bucket < len(LATENCY_BUCKETS_MS):
+        return f"le_{LATENCY_BUCKETS_MS[bucket]}"
+    return f"gt_{LATENCY_BUCKETS_MS[-1]}"
+
+
+class WebhookStatsReadModel:
+    def __init__(self, session):
+        self._session = session
+
+    def delivery_stats(
+        self, days: float = 1, now: Optional[datetime] = None
+    ) -> WebhookStats:
+        """
+        The delivery statistics of every webhook.
+
+        Args:
+            days: Count the logs written in the last N days; the queue depth
+                counts every pending log
+            now: The time the window and the ages are counted from
+        """
+        now = now or datetime.now()
+        since = now - timedelta(days=days)
+        webhooks: Dict[str, WebhookDeliveryStats] = {}
+        for row in self._session.execute(
+            select(
+                Webhook.id, Webhook.name, Webhook.platform, Webhook.enabled
+            ).order_by(Webhook.created_at)
+        ):
+            webhooks[str(row.id)] = WebhookDeliveryStats(
+                id=row.id, name=row.name, platform=row.platform, enabled=row.enabled
+            )
+
+        def stats_of(webhook_id) -> Optional[WebhookDeliveryStats]:
+            return webhooks.get(str(webhook_id))
+
+        for row in self._session.execute(self._outcomes(since)):
+            stats = stats_of(row.webhook_id)
+            if stats is not None:
+                stats.deliveries += row.deliveries
+                stats.delivered += row.delivered or 0
+                stats.dead_lettered += row.dead_lettered or 0
+
+        for row in self._session.execute(self._statuses(since)):
+            stats = stats_of(row.webhook_id)
+            if stats is not None:
+                stats.statuses[row.http_status] = row.count
+
+        for row in self._session.execute(self._latencies(since)):
+            stats = stats_of(row.webhook_id)
+            if stats is not None:
+                stats.latency.add(row.bucket, row.count, row.total_ms or 0, row.max_ms)
+
+        for row in self._session.execute(self._queue(now)):
+            stats = stats_of(row.webhook_id)
+            if stats is not None:
+                stats.queue = QueueDepth(
+                    pending=row.pending,
+                    due=row.due or 0,
+                    oldest_pending_at=row.oldest_pending_at,
+                )
+
+        return WebhookStats(since=since, now=now, webhooks=list(webhooks.values()))
+
+    @staticmethod
+    def _outcomes(since: datetime):
+        dead_lettered = (WebhookLog.next_attempt_at.is_(None)) & (
+            WebhookLog.succeeded.is_(False)
+        )
+        return (
+            select(
+                WebhookLog.webhook_id,
+                func.count().label("deliveries"),
+                func.sum(case((WebhookLog.succeeded.is_(True), 1), else_=0)).label(
+                    "delivered"
+                ),
+                func.sum(case((dead_lettered, 1), else_=0)).label("dead_lettered"),
+            )
+            .where(WebhookLog.timestamp >= since)
+            .group_by(WebhookLog.webhook_id)
+        )
+
+    @staticmethod
+    def _statuses(since: datetime):
+        return (
+            select(
+                WebhookLog.webhook_id,
+                WebhookLog.http_status,
+                func.count().label("count"),
+            )
+            .where(WebhookLog.timestamp >= since, WebhookLog.http_status.is_not(None))
+            .group_by(WebhookLog.webhook_id, WebhookLog.http_status)
+        )
+
+    @staticmethod
+    def _latencies(since: datetime):
+        bucket = case(
+            *(
+                (WebhookLog.latency_ms <= bound, index)
+                for index, bound in enumerate(LATENCY_BUCKETS_MS)
+            ),
+            else_=len(LATENCY_BUCKETS_MS),
+        ).label("bucket")
+        # The logs merged into a digest have no latency of their own, only the
+        # log the request was sent for
+        return (
+            select(
+                WebhookLog.webhook_id,
+                bucket,
+                func.count().label("count"),
+                func.sum(WebhookLog.latency_ms).label("total_ms"),
+                func.max(WebhookLog.latency_ms).label("max_ms"),
+            )
+            .where(WebhookLog.timestamp >= since, WebhookLog.latency_ms.is_not(None))
+            .group_by(WebhookLog.webhook_id, bucket)
+        )
+
+    @staticmethod
+    def _queue(now: datetime):
+        return (
+            select(
+                WebhookLog.webhook_id,
+                func.count().label("pending"),
+                func.sum(case((WebhookLog.next_attempt_at <= now, 1), else_=0)).label(
+                    "due"
+                ),
+                func.min(WebhookLog.timestamp).label("oldest_pending_at"),
+            )
+            .where(WebhookLog.next_attempt_at.is_not(None))
+            .group_by(WebhookLog.webhook_id)
+        )
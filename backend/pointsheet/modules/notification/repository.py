@@ -3,14 +3,26 @@ from typing import List, Optional
 from lato import Query
 from sqlalchemy import select, and_, or_
 
-from modules.notification.data_mappers import WebhookModelMapper, WebhookSubscriptionModelMapper, WebhookLogModelMapper
+from modules.notification.data_mappers import (
+    WebhookModelMapper,
+    WebhookSubscriptionModelMapper,
+    WebhookLogModelMapper,
+    OutboxMessageModelMapper,
+)
 from modules.notification.domain.entity import Webhook as WebhookEntity
 from modules.notification.domain.entity import WebhookSubscription as WebhookSubscriptionEntity
 from modules.notification.domain.entity import WebhookLog as WebhookLogEntity
+from modules.notification.domain.entity import OutboxMessage as OutboxMessageEntity
 from modules.notification.domain.value_objects import WebhookEventType
-from pointsheet.models.notification import Webhook, WebhookSubscription, WebhookLog
+from pointsheet.models.notification import (
+    Webhook,
+    WebhookSubscription,
+    WebhookLog,
+    OutboxMessage,
+)
+from pointsheet.domain.responses import CursorPage
 from pointsheet.domain.types import EntityId
-from pointsheet.repository import AbstractRepository
+from pointsheet.repository import AbstractRepository, PageRequest
 
 
 class WebhookRepository(AbstractRepository[Webhook, WebhookEntity]):
@@ -171,11 +183,13 @@ class WebhookLogRepository(AbstractRepository[WebhookLog, WebhookLogEntity]):
     mapper_class = WebhookLogModelMapper
     model_class = WebhookLogEntity
 
-    def all(self, criteria: Optional[Query] = None) -> List[WebhookLogEntity]:
+    def all(
+        self, criteria: Optional[Query] = None, page: Optional[PageRequest] = None
+    ) -> CursorPage[WebhookLogEntity]:
         """
-        Get all webhook logs, optionally filtered by criteria.
+        Get a page of webhook logs, newest first, optionally filtered by criteria.
         """
-        stmt = select(WebhookLog).order_by(WebhookLog.timestamp.desc())
+        stmt = select(WebhookLog)
 
         if criteria and hasattr(criteria, "webhook_id") and criteria.webhook_id:
             # Filter by webhook ID
@@ -189,8 +203,12 @@ class WebhookLogRepository(AbstractRepository[WebhookLog, WebhookLogEntity]):
             # Filter by success status
             stmt = stmt.where(WebhookLog.succeeded == criteria.succeeded)
 
-        result = self._session.execute(stmt).scalars()
-        return [self._map_to_model(item) for item in result]
+        return self._paginate(
+            stmt,
+            page or PageRequest(),
+            keys=[WebhookLog.timestamp, WebhookLog.id],
+            descending=True,
+        )
 
     def find_by_id(self, id: EntityId) -> Optional[WebhookLogEntity]:
         """
@@ -208,3 +226,30 @@ class WebhookLogRepository(AbstractRepository[WebhookLog, WebhookLogEntity]):
         entity_to_delete = self._session.get(WebhookLog, id)
         if entity_to_delete:
             self._session.delete(entity_to_delete)
+
+
+class OutboxRepository(AbstractRepository[OutboxMessage, OutboxMessageEntity]):
+    """
+    Repository for the notification outbox. Messages are only added here,
+    ``OutboxRelay`` turns them into webhook logs.
+    """
+
+    mapper_class = OutboxMessageModelMapper
+    model_class = OutboxMessageEntity
+
+    def find_by_id(self, id: EntityId) -> Optional[OutboxMessageEntity]:
+        """
+        Find an outbox message by ID.
+        """
+        result = self._session.get(OutboxMessage, id)
+        if result:
+            return self._map_to_model(result)
+        return None
+
+    def delete(self, id: EntityId) -> None:
+        """
+        Delete an outbox message by ID.
+        """
+        entity_to_delete = self._session.get(OutboxMessage, id)
+        if entity_to_delete:
+            self._session.delete(entity_to_delete)
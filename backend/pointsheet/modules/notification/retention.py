@@ -0,0 +1,313 @@
+"""
+Retention of webhook logs.
+
+Finished logs are archived to gzipped NDJSON and deleted once they are older
+than the ``RetentionPolicy`` allows.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import String, and_, delete, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from pointsheet.db import get_session
+from pointsheet.models.notification import (
+    Webhook,
+    WebhookLog as WebhookLogModel,
+    WebhookSubscription,
+)
+
+# The columns of a log kept in an archive, besides its payload
+ARCHIVED_COLUMNS = (
+    "id",
+    "webhook_id",
+    "subscription_id",
+    "http_status",
+    "response_body",
+    "succeeded",
+    "timestamp",
+    "attempts",
+    "last_error_class",
+    "digest_key",
+)
+
+# The id as stored, the logs are deleted by it whatever form it was written in
+_STORED_ID = type_coerce(WebhookLogModel.id, String)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    How long finished webhook logs are kept, counted from when they were
+    written. Logs still in the due-queue or claimed by a daemon are kept
+    whatever their age.
+    """
+
+    keep_successes_days: float = 7
+    keep_failures_days: float = 30
+
+    def expired(self, now: Optional[datetime] = None):
+        """Condition of the logs to archive and delete."""
+        now = now or datetime.now()
+        return and_(
+            WebhookLogModel.next_attempt_at.is_(None),
+            WebhookLogModel.claimed_by.is_(None),
+            or_(
+                and_(
+                    WebhookLogModel.succeeded.is_(True),
+                    WebhookLogModel.timestamp
+                    < now - timedelta(days=self.keep_successes_days),
+                ),
+                and_(
+                    WebhookLogModel.succeeded.is_(False),
+                    WebhookLogModel.timestamp
+                    < now - timedelta(days=self.keep_failures_days),
+                ),
+            ),
+        )
+
+
+def payload_hash(payload: Any) -> str:
+    """The hash of a payload's content, the same for equal payloads whatever their key order."""
+    content = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class WebhookLogArchive:
+    """
+    A gzipped NDJSON file of archived webhook logs.
+
+    Each line is a record. A ``payload`` record holds a distinct payload of a
+    platform and event with its ``hash``; it comes before the first ``log``
+    record whose ``payload_hash`` refers to it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write the archive. It is written to a temporary file that replaces
+        the archive once it is complete, so a failed write leaves no archive
+        behind.
+
+        Args:
+            rows: The logs, each with its ``payload``, ``platform`` and ``event_type``
+
+        Returns:
+            The number of logs written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".part")
+        seen: Set[Tuple[Optional[str], Optional[str], str]] = set()
+        count = 0
+        try:
+            with open(partial, "wb") as file:
+                with gzip.GzipFile(fileobj=file, mode="wb") as archive:
+                    for row in rows:
+                        digest = payload_hash(row["payload"])
+                        key = (row["platform"], row["event_type"], digest)
+                        if key not in seen:
+                            seen.add(key)
+                            archive.write(
+                                self._line(
+                                    {
+                                        "record": "payload",
+                                        "hash": digest,
+                                        "platform": row["platform"],
+                                        "event_type": row["event_type"],
+                                        "payload": row["payload"],
+                                    }
+                                )
+                            )
+                        log = {column: row[column] for column in ARCHIVED_COLUMNS}
+                        archive.write(
+                            self._line(dict(log, record="log", payload_hash=digest))
+                        )
+                        count += 1
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(partial, self.path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return count
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read the logs of the archive back, each with its payload.
+
+        Returns:
+            An iterator over the archived logs
+        """
+        payloads: Dict[str, Any] = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                record = json.loads(line)
+                if record.pop("record") == "payload":
+                    payloads[record["hash"]] = record["payload"]
+                    continue
+                record["payload"] = payloads[record.pop("payload_hash")]
+                yield record
+
+    @staticmethod
+    def _line(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, default=str) + "\n").encode("utf-8")
+
+
+@dataclass(frozen=True)
+class PruneResult:
+    """The outcome of a prune: the logs archived, the logs deleted and the archive written, if any."""
+
+    archived: int
+    deleted: int
+    path: Optional[Path] = None
+
+
+class WebhookLogPruner:
+    """
+    Archives and deletes the webhook logs a ``RetentionPolicy`` expired.
+
+    The expired logs are read with ``yield_per``, ``batch_size`` rows at a
+    time, and written to the archive as they come, so a large backlog is
+    never held in memory; only the ids are. The logs are deleted after the
+    archive is complete, ``batch_size`` at a time with one commit each, and
+    only while they still match the policy: a log retried by ID in the
+    meantime is kept.
+    """
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        logger: Optional[logging.Logger] = None,
+        policy: Optional[RetentionPolicy] = None,
+        archive_dir: Optional[str] = "instance/webhook_archives",
+        batch_size: int = 500,
+    ):
+        """
+        Initialize the pruner.
+
+        Args:
+            session: The database session to use
+            logger: The logger to use
+            policy: How long logs are kept
+            archive_dir: Directory the archives are written to, None to delete without archiving
+            batch_size: Number of logs read and deleted at a time
+        """
+        self.session = session or next(get_session())
+        self.logger = logger or logging.getLogger(__name__)
+        self.policy = policy or RetentionPolicy()
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.batch_size = batch_size
+
+    def count_expired(self, now: Optional[datetime] = None) -> Dict[bool, int]:
+        """
+        Count the expired logs.
+
+        Returns:
+            The number of expired logs, keyed by whether they succeeded
+        """
+        rows = self.session.execute(
+            select(WebhookLogModel.succeeded, func.count())
+            .where(self.policy.expired(now))
+            .group_by(WebhookLogModel.succeeded)
+        )
+        counts = {True: 0, False: 0}
+        counts.update({bool(succeeded): count for succeeded, count in rows})
+        return counts
+
+    def prune(self, now: Optional[datetime] = None) -> PruneResult:
+        """
+        Archive the expired logs, then delete them.
+
+        Args:
+            now: The time the logs' age is counted from
+
+        Returns:
+            What was archived and deleted
+        """
+        now = now or datetime.now()
+        ids: List[Any] = []
+        path = None
+        archived = 0
+
+        if self.archive_dir is None:
+            ids = list(
+                self.session.scalars(select(_STORED_ID).where(self.policy.expired(now)))
+            )
+        else:
+            rows = self._expired_rows(now, ids)
+            first = next(rows, None)
+            if first is not None:
+                path = self.archive_dir / f"webhook_logs-{now:%Y%m%dT%H%M%S}.ndjson.gz"
+                archived = WebhookLogArchive(path).write(_chain(first, rows))
+                self.logger.info(f"Archived {archived} webhook logs to {path}")
+
+        deleted = 0
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start : start + self.batch_size]
+            result = self.session.execute(
+                delete(WebhookLogModel).where(
+                    _STORED_ID.in_(chunk), self.policy.expired(now)
+                )
+            )
+            self.session.commit()
+            deleted += result.rowcount
+        if deleted:
+            self.logger.info(f"Deleted {deleted} expired webhook logs")
+        return PruneResult(archived, deleted, path)
+
+    def compact(self) -> bool:
+        """
+        Give the space of the deleted rows back to the file system. Only
+        SQLite is compacted, with ``VACUUM``; other databases reclaim it on
+        their own.
+
+        Returns:
+            True if the database was compacted
+        """
+        bind = self.session.get_bind()
+        if bind.dialect.name != "sqlite":
+            return False
+        self.session.commit()
+        with bind.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            connection.exec_driver_sql("VACUUM")
+        return True
+
+    def _expired_rows(self, now: datetime, ids: List[Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the expired logs with their platform and event type, collecting their ids."""
+        stmt = (
+            select(
+                *(getattr(WebhookLogModel, column) for column in ARCHIVED_COLUMNS),
+                WebhookLogModel.payload,
+                _STORED_ID.label("stored_id"),
+                Webhook.platform,
+                WebhookSubscription.event_type,
+            )
+            .outerjoin(Webhook, Webhook.id == WebhookLogModel.webhook_id)
+            .outerjoin(
+                WebhookSubscription,
+                WebhookSubscription.id == WebhookLogModel.subscription_id,
+            )
+            .where(self.policy.expired(now))
+            .order_by(WebhookLogModel.timestamp)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for row in self.session.execute(stmt):
+            ids.append(row.stored_id)
+            yield row._asdict()
+
+
+def _chain(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
@@ -0,0 +1,295 @@
+"""
+Routing of domain events to the webhooks subscribed to them.
+
+``SubscriptionRoutes`` keeps the subscriptions in memory, compiled per event
+and resource to the enabled webhooks they deliver to.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.notification.domain.entity import Webhook, WebhookSubscription
+from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from modules.notification.formatters import WebhookDigestFormatter, WebhookFormatter
+from modules.notification.formatters.registry import formatter_registry
+from pointsheet.cache import query_cache
+from pointsheet.domain.types import EntityId
+
+ROUTES_TAG = "webhook_routes"
+
+# (event type, resource type, resource id), the last two None for subscriptions to every resource
+RouteKey = Tuple[str, Optional[str], Optional[str]]
+
+
+@dataclass(frozen=True)
+class Route:
+    """A subscription and the enabled webhook it delivers to."""
+
+    subscription_id: EntityId
+    webhook: Webhook
+
+
+@dataclass(frozen=True)
+class RouteSet:
+    """
+    The routes of a key. ``subscribed`` is set when any subscription has the
+    key, even when none of their webhooks is enabled: such a key doesn't fall
+    back to the default subscriptions.
+    """
+
+    subscribed: bool
+    routes: Tuple[Route, ...]
+
+
+_UNSUBSCRIBED = RouteSet(False, ())
+
+
+def _route_key(subscription: WebhookSubscription) -> RouteKey:
+    resource_id = (
+        str(subscription.resource_id) if subscription.resource_id is not None else None
+    )
+    return subscription.event_type.value, subscription.resource_type, resource_id
+
+
+def _is_default(subscription: WebhookSubscription) -> bool:
+    return subscription.resource_type is None and subscription.resource_id is None
+
+
+class SubscriptionRoutes:
+    """
+    In-memory routing table from domain events to webhooks.
+
+    The table is reloaded when the ``webhook_routes`` tag of the query cache
+    moved past the version it was built at, or once it is ``max_age`` seconds
+    old: the versions of the memory backend don't leave the process.
+    """
+
+    def __init__(
+        self, max_age: float = 300, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._version: Optional[int] = None
+        # Keyed by the string form of the ids, entities hold either UUIDs or strings
+        self._webhooks: Dict[str, Webhook] = {}
+        self._subscriptions: Dict[str, WebhookSubscription] = {}
+        self._routes: Dict[RouteKey, RouteSet] = {}
+        self._defaults: Tuple[Route, ...] = ()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def routes(
+        self,
+        event_type: WebhookEventType,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[EntityId] = None,
+        load: Optional[
+            Callable[[], Tuple[List[Webhook], List[WebhookSubscription]]]
+        ] = None,
+    ) -> Tuple[Route, ...]:
+        """
+        Find the routes of an event, most specific subscriptions first.
+
+        Subscriptions to the resource, to its type and to the event type all
+        apply. When there are none, the event goes to the default
+        subscriptions: those to any event type that don't name a resource.
+
+        Args:
+            event_type: The type of event
+            resource_type: Optional resource type (e.g., "Event", "Series")
+            resource_id: Optional resource ID
+            load: Returns every webhook and subscription, called when the
+                table has to be (re)loaded
+
+        Returns:
+            The routes to create delivery logs for
+        """
+        if load is not None and not self._current():
+            # Read the version first: a change committed while loading leaves the table stale
+            version = self._tag_version()
+            self._replace(*load(), version=version)
+
+        keys = []
+        if resource_type and resource_id:
+            keys.append((event_type.value, resource_type, str(resource_id)))
+        if resource_type:
+            keys.append((event_type.value, resource_type, None))
+        keys.append((event_type.value, None, None))
+
+        route_sets = [self._routes.get(key, _UNSUBSCRIBED) for key in keys]
+        if not any(route_set.subscribed for route_set in route_sets):
+            return self._defaults
+        if len(route_sets) == 1:
+            return route_sets[0].routes
+        return tuple(route for route_set in route_sets for route in route_set.routes)
+
+    @staticmethod
+    def formatter(platform: WebhookPlatform, event_type_name: str) -> WebhookFormatter:
+        """
+        The formatter of a platform and event.
+
+        Raises:
+            ValueError: If the platform is not supported
+        """
+        return formatter_registry.formatter(platform, event_type_name)
+
+    @staticmethod
+    def digest_formatter(platform: WebhookPlatform) -> Optional[WebhookDigestFormatter]:
+        """The digest formatter of a platform, None if its messages can't be merged."""
+        return formatter_registry.digest_formatter(platform)
+
+    def reload(
+        self, webhooks: List[Webhook], subscriptions: List[WebhookSubscription]
+    ) -> None:
+        """Replace the table with the given webhooks and subscriptions."""
+        self._replace(webhooks, subscriptions, version=self._tag_version())
+
+    def apply(self, changes: "PendingRouteChanges") -> None:
+        """
+        Apply the changes of a committed transaction and tell the other
+        processes about them.
+        """
+        before = self._tag_version()
+        query_cache.invalidate(ROUTES_TAG)
+        after = self._tag_version()
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if before != self._version or (after is not None and after != before + 1):
+                # Another process changed the routes as well, load them again
+                self._loaded_at = None
+                return
+            for change in changes.changes:
+                change(self)
+            self._version = after
+
+    def clear(self) -> None:
+        """Forget the routes, they are loaded again on next use."""
+        with self._lock:
+            self._loaded_at = None
+            self._webhooks = {}
+            self._subscriptions = {}
+            self._routes = {}
+            self._defaults = ()
+
+    def save_webhook(self, webhook: Webhook) -> None:
+        self._webhooks[str(webhook.id)] = webhook
+        self._recompile_webhook(webhook.id)
+
+    def delete_webhook(self, webhook_id: EntityId) -> None:
+        self._webhooks.pop(str(webhook_id), None)
+        self._recompile_webhook(webhook_id)
+
+    def save_subscription(self, subscription: WebhookSubscription) -> None:
+        previous = self._subscriptions.get(str(subscription.id))
+        self._subscriptions[str(subscription.id)] = subscription
+        keys = {_route_key(subscription)}
+        if previous is not None:
+            keys.add(_route_key(previous))
+        for key in keys:
+            self._compile(key)
+        if _is_default(subscription) or (
+            previous is not None and _is_default(previous)
+        ):
+            self._compile_defaults()
+
+    def delete_subscription(self, subscription_id: EntityId) -> None:
+        subscription = self._subscriptions.pop(str(subscription_id), None)
+        if subscription is None:
+            return
+        self._compile(_route_key(subscription))
+        if _is_default(subscription):
+            self._compile_defaults()
+
+    def _replace(self, webhooks, subscriptions, version: Optional[int]) -> None:
+        with self._lock:
+            self._webhooks = {str(webhook.id): webhook for webhook in webhooks}
+            self._subscriptions = {
+                str(subscription.id): subscription for subscription in subscriptions
+            }
+            by_key = defaultdict(list)
+            for subscription in subscriptions:
+                by_key[_route_key(subscription)].append(subscription)
+            self._routes = {
+                key: RouteSet(True, self._resolve(matching))
+                for key, matching in by_key.items()
+            }
+            self._compile_defaults()
+            self._version = version
+            self._loaded_at = self._clock()
+
+    def _current(self) -> bool:
+        if self._loaded_at is None or self._clock() - self._loaded_at > self.max_age:
+            return False
+        return self._tag_version() == self._version
+
+    @staticmethod
+    def _tag_version() -> Optional[int]:
+        backend = query_cache.backend
+        if backend is None:
+            return None
+        return backend.versions((ROUTES_TAG,))[ROUTES_TAG]
+
+    def _resolve(self, subscriptions) -> Tuple[Route, ...]:
+        routes = []
+        for subscription in subscriptions:
+            webhook = self._webhooks.get(str(subscription.webhook_id))
+            if webhook is not None and webhook.enabled:
+                routes.append(Route(subscription.id, webhook))
+        return tuple(routes)
+
+    def _compile(self, key: RouteKey) -> None:
+        subscriptions = [
+            s for s in self._subscriptions.values() if _route_key(s) == key
+        ]
+        if subscriptions:
+            self._routes[key] = RouteSet(True, self._resolve(subscriptions))
+        else:
+            self._routes.pop(key, None)
+
+    def _compile_defaults(self) -> None:
+        self._defaults = self._resolve(
+            s for s in self._subscriptions.values() if _is_default(s)
+        )
+
+    def _recompile_webhook(self, webhook_id: EntityId) -> None:
+        subscriptions = [
+            s
+            for s in self._subscriptions.values()
+            if str(s.webhook_id) == str(webhook_id)
+        ]
+        for key in {_route_key(subscription) for subscription in subscriptions}:
+            self._compile(key)
+        if any(_is_default(subscription) for subscription in subscriptions):
+            self._compile_defaults()
+
+
+class PendingRouteChanges:
+    """Changes to the routing table to apply once the current transaction has committed."""
+
+    def __init__(self):
+        self.changes: List[Callable[[SubscriptionRoutes], None]] = []
+
+    def save_webhook(self, webhook: Webhook) -> None:
+        webhook = webhook.model_copy(deep=True)
+        self.changes.append(lambda routes: routes.save_webhook(webhook))
+
+    def delete_webhook(self, webhook_id: EntityId) -> None:
+        self.changes.append(lambda routes: routes.delete_webhook(webhook_id))
+
+    def save_subscription(self, subscription: WebhookSubscription) -> None:
+        subscription = subscription.model_copy(deep=True)
+        self.changes.append(lambda routes: routes.save_subscription(subscription))
+
+    def delete_subscription(self, subscription_id: EntityId) -> None:
+        self.changes.append(lambda routes: routes.delete_subscription(subscription_id))
+
+
+subscription_routes = SubscriptionRoutes()
@@ -1,68 +1,193 @@
 import logging
-import sys
+import random
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Callable
+from urllib.parse import urlsplit
 
 import requests
-from sqlalchemy import select
+from requests.adapters import HTTPAdapter
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from pointsheet.db import get_session
-from modules.notification.domain.entity import WebhookLog
 from modules.notification.domain.value_objects import WebhookPlatform
-from modules.notification.formatters import WebhookFormatterFactory
 from pointsheet.models.notification import Webhook, WebhookSubscription, WebhookLog as WebhookLogModel
 
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When a failed webhook delivery is tried again.
+
+    The n-th retry waits ``base_delay * 2 ** (n - 1)`` seconds, capped at
+    ``max_delay``. Half of that wait is fixed and half is random, so the
+    deliveries of a batch that failed together do not all come back to the
+    endpoint at the same moment. A delivery is dead-lettered, it keeps its log
+    but leaves the due-queue, after ``max_attempts`` attempts or as soon as
+    the endpoint rejects it for good (a 4xx other than 408, 425 and 429).
+    """
+
+    max_attempts: int = 8
+    base_delay: float = 30.0
+    max_delay: float = 6 * 60 * 60.0
+    jitter: Callable[[], float] = field(default=random.random, compare=False)
+
+    RETRYABLE_STATUSES = frozenset({408, 425, 429})
+
+    def is_retryable(self, status_code: int, error: Optional[Exception] = None) -> bool:
+        """
+        Whether a failed attempt may succeed when tried again.
+
+        Args:
+            status_code: The HTTP status code, 0 if no response was received
+            error: The error raised while sending, if any
+
+        Returns:
+            True if the delivery should be retried
+        """
+        return (
+            error is not None
+            or status_code >= 500
+            or status_code in self.RETRYABLE_STATUSES
+        )
+
+    def next_attempt_at(
+        self,
+        attempts: int,
+        status_code: int,
+        error: Optional[Exception] = None,
+        now: Optional[datetime] = None,
+    ) -> Optional[datetime]:
+        """
+        When to try a failed delivery again.
+
+        Args:
+            attempts: The number of attempts made, including the failed one
+            status_code: The HTTP status code of the failed attempt, 0 if no response was received
+            error: The error raised while sending, if any
+            now: The time of the failed attempt
+
+        Returns:
+            The time of the next attempt, or None if the delivery is dead-lettered
+        """
+        if attempts >= self.max_attempts or not self.is_retryable(status_code, error):
+            return None
+
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return (now or datetime.now()) + timedelta(
+            seconds=delay / 2 + self.jitter() * delay / 2
+        )
+
+
+def error_class(status_code: int, error: Optional[Exception] = None) -> Optional[str]:
+    """
+    Classify the outcome of a delivery attempt, None if it succeeded.
+
+    Args:
+        status_code: The HTTP status code, 0 if no response was received
+        error: The error raised while sending, if any
+
+    Returns:
+        The class name of the error, or ``HTTP <status>`` for an error response
+    """
+    if error is not None:
+        return type(error).__name__
+    if 200 <= status_code < 300:
+        return None
+    return f"HTTP {status_code}"
+
+
+def elapsed_ms(started: float) -> int:
+    """Milliseconds since a ``time.perf_counter()`` reading, the latency of a delivery attempt."""
+    return round((time.perf_counter() - started) * 1000)
+
+
+def due(now: datetime):
+    """Condition of the logs in the due-queue that nobody holds a lease on."""
+    return and_(
+        WebhookLogModel.next_attempt_at <= now,
+        or_(
+            WebhookLogModel.lease_expires_at.is_(None),
+            WebhookLogModel.lease_expires_at < now,
+        ),
+    )
+
+
 class WebhookLogService:
     """
     Service for managing webhook logs.
     
     This service provides methods for finding, listing, and updating webhook logs.
     """
-    
-    def __init__(self, session: Optional[Session] = None, logger: Optional[logging.Logger] = None):
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        logger: Optional[logging.Logger] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         """
         Initialize the webhook log service.
         
         Args:
             session: The database session to use
             logger: The logger to use
+            retry_policy: When failed deliveries are tried again
         """
         self.session = session or next(get_session())
         self.logger = logger or logging.getLogger(__name__)
+        self.retry_policy = retry_policy or RetryPolicy()
     
     def find_pending_logs(self, limit: int = 50) -> List[WebhookLogModel]:
         """
-        Find pending webhook logs.
-        
+        Find the webhook logs of enabled webhooks that are due to be sent,
+        first due first.
+
         Args:
             limit: Maximum number of logs to return
-            
+
         Returns:
-            A list of pending webhook logs
+            A list of due webhook logs
         """
-        stmt = select(WebhookLogModel).where(
-            WebhookLogModel.succeeded == False,
-            WebhookLogModel.http_status.is_(None)
-        ).limit(limit)
+        stmt = (
+            select(WebhookLogModel)
+            .join(Webhook, Webhook.id == WebhookLogModel.webhook_id)
+            .where(due(datetime.now()), Webhook.enabled.is_(True))
+            .order_by(WebhookLogModel.next_attempt_at)
+            .limit(limit)
+        )
         
         return self.session.execute(stmt).scalars().all()
     
     def find_failed_logs(self, limit: int = 10) -> List[WebhookLogModel]:
         """
-        Find failed webhook logs.
-        
+        Find the failed webhook logs of enabled webhooks that are due to be
+        retried, first due first.
+
+        Dead-lettered logs are not returned, retry them one by one by ID. The
+        logs of disabled webhooks wait for their webhook to be enabled again,
+        without holding back the others.
+
         Args:
             limit: Maximum number of logs to return
-            
+
         Returns:
             A list of failed webhook logs
         """
-        stmt = select(WebhookLogModel).where(
-            WebhookLogModel.succeeded == False,
-            WebhookLogModel.http_status.isnot(None)  # Only logs that have been attempted
-        ).limit(limit)
+        stmt = (
+            select(WebhookLogModel)
+            .join(Webhook, Webhook.id == WebhookLogModel.webhook_id)
+            .where(
+                due(datetime.now()),
+                WebhookLogModel.attempts > 0,
+                Webhook.enabled.is_(True),
+            )
+            .order_by(WebhookLogModel.next_attempt_at)
+            .limit(limit)
+        )
         
         return self.session.execute(stmt).scalars().all()
     
@@ -114,11 +239,12 @@ class WebhookLogService:
         return self.session.execute(stmt).scalars().all()
     
     def update_log_with_response(
-        self, 
-        log: WebhookLogModel, 
-        status_code: int, 
-        response_body: str, 
-        succeeded: bool
+        self,
+        log: WebhookLogModel,
+        status_code: int,
+        response_body: str,
+        succeeded: bool,
+        latency_ms: Optional[int] = None,
     ) -> WebhookLogModel:
         """
         Update a webhook log with a response.
@@ -128,6 +254,7 @@ class WebhookLogService:
             status_code: The HTTP status code
             response_body: The response body
             succeeded: Whether the webhook was delivered successfully
+            latency_ms: Milliseconds the attempt took
             
         Returns:
             The updated webhook log
@@ -135,19 +262,24 @@ class WebhookLogService:
         log.http_status = status_code
         log.response_body = response_body[:1000]  # Limit response body size
         log.succeeded = succeeded
+        log.latency_ms = latency_ms
+        self._record_attempt(log, status_code)
         
         self.session.add(log)
         self.session.commit()
         
         return log
-    
-    def update_log_with_error(self, log: WebhookLogModel, error: Exception) -> WebhookLogModel:
+
+    def update_log_with_error(
+        self, log: WebhookLogModel, error: Exception, latency_ms: Optional[int] = None
+    ) -> WebhookLogModel:
         """
         Update a webhook log with an error.
         
         Args:
             log: The webhook log to update
             error: The error that occurred
+            latency_ms: Milliseconds the attempt took until it failed
             
         Returns:
             The updated webhook log
@@ -155,12 +287,28 @@ class WebhookLogService:
         log.http_status = 0
         log.response_body = str(error)
         log.succeeded = False
+        log.latency_ms = latency_ms
+        self._record_attempt(log, 0, error)
         
         self.session.add(log)
         self.session.commit()
         
         return log
-    
+
+    def _record_attempt(
+        self, log: WebhookLogModel, status_code: int, error: Optional[Exception] = None
+    ) -> None:
+        """Count an attempt and schedule the next one, if the log needs one."""
+        log.attempts = (log.attempts or 0) + 1
+        log.claimed_by = None
+        log.lease_expires_at = None
+        log.last_error_class = error_class(status_code, error)
+        log.next_attempt_at = (
+            None
+            if log.succeeded
+            else self.retry_policy.next_attempt_at(log.attempts, status_code, error)
+        )
+
     def get_webhook_for_log(self, log: WebhookLogModel) -> Optional[Webhook]:
         """
         Get the webhook configuration for a log.
@@ -189,33 +337,85 @@ class WebhookLogService:
         return self.session.get(WebhookSubscription, log.subscription_id)
 
 
+class HostSessions:
+    """
+    One keep-alive HTTP session per target host.
+
+    A webhook delivery to a host that was already sent to reuses an open
+    connection instead of paying for a new TCP and TLS handshake.
+    """
+
+    def __init__(self, pool_size: int = 4):
+        """
+        Initialize the sessions.
+
+        Args:
+            pool_size: Connections kept open per host, match the per-host limit
+        """
+        self._pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> requests.Session:
+        """
+        Get the session for the host of a URL.
+
+        Args:
+            url: The URL to send to
+
+        Returns:
+            The session of the host
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self) -> None:
+        """Close the connections of every host."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
 class WebhookSenderService:
     """
     Service for sending webhooks.
     
     This service provides methods for sending webhooks to their destinations.
     """
-    
-    def __init__(self, logger: Optional[logging.Logger] = None):
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        sessions: Optional[HostSessions] = None,
+    ):
         """
         Initialize the webhook sender service.
         
         Args:
             logger: The logger to use
+            sessions: Keep-alive sessions per host, without them every webhook opens a new connection
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.sessions = sessions
     
-    def send_webhook(self, webhook: Webhook, payload: Dict[str, Any], timeout: int = 10) -> requests.Response:
+    def build_headers(self, webhook: Webhook) -> Dict[str, str]:
         """
-        Send a webhook notification.
+        Build the HTTP headers of a webhook notification.
         
         Args:
             webhook: The webhook configuration
-            payload: The payload to send
-            timeout: The HTTP request timeout in seconds
             
         Returns:
-            The HTTP response
+            The headers to send
         """
         headers = {
             "Content-Type": "application/json"
@@ -237,214 +437,49 @@ class WebhookSenderService:
                 # Generic auth
                 headers["Authorization"] = webhook.secret
         
-        # Send the request
-        self.logger.debug(f"Sending webhook to {webhook.target_url}")
-        response = requests.post(
-            webhook.target_url,
-            json=payload,
-            headers=headers,
-            timeout=timeout
-        )
-        self.logger.debug(f"Received response with status code {response.status_code}")
-        
-        return response
+        return headers
 
-
-class WebhookProcessorService:
-    """
-    Service for processing webhooks.
-    
-    This service provides methods for processing pending webhooks and retrying failed webhooks.
-    """
-    
-    def __init__(
-        self, 
-        log_service: Optional[WebhookLogService] = None,
-        sender_service: Optional[WebhookSenderService] = None,
-        session: Optional[Session] = None,
-        logger: Optional[logging.Logger] = None
-    ):
-        """
-        Initialize the webhook processor service.
-        
-        Args:
-            log_service: The webhook log service to use
-            sender_service: The webhook sender service to use
-            session: The database session to use
-            logger: The logger to use
+    def post(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: int = 10,
+    ) -> requests.Response:
         """
-        self.session = session or next(get_session())
-        self.logger = logger or logging.getLogger(__name__)
-        self.log_service = log_service or WebhookLogService(self.session, self.logger)
-        self.sender_service = sender_service or WebhookSenderService(self.logger)
-    
-    def process_pending_webhooks(self, limit: int = 50, timeout: int = 10, dry_run: bool = False) -> Tuple[int, int]:
-        """
-        Process pending webhook notifications.
-        
+        Post a payload to a URL.
+
         Args:
-            limit: Maximum number of webhooks to process
-            timeout: HTTP request timeout in seconds
-            dry_run: Don't actually send webhooks, just log what would be sent
-            
+            url: The target URL
+            headers: The HTTP headers
+            payload: The payload to send
+            timeout: The HTTP request timeout in seconds
+
         Returns:
-            A tuple of (success_count, failure_count)
-        """
-        success_count = 0
-        failure_count = 0
-        
-        try:
-            # Find pending webhook logs
-            pending_logs = self.log_service.find_pending_logs(limit)
-            
-            if not pending_logs:
-                self.logger.info("No pending webhook notifications found.")
-                return success_count, failure_count
-            
-            self.logger.info(f"Found {len(pending_logs)} pending webhook notifications.")
-            
-            for log_model in pending_logs:
-                # Get the webhook configuration
-                webhook = self.log_service.get_webhook_for_log(log_model)
-                if not webhook:
-                    self.logger.warning(f"Webhook {log_model.webhook_id} not found for log {log_model.id}")
-                    continue
-                
-                if not webhook.enabled:
-                    self.logger.info(f"Skipping disabled webhook {webhook.id}")
-                    continue
-                
-                # Get the subscription if available
-                subscription = self.log_service.get_subscription_for_log(log_model)
-                
-                # Log what we're about to do
-                self.logger.info(f"Processing webhook log {log_model.id} for webhook {webhook.id} ({webhook.platform})")
-                
-                if dry_run:
-                    self.logger.info(f"DRY RUN: Would send to {webhook.target_url}")
-                    continue
-                
-                try:
-                    # Send the webhook
-                    response = self.sender_service.send_webhook(webhook, log_model.payload, timeout)
-                    
-                    # Update the log with the response
-                    succeeded = 200 <= response.status_code < 300
-                    self.log_service.update_log_with_response(
-                        log_model, 
-                        response.status_code, 
-                        response.text, 
-                        succeeded
-                    )
-                    
-                    if succeeded:
-                        success_count += 1
-                        self.logger.info(f"Webhook {log_model.id} sent with status {response.status_code}")
-                    else:
-                        failure_count += 1
-                        self.logger.warning(f"Webhook {log_model.id} failed with status {response.status_code}")
-                except Exception as e:
-                    # Log the error and update the log
-                    failure_count += 1
-                    self.logger.error(f"Error sending webhook {log_model.id}: {str(e)}")
-                    self.log_service.update_log_with_error(log_model, e)
-        
-        except Exception as e:
-            self.logger.error(f"Error processing webhooks: {str(e)}")
-            self.session.rollback()
-        
-        return success_count, failure_count
-    
-    def retry_webhook(self, log_id: str, timeout: int = 10) -> bool:
+            The HTTP response
         """
-        Retry a specific webhook delivery.
-        
-        Args:
-            log_id: The ID of the webhook log to retry
-            timeout: HTTP request timeout in seconds
-            
-        Returns:
-            True if the webhook was sent successfully, False otherwise
-        """
-        try:
-            # Find the webhook log
-            log_model = self.log_service.find_log_by_id(log_id)
-            if not log_model:
-                self.logger.warning(f"Webhook log {log_id} not found.")
-                return False
-            
-            # Get the webhook configuration
-            webhook = self.log_service.get_webhook_for_log(log_model)
-            if not webhook:
-                self.logger.warning(f"Webhook {log_model.webhook_id} not found for log {log_model.id}")
-                return False
-            
-            if not webhook.enabled:
-                self.logger.info(f"Skipping disabled webhook {webhook.id}")
-                return False
-            
-            self.logger.info(f"Retrying webhook log {log_model.id}...")
-            
-            try:
-                # Send the webhook
-                response = self.sender_service.send_webhook(webhook, log_model.payload, timeout)
-                
-                # Update the log with the response
-                succeeded = 200 <= response.status_code < 300
-                self.log_service.update_log_with_response(
-                    log_model, 
-                    response.status_code, 
-                    response.text, 
-                    succeeded
-                )
-                
-                status = "succeeded" if succeeded else "failed"
-                self.logger.info(f"Webhook {log_model.id} retry {status} with status {response.status_code}")
-                
-                return succeeded
-            except Exception as e:
-                # Log the error and update the log
-                self.logger.error(f"Error retrying webhook {log_model.id}: {str(e)}")
-                self.log_service.update_log_with_error(log_model, e)
-                return False
+        post = self.sessions.for_url(url).post if self.sessions else requests.post
+
+        self.logger.debug(f"Sending webhook to {url}")
+        response = post(url, json=payload, headers=headers, timeout=timeout)
+        self.logger.debug(f"Received response with status code {response.status_code}")
         
-        except Exception as e:
-            self.logger.error(f"Error retrying webhook: {str(e)}")
-            self.session.rollback()
-            return False
-    
-    def retry_failed_webhooks(self, limit: int = 10, timeout: int = 10) -> Tuple[int, int]:
+        return response
+
+    def send_webhook(
+        self, webhook: Webhook, payload: Dict[str, Any], timeout: int = 10
+    ) -> requests.Response:
         """
-        Retry failed webhook deliveries.
-        
+        Send a webhook notification.
+
         Args:
-            limit: Maximum number of webhooks to retry
-            timeout: HTTP request timeout in seconds
-            
+            webhook: The webhook configuration
+            payload: The payload to send
+            timeout: The HTTP request timeout in seconds
+
         Returns:
-            A tuple of (success_count, failure_count)
+            The HTTP response
         """
-        success_count = 0
-        failure_count = 0
-        
-        try:
-            # Find failed webhook logs
-            logs_to_retry = self.log_service.find_failed_logs(limit)
-            
-            if not logs_to_retry:
-                self.logger.info("No failed webhook logs to retry.")
-                return success_count, failure_count
-            
-            self.logger.info(f"Retrying {len(logs_to_retry)} webhook logs...")
-            
-            for log_model in logs_to_retry:
-                if self.retry_webhook(log_model.id, timeout):
-                    success_count += 1
-                else:
-                    failure_count += 1
-        
-        except Exception as e:
-            self.logger.error(f"Error retrying webhooks: {str(e)}")
-            self.session.rollback()
-        
-        return success_count, failure_count
\ No newline at end of file
+        return self.post(
+            webhook.target_url, self.build_headers(webhook), payload, timeout
+        )
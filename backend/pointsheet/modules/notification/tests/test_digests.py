@@ -0,0 +1,143 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select, update
+
+from modules import application
+from modules.event.events import DriverJoinedEvent
+from modules.notification.commands.create_webhook import CreateWebhook
+from modules.notification.commands.create_webhook_subscription import (
+    CreateWebhookSubscription,
+)
+from modules.notification.domain.entity import Webhook
+from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from modules.notification.formatters.discord.digest import DigestFormatter
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.outbox import OutboxRelay
+from modules.notification.services import WebhookSenderService
+from pointsheet.models.notification import WebhookLog
+
+
+class AcceptingSender(WebhookSenderService):
+    def __init__(self):
+        super().__init__()
+        self.payloads = []
+
+    def post(self, url, headers, payload, timeout=10):
+        self.payloads.append(payload)
+        return SimpleNamespace(status_code=204, text="")
+
+
+def _subscribed_webhook(config=None):
+    webhook = application.execute(
+        CreateWebhook(
+            name="league",
+            target_url="https://discord.test",
+            platform=WebhookPlatform.DISCORD,
+            config=config,
+        )
+    )
+    application.execute(
+        CreateWebhookSubscription(
+            webhook_id=webhook.id, event_type=WebhookEventType.DRIVER_JOINED.value
+        )
+    )
+    return webhook
+
+
+def _drivers_join(event_id, count):
+    for _ in range(count):
+        application.publish(
+            DriverJoinedEvent(event_id=event_id, driver_id=uuid.uuid4())
+        )
+
+
+def _windows(db_session):
+    return db_session.execute(
+        select(WebhookLog.digest_key, WebhookLog.next_attempt_at)
+    ).all()
+
+
+def test_events_about_a_resource_are_sent_as_digests(db_session):
+    _subscribed_webhook()
+    busy, quiet = uuid.uuid4(), uuid.uuid4()
+    _drivers_join(busy, 12)
+    _drivers_join(quiet, 1)
+
+    started = datetime.now()
+    OutboxRelay(db_session, digest_window=60).expand()
+
+    windows = _windows(db_session)
+    assert {key for key, _ in windows} == {f"Event:{busy}", f"Event:{quiet}"}
+    assert all(
+        started + timedelta(seconds=59)
+        < ends_at
+        < datetime.now() + timedelta(seconds=61)
+        for _, ends_at in windows
+    )
+    # nothing goes out before the window ends
+    sender = AcceptingSender()
+    dispatcher = WebhookDispatcher(db_session, sender)
+    assert dispatcher.dispatch() == (0, 0)
+
+    db_session.execute(
+        update(WebhookLog).values(next_attempt_at=datetime.now() - timedelta(seconds=1))
+    )
+    db_session.commit()
+    assert dispatcher.dispatch() == (13, 0)
+
+    assert sorted(len(payload.get("embeds", [])) for payload in sender.payloads) == [
+        1,
+        2,
+        10,
+    ]
+    assert db_session.scalars(select(WebhookLog.succeeded)).all() == [True] * 13
+    # one latency per message sent
+    assert (
+        len(
+            db_session.scalars(
+                select(WebhookLog.id).where(WebhookLog.latency_ms.is_not(None))
+            ).all()
+        )
+        == 3
+    )
+
+
+def test_later_events_join_the_open_window(db_session):
+    _subscribed_webhook()
+    event_id = uuid.uuid4()
+    relay = OutboxRelay(db_session, digest_window=60)
+    _drivers_join(event_id, 1)
+    relay.expand()
+
+    _drivers_join(event_id, 2)
+    relay.expand()
+
+    assert len({ends_at for _, ends_at in _windows(db_session)}) == 1
+
+
+def test_webhook_config_turns_digests_off(db_session):
+    _subscribed_webhook(config={"digest_window": 0})
+    _drivers_join(uuid.uuid4(), 2)
+
+    OutboxRelay(db_session, digest_window=60).expand()
+
+    assert [key for key, _ in _windows(db_session)] == [None, None]
+
+
+def test_discord_digest_counts_repeated_lines_and_keeps_embeds():
+    webhook = Webhook(
+        target_url="https://discord.test", platform=WebhookPlatform.DISCORD
+    )
+    payloads = [
+        {"content": "Driver joined", "username": "PSR", "embeds": [{"title": "a"}]},
+        {"content": "Driver joined", "username": "PSR", "embeds": [{"title": "b"}]},
+        {"content": "Results uploaded", "username": "PSR", "embeds": [{"title": "b"}]},
+    ]
+
+    digest = DigestFormatter().merge(webhook, payloads)
+
+    assert digest["content"] == "Driver joined (×2)\nResults uploaded"
+    assert digest["username"] == "PSR"
+    assert digest["embeds"] == [{"title": "a"}, {"title": "b"}]
@@ -0,0 +1,427 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import requests
+from sqlalchemy import create_engine, select, text, update
+
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.daemon import DatabaseWriteWatcher, WebhookDaemon
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.services import (
+    HostSessions,
+    RetryPolicy,
+    WebhookLogService,
+    WebhookSenderService,
+)
+from pointsheet.models.notification import Webhook, WebhookLog
+
+
+class RecordingSender(WebhookSenderService):
+    """Answers from a table of URLs and records the deliveries in flight."""
+
+    def __init__(self, statuses, delay=0.02):
+        super().__init__()
+        self.statuses = statuses
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self.max_total = 0
+
+    def post(self, url, headers, payload, timeout=10):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.in_flight[host] += 1
+            self.max_in_flight[host] = max(
+                self.max_in_flight[host], self.in_flight[host]
+            )
+            self.max_total = max(self.max_total, sum(self.in_flight.values()))
+        try:
+            time.sleep(self.delay)
+            status = self.statuses[url]
+            if isinstance(status, Exception):
+                raise status
+            return SimpleNamespace(status_code=status, text=f"{status}")
+        finally:
+            with self.lock:
+                self.in_flight[host] -= 1
+
+
+def _webhook(db_session, url, enabled=True):
+    webhook = Webhook(
+        id=uuid.uuid4(),
+        name=url,
+        target_url=url,
+        platform=WebhookPlatform.GENERIC_HTTP.value,
+        enabled=enabled,
+    )
+    db_session.add(webhook)
+    return webhook
+
+
+def _logs(db_session, webhook, count):
+    db_session.add_all(
+        WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={"n": n})
+        for n in range(count)
+    )
+
+
+def test_dispatch_respects_global_and_per_host_limits(db_session):
+    urls = [f"http://host-{n}.test/hook" for n in range(3)]
+    for url in urls:
+        _logs(db_session, _webhook(db_session, url), 6)
+    db_session.commit()
+    sender = RecordingSender({url: 204 for url in urls})
+
+    dispatcher = WebhookDispatcher(
+        db_session, sender, max_workers=4, per_host=2, chunk_size=5
+    )
+    success_count, failure_count = dispatcher.dispatch(limit=50)
+
+    assert (success_count, failure_count) == (18, 0)
+    assert max(sender.max_in_flight.values()) == 2
+    assert sender.max_total == 4
+
+
+def test_dispatch_saves_outcomes_in_chunks(db_session, monkeypatch):
+    ok = _webhook(db_session, "http://ok.test/hook")
+    broken = _webhook(db_session, "http://broken.test/hook")
+    down = _webhook(db_session, "http://down.test/hook")
+    disabled = _webhook(db_session, "http://disabled.test/hook", enabled=False)
+    for webhook in (ok, broken, down, disabled):
+        _logs(db_session, webhook, 2)
+    db_session.commit()
+    sender = RecordingSender(
+        {
+            ok.target_url: 200,
+            broken.target_url: 500,
+            down.target_url: requests.ConnectionError("refused"),
+        },
+        delay=0,
+    )
+
+    commits = []
+    commit = db_session.commit
+    monkeypatch.setattr(db_session, "commit", lambda: commits.append(1) or commit())
+
+    dispatcher = WebhookDispatcher(db_session, sender, chunk_size=4)
+    assert dispatcher.dispatch() == (2, 4)
+
+    # the claim, then two chunks of outcomes
+    assert len(commits) == 3
+    statuses = Counter(
+        (webhook_id, status, succeeded)
+        for webhook_id, status, succeeded in db_session.execute(
+            select(WebhookLog.webhook_id, WebhookLog.http_status, WebhookLog.succeeded)
+        )
+    )
+    assert statuses == {
+        (ok.id, 200, True): 2,
+        (broken.id, 500, False): 2,
+        (down.id, 0, False): 2,
+        (disabled.id, None, False): 2,
+    }
+
+
+def test_host_sessions_reuse_one_session_per_host():
+    sessions = HostSessions()
+
+    first = sessions.for_url("https://discord.com/api/webhooks/1/a")
+    second = sessions.for_url("https://discord.com/api/webhooks/2/b")
+    other = sessions.for_url("https://hooks.slack.com/services/x")
+
+    assert first is second
+    assert other is not first
+    sessions.close()
+
+
+def test_claims_are_not_shared_between_dispatchers(db_session):
+    webhook = _webhook(db_session, "http://claims.test/hook")
+    _logs(db_session, webhook, 5)
+    db_session.commit()
+    first = WebhookDispatcher(db_session, RecordingSender({}), worker_id="node-1")
+    second = WebhookDispatcher(db_session, RecordingSender({}), worker_id="node-2")
+
+    claimed = first.claim_deliveries(limit=3)
+    rest = second.claim_deliveries(limit=50)
+
+    assert len(claimed) == 3
+    assert len(rest) == 2
+    assert not {d.log_id for d in claimed} & {d.log_id for d in rest}
+    assert second.claim_deliveries(limit=50) == []
+
+
+def test_expired_lease_is_claimed_again_and_saving_ends_the_claim(db_session):
+    webhook = _webhook(db_session, "http://lease.test/hook")
+    _logs(db_session, webhook, 2)
+    db_session.commit()
+    crashed = WebhookDispatcher(db_session, RecordingSender({}), worker_id="crashed")
+    crashed.claim_deliveries()
+    db_session.execute(
+        update(WebhookLog).values(
+            lease_expires_at=datetime.now() - timedelta(seconds=1)
+        )
+    )
+    db_session.commit()
+
+    sender = RecordingSender({webhook.target_url: 200}, delay=0)
+    assert WebhookDispatcher(db_session, sender, worker_id="healthy").dispatch() == (
+        2,
+        0,
+    )
+
+    assert (
+        db_session.execute(
+            select(
+                WebhookLog.claimed_by, WebhookLog.lease_expires_at, WebhookLog.succeeded
+            )
+        ).all()
+        == [(None, None, True)] * 2
+    )
+
+
+def test_release_claims_gives_back_unsent_logs(db_session):
+    webhook = _webhook(db_session, "http://release.test/hook")
+    _logs(db_session, webhook, 2)
+    db_session.commit()
+    dispatcher = WebhookDispatcher(
+        db_session, RecordingSender({}), worker_id="stopping"
+    )
+    dispatcher.claim_deliveries()
+
+    dispatcher.release_claims()
+
+    assert (
+        len(WebhookDispatcher(db_session, RecordingSender({})).claim_deliveries()) == 2
+    )
+
+
+def test_retry_skips_a_log_claimed_by_a_dispatcher(db_session):
+    webhook = _webhook(db_session, "http://retry-claim.test/hook")
+    _logs(db_session, webhook, 1)
+    db_session.commit()
+    WebhookDispatcher(
+        db_session, RecordingSender({}), worker_id="serve"
+    ).claim_deliveries()
+    log_id = db_session.execute(select(WebhookLog.id)).scalar_one()
+
+    sender = RecordingSender({webhook.target_url: 200}, delay=0)
+    retrying = WebhookDispatcher(db_session, sender, worker_id="retry")
+
+    assert retrying.retry_log(log_id) is None
+    assert sender.max_total == 0
+
+    db_session.execute(
+        update(WebhookLog).values(
+            lease_expires_at=datetime.now() - timedelta(seconds=1)
+        )
+    )
+    db_session.commit()
+    assert retrying.retry_log(log_id).succeeded
+    assert db_session.execute(
+        select(WebhookLog.claimed_by, WebhookLog.lease_expires_at, WebhookLog.succeeded)
+    ).one() == (None, None, True)
+
+
+def test_retry_sends_a_dead_lettered_log(db_session):
+    webhook = _webhook(db_session, "http://dead-letter.test/hook")
+    log = WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={}, attempts=8)
+    db_session.add(log)
+    db_session.flush()
+    log.next_attempt_at = None
+    db_session.commit()
+    dispatcher = WebhookDispatcher(
+        db_session, RecordingSender({webhook.target_url: 200}, delay=0)
+    )
+
+    assert dispatcher.dispatch(failed_only=True) == (0, 0)
+    assert dispatcher.retry_log(log.id).succeeded
+    assert db_session.execute(
+        select(WebhookLog.attempts, WebhookLog.succeeded)
+    ).one() == (9, True)
+
+
+def _failed_logs(db_session, webhook, count):
+    db_session.add_all(
+        WebhookLog(
+            id=uuid.uuid4(),
+            webhook_id=webhook.id,
+            payload={"n": n},
+            attempts=1,
+            next_attempt_at=datetime.now() - timedelta(minutes=10),
+        )
+        for n in range(count)
+    )
+
+
+def test_logs_of_a_disabled_webhook_do_not_hold_back_the_others(db_session):
+    disabled = _webhook(db_session, "http://disabled.test/hook", enabled=False)
+    enabled = _webhook(db_session, "http://enabled.test/hook")
+    _failed_logs(db_session, disabled, 12)
+    db_session.commit()
+    _failed_logs(db_session, enabled, 1)
+    _logs(db_session, enabled, 1)
+    db_session.commit()
+    log_service = WebhookLogService(db_session)
+
+    assert [log.webhook_id for log in log_service.find_failed_logs(limit=10)] == [
+        enabled.id
+    ]
+    assert [log.webhook_id for log in log_service.find_pending_logs(limit=10)] == [
+        enabled.id
+    ] * 2
+
+
+def test_retry_dead_letters_a_log_whose_webhook_is_gone(db_session):
+    log = WebhookLog(id=uuid.uuid4(), webhook_id=uuid.uuid4(), payload={}, attempts=1)
+    db_session.add(log)
+    db_session.commit()
+    dispatcher = WebhookDispatcher(db_session, RecordingSender({}))
+
+    assert dispatcher.retry_log(log.id) is None
+    assert db_session.execute(select(WebhookLog.next_attempt_at)).scalar_one() is None
+
+
+def test_retry_of_failed_logs_leaves_new_ones_to_the_daemon(db_session):
+    webhook = _webhook(db_session, "http://retry-all.test/hook")
+    _failed_logs(db_session, webhook, 2)
+    _logs(db_session, webhook, 3)
+    db_session.commit()
+    dispatcher = WebhookDispatcher(
+        db_session, RecordingSender({webhook.target_url: 200}, delay=0)
+    )
+
+    assert dispatcher.dispatch(failed_only=True) == (2, 0)
+    assert dispatcher.dispatch(failed_only=True) == (0, 0)
+    assert dispatcher.dispatch() == (3, 0)
+
+
+class ScriptedWatcher:
+    """Records the waits of a daemon and stops it after a number of them."""
+
+    def __init__(self, daemon_waits, woken=()):
+        self.daemon_waits = daemon_waits
+        self.woken = list(woken)
+        self.waits = []
+        self.daemon = None
+
+    def mark(self):
+        pass
+
+    def wait(self, timeout, stopping):
+        self.waits.append(timeout)
+        if len(self.waits) >= self.daemon_waits:
+            self.daemon.stop()
+        return bool(self.woken) and self.woken.pop(0)
+
+
+def test_daemon_backs_off_while_idle_and_resets_when_woken(db_session):
+    watcher = ScriptedWatcher(5, woken=[False, False, True, False])
+    daemon = WebhookDaemon(
+        WebhookDispatcher(db_session, RecordingSender({})),
+        watcher,
+        min_interval=1,
+        max_interval=4,
+    )
+    watcher.daemon = daemon
+
+    daemon.run()
+
+    assert watcher.waits == [2, 4, 4, 2, 4]
+
+
+def test_daemon_sends_new_logs_and_stops_gracefully(db_session):
+    webhook = _webhook(db_session, "http://daemon.test/hook")
+    _logs(db_session, webhook, 3)
+    db_session.commit()
+    watcher = ScriptedWatcher(1)
+    daemon = WebhookDaemon(
+        WebhookDispatcher(
+            db_session, RecordingSender({webhook.target_url: 200}, delay=0)
+        ),
+        watcher,
+        limit=2,
+    )
+    watcher.daemon = daemon
+
+    daemon.run()
+
+    assert (
+        db_session.execute(select(WebhookLog.succeeded)).scalars().all() == [True] * 3
+    )
+    assert watcher.waits == [daemon.min_interval]
+
+
+def test_database_write_watcher_wakes_on_commits_of_other_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'watched.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (n INTEGER)"))
+    watcher = DatabaseWriteWatcher(engine, interval=0.01)
+    stopping = threading.Event()
+
+    assert watcher.wait(0.05, stopping) is False
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+    assert watcher.wait(1, stopping) is True
+
+    watcher.close()
+    engine.dispose()
+
+
+def test_failed_deliveries_are_retried_when_due_then_dead_lettered(db_session):
+    flaky = _webhook(db_session, "http://flaky.test/hook")
+    gone = _webhook(db_session, "http://gone.test/hook")
+    _logs(db_session, flaky, 1)
+    _logs(db_session, gone, 1)
+    db_session.commit()
+    sender = RecordingSender({flaky.target_url: 503, gone.target_url: 404}, delay=0)
+    dispatcher = WebhookDispatcher(
+        db_session, sender, retry_policy=RetryPolicy(max_attempts=2, jitter=lambda: 1.0)
+    )
+
+    assert dispatcher.dispatch() == (0, 2)
+    assert dispatcher.dispatch() == (0, 0)
+
+    def outcomes():
+        return {
+            webhook_id: (attempts, next_attempt_at is not None, last_error_class)
+            for webhook_id, attempts, next_attempt_at, last_error_class in db_session.execute(
+                select(
+                    WebhookLog.webhook_id,
+                    WebhookLog.attempts,
+                    WebhookLog.next_attempt_at,
+                    WebhookLog.last_error_class,
+                )
+            )
+        }
+
+    assert outcomes() == {
+        flaky.id: (1, True, "HTTP 503"),
+        gone.id: (1, False, "HTTP 404"),
+    }
+    retry_at = db_session.execute(
+        select(WebhookLog.next_attempt_at).where(WebhookLog.webhook_id == flaky.id)
+    ).scalar_one()
+    assert retry_at > datetime.now() + timedelta(seconds=25)
+
+    db_session.execute(
+        update(WebhookLog)
+        .where(WebhookLog.webhook_id == flaky.id)
+        .values(next_attempt_at=datetime.now() - timedelta(seconds=1))
+    )
+    db_session.commit()
+    assert [
+        log.webhook_id for log in WebhookLogService(db_session).find_failed_logs()
+    ] == [flaky.id]
+    assert dispatcher.dispatch() == (0, 1)
+
+    assert outcomes() == {
+        flaky.id: (2, False, "HTTP 503"),
+        gone.id: (1, False, "HTTP 404"),
+    }
+    assert WebhookLogService(db_session).find_failed_logs() == []
@@ -0,0 +1,104 @@
+import pytest
+
+from modules.notification.domain.entity import Webhook
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.formatters.discord.default import DefaultFormatter
+from modules.notification.formatters.discord.digest import DigestFormatter
+from modules.notification.formatters.discord.driver_joined import DriverJoinedFormatter
+from modules.notification.formatters.discord.series_started import (
+    SeriesStartedFormatter,
+)
+from modules.notification.formatters.registry import FormatterRegistry, module_names
+from modules.notification.formatters.templates import compile_template
+
+
+@pytest.fixture
+def registry():
+    registry = FormatterRegistry()
+    registry.discover()
+    return registry
+
+
+def _webhook(config=None):
+    return Webhook(
+        target_url="https://discord.test",
+        platform=WebhookPlatform.DISCORD,
+        config=config,
+    )
+
+
+def test_registry_finds_the_formatter_defined_in_the_event_module(registry):
+    # the event modules import DiscordFormatter as well
+    assert (
+        type(registry.formatter(WebhookPlatform.DISCORD, "SeriesStarted"))
+        is SeriesStartedFormatter
+    )
+    assert (
+        type(registry.formatter(WebhookPlatform.DISCORD, "DriverJoinedEvent"))
+        is DriverJoinedFormatter
+    )
+    assert (
+        type(registry.formatter(WebhookPlatform.DISCORD, "EventCreated"))
+        is DefaultFormatter
+    )
+    assert type(registry.digest_formatter(WebhookPlatform.DISCORD)) is DigestFormatter
+
+
+def test_registry_keeps_one_formatter_per_platform_and_event(registry):
+    formatter = registry.formatter(WebhookPlatform.DISCORD, "SeriesStarted")
+
+    assert registry.formatter(WebhookPlatform.DISCORD, "SeriesStarted") is formatter
+    assert registry.digest_formatter(WebhookPlatform.SLACK) is None
+    with pytest.raises(ValueError):
+        registry.formatter(WebhookPlatform.SLACK, "SeriesStarted")
+
+
+def test_module_names_of_an_event():
+    assert module_names("SeriesCreated") == ("series_created",)
+    assert module_names("DriverLeftEvent") == ("driver_left_event", "driver_left")
+
+
+def test_content_template_wins_over_the_event_formatter(registry):
+    webhook = _webhook({"content_template": "{driver_id} joined {event_id}"})
+    formatter = registry.formatter(WebhookPlatform.DISCORD, "DriverJoinedEvent")
+
+    payload = formatter.format_payload(
+        webhook,
+        {"event_type": "DriverJoinedEvent", "driver_id": "d1", "event_id": "e1"},
+    )
+
+    assert payload["content"] == "d1 joined e1"
+    assert formatter.format_payload(webhook, {"event_type": "DriverJoinedEvent"})[
+        "content"
+    ] == ("🏎️ Driver has joined an event!")
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{a} and {b}",
+        "no fields",
+        "{{literal}} {a}",
+        "{a!r} {n:>5} {n:0{width}d}",
+        "{items[0]} {nested[key]}",
+    ],
+)
+def test_compiled_templates_render_like_str_format(template):
+    fields = {
+        "a": "x",
+        "b": 2,
+        "n": 42,
+        "width": 6,
+        "items": ["first"],
+        "nested": {"key": "value"},
+    }
+
+    assert compile_template(template).render(fields) == template.format(**fields)
+
+
+def test_templates_are_compiled_once_and_invalid_ones_are_skipped():
+    assert compile_template("{a}") is compile_template("{a}")
+    assert compile_template("{0} positional") is None
+    assert compile_template("{unclosed") is None
+    with pytest.raises(KeyError):
+        compile_template("{missing}").render({})
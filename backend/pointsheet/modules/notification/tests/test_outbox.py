@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import func, select, update
+
+from modules import application
+from modules.event.events import DriverJoinedEvent
+from modules.notification.commands.create_webhook import CreateWebhook
+from modules.notification.commands.create_webhook_subscription import (
+    CreateWebhookSubscription,
+)
+from modules.notification.commands.delete_webhook_subscription import (
+    DeleteWebhookSubscription,
+)
+from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from modules.notification.daemon import WebhookDaemon
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.outbox import OutboxRelay
+from modules.notification.services import WebhookSenderService
+from pointsheet.models.notification import OutboxMessage, WebhookLog
+
+
+class AcceptingSender(WebhookSenderService):
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def post(self, url, headers, payload, timeout=10):
+        self.urls.append(url)
+        return SimpleNamespace(status_code=204, text="")
+
+
+def _subscribed_webhooks(count):
+    subscriptions = []
+    for n in range(count):
+        webhook = application.execute(
+            CreateWebhook(
+                name=f"league {n}",
+                target_url=f"https://discord.test/{n}",
+                platform=WebhookPlatform.DISCORD,
+            )
+        )
+        subscriptions.append(
+            application.execute(
+                CreateWebhookSubscription(
+                    webhook_id=webhook.id,
+                    event_type=WebhookEventType.DRIVER_JOINED.value,
+                )
+            )
+        )
+    return subscriptions
+
+
+def _count(db_session, model):
+    return db_session.scalar(select(func.count()).select_from(model))
+
+
+def _publish_driver_joined():
+    application.publish(
+        DriverJoinedEvent(event_id=uuid.uuid4(), driver_id=uuid.uuid4())
+    )
+
+
+def test_event_is_one_outbox_message_until_the_relay_expands_it(db_session):
+    subscriptions = _subscribed_webhooks(5)
+
+    _publish_driver_joined()
+
+    message = db_session.scalars(select(OutboxMessage)).one()
+    assert sorted(message.subscription_ids) == sorted(str(s.id) for s in subscriptions)
+    assert message.payload["event_type"] == "DriverJoinedEvent"
+    assert _count(db_session, WebhookLog) == 0
+
+    assert OutboxRelay(db_session).expand() == 1
+
+    logs = db_session.scalars(select(WebhookLog)).all()
+    assert sorted(str(log.subscription_id) for log in logs) == sorted(
+        str(s.id) for s in subscriptions
+    )
+    assert all(log.payload["username"] == "PSR" and log.next_attempt_at for log in logs)
+    assert _count(db_session, OutboxMessage) == 0
+
+
+def test_event_without_subscriptions_writes_nothing(db_session):
+    _publish_driver_joined()
+
+    assert _count(db_session, OutboxMessage) == 0
+
+
+def test_subscriptions_deleted_before_the_expansion_are_skipped(db_session):
+    kept, deleted = _subscribed_webhooks(2)
+    _publish_driver_joined()
+
+    application.execute(DeleteWebhookSubscription(subscription_id=deleted.id))
+    OutboxRelay(db_session).expand()
+
+    assert [
+        str(id) for id in db_session.scalars(select(WebhookLog.subscription_id))
+    ] == [str(kept.id)]
+
+
+def test_claimed_messages_wait_for_the_lease_to_expire(db_session):
+    _subscribed_webhooks(1)
+    _publish_driver_joined()
+    crashed, relay = OutboxRelay(db_session), OutboxRelay(db_session)
+
+    assert len(crashed.claim_messages()) == 1
+    assert relay.expand() == 0
+
+    db_session.execute(
+        update(OutboxMessage).values(
+            lease_expires_at=datetime.now() - timedelta(seconds=1)
+        )
+    )
+    db_session.commit()
+    assert relay.expand() == 1
+    assert _count(db_session, WebhookLog) == 1
+
+
+def test_daemon_expands_the_outbox_before_sending(db_session):
+    _subscribed_webhooks(2)
+    _publish_driver_joined()
+    sender = AcceptingSender()
+    dispatcher = WebhookDispatcher(db_session, sender)
+    daemon = WebhookDaemon(
+        dispatcher, relay=OutboxRelay(db_session, worker_id=dispatcher.worker_id)
+    )
+
+    assert daemon.run_once() == 3
+
+    assert sorted(sender.urls) == ["https://discord.test/0", "https://discord.test/1"]
+    assert db_session.scalars(select(WebhookLog.succeeded)).all() == [True, True]
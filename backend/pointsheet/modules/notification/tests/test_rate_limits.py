@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.rate_limits import RateLimit, TokenBucket
+from modules.notification.services import HostSessions, WebhookSenderService
+from pointsheet.models.notification import Webhook, WebhookLog
+
+
+class StubServer(ThreadingHTTPServer):
+    """Answers webhook posts with ``respond(server)``, a (status, headers, body) tuple."""
+
+    daemon_threads = True
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.lock = threading.Lock()
+        self.requests = []
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+    def statuses(self) -> list:
+        return [status for _, status in self.requests]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            status, headers, body = self.server.respond(self.server)
+            self.server.requests.append((time.monotonic(), status))
+        body = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DiscordWindow:
+    """Discord's webhook rate limit: ``limit`` requests per fixed window, with its headers and 429s."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.started = 0.0
+        self.used = 0
+
+    def __call__(self, server):
+        now = time.monotonic()
+        if now - self.started >= self.window:
+            self.started, self.used = now, 0
+        reset_after = self.window - (now - self.started)
+        if self.used >= self.limit:
+            body = {
+                "message": "You are being rate limited.",
+                "retry_after": reset_after,
+                "global": False,
+            }
+            return 429, self.headers(0, reset_after), body
+        self.used += 1
+        return 200, self.headers(self.limit - self.used, reset_after), {}
+
+    def headers(self, remaining, reset_after):
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+
+
+@pytest.fixture
+def stub_servers():
+    servers = []
+
+    def start(respond):
+        server = StubServer(respond)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _webhook(db_session, url, platform, count):
+    webhook = Webhook(
+        id=uuid.uuid4(), name=url, target_url=url, platform=platform.value
+    )
+    db_session.add(webhook)
+    db_session.add_all(
+        WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={"n": n})
+        for n in range(count)
+    )
+    return webhook
+
+
+def _dispatcher(db_session, **kwargs):
+    sender = WebhookSenderService(sessions=HostSessions())
+    return WebhookDispatcher(db_session, sender, **kwargs)
+
+
+def test_rate_limit_headers_are_honoured_while_other_webhooks_keep_flowing(
+    db_session, stub_servers
+):
+    discord = stub_servers(DiscordWindow(limit=2, window=0.4))
+    generic = stub_servers(lambda server: (200, {}, {}))
+    _webhook(db_session, discord.url, WebhookPlatform.DISCORD, 5)
+    _webhook(db_session, generic.url, WebhookPlatform.GENERIC_HTTP, 5)
+    db_session.commit()
+
+    dispatcher = _dispatcher(db_session, per_host=1, max_hold=1.0)
+    assert dispatcher.dispatch() == (10, 0)
+
+    assert discord.statuses() == [200] * 5
+    assert generic.statuses() == [200] * 5
+    assert max(at for at, _ in generic.requests) < discord.requests[2][0]
+    assert discord.requests[-1][0] - discord.requests[0][0] >= 0.4
+    dispatcher.sender_service.sessions.close()
+
+
+def test_throttled_deliveries_are_rescheduled_for_retry_after(db_session, stub_servers):
+    slack = stub_servers(lambda server: (429, {"Retry-After": "30"}, {"ok": False}))
+    webhook = _webhook(db_session, slack.url, WebhookPlatform.SLACK, 3)
+    db_session.commit()
+
+    dispatcher = _dispatcher(db_session, per_host=1)
+    started = datetime.now()
+    assert dispatcher.dispatch() == (0, 1)
+
+    assert slack.statuses() == [429]
+    logs = db_session.execute(
+        select(
+            WebhookLog.http_status,
+            WebhookLog.attempts,
+            WebhookLog.next_attempt_at,
+            WebhookLog.claimed_by,
+        ).where(WebhookLog.webhook_id == webhook.id)
+    ).all()
+    # the first one was throttled, the other two were held back without being sent
+    assert sorted(
+        (status or 0, attempts, claimed_by) for status, attempts, _, claimed_by in logs
+    ) == [
+        (0, 0, None),
+        (0, 0, None),
+        (429, 0, None),
+    ]
+    for _, _, next_attempt_at, _ in logs:
+        assert (
+            started + timedelta(seconds=29)
+            < next_attempt_at
+            < datetime.now() + timedelta(seconds=31)
+        )
+    assert dispatcher.dispatch() == (0, 0)
+    dispatcher.sender_service.sessions.close()
+
+
+def test_retry_of_a_throttled_log_waits_for_retry_after(db_session, stub_servers):
+    slack = stub_servers(lambda server: (429, {"Retry-After": "30"}, {"ok": False}))
+    webhook = Webhook(
+        id=uuid.uuid4(),
+        name="slack",
+        target_url=slack.url,
+        platform=WebhookPlatform.SLACK.value,
+    )
+    log = WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={}, attempts=1)
+    db_session.add_all([webhook, log])
+    db_session.commit()
+
+    dispatcher = _dispatcher(db_session)
+    started = datetime.now()
+    assert dispatcher.retry_log(log.id).throttled
+
+    attempts, next_attempt_at = db_session.execute(
+        select(WebhookLog.attempts, WebhookLog.next_attempt_at)
+    ).one()
+    # being throttled does not use up an attempt
+    assert attempts == 1
+    assert (
+        started + timedelta(seconds=29)
+        < next_attempt_at
+        < datetime.now() + timedelta(seconds=31)
+    )
+    dispatcher.sender_service.sessions.close()
+
+
+def test_rate_limit_of_a_discord_429():
+    response = SimpleNamespace(
+        status_code=429,
+        headers={
+            "X-RateLimit-Limit": "5",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "1.5",
+        },
+        json=lambda: {"retry_after": 0.75, "global": False},
+    )
+
+    assert RateLimit.from_response(response) == RateLimit(5, 0, 1.5, 0.75)
+
+
+def test_rate_limit_of_a_retry_after_date():
+    retry_at = datetime.now().astimezone() + timedelta(seconds=120)
+    response = SimpleNamespace(
+        status_code=429,
+        headers={"Retry-After": format_datetime(retry_at, usegmt=False)},
+        json=lambda: {},
+    )
+
+    assert 115 < RateLimit.from_response(response).retry_after <= 120
+
+
+def test_response_without_rate_limit():
+    assert RateLimit.from_response(SimpleNamespace(status_code=200, headers={})) is None
+
+
+def test_token_bucket_refills_and_obeys_the_endpoint():
+    bucket = TokenBucket(capacity=2, period=1.0, now=0.0)
+
+    bucket.take(0.0)
+    bucket.take(0.0)
+    assert bucket.delay(0.0) == pytest.approx(0.5)
+    assert bucket.delay(0.5) == 0
+
+    bucket.observe(RateLimit(limit=2, remaining=0, reset_after=3.0), now=0.5)
+    assert bucket.delay(0.5) == pytest.approx(3.0)
+
+    bucket.observe(RateLimit(retry_after=10.0), now=1.0)
+    assert bucket.delay(1.0) == pytest.approx(10.0)
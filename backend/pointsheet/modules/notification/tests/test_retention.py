@@ -0,0 +1,135 @@
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from modules.notification.retention import (
+    RetentionPolicy,
+    WebhookLogArchive,
+    WebhookLogPruner,
+    payload_hash,
+)
+from pointsheet.models.notification import Webhook, WebhookLog, WebhookSubscription
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def _webhook(db_session, platform=WebhookPlatform.DISCORD):
+    webhook = Webhook(
+        id=uuid.uuid4(),
+        name="league",
+        target_url="https://discord.test",
+        platform=platform.value,
+    )
+    subscription = WebhookSubscription(
+        id=uuid.uuid4(),
+        webhook_id=webhook.id,
+        event_type=WebhookEventType.DRIVER_JOINED.value,
+    )
+    db_session.add_all([webhook, subscription])
+    return subscription
+
+
+def _log(db_session, subscription, days, succeeded=True, finished=True, payload=None):
+    log = WebhookLog(
+        id=uuid.uuid4(),
+        webhook_id=subscription.webhook_id,
+        subscription_id=subscription.id,
+        payload=payload or {"content": "Driver joined"},
+        succeeded=succeeded,
+        http_status=204 if succeeded else 404,
+        attempts=1,
+        timestamp=NOW - timedelta(days=days),
+        next_attempt_at=NOW,
+    )
+    db_session.add(log)
+    if finished:
+        # None would get the column default, the log leaves the due-queue once it is written
+        db_session.flush()
+        log.next_attempt_at = None
+    return log
+
+
+def _remaining(db_session):
+    return {str(id) for id in db_session.scalars(select(WebhookLog.id))}
+
+
+def test_expired_logs_are_archived_then_deleted(db_session, tmp_path):
+    subscription = _webhook(db_session)
+    old_success = str(_log(db_session, subscription, days=8).id)
+    recent_success = str(_log(db_session, subscription, days=2).id)
+    old_failure = str(_log(db_session, subscription, days=31, succeeded=False).id)
+    recent_failure = str(_log(db_session, subscription, days=8, succeeded=False).id)
+    pending = str(
+        _log(db_session, subscription, days=60, succeeded=False, finished=False).id
+    )
+    db_session.commit()
+
+    pruner = WebhookLogPruner(db_session, archive_dir=str(tmp_path), batch_size=1)
+    assert pruner.count_expired(NOW) == {True: 1, False: 1}
+    result = pruner.prune(NOW)
+
+    assert (result.archived, result.deleted) == (2, 2)
+    assert result.path == tmp_path / "webhook_logs-20261018T120000.ndjson.gz"
+    assert list(tmp_path.iterdir()) == [result.path]
+    assert _remaining(db_session) == {recent_success, recent_failure, pending}
+
+    archived = list(WebhookLogArchive(result.path).read())
+    assert [log["id"] for log in archived] == [old_failure, old_success]
+    assert archived[0]["http_status"] == 404 and archived[0]["succeeded"] is False
+    assert archived[1]["payload"] == {"content": "Driver joined"}
+
+
+def test_payloads_of_a_platform_and_event_are_archived_once(db_session, tmp_path):
+    discord, slack = _webhook(db_session), _webhook(db_session, WebhookPlatform.SLACK)
+    for _ in range(3):
+        _log(db_session, discord, days=10)
+    _log(db_session, discord, days=10, payload={"content": "Results uploaded"})
+    _log(db_session, slack, days=10)
+    db_session.commit()
+
+    result = WebhookLogPruner(db_session, archive_dir=str(tmp_path)).prune(NOW)
+
+    with gzip.open(result.path, "rt") as archive:
+        records = [json.loads(line) for line in archive]
+    payloads = [record for record in records if record["record"] == "payload"]
+    assert sorted((p["platform"], p["payload"]["content"]) for p in payloads) == [
+        ("discord", "Driver joined"),
+        ("discord", "Results uploaded"),
+        ("slack", "Driver joined"),
+    ]
+    assert all(
+        p["event_type"] == WebhookEventType.DRIVER_JOINED.value for p in payloads
+    )
+    assert sum(record["record"] == "log" for record in records) == 5
+    assert len(list(WebhookLogArchive(result.path).read())) == 5
+
+
+def test_nothing_expired_writes_no_archive(db_session, tmp_path):
+    _log(db_session, _webhook(db_session), days=1)
+    db_session.commit()
+
+    result = WebhookLogPruner(db_session, archive_dir=str(tmp_path)).prune(NOW)
+
+    assert (result.archived, result.deleted, result.path) == (0, 0, None)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_logs_are_deleted_without_archive(db_session):
+    _log(db_session, _webhook(db_session), days=1)
+    _log(db_session, _webhook(db_session), days=2)
+    db_session.commit()
+
+    policy = RetentionPolicy(keep_successes_days=1.5)
+    result = WebhookLogPruner(db_session, policy=policy, archive_dir=None).prune(NOW)
+
+    assert (result.archived, result.deleted, result.path) == (0, 1, None)
+    assert len(_remaining(db_session)) == 1
+
+
+def test_payload_hash_ignores_key_order():
+    assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
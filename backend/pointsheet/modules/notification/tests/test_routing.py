@@ -0,0 +1,195 @@
+import uuid
+
+import pytest
+import sqlalchemy.event
+from sqlalchemy import select
+
+from modules import application
+from modules.event.events import DriverJoinedEvent, SeriesStarted
+from modules.notification.commands.create_webhook import CreateWebhook
+from modules.notification.commands.create_webhook_subscription import (
+    CreateWebhookSubscription,
+)
+from modules.notification.commands.delete_webhook_subscription import (
+    DeleteWebhookSubscription,
+)
+from modules.notification.commands.toggle_webhook import ToggleWebhook
+from modules.notification.domain.entity import Webhook, WebhookSubscription
+from modules.notification.domain.value_objects import WebhookEventType, WebhookPlatform
+from modules.notification.routing import (
+    ROUTES_TAG,
+    SubscriptionRoutes,
+    subscription_routes,
+)
+from modules.notification.outbox import OutboxRelay
+from pointsheet.cache import query_cache
+from pointsheet.db import engine
+from pointsheet.models.notification import (
+    WebhookLog,
+    WebhookSubscription as WebhookSubscriptionModel,
+)
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    sqlalchemy.event.remove(engine, "before_cursor_execute", record)
+
+
+def _create_webhook(name="league"):
+    return application.execute(
+        CreateWebhook(
+            name=name,
+            target_url=f"https://discord.test/{name}",
+            platform=WebhookPlatform.DISCORD,
+        )
+    )
+
+
+def _subscribe(webhook, event_type, resource_type=None, resource_id=None):
+    return application.execute(
+        CreateWebhookSubscription(
+            webhook_id=webhook.id,
+            event_type=event_type.value,
+            resource_type=resource_type,
+            resource_id=resource_id,
+        )
+    )
+
+
+def _logs(db_session):
+    OutboxRelay(db_session).expand()
+    rows = db_session.execute(select(WebhookLog.webhook_id, WebhookLog.subscription_id))
+    return [
+        (str(webhook_id), str(subscription_id)) for webhook_id, subscription_id in rows
+    ]
+
+
+def test_fan_out_reads_no_subscriptions_once_routes_are_loaded(db_session, statements):
+    webhook = _create_webhook()
+    subscription = _subscribe(webhook, WebhookEventType.DRIVER_JOINED)
+    event_id = uuid.uuid4()
+    application.publish(DriverJoinedEvent(event_id=event_id, driver_id=uuid.uuid4()))
+
+    statements.clear()
+    application.publish(DriverJoinedEvent(event_id=event_id, driver_id=uuid.uuid4()))
+
+    assert [s.split()[:3] for s in statements] == [
+        ["INSERT", "INTO", "notification_outbox"]
+    ]
+    assert _logs(db_session) == [(str(webhook.id), str(subscription.id))] * 2
+
+
+def test_commands_update_the_routes(db_session):
+    webhook = _create_webhook()
+    series_id = uuid.uuid4()
+    application.publish(SeriesStarted(series_id=series_id))
+    assert subscription_routes.loaded
+
+    subscription = _subscribe(
+        webhook, WebhookEventType.SERIES_STARTED, "Series", series_id
+    )
+    application.publish(SeriesStarted(series_id=series_id))
+    application.publish(SeriesStarted(series_id=uuid.uuid4()))
+    assert _logs(db_session) == [(str(webhook.id), str(subscription.id))]
+
+    application.execute(ToggleWebhook(webhook_id=webhook.id))
+    application.publish(SeriesStarted(series_id=series_id))
+    assert len(_logs(db_session)) == 1
+
+    application.execute(ToggleWebhook(webhook_id=webhook.id))
+    application.execute(DeleteWebhookSubscription(subscription_id=subscription.id))
+    application.publish(SeriesStarted(series_id=series_id))
+    assert len(_logs(db_session)) == 1
+    assert subscription_routes.loaded
+
+
+def test_routes_changed_by_another_process_are_reloaded(db_session):
+    webhook = _create_webhook()
+    application.publish(SeriesStarted(series_id=uuid.uuid4()))
+
+    # another worker subscribes the webhook and bumps the tag
+    db_session.add(
+        WebhookSubscriptionModel(
+            id=uuid.uuid4(),
+            webhook_id=webhook.id,
+            event_type=WebhookEventType.SERIES_STARTED.value,
+        )
+    )
+    db_session.commit()
+    query_cache.invalidate(ROUTES_TAG)
+
+    application.publish(SeriesStarted(series_id=uuid.uuid4()))
+    assert len(_logs(db_session)) == 1
+
+
+def _webhook(enabled=True):
+    return Webhook(
+        target_url="https://discord.test",
+        platform=WebhookPlatform.DISCORD,
+        enabled=enabled,
+    )
+
+
+def _subscription(webhook, event_type, resource_type=None, resource_id=None):
+    return WebhookSubscription(
+        webhook_id=webhook.id,
+        event_type=event_type,
+        resource_type=resource_type,
+        resource_id=resource_id,
+    )
+
+
+def test_routes_match_the_resource_its_type_and_the_event_type():
+    event_id = uuid.uuid4()
+    webhook = _webhook()
+    exact = _subscription(webhook, WebhookEventType.DRIVER_JOINED, "Event", event_id)
+    by_type = _subscription(webhook, WebhookEventType.DRIVER_JOINED, "Event")
+    general = _subscription(webhook, WebhookEventType.DRIVER_JOINED)
+    other = _subscription(
+        webhook, WebhookEventType.DRIVER_JOINED, "Event", uuid.uuid4()
+    )
+    routes = SubscriptionRoutes()
+    routes.reload([webhook], [exact, by_type, general, other])
+
+    found = routes.routes(WebhookEventType.DRIVER_JOINED, "Event", event_id)
+
+    assert [route.subscription_id for route in found] == [
+        exact.id,
+        by_type.id,
+        general.id,
+    ]
+
+
+def test_unmatched_events_fall_back_to_default_subscriptions():
+    webhook, disabled = _webhook(), _webhook(enabled=False)
+    default = _subscription(webhook, WebhookEventType.SERIES_CLOSED)
+    blocked = _subscription(disabled, WebhookEventType.DRIVER_LEFT, "Event")
+    routes = SubscriptionRoutes()
+    routes.reload([webhook, disabled], [default, blocked])
+
+    assert [
+        r.subscription_id
+        for r in routes.routes(WebhookEventType.SERIES_STARTED, "Series", uuid.uuid4())
+    ] == [default.id]
+    # a subscription to a disabled webhook still keeps the defaults out
+    assert routes.routes(WebhookEventType.DRIVER_LEFT, "Event", uuid.uuid4()) == ()
+
+    routes.delete_subscription(blocked.id)
+    assert len(routes.routes(WebhookEventType.DRIVER_LEFT, "Event", uuid.uuid4())) == 1
+
+
+def test_formatters_are_created_once():
+    routes = SubscriptionRoutes()
+
+    formatter = routes.formatter(WebhookPlatform.DISCORD, "SeriesStarted")
+
+    assert routes.formatter(WebhookPlatform.DISCORD, "SeriesStarted") is formatter
+    with pytest.raises(ValueError):
+        routes.formatter(WebhookPlatform.SLACK, "SeriesStarted")
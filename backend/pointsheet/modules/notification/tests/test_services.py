@@ -1,11 +1,16 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 from datetime import datetime, timedelta
 
 import requests
 from sqlalchemy.orm import Session
 
-from modules.notification.services import WebhookLogService, WebhookSenderService, WebhookProcessorService
+from modules.notification.services import (
+    RetryPolicy,
+    WebhookLogService,
+    WebhookSenderService,
+    error_class,
+)
 from modules.notification.domain.entity import WebhookLog
 from modules.notification.domain.value_objects import WebhookPlatform
 from pointsheet.models.notification import Webhook, WebhookSubscription, WebhookLog as WebhookLogModel
@@ -65,16 +70,18 @@ class TestWebhookLogService(unittest.TestCase):
         """Test updating a webhook log with a response."""
         # Create a mock log
         mock_log = MagicMock(spec=WebhookLogModel)
+        mock_log.attempts = 0
 
         # Call the method
-        result = self.service.update_log_with_response(
-            mock_log, 200, "OK", True
-        )
+        result = self.service.update_log_with_response(mock_log, 200, "OK", True, ANY)
 
         # Assert the log was updated correctly
         self.assertEqual(mock_log.http_status, 200)
         self.assertEqual(mock_log.response_body, "OK")
         self.assertEqual(mock_log.succeeded, True)
+        self.assertEqual(mock_log.attempts, 1)
+        self.assertIsNone(mock_log.next_attempt_at)
+        self.assertIsNone(mock_log.last_error_class)
 
         # Assert the log was added to the session and committed
         self.session.add.assert_called_once_with(mock_log)
@@ -87,6 +94,7 @@ class TestWebhookLogService(unittest.TestCase):
         """Test updating a webhook log with an error."""
         # Create a mock log
         mock_log = MagicMock(spec=WebhookLogModel)
+        mock_log.attempts = 0
 
         # Create a test error
         test_error = Exception("Test error")
@@ -98,6 +106,9 @@ class TestWebhookLogService(unittest.TestCase):
         self.assertEqual(mock_log.http_status, 0)
         self.assertEqual(mock_log.response_body, "Test error")
         self.assertEqual(mock_log.succeeded, False)
+        self.assertEqual(mock_log.attempts, 1)
+        self.assertGreater(mock_log.next_attempt_at, datetime.now())
+        self.assertEqual(mock_log.last_error_class, "Exception")
 
         # Assert the log was added to the session and committed
         self.session.add.assert_called_once_with(mock_log)
@@ -107,6 +118,62 @@ class TestWebhookLogService(unittest.TestCase):
         self.assertEqual(result, mock_log)
 
 
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Tests for the RetryPolicy class.
+    """
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+
+    def test_backoff_doubles_with_jitter_and_is_capped(self):
+        """Test that each retry waits twice as long, between half and all of the delay."""
+        low = RetryPolicy(base_delay=30, max_delay=100, jitter=lambda: 0.0)
+        high = RetryPolicy(base_delay=30, max_delay=100, jitter=lambda: 1.0)
+
+        self.assertEqual(
+            low.next_attempt_at(1, 500, now=self.now), self.now + timedelta(seconds=15)
+        )
+        self.assertEqual(
+            high.next_attempt_at(1, 500, now=self.now), self.now + timedelta(seconds=30)
+        )
+        self.assertEqual(
+            high.next_attempt_at(2, 500, now=self.now), self.now + timedelta(seconds=60)
+        )
+        self.assertEqual(
+            high.next_attempt_at(3, 500, now=self.now),
+            self.now + timedelta(seconds=100),
+        )
+        self.assertEqual(
+            low.next_attempt_at(7, 500, now=self.now), self.now + timedelta(seconds=50)
+        )
+
+    def test_dead_letters_after_max_attempts(self):
+        """Test that the last attempt is not retried."""
+        policy = RetryPolicy(max_attempts=3)
+
+        self.assertIsNotNone(policy.next_attempt_at(2, 503, now=self.now))
+        self.assertIsNone(policy.next_attempt_at(3, 503, now=self.now))
+
+    def test_dead_letters_permanent_rejections_at_once(self):
+        """Test that 4xx responses other than 408, 425 and 429 are not retried."""
+        policy = RetryPolicy()
+
+        self.assertIsNone(policy.next_attempt_at(1, 404, now=self.now))
+        self.assertIsNone(policy.next_attempt_at(1, 401, now=self.now))
+        self.assertIsNotNone(policy.next_attempt_at(1, 429, now=self.now))
+        self.assertIsNotNone(
+            policy.next_attempt_at(1, 0, requests.ConnectionError(), now=self.now)
+        )
+
+    def test_error_class(self):
+        """Test the classification of delivery outcomes."""
+        self.assertIsNone(error_class(204))
+        self.assertEqual(error_class(404), "HTTP 404")
+        self.assertEqual(error_class(0, requests.Timeout()), "Timeout")
+
+
 class TestWebhookSenderService(unittest.TestCase):
     """
     Tests for the WebhookSenderService class.
@@ -208,183 +275,5 @@ class TestWebhookSenderService(unittest.TestCase):
         self.assertEqual(result, mock_response)
 
 
-class TestWebhookProcessorService(unittest.TestCase):
-    """
-    Tests for the WebhookProcessorService class.
-    """
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.session = MagicMock(spec=Session)
-        self.logger = MagicMock()
-        self.log_service = MagicMock(spec=WebhookLogService)
-        self.sender_service = MagicMock(spec=WebhookSenderService)
-        self.service = WebhookProcessorService(
-            self.log_service, self.sender_service, self.session, self.logger
-        )
-
-    def test_process_pending_webhooks_no_logs(self):
-        """Test processing pending webhooks when there are none."""
-        # Mock the log service to return no logs
-        self.log_service.find_pending_logs.return_value = []
-
-        # Call the method
-        success_count, failure_count = self.service.process_pending_webhooks()
-
-        # Assert the result
-        self.assertEqual(success_count, 0)
-        self.assertEqual(failure_count, 0)
-        self.log_service.find_pending_logs.assert_called_once_with(50)
-        self.sender_service.send_webhook.assert_not_called()
-
-    def test_process_pending_webhooks_dry_run(self):
-        """Test processing pending webhooks in dry run mode."""
-        # Create mock logs and webhooks
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-
-        # Mock the log service
-        self.log_service.find_pending_logs.return_value = [mock_log]
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-
-        # Call the method with dry_run=True
-        success_count, failure_count = self.service.process_pending_webhooks(dry_run=True)
-
-        # Assert the result
-        self.assertEqual(success_count, 0)
-        self.assertEqual(failure_count, 0)
-        self.log_service.find_pending_logs.assert_called_once_with(50)
-        self.sender_service.send_webhook.assert_not_called()
-
-    def test_process_pending_webhooks_success(self):
-        """Test processing pending webhooks with a successful response."""
-        # Create mock logs, webhooks, and responses
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-        mock_response = MagicMock(spec=requests.Response)
-        mock_response.status_code = 200
-        mock_response.text = "OK"
-
-        # Mock the log service and sender service
-        self.log_service.find_pending_logs.return_value = [mock_log]
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-        self.sender_service.send_webhook.return_value = mock_response
-
-        # Call the method
-        success_count, failure_count = self.service.process_pending_webhooks()
-
-        # Assert the result
-        self.assertEqual(success_count, 1)
-        self.assertEqual(failure_count, 0)
-        self.log_service.find_pending_logs.assert_called_once_with(50)
-        self.sender_service.send_webhook.assert_called_once()
-        self.log_service.update_log_with_response.assert_called_once_with(
-            mock_log, 200, "OK", True
-        )
-
-    def test_process_pending_webhooks_failure(self):
-        """Test processing pending webhooks with a failed response."""
-        # Create mock logs, webhooks, and responses
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-        mock_response = MagicMock(spec=requests.Response)
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-
-        # Mock the log service and sender service
-        self.log_service.find_pending_logs.return_value = [mock_log]
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-        self.sender_service.send_webhook.return_value = mock_response
-
-        # Call the method
-        success_count, failure_count = self.service.process_pending_webhooks()
-
-        # Assert the result
-        self.assertEqual(success_count, 0)
-        self.assertEqual(failure_count, 1)
-        self.log_service.find_pending_logs.assert_called_once_with(50)
-        self.sender_service.send_webhook.assert_called_once()
-        self.log_service.update_log_with_response.assert_called_once_with(
-            mock_log, 404, "Not Found", False
-        )
-
-    def test_process_pending_webhooks_exception(self):
-        """Test processing pending webhooks with an exception."""
-        # Create mock logs and webhooks
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-
-        # Mock the log service and sender service
-        self.log_service.find_pending_logs.return_value = [mock_log]
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-        self.sender_service.send_webhook.side_effect = Exception("Test error")
-
-        # Call the method
-        success_count, failure_count = self.service.process_pending_webhooks()
-
-        # Assert the result
-        self.assertEqual(success_count, 0)
-        self.assertEqual(failure_count, 1)
-        self.log_service.find_pending_logs.assert_called_once_with(50)
-        self.sender_service.send_webhook.assert_called_once()
-        self.log_service.update_log_with_error.assert_called_once()
-
-    def test_retry_webhook_success(self):
-        """Test retrying a webhook with a successful response."""
-        # Create mock logs, webhooks, and responses
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-        mock_response = MagicMock(spec=requests.Response)
-        mock_response.status_code = 200
-        mock_response.text = "OK"
-
-        # Mock the log service and sender service
-        self.log_service.find_log_by_id.return_value = mock_log
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-        self.sender_service.send_webhook.return_value = mock_response
-
-        # Call the method
-        result = self.service.retry_webhook("test-id")
-
-        # Assert the result
-        self.assertTrue(result)
-        self.log_service.find_log_by_id.assert_called_once_with("test-id")
-        self.sender_service.send_webhook.assert_called_once()
-        self.log_service.update_log_with_response.assert_called_once_with(
-            mock_log, 200, "OK", True
-        )
-
-    def test_retry_webhook_failure(self):
-        """Test retrying a webhook with a failed response."""
-        # Create mock logs, webhooks, and responses
-        mock_log = MagicMock(spec=WebhookLogModel)
-        mock_webhook = MagicMock(spec=Webhook)
-        mock_webhook.enabled = True
-        mock_response = MagicMock(spec=requests.Response)
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-
-        # Mock the log service and sender service
-        self.log_service.find_log_by_id.return_value = mock_log
-        self.log_service.get_webhook_for_log.return_value = mock_webhook
-        self.sender_service.send_webhook.return_value = mock_response
-
-        # Call the method
-        result = self.service.retry_webhook("test-id")
-
-        # Assert the result
-        self.assertFalse(result)
-        self.log_service.find_log_by_id.assert_called_once_with("test-id")
-        self.sender_service.send_webhook.assert_called_once()
-        self.log_service.update_log_with_response.assert_called_once_with(
-            mock_log, 404, "Not Found", False
-        )
-
-
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.read_models import LatencyHistogram, WebhookStatsReadModel
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.services import WebhookSenderService
+from pointsheet.models.notification import Webhook, WebhookLog
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def _webhook(db_session, name, platform=WebhookPlatform.DISCORD):
+    webhook = Webhook(
+        id=uuid.uuid4(),
+        name=name,
+        target_url=f"https://{name}.test",
+        platform=platform.value,
+    )
+    db_session.add(webhook)
+    return webhook
+
+
+def _log(
+    db_session,
+    webhook,
+    status=204,
+    latency_ms=None,
+    age=timedelta(hours=1),
+    next_attempt_at=None,
+):
+    log = WebhookLog(
+        id=uuid.uuid4(),
+        webhook_id=webhook.id,
+        payload={},
+        http_status=status,
+        succeeded=status is not None and 200 <= status < 300,
+        latency_ms=latency_ms,
+        timestamp=NOW - age,
+        next_attempt_at=next_attempt_at or NOW,
+    )
+    db_session.add(log)
+    if next_attempt_at is None:
+        # None would get the column default, the log has left the due-queue
+        db_session.flush()
+        log.next_attempt_at = None
+    return log
+
+
+def test_stats_count_deliveries_statuses_latencies_and_queue(db_session):
+    fast, slow = (
+        _webhook(db_session, "fast"),
+        _webhook(db_session, "slow", WebhookPlatform.SLACK),
+    )
+    for latency in (20, 40, 80, 120):
+        _log(db_session, fast, latency_ms=latency)
+    _log(db_session, fast, latency_ms=30, age=timedelta(days=2))
+    _log(db_session, slow, status=503, latency_ms=12000)
+    _log(db_session, slow, status=404, latency_ms=300)
+    _log(
+        db_session,
+        slow,
+        status=None,
+        age=timedelta(minutes=10),
+        next_attempt_at=NOW - timedelta(minutes=1),
+    )
+    _log(
+        db_session,
+        slow,
+        status=None,
+        age=timedelta(minutes=5),
+        next_attempt_at=NOW + timedelta(minutes=5),
+    )
+    db_session.commit()
+
+    summary = (
+        WebhookStatsReadModel(db_session).delivery_stats(days=1, now=NOW).summary()
+    )
+
+    assert summary["queue"] == {
+        "pending": 2,
+        "due": 1,
+        "oldest_pending_age_seconds": 600.0,
+    }
+    fast_stats, slow_stats = summary["webhooks"]
+    assert (fast_stats["name"], fast_stats["deliveries"], fast_stats["delivered"]) == (
+        "fast",
+        4,
+        4,
+    )
+    assert fast_stats["statuses"] == {"204": 4}
+    assert fast_stats["latency"]["histogram"]["le_50"] == 2
+    assert fast_stats["latency"]["histogram"]["le_250"] == 1
+    assert (fast_stats["latency"]["p50_ms"], fast_stats["latency"]["max_ms"]) == (
+        50,
+        120,
+    )
+    assert fast_stats["latency"]["avg_ms"] == 65.0
+    assert slow_stats["statuses"] == {"404": 1, "503": 1}
+    assert slow_stats["dead_lettered"] == 2
+    assert slow_stats["latency"]["p95_ms"] == 12000
+    assert slow_stats["queue"]["pending"] == 2
+    assert set(summary["platforms"]) == {"discord", "slack"}
+    assert summary["platforms"]["slack"]["latency"]["count"] == 2
+
+
+def test_dispatcher_records_the_latency_of_each_attempt(db_session):
+    webhook = _webhook(db_session, "league")
+    db_session.add(WebhookLog(id=uuid.uuid4(), webhook_id=webhook.id, payload={}))
+    db_session.commit()
+
+    class SlowSender(WebhookSenderService):
+        def post(self, url, headers, payload, timeout=10):
+            time.sleep(0.02)
+            return SimpleNamespace(status_code=204, text="", headers={})
+
+    assert WebhookDispatcher(db_session, SlowSender()).dispatch() == (1, 0)
+
+    assert 20 <= db_session.scalar(select(WebhookLog.latency_ms)) < 1000
+
+
+@pytest.mark.parametrize(
+    "percent, expected",
+    [(50, 100), (90, 500), (100, 20000)],
+)
+def test_percentiles_are_bucket_upper_bounds(percent, expected):
+    histogram = LatencyHistogram()
+    histogram.add(0, 3, 90, 40)
+    histogram.add(1, 3, 270, 95)
+    histogram.add(3, 3, 1200, 450)
+    histogram.add(8, 1, 20000, 20000)
+
+    assert histogram.percentile(percent) == expected
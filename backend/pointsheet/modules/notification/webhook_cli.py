@@ -1,73 +1,19 @@
-import os
 import sys
+import json
+import signal
 import logging
-import atexit
 from typing import Optional
 
 import click
 import requests
 
-from modules.notification.services import WebhookLogService, WebhookSenderService, WebhookProcessorService
-
-# Define lock file path
-LOCK_FILE = "/tmp/webhook_cli.lock"
-
-def acquire_lock():
-    """
-    Acquire a lock to ensure only one instance of the CLI can run at a time.
-
-    If another instance is already running, exit with a message.
-    """
-    # Check if lock file exists
-    if os.path.exists(LOCK_FILE):
-        # Read the PID from the lock file
-        try:
-            with open(LOCK_FILE, 'r') as f:
-                pid = int(f.read().strip())
-
-            # Check if the process is still running
-            try:
-                # Sending signal 0 to a process will raise an OSError if the process is not running
-                os.kill(pid, 0)
-                logger.warning(f"Another instance of webhook_cli is already running (PID: {pid}). Exiting.")
-                sys.exit(1)
-            except OSError:
-                # Process is not running, we can acquire the lock
-                logger.info(f"Stale lock file found. Previous process (PID: {pid}) is not running.")
-        except (ValueError, IOError) as e:
-            # Invalid PID or error reading the file
-            logger.warning(f"Invalid lock file found: {str(e)}. Removing it.")
-
-    # Create lock file with current PID
-    with open(LOCK_FILE, 'w') as f:
-        f.write(str(os.getpid()))
-
-    logger.info(f"Lock acquired (PID: {os.getpid()}).")
-
-    # Register function to release lock on exit
-    atexit.register(release_lock)
-
-def release_lock():
-    """
-    Release the lock by removing the lock file.
-    """
-    if os.path.exists(LOCK_FILE):
-        try:
-            # Check if the lock file contains our PID
-            with open(LOCK_FILE, 'r') as f:
-                pid = int(f.read().strip())
-
-            if pid == os.getpid():
-                os.remove(LOCK_FILE)
-                logger.info(f"Lock released (PID: {os.getpid()}).")
-            else:
-                logger.warning(f"Lock file contains different PID: {pid}, not removing.")
-        except (ValueError, IOError) as e:
-            logger.warning(f"Error reading lock file: {str(e)}. Removing it anyway.")
-            try:
-                os.remove(LOCK_FILE)
-            except OSError as e:
-                logger.warning(f"Error removing lock file: {str(e)}")
+from modules.notification.read_models import WebhookStatsReadModel
+from modules.notification.retention import RetentionPolicy, WebhookLogPruner
+from modules.notification.daemon import DatabaseWriteWatcher, WebhookDaemon
+from modules.notification.dispatcher import WebhookDispatcher
+from modules.notification.outbox import OutboxRelay
+from modules.notification.services import RetryPolicy, WebhookLogService
+from pointsheet.db import engine, get_session
 
 # Set up logging
 logger = logging.getLogger("webhook_cli")
@@ -85,15 +31,50 @@ def webhook_cli():
 @click.option("--limit", default=50, help="Maximum number of webhooks to process")
 @click.option("--timeout", default=10, help="HTTP request timeout in seconds")
 @click.option("--dry-run", is_flag=True, help="Don't actually send webhooks, just log what would be sent")
-def process_webhooks(limit: int, timeout: int, dry_run: bool):
+@click.option(
+    "--workers", default=16, help="Maximum number of webhooks sent at the same time"
+)
+@click.option(
+    "--per-host",
+    default=4,
+    help="Maximum number of webhooks sent to the same host at the same time",
+)
+@click.option(
+    "--max-attempts",
+    default=8,
+    help="Attempts before a failing webhook is dead-lettered",
+)
+@click.option(
+    "--digest-window",
+    default=30.0,
+    help="Seconds events about a resource are held to be sent as one message, 0 to send each one",
+)
+def process_webhooks(
+    limit: int,
+    timeout: int,
+    dry_run: bool,
+    workers: int,
+    per_host: int,
+    max_attempts: int,
+    digest_window: float,
+):
     """Process pending webhook notifications."""
-    # Acquire lock to ensure only one instance is running
-    acquire_lock()
-
-    processor = WebhookProcessorService(logger=logger)
+    processor = WebhookDispatcher(
+        logger=logger,
+        max_workers=workers,
+        per_host=per_host,
+        retry_policy=RetryPolicy(max_attempts=max_attempts),
+    )
 
     try:
-        success_count, failure_count = processor.process_pending_webhooks(limit, timeout, dry_run)
+        if not dry_run:
+            OutboxRelay(
+                processor.session,
+                logger,
+                worker_id=processor.worker_id,
+                digest_window=digest_window,
+            ).expand(limit)
+        success_count, failure_count = processor.dispatch(limit, timeout, dry_run)
 
         if success_count > 0 or failure_count > 0:
             logger.info(f"Processed {success_count + failure_count} webhooks: {success_count} succeeded, {failure_count} failed")
@@ -108,9 +89,93 @@ def process_webhooks(limit: int, timeout: int, dry_run: bool):
         # Always close the session to avoid resource leaks
         if hasattr(processor, 'session'):
             processor.session.close()
+        if processor.sender_service.sessions:
+            processor.sender_service.sessions.close()
+
+
+@webhook_cli.command(
+    name="serve", help="Keep sending webhook notifications as they come in"
+)
+@click.option("--limit", default=50, help="Maximum number of webhooks per batch")
+@click.option("--timeout", default=10, help="HTTP request timeout in seconds")
+@click.option(
+    "--workers", default=16, help="Maximum number of webhooks sent at the same time"
+)
+@click.option(
+    "--per-host",
+    default=4,
+    help="Maximum number of webhooks sent to the same host at the same time",
+)
+@click.option(
+    "--lease",
+    default=300,
+    help="Seconds before webhooks claimed by a daemon that died are sent by another",
+)
+@click.option(
+    "--min-interval",
+    default=1.0,
+    help="Seconds between polls while webhooks keep coming in",
+)
+@click.option(
+    "--max-interval", default=30.0, help="Seconds between polls of an idle queue"
+)
+@click.option(
+    "--max-attempts",
+    default=8,
+    help="Attempts before a failing webhook is dead-lettered",
+)
+@click.option(
+    "--digest-window",
+    default=30.0,
+    help="Seconds events about a resource are held to be sent as one message, 0 to send each one",
+)
+def serve_webhooks(
+    limit: int,
+    timeout: int,
+    workers: int,
+    per_host: int,
+    lease: int,
+    min_interval: float,
+    max_interval: float,
+    max_attempts: int,
+    digest_window: float,
+):
+    """Send webhook notifications until SIGTERM or SIGINT."""
+    dispatcher = WebhookDispatcher(
+        logger=logger,
+        max_workers=workers,
+        per_host=per_host,
+        lease=lease,
+        retry_policy=RetryPolicy(max_attempts=max_attempts),
+    )
+    relay = OutboxRelay(
+        dispatcher.session,
+        logger,
+        worker_id=dispatcher.worker_id,
+        lease=lease,
+        digest_window=digest_window,
+    )
+    watcher = DatabaseWriteWatcher(engine)
+    daemon = WebhookDaemon(
+        dispatcher,
+        watcher,
+        logger=logger,
+        limit=limit,
+        timeout=timeout,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        relay=relay,
+    )
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
 
-        # Release the lock
-        release_lock()
+    try:
+        daemon.run()
+    finally:
+        watcher.close()
+        dispatcher.session.close()
+        if dispatcher.sender_service.sessions:
+            dispatcher.sender_service.sessions.close()
 
 @webhook_cli.command(name="list", help="List webhook logs")
 @click.option("--limit", default=20, help="Maximum number of logs to show")
@@ -119,9 +184,6 @@ def process_webhooks(limit: int, timeout: int, dry_run: bool):
 @click.option("--days", default=1, help="Show logs from the last N days")
 def list_webhook_logs(limit: int, succeeded: Optional[bool], webhook_id: Optional[str], days: int):
     """List webhook logs."""
-    # Acquire lock to ensure only one instance is running
-    acquire_lock()
-
     log_service = WebhookLogService(logger=logger)
 
     try:
@@ -137,7 +199,15 @@ def list_webhook_logs(limit: int, succeeded: Optional[bool], webhook_id: Optiona
             status = "✅" if log.succeeded else "❌"
             timestamp = log.timestamp.strftime("%Y-%m-%d %H:%M:%S")
             http_status = log.http_status or "N/A"
-            click.echo(f"{status} [{timestamp}] ID: {log.id} HTTP: {http_status}")
+            if log.succeeded:
+                retry = ""
+            elif log.next_attempt_at:
+                retry = f" Next attempt: {log.next_attempt_at.strftime('%Y-%m-%d %H:%M:%S')}"
+            else:
+                retry = " Dead-lettered"
+            click.echo(
+                f"{status} [{timestamp}] ID: {log.id} HTTP: {http_status} Attempts: {log.attempts}{retry}"
+            )
 
     except Exception as e:
         click.echo(f"Error listing webhook logs: {str(e)}")
@@ -146,42 +216,57 @@ def list_webhook_logs(limit: int, succeeded: Optional[bool], webhook_id: Optiona
         if hasattr(log_service, 'session'):
             log_service.session.close()
 
-        # Release the lock
-        release_lock()
 
 @webhook_cli.command(name="retry", help="Retry failed webhook deliveries")
-@click.option("--id", help="Retry a specific webhook log by ID")
-@click.option("--all", "retry_all", is_flag=True, help="Retry all failed webhooks")
+@click.option(
+    "--id", help="Retry a specific webhook log by ID, even a dead-lettered one"
+)
+@click.option(
+    "--all", "retry_all", is_flag=True, help="Retry the failed webhooks that are due"
+)
 @click.option("--limit", default=10, help="Maximum number of webhooks to retry")
 @click.option("--timeout", default=10, help="HTTP request timeout in seconds")
-def retry_webhooks(id: Optional[str], retry_all: bool, limit: int, timeout: int):
-    """Retry failed webhook deliveries."""
-    # Acquire lock to ensure only one instance is running
-    acquire_lock()
-
+@click.option(
+    "--max-attempts",
+    default=8,
+    help="Attempts before a failing webhook is dead-lettered",
+)
+def retry_webhooks(
+    id: Optional[str], retry_all: bool, limit: int, timeout: int, max_attempts: int
+):
+    """Retry failed webhook deliveries, within the rate limits of their webhooks."""
     if not id and not retry_all:
         click.echo("Please specify either --id or --all")
-        release_lock()  # Release lock before returning
         return
 
-    processor = WebhookProcessorService(logger=logger)
+    dispatcher = WebhookDispatcher(
+        logger=logger, retry_policy=RetryPolicy(max_attempts=max_attempts)
+    )
 
     try:
         if id:
             # Retry a specific webhook log
-            result = processor.retry_webhook(id, timeout)
-            if result:
+            result = dispatcher.retry_log(id, timeout)
+            if result is None:
+                click.echo(f"Webhook {id} was not retried")
+            elif not result.sent or result.throttled:
+                click.echo(
+                    f"Webhook {id} is rate limited, due again at {result.retry_at}"
+                )
+            elif result.succeeded:
                 click.echo(f"Webhook {id} retry succeeded")
             else:
                 click.echo(f"Webhook {id} retry failed")
         else:
-            # Retry all failed webhook logs
-            success_count, failure_count = processor.retry_failed_webhooks(limit, timeout)
+            # Retry all failed webhook logs that are due
+            success_count, failure_count = dispatcher.dispatch(
+                limit, timeout, failed_only=True
+            )
 
             if success_count > 0 or failure_count > 0:
                 click.echo(f"Retried {success_count + failure_count} webhooks: {success_count} succeeded, {failure_count} failed")
             else:
-                click.echo("No failed webhook logs to retry.")
+                click.echo("No failed webhook logs are due for a retry.")
 
     except ConnectionError as e:
         click.echo(f"Connection error while retrying webhooks: {str(e)}")
@@ -191,11 +276,135 @@ def retry_webhooks(id: Optional[str], retry_all: bool, limit: int, timeout: int)
         click.echo(f"Error retrying webhooks: {str(e)}")
     finally:
         # Always close the session to avoid resource leaks
-        if hasattr(processor, 'session'):
-            processor.session.close()
+        if hasattr(dispatcher, "session"):
+            dispatcher.session.close()
+        if dispatcher.sender_service.sessions:
+            dispatcher.sender_service.sessions.close()
+
+
+@webhook_cli.command(name="prune", help="Archive and delete old webhook logs")
+@click.option(
+    "--keep-successes", default=7.0, help="Days delivered webhook logs are kept"
+)
+@click.option(
+    "--keep-failures", default=30.0, help="Days dead-lettered webhook logs are kept"
+)
+@click.option(
+    "--archive-dir",
+    default="instance/webhook_archives",
+    help="Directory the archives of the deleted logs are written to",
+)
+@click.option(
+    "--no-archive", is_flag=True, help="Delete the logs without archiving them"
+)
+@click.option(
+    "--batch-size", default=500, help="Number of logs read and deleted at a time"
+)
+@click.option(
+    "--vacuum",
+    is_flag=True,
+    help="Give the space of the deleted logs back to the file system (SQLite)",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Don't delete anything, just count the logs that would be",
+)
+def prune_webhook_logs(
+    keep_successes: float,
+    keep_failures: float,
+    archive_dir: str,
+    no_archive: bool,
+    batch_size: int,
+    vacuum: bool,
+    dry_run: bool,
+):
+    """Archive and delete the webhook logs older than the retention policy."""
+    pruner = WebhookLogPruner(
+        logger=logger,
+        policy=RetentionPolicy(
+            keep_successes_days=keep_successes, keep_failures_days=keep_failures
+        ),
+        archive_dir=None if no_archive else archive_dir,
+        batch_size=batch_size,
+    )
+
+    try:
+        if dry_run:
+            counts = pruner.count_expired()
+            click.echo(
+                f"{counts[True] + counts[False]} webhook logs would be pruned: {counts[True]} succeeded, {counts[False]} failed"
+            )
+            return
+
+        result = pruner.prune()
+        if result.path:
+            click.echo(f"Archived {result.archived} webhook logs to {result.path}")
+        click.echo(f"Deleted {result.deleted} webhook logs.")
 
-        # Release the lock
-        release_lock()
+        if vacuum and pruner.compact():
+            click.echo("Compacted the database.")
+
+    except Exception as e:
+        click.echo(f"Error pruning webhook logs: {str(e)}")
+    finally:
+        # Always close the session to avoid resource leaks
+        if hasattr(pruner, "session"):
+            pruner.session.close()
+
+
+def _ms(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value}ms"
+
+
+@webhook_cli.command(name="stats", help="Show webhook delivery statistics")
+@click.option("--days", default=1.0, help="Count the deliveries of the last N days")
+@click.option("--json", "as_json", is_flag=True, help="Print the statistics as JSON")
+def webhook_stats(days: float, as_json: bool):
+    """Show the deliveries, latencies and queue depth of every webhook."""
+    session = next(get_session())
+
+    try:
+        summary = WebhookStatsReadModel(session).delivery_stats(days).summary()
+        if as_json:
+            click.echo(json.dumps(summary, indent=2))
+            return
+
+        queue = summary["queue"]
+        oldest = queue["oldest_pending_age_seconds"]
+        click.echo(
+            f"Queue: {queue['pending']} pending, {queue['due']} due"
+            + (f", oldest waiting {oldest:.0f}s" if oldest is not None else "")
+        )
+        for title, rows in (
+            (
+                "Platforms",
+                [
+                    dict(stats, name=platform)
+                    for platform, stats in summary["platforms"].items()
+                ],
+            ),
+            ("Webhooks", summary["webhooks"]),
+        ):
+            click.echo(f"{title}:")
+            for stats in rows:
+                latency = stats["latency"]
+                statuses = " ".join(
+                    f"{status}:{count}" for status, count in stats["statuses"].items()
+                )
+                click.echo(
+                    f"  {stats['name'] or stats['id']}: {stats['deliveries']} deliveries,"
+                    f" {stats['delivered']} delivered, {stats['dead_lettered']} dead-lettered,"
+                    f" {stats['queue']['pending']} pending"
+                    f" | p50 {_ms(latency['p50_ms'])} p95 {_ms(latency['p95_ms'])} max {_ms(latency['max_ms'])}"
+                    f" | {statuses or 'no responses'}"
+                )
+
+    except Exception as e:
+        click.echo(f"Error reading webhook statistics: {str(e)}")
+    finally:
+        # Always close the session to avoid resource leaks
+        session.close()
 
 
 if __name__ == "__main__":
@@ -4,12 +4,16 @@ import os
 from pathlib import Path
 
 import sentry_sdk
-from flask import Flask, render_template, Response, session, redirect, abort, g
+from flask import Flask, render_template, Response, session, redirect, abort, g, request
 from flask_wtf.csrf import CSRFProtect
 from flask_cors import CORS
 from pydantic import ValidationError
 
 from api import api_bp
+from api.pagination import PAGINATION_HEADERS
+from pointsheet import instrumentation
+from modules.notification.formatters.registry import formatter_registry
+from pointsheet.cache import backend_from_config, query_cache
 from pointsheet.config import config as app_config
 
 root_dir = os.path.join(Path(__file__).parent.parent)
@@ -46,7 +50,9 @@ def create_app(test_config=None):
 
     csrf = CSRFProtect()
     csrf.init_app(app)
-    CORS(app)
+    CORS(app, expose_headers=PAGINATION_HEADERS)
+    query_cache.configure(backend_from_config(app_config), app_config.QUERY_CACHE_TTL)
+    formatter_registry.discover()
 
     try:
         os.makedirs(app.instance_path)
@@ -177,6 +183,23 @@ def create_app(test_config=None):
             response=json.dumps(resp),
         )
 
+    @app.before_request
+    def start_request_tracking():
+        g.request_tracker = instrumentation.start_tracking(
+            "request", f"{request.method} {request.endpoint or request.path}"
+        )
+
+    @app.after_request
+    def stop_request_tracking(response):
+        tracker = g.get("request_tracker")
+        if tracker is not None:
+            instrumentation.stop_tracking(tracker)
+            if app.config.get("DEBUG"):
+                response.headers["Server-Timing"] = (
+                    instrumentation.server_timing_header(tracker)
+                )
+        return response
+
     # In __init__.py (Flask app creation)
     @app.teardown_appcontext
     def close_db_session(exception=None):
@@ -0,0 +1,46 @@
+"""participants per event and waitlist
+
+Revision ID: 4f2c9a7d1e85
+Revises: bb6b548efbcf
+Create Date: 2026-10-18 09:30:12.418307
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2c9a7d1e85"
+down_revision: Union[str, None] = "bb6b548efbcf"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A driver is a participant once per event, not once overall. The
+    # primary key enforces it, the unique constraint on the same columns goes.
+    with op.batch_alter_table(
+        "participants", schema=None, recreate="always"
+    ) as batch_op:
+        batch_op.drop_constraint("unique_driver_event", type_="unique")
+        batch_op.add_column(
+            sa.Column(
+                "waitlisted", sa.Boolean(), server_default=sa.false(), nullable=False
+            )
+        )
+        batch_op.add_column(sa.Column("joined_at", sa.DateTime(), nullable=True))
+        batch_op.create_primary_key("pk_participants", ["id", "event_id"])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM participants WHERE waitlisted")
+    with op.batch_alter_table(
+        "participants", schema=None, recreate="always"
+    ) as batch_op:
+        batch_op.create_primary_key("pk_participants", ["id"])
+        batch_op.create_unique_constraint("unique_driver_event", ["id", "event_id"])
+        batch_op.drop_column("joined_at")
+        batch_op.drop_column("waitlisted")
@@ -0,0 +1,33 @@
+"""index series events and participants
+
+Revision ID: 9b3e6f21c0d4
+Revises: 4f2c9a7d1e85
+Create Date: 2026-10-18 14:15:40.902113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6f21c0d4"
+down_revision: Union[str, None] = "4f2c9a7d1e85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_series", "events", ["series"], unique=False)
+    op.create_index(
+        "ix_participants_event_id_waitlisted",
+        "participants",
+        ["event_id", "waitlisted"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_participants_event_id_waitlisted", table_name="participants")
+    op.drop_index("ix_events_series", table_name="events")
@@ -0,0 +1,75 @@
+"""car full text search
+
+Revision ID: 3c8d5a7f2b16
+Revises: 9b3e6f21c0d4
+Create Date: 2026-10-18 17:30:12.518304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8d5a7f2b16"
+down_revision: Union[str, None] = "9b3e6f21c0d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Left behind by earlier versions of the ``create-car-fts`` command.
+LEGACY_TRIGGERS = ("car_ai", "car_ad", "car_au")
+
+CAR_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE car_fts USING fts5(
+        model,
+        year,
+        content='cars',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER car_fts_ai AFTER INSERT ON cars BEGIN
+        INSERT INTO car_fts(rowid, model, year) VALUES (new.id, new.model, new.year);
+    END
+    """,
+    """
+    CREATE TRIGGER car_fts_ad AFTER DELETE ON cars BEGIN
+        INSERT INTO car_fts(car_fts, rowid, model, year)
+        VALUES ('delete', old.id, old.model, old.year);
+    END
+    """,
+    """
+    CREATE TRIGGER car_fts_au AFTER UPDATE ON cars BEGIN
+        INSERT INTO car_fts(car_fts, rowid, model, year)
+        VALUES ('delete', old.id, old.model, old.year);
+        INSERT INTO car_fts(rowid, model, year) VALUES (new.id, new.model, new.year);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_index("ix_cars_game_id", "cars", ["game_id"], unique=False)
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in LEGACY_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS car_fts")
+    for statement in CAR_FTS_DDL:
+        op.execute(statement)
+    op.execute("INSERT INTO car_fts(car_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("car_fts_ai", "car_fts_ad", "car_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS car_fts")
+
+    op.drop_index("ix_cars_game_id", table_name="cars")
@@ -0,0 +1,35 @@
+"""webhook log leases
+
+Revision ID: 6d1e4b8a2f37
+Revises: 3c8d5a7f2b16
+Create Date: 2026-10-18 19:00:27.310942
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1e4b8a2f37"
+down_revision: Union[str, None] = "3c8d5a7f2b16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("claimed_by", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+        batch_op.create_index(
+            batch_op.f("ix_webhook_logs_claimed_by"), ["claimed_by"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_webhook_logs_claimed_by"))
+        batch_op.drop_column("lease_expires_at")
+        batch_op.drop_column("claimed_by")
@@ -0,0 +1,63 @@
+"""webhook log retries
+
+Revision ID: a7c3e9d15b42
+Revises: 6d1e4b8a2f37
+Create Date: 2026-10-18 20:30:52.184407
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d15b42"
+down_revision: Union[str, None] = "6d1e4b8a2f37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("attempts", sa.Integer(), server_default="0", nullable=False)
+        )
+        batch_op.add_column(sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("last_error_class", sa.String(), nullable=True))
+        batch_op.create_index(
+            "ix_webhook_logs_due", ["next_attempt_at", "lease_expires_at"], unique=False
+        )
+
+    # Unsent logs are due right away. Logs that already failed were only ever
+    # retried by hand, so they are dead-lettered rather than sent out late;
+    # `webhook retry --id` still sends them.
+    logs = sa.table(
+        "webhook_logs",
+        sa.column("timestamp", sa.DateTime),
+        sa.column("succeeded", sa.Boolean),
+        sa.column("http_status", sa.Integer),
+        sa.column("attempts", sa.Integer),
+        sa.column("next_attempt_at", sa.DateTime),
+        sa.column("last_error_class", sa.String),
+    )
+    op.execute(
+        logs.update()
+        .where(logs.c.http_status.is_(None), logs.c.succeeded == sa.false())
+        .values(next_attempt_at=logs.c.timestamp)
+    )
+    op.execute(logs.update().where(logs.c.http_status.isnot(None)).values(attempts=1))
+    op.execute(
+        logs.update()
+        .where(logs.c.succeeded == sa.false(), logs.c.http_status > 0)
+        .values(last_error_class="HTTP " + sa.cast(logs.c.http_status, sa.String))
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.drop_index("ix_webhook_logs_due")
+        batch_op.drop_column("last_error_class")
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("attempts")
@@ -0,0 +1,38 @@
+"""notification outbox
+
+Revision ID: e4f2a6c81d93
+Revises: a7c3e9d15b42
+Create Date: 2026-10-18 22:00:14.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pointsheet
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f2a6c81d93"
+down_revision: Union[str, None] = "a7c3e9d15b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", pointsheet.models.custom_types.EntityIdType, nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("subscription_ids", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("claimed_by", sa.String(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_outbox")
@@ -0,0 +1,44 @@
+"""webhook digests
+
+Revision ID: 5b9d3e7a1c48
+Revises: e4f2a6c81d93
+Create Date: 2026-10-18 23:00:41.227613
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pointsheet
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9d3e7a1c48"
+down_revision: Union[str, None] = "e4f2a6c81d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("notification_outbox", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("resource_type", sa.String(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "resource_id",
+                pointsheet.models.custom_types.EntityIdType,
+                nullable=True,
+            )
+        )
+
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("digest_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.drop_column("digest_key")
+
+    with op.batch_alter_table("notification_outbox", schema=None) as batch_op:
+        batch_op.drop_column("resource_id")
+        batch_op.drop_column("resource_type")
@@ -0,0 +1,28 @@
+"""webhook log retention
+
+Revision ID: c2e8f4a07d15
+Revises: 5b9d3e7a1c48
+Create Date: 2026-10-19 09:00:12.384520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e8f4a07d15"
+down_revision: Union[str, None] = "5b9d3e7a1c48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.create_index("ix_webhook_logs_timestamp", ["timestamp"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.drop_index("ix_webhook_logs_timestamp")
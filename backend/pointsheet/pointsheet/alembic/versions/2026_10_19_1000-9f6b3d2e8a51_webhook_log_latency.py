@@ -0,0 +1,29 @@
+"""webhook log latency
+
+Revision ID: 9f6b3d2e8a51
+Revises: c2e8f4a07d15
+Create Date: 2026-10-19 10:00:27.905164
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f6b3d2e8a51"
+down_revision: Union[str, None] = "c2e8f4a07d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("latency_ms", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_logs", schema=None) as batch_op:
+        batch_op.drop_column("latency_ms")
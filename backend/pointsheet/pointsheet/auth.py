@@ -30,6 +30,20 @@ def verify_token(token):
         raise AuthenticationException()
 
 
+@api_auth.get_user_roles
+def get_user_roles(user):
+    from flask import current_app
+    from modules.auth.exceptions import InvalidUserException
+    from modules.auth.query.get_user_by_id import GetUserById
+
+    try:
+        active_user = current_app.application.execute(GetUserById(user_id=user["id"]))
+    except InvalidUserException:
+        # The user of the token no longer exists, it has no role
+        return None
+    return active_user.role if active_user else None
+
+
 @web_auth.verify_password
 def verify_password(username, password):
     if session.get("is_authenticated"):
@@ -0,0 +1,418 @@
+"""Result cache for lato query handlers."""
+
+import abc
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Tracks, games and cars are only written by migrations and imports.
+CATALOG_TTL = 60 * 60
+
+
+class CacheBackend(abc.ABC):
+    name: str
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the value stored under ``key``, or ``_MISSING``."""
+
+    @abc.abstractmethod
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Tuple[str, ...],
+        versions: Dict[str, int],
+    ) -> bool:
+        """Store ``value`` unless one of ``tags`` moved past ``versions``."""
+
+    @abc.abstractmethod
+    def versions(self, tags: Tuple[str, ...]) -> Dict[str, int]:
+        """Current version of each tag."""
+
+    @abc.abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying one of ``tags`` and bump their versions."""
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """LRU bounded cache living in the current process."""
+
+    name = "memory"
+
+    def __init__(
+        self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic
+    ):
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]] = (
+            OrderedDict()
+        )
+        self._keys_by_tag: Dict[str, set] = defaultdict(set)
+        self._versions: Dict[str, int] = defaultdict(int)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value, _ = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags, versions) -> bool:
+        with self._lock:
+            if any(self._versions[tag] != versions.get(tag, 0) for tag in tags):
+                return False
+            self._remove(key)
+            self._entries[key] = (self._clock() + ttl, value, tags)
+            for tag in tags:
+                self._keys_by_tag[tag].add(key)
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def versions(self, tags) -> Dict[str, int]:
+        with self._lock:
+            return {tag: self._versions[tag] for tag in tags}
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] += 1
+                for key in list(self._keys_by_tag.pop(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    LRU bounded cache stored in a SQLite file.
+
+    Every worker process of a gunicorn server opening the same file shares
+    the entries and sees the invalidations of the others. Values are pickled.
+    The last use of an entry is refreshed at most once a second, so cache
+    hits rarely need the write lock.
+    """
+
+    name = "sqlite"
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS query_cache (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            used_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_query_cache_used_at ON query_cache (used_at)",
+        """
+        CREATE TABLE IF NOT EXISTS query_cache_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS query_cache_versions (
+            tag TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    def __init__(
+        self, path: str, max_entries: int = 1024, clock: Callable[[], float] = time.time
+    ):
+        self._path = path
+        self._max_entries = max_entries
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        backend = self
+
+        class _Transaction:
+            def __enter__(self):
+                backend._conn.execute("BEGIN IMMEDIATE")
+                return backend._conn
+
+            def __exit__(self, exc_type, exc, tb):
+                backend._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+        return _Transaction()
+
+    def get(self, key: str) -> Any:
+        row = self._conn.execute(
+            "SELECT value, expires_at, used_at FROM query_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+
+        value, expires_at, used_at = row
+        now = self._clock()
+        if expires_at <= now:
+            with self._transaction() as conn:
+                self._delete_keys(conn, [key])
+            return _MISSING
+        if now - used_at > 1:
+            self._conn.execute(
+                "UPDATE query_cache SET used_at = ? WHERE key = ?", (now, key)
+            )
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl, tags, versions) -> bool:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = self._clock()
+        with self._transaction() as conn:
+            if self._current_versions(conn, tags) != {
+                tag: versions.get(tag, 0) for tag in tags
+            }:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO query_cache (key, value, expires_at, used_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now),
+            )
+            conn.execute("DELETE FROM query_cache_tags WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO query_cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+            (count,) = conn.execute("SELECT count(*) FROM query_cache").fetchone()
+            if count > self._max_entries:
+                evicted = conn.execute(
+                    "SELECT key FROM query_cache ORDER BY used_at LIMIT ?",
+                    (count - self._max_entries,),
+                ).fetchall()
+                self._delete_keys(conn, [key for (key,) in evicted])
+        return True
+
+    def versions(self, tags) -> Dict[str, int]:
+        return self._current_versions(self._conn, tags)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO query_cache_versions (tag, version) VALUES (?, 1)"
+                " ON CONFLICT (tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags],
+            )
+            placeholders = ", ".join("?" for _ in tags)
+            keys = conn.execute(
+                f"SELECT DISTINCT key FROM query_cache_tags WHERE tag IN ({placeholders})",
+                tags,
+            ).fetchall()
+            self._delete_keys(conn, [key for (key,) in keys])
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM query_cache")
+            conn.execute("DELETE FROM query_cache_tags")
+
+    @staticmethod
+    def _current_versions(conn, tags) -> Dict[str, int]:
+        if not tags:
+            return {}
+        placeholders = ", ".join("?" for _ in tags)
+        stored = dict(
+            conn.execute(
+                f"SELECT tag, version FROM query_cache_versions WHERE tag IN ({placeholders})",
+                list(tags),
+            ).fetchall()
+        )
+        return {tag: stored.get(tag, 0) for tag in tags}
+
+    @staticmethod
+    def _delete_keys(conn, keys) -> None:
+        params = [(key,) for key in keys]
+        conn.executemany("DELETE FROM query_cache WHERE key = ?", params)
+        conn.executemany("DELETE FROM query_cache_tags WHERE key = ?", params)
+
+
+class QueryCache:
+    """
+    Caches the results of lato query handlers and counts hits and misses.
+
+    A result is only stored when the versions of its tags are unchanged since
+    the handler started, so a read racing a commit can't put stale data back.
+    """
+
+    def __init__(
+        self, backend: Optional[CacheBackend] = None, default_ttl: float = 300
+    ):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+        self._invalidations: Dict[str, int] = defaultdict(int)
+
+    def configure(
+        self, backend: Optional[CacheBackend], default_ttl: Optional[float] = None
+    ):
+        self.backend = backend
+        if default_ttl is not None:
+            self.default_ttl = default_ttl
+
+    @staticmethod
+    def key_for(query) -> str:
+        # The message id differs for every query, it isn't part of the key.
+        fields = query.model_dump_json(exclude={"id"})
+        digest = hashlib.sha1(fields.encode()).hexdigest()
+        return f"{type(query).__module__}.{type(query).__qualname__}:{digest}"
+
+    def cached(self, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        """Cache the result of the decorated query handler."""
+        tags = tuple(tags)
+
+        def decorator(fn):
+            # lato passes the query by the name of the handler's first parameter
+            query_param = next(iter(inspect.signature(fn).parameters))
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                if backend is None:
+                    return fn(*args, **kwargs)
+
+                query = args[0] if args else kwargs[query_param]
+                key = self.key_for(query)
+                name = type(query).__name__
+                value = backend.get(key)
+                if value is not _MISSING:
+                    self._count(name, "hits")
+                    return value
+
+                self._count(name, "misses")
+                versions = backend.versions(tags)
+                value = fn(*args, **kwargs)
+                backend.set(key, value, ttl or self.default_ttl, tags, versions)
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        with self._lock:
+            for tag in tags:
+                self._invalidations[tag] += 1
+        if self.backend is not None:
+            self.backend.invalidate(tags)
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._invalidations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            queries = {
+                name: {
+                    **counters,
+                    "hit_ratio": round(
+                        counters["hits"] / (counters["hits"] + counters["misses"]), 3
+                    ),
+                }
+                for name, counters in self._counters.items()
+            }
+            return {
+                "backend": self.backend.name if self.backend else None,
+                "queries": queries,
+                "invalidations": dict(self._invalidations),
+            }
+
+    def _count(self, name: str, counter: str) -> None:
+        with self._lock:
+            self._counters[name][counter] += 1
+
+
+class PendingInvalidations:
+    """Cache tags to invalidate once the current transaction has committed."""
+
+    def __init__(self):
+        self.tags = set()
+
+    def add(self, *tags: str) -> None:
+        self.tags.update(tags)
+
+
+def backend_from_config(config) -> Optional[CacheBackend]:
+    match config.QUERY_CACHE_BACKEND:
+        case "memory":
+            return MemoryBackend(max_entries=config.QUERY_CACHE_MAX_ENTRIES)
+        case "sqlite":
+            return SQLiteBackend(
+                config.QUERY_CACHE_PATH, max_entries=config.QUERY_CACHE_MAX_ENTRIES
+            )
+        case "none" | None:
+            return None
+        case backend:
+            raise ValueError(f"Unknown query cache backend: {backend}")
+
+
+query_cache = QueryCache()
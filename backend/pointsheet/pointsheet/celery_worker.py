@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 
 def _celery_collect_submodules(directory):
@@ -15,3 +16,13 @@ def _celery_collect_submodules(directory):
 celery_task = Celery("pointsheet")
 celery_task.config_from_object("pointsheet.celeryconfig")
 celery_task.autodiscover_tasks(_celery_collect_submodules("modules"))
+
+
+@worker_process_init.connect
+def configure_query_cache(**kwargs):
+    # Tasks commit results too: their invalidations have to reach the cache
+    # the web processes read from.
+    from pointsheet.cache import backend_from_config, query_cache
+    from pointsheet.config import config
+
+    query_cache.configure(backend_from_config(config), config.QUERY_CACHE_TTL)
@@ -1,6 +1,6 @@
 import os.path
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -35,6 +35,25 @@ class Config(BaseSettings):
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     CLOUDFRONT_DOMAIN: Optional[str] = None
+    # Query result cache: "sqlite" (shared by the web, Celery and CLI processes of a host),
+    # "memory" (only sees the invalidations of its own process) or "none"
+    QUERY_CACHE_BACKEND: Optional[str] = "sqlite"
+    QUERY_CACHE_PATH: str = "instance/query_cache.sqlite"
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL: int = 300
+    # OCR text and results extracted from race result screenshots, empty to disable
+    EXTRACTION_CACHE_PATH: Optional[str] = "instance/extraction_cache.sqlite"
+    EXTRACTION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Results tables parsed with less confidence (0-1) are extracted by the LLM
+    RESULTS_PARSER_MIN_CONFIDENCE: float = 0.8
+    # Processes reading result screenshots, the number of CPUs by default
+    OCR_WORKERS: Optional[int] = None
+    # Preprocessing of the screenshots of a game by its id, e.g. {"2": {"median_blur": 3}}
+    OCR_GAME_PROFILES: Dict[int, Dict[str, Any]] = {}
+    # Columns of the CSV results of a game by its id, e.g. {"1": {"Gamertag": "driver"}}
+    RESULT_CSV_COLUMNS: Dict[int, Dict[str, str]] = {}
+    # Result files up to this size are imported during the upload request, larger ones by a task
+    RESULT_IMPORT_INLINE_MAX_BYTES: int = 1024 * 1024
     model_config = SettingsConfigDict()
 
     @property
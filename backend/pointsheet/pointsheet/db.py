@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session as OrmSession, sessionmaker, scoped_session
 
 from pointsheet.config import config
+from pointsheet.instrumentation import instrument_engine
 
 
 engine = create_engine(
@@ -14,12 +16,83 @@ engine = create_engine(
     # pool_timeout=30,
     echo_pool=False,
 )
+instrument_engine(engine)
+
+
+def _in_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+if engine.url.get_backend_name() == "sqlite" and not _in_memory_sqlite(engine.url):
+
+    @event.listens_for(engine, "connect")
+    def set_wal_journal_mode(dbapi_connection, connection_record):
+        # In WAL mode readers keep reading the last committed state while a
+        # writer commits, rather than waiting on the rollback journal's lock.
+        # The mode is stored in the database file, for every connection.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.close()
+
+
+def _create_read_engine():
+    """
+    Engine used by read-only transactions.
+
+    A file backed SQLite database gets its own connection pool with
+    ``query_only`` set, so reads never queue behind a connection holding the
+    write lock: the main engine puts the database in WAL mode, where readers
+    don't block on a commit. An in-memory database only exists on the
+    connection that created it, so it has to share the main engine.
+    """
+    if _in_memory_sqlite(engine.url):
+        return engine
+
+    read_engine = create_engine(
+        config.DATABASE,
+        connect_args={"check_same_thread": False},
+        pool_size=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        echo_pool=False,
+    )
+
+    if read_engine.url.get_backend_name() == "sqlite":
+
+        @event.listens_for(read_engine, "connect")
+        def set_query_only(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only = ON")
+            cursor.close()
+
+    instrument_engine(read_engine)
+    return read_engine
+
+
+read_engine = _create_read_engine()
 
 # Create a sessionmaker that can be used to create sessions
 SessionFactory = sessionmaker(bind=engine)
 Session = scoped_session(SessionFactory)
 
 
+class ReadOnlySession(OrmSession):
+    """Session for queries: it never flushes, so it never writes."""
+
+    def flush(self, objects=None):
+        if self._is_clean():
+            return
+        raise InvalidRequestError("Read-only session cannot flush pending changes")
+
+
+ReadSessionFactory = sessionmaker(
+    bind=read_engine,
+    class_=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
 def get_session():
     """Context manager for database sessions."""
     session = Session()
@@ -18,3 +18,8 @@ class BusinessRuleValidationException(PointSheetException):
 class PointSheetValidationError(PointSheetException):
     def __init__(self, message):
         self.message = message
+
+
+class InvalidCursor(PointSheetException):
+    code = 400
+    message = "Invalid pagination cursor"
@@ -0,0 +1,191 @@
+"""Per-request and per-transaction SQL instrumentation."""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Statements are truncated to keep log lines and the admin payload readable.
+MAX_STATEMENT_LENGTH = 500
+
+_active_trackers: ContextVar[Tuple["Tracker", ...]] = ContextVar(
+    "active_trackers", default=()
+)
+
+
+@dataclass
+class Tracker:
+    """Statements executed while the tracker is open, see ``start_tracking``."""
+
+    kind: str
+    name: str
+    statement_count: int = 0
+    db_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    slowest_time: float = 0.0
+    handlers: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.elapsed is not None
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.statement_count += 1
+        self.db_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement[:MAX_STATEMENT_LENGTH]
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "handlers": self.handlers,
+            "statement_count": self.statement_count,
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "elapsed_ms": round((self.elapsed or 0.0) * 1000, 3),
+            "slowest_statement": self.slowest_statement,
+            "slowest_statement_ms": round(self.slowest_time * 1000, 3),
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class MetricsRegistry:
+    """Thread-safe store of the most recent samples for each tracked name."""
+
+    def __init__(self, max_samples: int = 1000):
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, float, int]]] = (
+            defaultdict(lambda: deque(maxlen=self._max_samples))
+        )
+
+    def record(self, tracker: Tracker) -> None:
+        with self._lock:
+            self._samples[(tracker.kind, tracker.name)].append(
+                (tracker.elapsed or 0.0, tracker.db_time, tracker.statement_count)
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Summarise the recorded samples grouped by kind and name.
+
+        Times are reported in milliseconds.
+        """
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+
+        result: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        for (kind, name), values in samples.items():
+            elapsed = sorted(value[0] for value in values)
+            db_time = sorted(value[1] for value in values)
+            statements = sorted(value[2] for value in values)
+            result[kind][name] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(elapsed, 50) * 1000, 3),
+                "p95_ms": round(_percentile(elapsed, 95) * 1000, 3),
+                "db_p50_ms": round(_percentile(db_time, 50) * 1000, 3),
+                "db_p95_ms": round(_percentile(db_time, 95) * 1000, 3),
+                "statements_p50": _percentile(statements, 50),
+                "statements_p95": _percentile(statements, 95),
+            }
+        return dict(result)
+
+
+metrics = MetricsRegistry()
+
+
+def active_trackers() -> Tuple[Tracker, ...]:
+    return _active_trackers.get()
+
+
+def start_tracking(kind: str, name: str) -> Tracker:
+    """Open a tracker which records every statement until it is stopped."""
+    tracker = Tracker(kind=kind, name=name)
+    _active_trackers.set(_active_trackers.get() + (tracker,))
+    return tracker
+
+
+def stop_tracking(tracker: Tracker) -> Tracker:
+    """Close the tracker, log it and add it to the metrics registry."""
+    if tracker.finished:
+        return tracker
+
+    tracker.elapsed = time.perf_counter() - tracker.started_at
+    _active_trackers.set(
+        tuple(active for active in _active_trackers.get() if active is not tracker)
+    )
+    metrics.record(tracker)
+    logger.info(json.dumps(tracker.as_dict()))
+    return tracker
+
+
+def note_handler(name: str) -> None:
+    """Attach a handler name to every open tracker."""
+    for tracker in _active_trackers.get():
+        tracker.handlers.append(name)
+        if tracker.kind == "transaction" and tracker.name == "transaction":
+            tracker.name = name
+
+
+def server_timing_header(tracker: Tracker) -> str:
+    """Format a tracker as a ``Server-Timing`` header value."""
+    elapsed = tracker.elapsed
+    if elapsed is None:
+        elapsed = time.perf_counter() - tracker.started_at
+    return (
+        f'db;dur={tracker.db_time * 1000:.3f};desc="{tracker.statement_count} queries", '
+        f"app;dur={elapsed * 1000:.3f}"
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("instrumentation_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("instrumentation_start")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    for tracker in _active_trackers.get():
+        tracker.record_statement(statement, duration)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, drop its start time.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("instrumentation_start"):
+        conn.info["instrumentation_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Register the statement timing listeners on ``engine``."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
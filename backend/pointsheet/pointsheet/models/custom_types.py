@@ -39,6 +39,7 @@ class EntityIdType(BaseCustomTypes):
 
 class SeriesStatusType(BaseCustomTypes):
     impl = String
+    cache_ok = True
 
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
         if value and value not in SeriesStatus.__members__.values():
@@ -81,6 +82,7 @@ class EventStatusType(BaseCustomTypes):
 
 class UserRoleType(BaseCustomTypes):
     impl = String
+    cache_ok = True
 
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
         if value and value not in UserRole.__members__.values():
@@ -101,6 +103,7 @@ class UserRoleType(BaseCustomTypes):
 
 class ScheduleTypeType(BaseCustomTypes):
     impl = String
+    cache_ok = True
 
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
         if value and value not in ScheduleType.__members__.values():
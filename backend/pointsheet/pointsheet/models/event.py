@@ -6,10 +6,19 @@ from sqlalchemy import (
     ForeignKey,
     String,
     Integer,
-    UniqueConstraint,
     Text,
     Table,
-    Column, Boolean, inspect,
+    Column,
+    Boolean,
+    Index,
+    inspect,
+    and_,
+    false,
+    DDL,
+    Float,
+    column,
+    event,
+    table,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
@@ -76,10 +85,21 @@ class Participants(BaseModel):
     event_id: Mapped[EntityId] = mapped_column(
         EntityIdType,
         ForeignKey("events.id", ondelete="CASCADE", name="drivers_event"),
+        primary_key=True,
         nullable=False,
     )
+    waitlisted: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
+    joined_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.now, nullable=True
+    )
 
-    __table_args__ = (UniqueConstraint("id", "event_id", name="unique_driver_event"),)
+    __table_args__ = (
+        # The primary key starts with the driver, counting an event's
+        # participants needs its own index.
+        Index("ix_participants_event_id_waitlisted", "event_id", "waitlisted"),
+    )
 
 
 class Track(BaseModel):
@@ -109,7 +129,7 @@ class Game(BaseModel):
 class Car(BaseModel):
     __tablename__ = "cars"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    game_id: Mapped[int] = mapped_column(Integer, ForeignKey("games.id"))
+    game_id: Mapped[int] = mapped_column(Integer, ForeignKey("games.id"), index=True)
     game: Mapped["Game"] = relationship("Game", back_populates="cars")
     model: Mapped[str] = mapped_column(String(255))
     year: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
@@ -128,6 +148,53 @@ class Car(BaseModel):
         return self.id == other.id
 
 
+# FTS5 index of the car catalog. It is an external content table, the text is
+# only stored in ``cars`` and the triggers keep the index in step with it.
+# ``rank`` is the bm25 score of a match, lower is better.
+car_fts = table("car_fts", column("rowid", Integer), column("rank", Float))
+
+CAR_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE car_fts USING fts5(
+        model,
+        year,
+        content='cars',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER car_fts_ai AFTER INSERT ON cars BEGIN
+        INSERT INTO car_fts(rowid, model, year) VALUES (new.id, new.model, new.year);
+    END
+    """,
+    """
+    CREATE TRIGGER car_fts_ad AFTER DELETE ON cars BEGIN
+        INSERT INTO car_fts(car_fts, rowid, model, year)
+        VALUES ('delete', old.id, old.model, old.year);
+    END
+    """,
+    """
+    CREATE TRIGGER car_fts_au AFTER UPDATE ON cars BEGIN
+        INSERT INTO car_fts(car_fts, rowid, model, year)
+        VALUES ('delete', old.id, old.model, old.year);
+        INSERT INTO car_fts(rowid, model, year) VALUES (new.id, new.model, new.year);
+    END
+    """,
+)
+
+for _statement in CAR_FTS_DDL:
+    event.listen(
+        Car.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Car.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS car_fts").execute_if(dialect="sqlite"),
+)
+
+
 class Event(BaseModel):
     __tablename__ = "events"
     id: Mapped[EntityId] = mapped_column(
@@ -141,6 +208,7 @@ class Event(BaseModel):
             name="series_event",
         ),
         nullable=True,
+        index=True,
     )
     track: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     starts_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -151,7 +219,21 @@ class Event(BaseModel):
         cascade="all, delete-orphan"
     )
     drivers: Mapped[Optional[List[Participants]]] = relationship(
-        Participants, cascade="all, delete-orphan"
+        Participants,
+        primaryjoin=lambda: and_(
+            Event.id == Participants.event_id, Participants.waitlisted.is_(False)
+        ),
+        cascade="all, delete-orphan",
+        overlaps="waitlist",
+    )
+    waitlist: Mapped[List[Participants]] = relationship(
+        Participants,
+        primaryjoin=lambda: and_(
+            Event.id == Participants.event_id, Participants.waitlisted.is_(True)
+        ),
+        order_by=Participants.joined_at,
+        cascade="all, delete-orphan",
+        overlaps="drivers",
     )
     cars: Mapped[Optional[List[Car]]] = relationship(
         "Car", 
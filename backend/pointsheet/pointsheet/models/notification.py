@@ -1,5 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -45,6 +55,12 @@ class WebhookLog(BaseModel):
     Database model for webhook logs.
     """
     __tablename__ = "webhook_logs"
+    __table_args__ = (
+        # The due-queue: pending and retried logs, in the order they are due
+        Index("ix_webhook_logs_due", "next_attempt_at", "lease_expires_at"),
+        # Logs by age, for list_logs and WebhookLogPruner
+        Index("ix_webhook_logs_timestamp", "timestamp"),
+    )
 
     id: Mapped[EntityId] = mapped_column(EntityIdType, primary_key=True, default=uuid_default())
     webhook_id: Mapped[EntityId] = mapped_column(EntityIdType, ForeignKey("webhooks.id"), nullable=False)
@@ -54,3 +70,43 @@ class WebhookLog(BaseModel):
     response_body: Mapped[str] = mapped_column(Text, nullable=True)
     succeeded: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, nullable=False)
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # When the log is due to be sent, NULL once it is delivered or dead-lettered
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=True
+    )
+    last_error_class: Mapped[str] = mapped_column(String, nullable=True)
+    # Milliseconds the last attempt took, until the response or the error
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=True)
+    # Logs of a webhook with the same key are sent as one digest, see OutboxRelay
+    digest_key: Mapped[str] = mapped_column(String, nullable=True)
+    # Set while a webhook daemon is sending the log, see WebhookDispatcher.claim_deliveries
+    claimed_by: Mapped[str] = mapped_column(String, nullable=True, index=True)
+    lease_expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class OutboxMessage(BaseModel):
+    """
+    Database model for the notification outbox: a domain event waiting to be
+    expanded into webhook logs, see OutboxRelay.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[EntityId] = mapped_column(
+        EntityIdType, primary_key=True, default=uuid_default()
+    )
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    resource_type: Mapped[str] = mapped_column(String, nullable=True)
+    resource_id: Mapped[EntityId] = mapped_column(EntityIdType, nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # The subscriptions the event was routed to when it was published
+    subscription_ids: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+    # Set while a relay is expanding the message, see OutboxRelay.claim_messages
+    claimed_by: Mapped[str] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -1,15 +1,137 @@
 import abc
+import base64
+import binascii
+import json
+import uuid
 from abc import abstractmethod
-from typing import Any, Generic, List, TypeVar
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
 
-from sqlalchemy import select
+from pydantic import BaseModel as PydanticModel, Field
+from sqlalchemy import DateTime, func, literal, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
 
+from pointsheet.domain.exceptions.base import InvalidCursor
+from pointsheet.domain.responses import CursorPage
 from pointsheet.domain.types import EntityId
 from pointsheet.models import BaseModel
 
 DbModel = TypeVar("S", bound=BaseModel)
 T = TypeVar("T", bound="Any")
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PageRequest(PydanticModel):
+    """
+    Position and size of a page in a keyset paginated listing.
+
+    ``cursor`` is the ``next_cursor`` of the previous page, or ``None`` for
+    the first one. ``with_total`` adds a COUNT over the whole listing.
+    """
+
+    cursor: Optional[str] = None
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    with_total: bool = False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the sort key values of the last row of a page into a cursor."""
+    payload = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """Unpack a cursor made by ``encode_cursor`` for the given sort keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise InvalidCursor()
+        return [
+            datetime.fromisoformat(value)
+            if isinstance(key.type, DateTime) and value is not None
+            else value
+            for key, value in zip(keys, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursor()
+
+
+def paginate(
+    session,
+    stmt: Any,
+    page: PageRequest,
+    keys: Sequence[InstrumentedAttribute],
+    map_row: Callable[[Any], Any],
+    descending: bool = False,
+    total_column: Optional[str] = None,
+) -> CursorPage:
+    """
+    Fetch one page of ``stmt`` ordered by ``keys``.
+
+    ``keys`` must end with a unique column so the order is total. Rows after
+    the cursor are selected with a row value comparison on the keys, so a
+    deep page costs the same as the first one, unlike an OFFSET which reads
+    and discards every row before it. The sort keys must not be nullable.
+
+    ``stmt`` may select a single entity or a set of columns; in the latter
+    case the key columns must be selected under their attribute names.
+
+    ``total_column`` names a column of ``stmt`` holding ``count(*) OVER ()``
+    over the unpaged rows. The total is then read from the page instead of
+    running the statement a second time to count it.
+    """
+    paged = stmt
+    if page.cursor:
+        values = decode_cursor(page.cursor, keys)
+        position = tuple_(
+            *(literal(value, key.type) for key, value in zip(keys, values))
+        )
+        paged = paged.where(
+            tuple_(*keys) < position if descending else tuple_(*keys) > position
+        )
+
+    order = [key.desc() for key in keys] if descending else list(keys)
+    result = session.execute(paged.order_by(*order).limit(page.limit + 1))
+    rows = (result.scalars() if _selects_entity(stmt) else result).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+    total = None
+    if page.with_total and total_column and rows:
+        total = getattr(rows[0], total_column)
+    elif page.with_total:
+        total = session.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar()
+
+    return CursorPage.create(
+        items=[map_row(row) for row in rows],
+        limit=page.limit,
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+def _selects_entity(stmt: Any) -> bool:
+    descriptions = stmt.column_descriptions
+    return (
+        len(descriptions) == 1 and descriptions[0]["entity"] is descriptions[0]["expr"]
+    )
+
 
 class DataMapper(Generic[DbModel, T], abc.ABC):
     db_entity_class: type[DbModel]
@@ -50,6 +172,25 @@ class AbstractRepository(Generic[DbModel, T], abc.ABC):
         result = session.execute(stmt).scalars()
         return [self._map_to_model(item) for item in result] if result else None
 
+    def _paginate(
+        self,
+        stmt: Any,
+        page: PageRequest,
+        keys: Sequence[InstrumentedAttribute],
+        descending: bool = False,
+        map_row: Optional[Callable[[Any], T]] = None,
+        total_column: Optional[str] = None,
+    ) -> CursorPage[T]:
+        """Fetch one page of entities of ``stmt``, see ``paginate``."""
+        return paginate(
+            self._session,
+            stmt,
+            page,
+            keys,
+            map_row or self._map_to_model,
+            descending,
+            total_column,
+        )
 
     @property
     def mapper(self):
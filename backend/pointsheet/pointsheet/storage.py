@@ -48,7 +48,7 @@ class LocalFileStore(FileStore):
         """
         import uuid
 
-        allowed_extensions = {"jpeg", "png", "csv", "pdf", "jpg", "webp"}
+        allowed_extensions = {"jpeg", "png", "csv", "json", "pdf", "jpg", "webp"}
         sanitized_name = secure_filename(file_path)
         extension = os.path.splitext(sanitized_name)[1].lower().lstrip(".")
 
@@ -126,7 +126,7 @@ class S3FileStore(FileStore):
         """
         import uuid
 
-        allowed_extensions = {"jpeg", "png", "csv", "pdf", "jpg"}
+        allowed_extensions = {"jpeg", "png", "csv", "json", "pdf", "jpg"}
         sanitized_name = secure_filename(file_path)
         extension = os.path.splitext(sanitized_name)[1].lower().lstrip(".")
 
@@ -208,6 +208,7 @@ class S3FileStore(FileStore):
             "jpg": "image/jpeg",
             "png": "image/png",
             "csv": "text/csv",
+            "json": "application/json",
             "pdf": "application/pdf",
         }
         return content_types.get(extension, "application/octet-stream")
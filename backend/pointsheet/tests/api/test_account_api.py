@@ -25,6 +25,37 @@ def test_get_all_drivers(client, auth_token, db_session):
     assert str(user2.id) in driver_ids
 
 
+def test_get_drivers_page_by_page(client, auth_token, db_session):
+    for _ in range(3):
+        UserFactory(session=db_session)
+    db_session.commit()
+
+    response = client.get(
+        "/api/accounts/drivers?limit=2&total=true", headers=auth_token
+    )
+
+    assert response.status_code == 200
+    assert len(response.json) == 2
+    total = int(response.headers["X-Total-Count"])
+    assert 'rel="next"' in response.headers["Link"]
+
+    seen = [driver["id"] for driver in response.json]
+    cursor = response.headers["X-Next-Cursor"]
+    while cursor:
+        response = client.get(
+            f"/api/accounts/drivers?limit=2&cursor={cursor}", headers=auth_token
+        )
+        seen += [driver["id"] for driver in response.json]
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert len(seen) == len(set(seen)) == total
+
+
+def test_get_drivers_with_invalid_cursor_fails(client, auth_token):
+    response = client.get("/api/accounts/drivers?cursor=bogus", headers=auth_token)
+    assert response.status_code == 400
+
+
 def test_get_driver_by_id(client, auth_token, db_session):
     # Create a test driver
     user = UserFactory(session=db_session)
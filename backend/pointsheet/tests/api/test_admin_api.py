@@ -0,0 +1,94 @@
+from sqlalchemy import delete, update
+
+from pointsheet import instrumentation
+from pointsheet.domain.entity import UserRole
+from pointsheet.models import User
+
+
+def make_admin(db_session, user):
+    db_session.execute(
+        update(User).where(User.id == user.id).values(role=UserRole.admin)
+    )
+    db_session.commit()
+
+
+def test_metrics_requires_admin_role(client, auth_token):
+    response = client.get("/api/admin/metrics", headers=auth_token)
+
+    assert response.status_code == 403
+
+
+def test_metrics_forbid_a_deleted_user(client, auth_token, db_session, default_user):
+    db_session.execute(delete(User).where(User.id == default_user.id))
+    db_session.commit()
+
+    response = client.get("/api/admin/metrics", headers=auth_token)
+
+    assert response.status_code == 403
+
+
+def test_metrics_returns_request_and_transaction_percentiles(
+    client, auth_token, db_session, default_user
+):
+    make_admin(db_session, default_user)
+    instrumentation.metrics.reset()
+
+    client.get("/api/games", headers=auth_token)
+    response = client.get("/api/admin/metrics", headers=auth_token)
+
+    assert response.status_code == 200
+    assert "GET api.games.get_games" in response.json["request"]
+    assert response.json["transaction"]["fetch_all_games"]["count"] == 1
+
+
+def test_metrics_report_query_cache_hits(client, auth_token, db_session, default_user):
+    make_admin(db_session, default_user)
+
+    client.get("/api/games", headers=auth_token)
+    client.get("/api/games", headers=auth_token)
+    response = client.get("/api/admin/metrics", headers=auth_token)
+
+    assert response.json["cache"]["backend"] == "memory"
+    assert response.json["cache"]["queries"]["GetGames"] == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_webhook_stats_require_admin_role(client, auth_token):
+    response = client.get("/api/admin/webhooks/stats", headers=auth_token)
+
+    assert response.status_code == 403
+
+
+def test_webhook_stats_return_queue_and_webhooks(
+    client, auth_token, db_session, default_user
+):
+    make_admin(db_session, default_user)
+    client.post(
+        "/api/webhooks",
+        json={
+            "name": "league",
+            "target_url": "https://discord.test/hook",
+            "platform": "discord",
+        },
+        headers=auth_token,
+    )
+
+    response = client.get("/api/admin/webhooks/stats?days=7", headers=auth_token)
+
+    assert response.status_code == 200
+    assert response.json["queue"] == {
+        "pending": 0,
+        "due": 0,
+        "oldest_pending_age_seconds": None,
+    }
+    assert [webhook["name"] for webhook in response.json["webhooks"]] == ["league"]
+    assert response.json["platforms"]["discord"]["deliveries"] == 0
+
+
+def test_server_timing_header_is_sent_in_debug(client, auth_token):
+    response = client.get("/api/games", headers=auth_token)
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
@@ -0,0 +1,42 @@
+from pointsheet.factories.event import GameFactory
+from pointsheet.models import Car
+
+
+def test_suggest_cars_matches_prefixes(client, auth_token, db_session):
+    game = GameFactory(session=db_session)
+    db_session.add_all(
+        Car(game_id=game.id, model=model, year="2020")
+        for model in ("Porsche 911 GT3", "Porsche 918 Spyder", "Mazda MX-5")
+    )
+    db_session.commit()
+
+    response = client.get(
+        f"/api/cars/suggest?q=pors 91&game={game.id}&limit=1", headers=auth_token
+    )
+
+    assert response.status_code == 200, response.json
+    assert len(response.json) == 1
+    assert response.json[0]["model"].startswith("Porsche 91")
+
+
+def test_suggest_cars_without_words_is_empty(client, auth_token):
+    response = client.get("/api/cars/suggest?q=%20-", headers=auth_token)
+
+    assert response.status_code == 200
+    assert response.json == []
+
+
+def test_search_cars_by_game_name(client, auth_token, db_session):
+    game = GameFactory(session=db_session)
+    other = GameFactory(session=db_session)
+    db_session.add(Car(game_id=game.id, model="Porsche 911 GT3", year="2020"))
+    db_session.add(Car(game_id=other.id, model="Porsche 935", year="1978"))
+    db_session.commit()
+
+    response = client.get(
+        f"/api/cars?game={game.name}&search=porsche&total=true", headers=auth_token
+    )
+
+    assert response.status_code == 200, response.json
+    assert [car["model"] for car in response.json] == ["Porsche 911 GT3"]
+    assert response.headers["X-Total-Count"] == "1"
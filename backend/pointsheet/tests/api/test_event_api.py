@@ -1,6 +1,9 @@
+import io
 import uuid
+from unittest.mock import patch
 
 from fastjsonschema import validate
+from werkzeug.datastructures import FileStorage
 
 from pointsheet.factories.account import UserFactory
 from pointsheet.factories.event import EventFactory, EventDriverFactory, TrackFactory, GameFactory
@@ -109,6 +112,31 @@ def test_driver_joining_event_twice_fails(client, auth_token, default_user, db_s
     assert response.status_code == 400, response.json
 
 
+def test_driver_joining_full_event(client, auth_token, default_user, db_session):
+    event = EventFactory(session=db_session, max_participants=1)
+    EventDriverFactory(event_id=event.id, session=db_session)
+    UserFactory(id=default_user.id, session=db_session)
+    db_session.flush()
+
+    response = client.put(f"/api/events/{event.id}/join", headers=auth_token)
+    assert response.status_code == 409, response.json
+
+
+def test_driver_joining_waitlist_of_full_event(
+    client, auth_token, default_user, db_session
+):
+    event = EventFactory(session=db_session, max_participants=1)
+    EventDriverFactory(event_id=event.id, session=db_session)
+    UserFactory(id=default_user.id, session=db_session)
+    db_session.flush()
+
+    response = client.put(
+        f"/api/events/{event.id}/join?waitlist=true", headers=auth_token
+    )
+    assert response.status_code == 202, response.json
+    assert response.json == {"status": "waitlisted"}
+
+
 def test_driver_leaving_event_succeeds(client, auth_token, default_user, db_session):
     event = EventFactory(session=db_session)
     EventDriverFactory(id=default_user.id, event_id=event.id, session=db_session)
@@ -257,3 +285,162 @@ def test_delete_non_existent_event_returns_400(client, auth_token):
 
     # Should return a 400 error
     assert response.status_code == 400
+
+
+def _screenshot(name):
+    return FileStorage(
+        stream=io.BytesIO(b"\x89PNG\r\n\x1a\n" + name.encode()),
+        filename=name,
+        content_type="image/png",
+    )
+
+
+def test_upload_result_screenshots_extracts_them_together(
+    client, auth_token, db_session
+):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+
+    with patch(
+        "modules.event.commands.save_uploaded_result.extract_race_results_from_files.delay"
+    ) as delay:
+        response = client.post(
+            f"/api/events/{event.id}/schedule/1/results",
+            data={"file": [_screenshot("result.png"), _screenshot("result.png")]},
+            headers=auth_token,
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 204
+    event_id, schedule_id, file_paths, _ = delay.call_args.args
+    assert (event_id, schedule_id) == (event.id, 1)
+    # both screenshots are kept though they have the same name
+    assert len(set(file_paths)) == 2
+
+
+def test_upload_result_screenshots_are_limited(client, auth_token, db_session):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+
+    response = client.post(
+        f"/api/events/{event.id}/schedule/1/results",
+        data={"file": [_screenshot(f"result_{n}.png") for n in range(6)]},
+        headers=auth_token,
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+
+
+def test_upload_several_files_to_the_event_results_is_rejected(
+    client, auth_token, db_session
+):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+
+    response = client.post(
+        f"/api/events/{event.id}/results",
+        data={"file": [_screenshot("result_1.png"), _screenshot("result_2.png")]},
+        headers=auth_token,
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+
+
+def test_upload_results_file_is_imported_without_the_task_queue(
+    client, auth_token, db_session
+):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+    client.post(
+        f"/api/events/{event.id}/schedule",
+        json={"type": "race", "duration": "00:45:00"},
+        headers=auth_token,
+    )
+    schedule_id = client.get(f"/api/events/{event.id}", headers=auth_token).json[
+        "schedule"
+    ][0]["id"]
+    results = FileStorage(
+        stream=io.BytesIO(
+            b"Pos,Driver,Best Lap,Total\n1,Max,1:32.100,45:10.000\n2,Lando,1:32.200,45:12.300\n"
+        ),
+        filename="results.csv",
+        content_type="text/csv",
+    )
+
+    with (
+        patch(
+            "modules.event.commands.save_uploaded_result.extract_race_result_from_file.delay"
+        ) as extract,
+        patch(
+            "modules.event.commands.save_uploaded_result.import_race_result_from_file.delay"
+        ) as import_,
+    ):
+        response = client.post(
+            f"/api/events/{event.id}/schedule/{schedule_id}/results",
+            data={"file": results},
+            headers=auth_token,
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 204, response.json
+    assert not extract.called and not import_.called
+    schedule = client.get(f"/api/events/{event.id}", headers=auth_token).json[
+        "schedule"
+    ][0]
+    assert [
+        (result["position"], result["driver"])
+        for result in schedule["result"]["result"]
+    ] == [(1, "Max"), (2, "Lando")]
+
+
+def test_upload_large_results_file_is_imported_by_a_task(
+    client, auth_token, db_session, monkeypatch
+):
+    from pointsheet.config import config
+
+    monkeypatch.setattr(config, "RESULT_IMPORT_INLINE_MAX_BYTES", 16)
+    event = EventFactory(session=db_session)
+    db_session.commit()
+    results = FileStorage(
+        stream=io.BytesIO(b"Pos,Driver\n1,Max\n2,Lando\n"),
+        filename="results.csv",
+        content_type="text/csv",
+    )
+
+    with patch(
+        "modules.event.commands.save_uploaded_result.import_race_result_from_file.delay"
+    ) as delay:
+        response = client.post(
+            f"/api/events/{event.id}/schedule/1/results",
+            data={"file": results},
+            headers=auth_token,
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 204
+    assert delay.call_args.args[2].endswith("results.csv")
+
+
+def test_upload_unknown_json_is_rejected_rather_than_read_by_ocr(
+    client, auth_token, db_session
+):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+    standings = FileStorage(
+        stream=io.BytesIO(b'{"standings": []}'), filename="standings.json"
+    )
+
+    with patch(
+        "modules.event.commands.save_uploaded_result.extract_race_result_from_file.delay"
+    ) as delay:
+        response = client.post(
+            f"/api/events/{event.id}/schedule/1/results",
+            data={"file": standings},
+            headers=auth_token,
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 400
+    assert not delay.called
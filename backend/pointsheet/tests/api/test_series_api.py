@@ -59,6 +59,39 @@ def test_fetch_series_by_id(client, db_session, auth_token):
         assert str(series.id) == resp.json["id"]
 
 
+def test_fetch_all_series_lists_summaries(client, db_session, auth_token):
+    series = SeriesFactory(status=SeriesStatus.started, session=db_session)
+    for _ in range(2):
+        EventFactory(series=series.id, session=db_session)
+    db_session.commit()
+
+    resp = client.get("/api/series?status=started", headers=auth_token)
+
+    assert resp.status_code == HTTPStatus.OK
+    summary = next(item for item in resp.json if item["id"] == str(series.id))
+    assert summary["event_count"] == 2
+    assert "events" not in summary
+
+
+def test_series_list_shows_a_status_change(client, db_session, auth_token):
+    series = SeriesFactory(status=SeriesStatus.started, session=db_session)
+    db_session.commit()
+    resp = client.get("/api/series", headers=auth_token)
+    summary = next(item for item in resp.json if item["id"] == str(series.id))
+    assert summary["status"] == "started"
+
+    resp = client.put(
+        f"/api/series/{series.id}/status",
+        json={"status": "not_started"},
+        headers=auth_token,
+    )
+    assert resp.status_code == HTTPStatus.NO_CONTENT, resp.json
+
+    resp = client.get("/api/series", headers=auth_token)
+    summary = next(item for item in resp.json if item["id"] == str(series.id))
+    assert summary["status"] == "not_started"
+
+
 def test_add_event_to_series(client, db_session, auth_token):
     series = SeriesFactory(session=db_session)
     db_session.commit()
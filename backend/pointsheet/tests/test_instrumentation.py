@@ -0,0 +1,60 @@
+from sqlalchemy import text
+
+from pointsheet import instrumentation
+from pointsheet.instrumentation import MetricsRegistry, Tracker
+
+
+def test_tracker_records_statements_executed_while_active(db_session):
+    tracker = instrumentation.start_tracking("transaction", "test")
+    db_session.execute(text("SELECT 1"))
+    db_session.execute(text("SELECT 2"))
+    instrumentation.stop_tracking(tracker)
+    db_session.execute(text("SELECT 3"))
+
+    assert tracker.statement_count == 2
+    assert tracker.slowest_statement in ("SELECT 1", "SELECT 2")
+    assert tracker.db_time >= tracker.slowest_time > 0
+    assert tracker not in instrumentation.active_trackers()
+
+
+def test_nested_trackers_both_see_inner_statements(db_session):
+    outer = instrumentation.start_tracking("request", "outer")
+    db_session.execute(text("SELECT 1"))
+    inner = instrumentation.start_tracking("transaction", "transaction")
+    instrumentation.note_handler("inner_handler")
+    db_session.execute(text("SELECT 2"))
+    instrumentation.stop_tracking(inner)
+    instrumentation.stop_tracking(outer)
+
+    assert outer.statement_count == 2
+    assert inner.statement_count == 1
+    assert inner.name == "inner_handler"
+    assert outer.handlers == ["inner_handler"]
+
+
+def test_registry_reports_percentiles():
+    registry = MetricsRegistry()
+    for elapsed in range(1, 101):
+        registry.record(
+            Tracker(
+                kind="request", name="GET x", elapsed=elapsed / 1000, statement_count=1
+            )
+        )
+
+    summary = registry.snapshot()["request"]["GET x"]
+
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50
+    assert summary["p95_ms"] == 95
+    assert summary["statements_p95"] == 1
+
+
+def test_executing_a_query_records_the_handler_name(db_session):
+    from modules import application
+    from modules.event.queries.get_games import GetGames
+
+    instrumentation.metrics.reset()
+    application.execute(GetGames())
+
+    transactions = instrumentation.metrics.snapshot()["transaction"]
+    assert transactions["fetch_all_games"]["count"] == 1
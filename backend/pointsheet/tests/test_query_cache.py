@@ -0,0 +1,183 @@
+import uuid
+
+import pytest
+
+from modules import application
+from modules.auth.exceptions import EventNotFoundException
+from modules.event.commands.create_series import CreateSeries
+from modules.event.commands.delete_event import DeleteEvent
+from modules.event.queries.get_all_series import GetAllSeries
+from modules.event.queries.get_events import GetEvents
+from modules.event.queries.get_games import GetGames
+from pointsheet.cache import (
+    MemoryBackend,
+    QueryCache,
+    SQLiteBackend,
+    _MISSING,
+    query_cache,
+)
+from pointsheet.factories.event import EventFactory, GameFactory
+from pointsheet.repository import PageRequest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend_factory(request, tmp_path):
+    def create(max_entries=10, clock=None):
+        clock = clock or Clock()
+        if request.param == "memory":
+            return MemoryBackend(max_entries=max_entries, clock=clock)
+        return SQLiteBackend(
+            str(tmp_path / "cache.sqlite"), max_entries=max_entries, clock=clock
+        )
+
+    return create
+
+
+def test_entries_expire_after_their_ttl(backend_factory):
+    clock = Clock()
+    backend = backend_factory(clock=clock)
+
+    backend.set("key", [1, 2], ttl=60, tags=(), versions={})
+    clock.now += 59
+    assert backend.get("key") == [1, 2]
+
+    clock.now += 1
+    assert backend.get("key") is _MISSING
+
+
+def test_least_recently_used_entry_is_evicted(backend_factory):
+    clock = Clock()
+    backend = backend_factory(max_entries=2, clock=clock)
+
+    backend.set("a", "a", ttl=60, tags=(), versions={})
+    clock.now += 2
+    backend.set("b", "b", ttl=60, tags=(), versions={})
+    clock.now += 2
+    backend.get("a")
+    clock.now += 2
+    backend.set("c", "c", ttl=60, tags=(), versions={})
+
+    assert backend.get("a") == "a"
+    assert backend.get("b") is _MISSING
+    assert backend.get("c") == "c"
+
+
+def test_invalidating_a_tag_drops_its_entries(backend_factory):
+    backend = backend_factory()
+    backend.set("series", 1, ttl=60, tags=("series", "events"), versions={})
+    backend.set("tracks", 2, ttl=60, tags=("catalog",), versions={})
+
+    backend.invalidate(["events"])
+
+    assert backend.get("series") is _MISSING
+    assert backend.get("tracks") == 2
+
+
+def test_result_read_before_an_invalidation_is_not_stored(backend_factory):
+    backend = backend_factory()
+    versions = backend.versions(("events",))
+
+    backend.invalidate(["events"])
+
+    assert not backend.set(
+        "events", "stale", ttl=60, tags=("events",), versions=versions
+    )
+    assert backend.get("events") is _MISSING
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+    first.set("key", {"title": "Sunday league"}, ttl=60, tags=("series",), versions={})
+    assert second.get("key") == {"title": "Sunday league"}
+
+    second.invalidate(["series"])
+    assert first.get("key") is _MISSING
+
+
+def test_cache_keys_differ_per_query_and_page():
+    keys = {
+        QueryCache.key_for(GetEvents()),
+        QueryCache.key_for(GetEvents(page=PageRequest(limit=10))),
+        QueryCache.key_for(GetAllSeries()),
+    }
+
+    assert len(keys) == 3
+    assert QueryCache.key_for(GetGames()) == QueryCache.key_for(GetGames())
+
+
+def test_cached_query_counts_hits_and_misses(db_session):
+    GameFactory(session=db_session)
+    db_session.commit()
+
+    first = application.execute(GetGames())
+    second = application.execute(GetGames())
+
+    assert second == first
+    assert query_cache.stats()["queries"]["GetGames"] == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_committed_command_invalidates_listings(db_session):
+    event = EventFactory(session=db_session)
+    db_session.commit()
+    assert len(application.execute(GetEvents())) == 1
+
+    application.execute(DeleteEvent(event_id=event.id))
+
+    assert len(application.execute(GetEvents())) == 0
+    assert query_cache.stats()["invalidations"] == {"series": 1, "events": 1}
+
+
+def test_failed_command_keeps_cached_listings(db_session):
+    application.execute(GetAllSeries())
+
+    with pytest.raises(EventNotFoundException):
+        application.execute(DeleteEvent(event_id=uuid.uuid4()))
+    application.execute(GetAllSeries())
+
+    assert query_cache.stats()["invalidations"] == {}
+    assert query_cache.stats()["queries"]["GetAllSeries"]["hits"] == 1
+
+
+def test_creating_a_series_invalidates_series_listing(db_session):
+    assert len(application.execute(GetAllSeries())) == 0
+
+    application.execute(CreateSeries(title="Sunday league"))
+
+    assert [series.title for series in application.execute(GetAllSeries())] == [
+        "Sunday league"
+    ]
+
+
+def test_result_imported_by_a_task_invalidates_listings(db_session, tmp_path):
+    from modules.event.domain.value_objects import ScheduleType
+    from modules.event.repository import EventRepository
+    from modules.event.tasks import import_race_result_from_file
+    from pointsheet.models import EventSchedule
+
+    event = EventFactory(
+        session=db_session,
+        schedule=[EventSchedule(type=ScheduleType.race, duration="30m")],
+    )
+    db_session.commit()
+    results = tmp_path / "results.csv"
+    results.write_text("Pos,Driver\n1,Max\n2,Lando\n")
+
+    import_race_result_from_file(
+        event.id, event.schedule[0].id, str(results), EventRepository(db_session)
+    )
+
+    assert query_cache.stats()["invalidations"] == {"events": 1}
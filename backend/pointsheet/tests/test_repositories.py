@@ -1,8 +1,22 @@
+import uuid
+from datetime import datetime
+
+import pytest
+import sqlalchemy.event
+
 from modules.event.domain.entity import Event
 from modules.event.domain.value_objects import EventStatus
 from pointsheet.domain.types import EntityId
-from modules.event.repository import EventRepository
+from modules.event.queries.get_cars import GetCars
+from modules.event.repository import CarRepository, EventRepository
+from modules.notification.domain.value_objects import WebhookPlatform
+from modules.notification.repository import WebhookLogRepository
+from pointsheet.db import engine
+from pointsheet.domain.exceptions.base import InvalidCursor
 from pointsheet.factories.event import EventFactory
+from pointsheet.models import Car, Game
+from pointsheet.models.notification import Webhook, WebhookLog
+from pointsheet.repository import PageRequest
 
 
 def test_saving_of_event_using_repository(db_session):
@@ -29,3 +43,159 @@ def test_fetching_all_event_using_repository(db_session):
     result = EventRepository(db_session).all()
 
     assert len(result) == 2
+
+
+def _pages(fetch, limit):
+    cursor, pages = None, []
+    while True:
+        page = fetch(PageRequest(cursor=cursor, limit=limit))
+        pages.append(page)
+        cursor = page.pagination.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_paging_through_events_returns_each_event_once(db_session):
+    event_ids = {EventFactory(session=db_session).id for _ in range(7)}
+    db_session.commit()
+    repo = EventRepository(db_session)
+
+    pages = _pages(repo.all, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [event.id for page in pages for event in page] == sorted(event_ids)
+    assert all(page.pagination.total is None for page in pages)
+
+
+def test_deep_pages_seek_instead_of_offset(db_session):
+    for _ in range(5):
+        EventFactory(session=db_session)
+    db_session.commit()
+    repo = EventRepository(db_session)
+    cursor = repo.all(PageRequest(limit=2)).pagination.next_cursor
+
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", listener)
+    try:
+        page = repo.all(PageRequest(cursor=cursor, limit=2, with_total=True))
+    finally:
+        sqlalchemy.event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(page) == 2
+    assert page.pagination.total == 5
+    # SQLite always renders an OFFSET next to LIMIT, it must stay at 0.
+    paged = [params for statement, params in statements if "LIMIT" in statement]
+    assert paged and all(params[-1] == 0 for params in paged)
+
+
+def test_webhook_logs_page_newest_first_with_tied_timestamps(db_session):
+    webhook = Webhook(
+        id=uuid.uuid4(),
+        name="Discord",
+        target_url="https://discord.test/hook",
+        platform=WebhookPlatform.DISCORD.value,
+    )
+    db_session.add(webhook)
+    timestamps = [datetime(2026, 1, day) for day in (1, 2, 2, 2, 3)]
+    db_session.add_all(
+        WebhookLog(
+            id=uuid.uuid4(), webhook_id=webhook.id, payload={}, timestamp=timestamp
+        )
+        for timestamp in timestamps
+    )
+    db_session.commit()
+    repo = WebhookLogRepository(db_session)
+
+    pages = _pages(lambda page: repo.all(page=page), limit=2)
+    logs = [log for page in pages for log in page]
+
+    assert len({log.id for log in logs}) == 5
+    assert [log.timestamp for log in logs] == sorted(timestamps, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(InvalidCursor):
+        EventRepository(db_session).all(PageRequest(cursor="not a cursor"))
+
+
+def _car_catalog(db_session):
+    forza, acc = Game(id=1, name="Forza"), Game(id=2, name="ACC")
+    models = [
+        "Mercedes-AMG GT3",
+        "Mercedes-Benz 300 SL",
+        "Mercedes-Benz Mercedes C 9",
+        "Mercury Cougar Eliminator",
+        "Porsche 911 GT3",
+        "McLaren F1",
+    ]
+    db_session.add_all(Car(game=forza, model=model, year="2020") for model in models)
+    db_session.add(Car(game=acc, model="Mercedes-AMG GT3 Evo", year="2020"))
+    db_session.commit()
+
+
+def test_car_search_pages_through_ranked_prefix_matches(db_session):
+    _car_catalog(db_session)
+    repo = CarRepository(db_session)
+    query = GetCars(game_id=1, search="merc")
+
+    pages = _pages(lambda page: repo.all(query, page), limit=2)
+    cars = [car.model for page in pages for car in page]
+
+    assert sorted(cars) == [
+        "Mercedes-AMG GT3",
+        "Mercedes-Benz 300 SL",
+        "Mercedes-Benz Mercedes C 9",
+        "Mercury Cougar Eliminator",
+    ]
+    # Two matching words rank above one.
+    assert cars[0] == "Mercedes-Benz Mercedes C 9"
+
+
+def test_car_search_counts_matches_in_the_same_statement(db_session):
+    _car_catalog(db_session)
+    repo = CarRepository(db_session)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", listener)
+    try:
+        page = repo.all(
+            GetCars(game_id=1, search="mercedes gt"),
+            PageRequest(limit=1, with_total=True),
+        )
+    finally:
+        sqlalchemy.event.remove(engine, "before_cursor_execute", listener)
+
+    assert [car.model for car in page] == ["Mercedes-AMG GT3"]
+    assert page.pagination.total == 1
+    assert len(statements) == 1
+
+
+def test_car_search_treats_operators_as_text(db_session):
+    _car_catalog(db_session)
+    repo = CarRepository(db_session)
+
+    assert len(repo.all(GetCars(game_id=1, search='"AND (NEAR'))) == 0
+    assert len(repo.all(GetCars(game_id=1, search="--"))) == 0
+
+
+def test_car_suggestions_follow_catalog_changes(db_session):
+    _car_catalog(db_session)
+    repo = CarRepository(db_session)
+    porsche = db_session.query(Car).filter_by(model="Porsche 911 GT3").one()
+
+    porsche.model = "Porsche 918 Spyder"
+    db_session.commit()
+
+    assert [car.model for car in repo.suggest("por 91")] == ["Porsche 918 Spyder"]
+    assert [car.model for car in repo.suggest("gt3", game_id=2)] == [
+        "Mercedes-AMG GT3 Evo"
+    ]
+    assert repo.suggest("911") == []
@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from modules import (
+    TransactionScope,
+    application,
+    on_create_transaction_context,
+)
+from modules.event.commands.delete_event import DeleteEvent
+from modules.event.queries.get_games import GetGames
+from modules.event.repository import EventRepository, GameRepository, SeriesRepository
+from pointsheet.db import ReadOnlySession, ReadSessionFactory, Session
+from pointsheet.models import Game
+
+
+def test_dependencies_are_built_on_first_use():
+    ctx = on_create_transaction_context()
+    scope = ctx[TransactionScope]
+
+    assert not scope.opened
+
+    repository = ctx[EventRepository]
+
+    assert scope.opened
+    assert ctx[EventRepository] is repository
+    assert ctx[SeriesRepository]._session is repository._session is ctx[Session]
+
+
+def test_transactions_do_not_share_scope():
+    first = on_create_transaction_context()
+    second = on_create_transaction_context()
+
+    assert first[TransactionScope] is not second[TransactionScope]
+    assert first[EventRepository] is not second[EventRepository]
+
+
+def test_transaction_without_queries_does_not_open_a_session():
+    with application.transaction_context() as ctx:
+        scope = ctx[TransactionScope]
+
+    assert not scope.opened
+
+
+def test_queries_use_a_read_only_session():
+    ctx = on_create_transaction_context()
+    ctx.set_dependency("message", GetGames())
+
+    assert isinstance(ctx[Session], ReadOnlySession)
+    assert ctx[TransactionScope].read_only
+    assert ctx[GameRepository]._session is ctx[Session]
+
+
+def test_commands_use_the_read_write_session():
+    ctx = on_create_transaction_context()
+    ctx.set_dependency("message", DeleteEvent(event_id=uuid.uuid4()))
+
+    assert not isinstance(ctx[Session], ReadOnlySession)
+    assert not ctx[TransactionScope].read_only
+
+
+def test_read_only_session_refuses_to_flush():
+    session = ReadSessionFactory()
+    session.add(Game(name="Assetto Corsa Competizione"))
+
+    with pytest.raises(InvalidRequestError):
+        session.flush()
+
+    session.close()
+
+
+def test_query_inside_a_command_leaves_the_command_transaction_alone(db_session):
+    with application.transaction_context() as ctx:
+        ctx.set_dependency("message", DeleteEvent(event_id=uuid.uuid4()))
+        session = ctx[Session]
+        session.add(Game(name="Gran Turismo 7"))
+        session.flush()
+
+        application.execute(GetGames())
+
+        # the query didn't commit the command's partial work
+        session.rollback()
+
+    assert db_session.query(Game).filter_by(name="Gran Turismo 7").count() == 0
@@ -118,21 +118,24 @@ process_systemd_template() {
 echo "Setting up pointsheet service..."
 process_systemd_template "$CURRENT_LINK/bin/systemd/pointsheet.service.template" "/etc/systemd/system/pointsheet.service"
 
-# Setup systemd service and timer for webhook processing
-echo "Setting up systemd service and timer for webhook processing..."
+# Setup systemd service for webhook delivery
+echo "Setting up systemd service for webhook delivery..."
 
-# Process and install webhook processor service and timer
-process_systemd_template "$CURRENT_LINK/bin/systemd/webhook-processor.service.template" "/etc/systemd/system/webhook-processor.service"
-process_systemd_template "$CURRENT_LINK/bin/systemd/webhook-processor.timer.template" "/etc/systemd/system/webhook-processor.timer"
+# The daemon replaces the timer that ran the processor every 2 minutes
+if [ -f /etc/systemd/system/webhook-processor.timer ]; then
+    sudo systemctl disable --now webhook-processor.timer
+    sudo rm /etc/systemd/system/webhook-processor.timer
+fi
 
-# Enable and start the timer
-sudo systemctl enable webhook-processor.timer
-sudo systemctl start webhook-processor.timer
+# Process and install webhook delivery service
+process_systemd_template "$CURRENT_LINK/bin/systemd/webhook-processor.service.template" "/etc/systemd/system/webhook-processor.service"
+sudo systemctl enable webhook-processor.service
 
 # Reload systemd and start services
 sudo systemctl daemon-reload
 echo "Starting pointsheet.service and pointsheet-worker.service..."
 sudo systemctl start pointsheet.service pointsheet-worker.service
+sudo systemctl restart webhook-processor.service
 sudo systemctl restart caddy
 
 # Keep only the 2 most recent versions and their zip files